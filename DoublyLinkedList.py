@@ -0,0 +1,148 @@
+# Implement a doubly linked list, whose Links also point back to the
+# previous Link, so a Link can be removed or moved in constant time
+
+from LinkedList import *
+
+class DoubleLink(Link):        # One datum in a doubly linked list
+   __slots__ = ('__previous',) # Adds one field to the slotted Link
+
+   def __init__(self, datum, next=None, previous=None): # Constructor
+      super().__init__(datum, next) # Datum and next Link as for Link
+      self.__previous = previous # Reference to previous Link
+
+   def getPrevious(self): return self.__previous # Return previous link
+
+   def setPrevious(self, link): # Change the previous link
+      if link is None or isinstance(link, DoubleLink): # Must be
+         self.__previous = link # DoubleLink or None
+      else:
+         raise Exception("Previous link must be DoubleLink or None")
+
+class DoublyLinkedList(LinkedList): # A linked list that can also be
+   # walked backwards. Methods adding a datum return its new Link, a
+   # handle that unlink and moveToFront use in constant time. As in
+   # LinkedList, loops use the slots directly (_Link__next,
+   # _DoubleLink__previous) and the list's own private fields
+   # (_LinkedList__first, _LinkedList__last, _LinkedList__size), and
+   # every change updates LinkedList's indexes (addIndex) if any.
+
+   def setFirst(self, link):   # Change the first link to a new chain
+      if link is not None and not isinstance(link, DoubleLink):
+         raise Exception("First link must be DoubleLink or None")
+      super().setFirst(link)   # Finds the last Link and the size
+      previous = None          # and then point every Link back at
+      while link is not None:  # the one before it
+         link._DoubleLink__previous = previous
+         previous = link
+         link = link._Link__next
+
+   def insert(self, datum):    # Insert a new datum at start of list
+      first = self._LinkedList__first
+      link = DoubleLink(datum, first) # New Link before current first
+      if first is None:        # The first Link of an empty list is
+         self._LinkedList__last = link # also its last
+      else:
+         first._DoubleLink__previous = link
+      self._LinkedList__first = link
+      self._LinkedList__size += 1
+      if self._LinkedList__indexes:
+         self._LinkedList__linked(link, None)
+      return link
+
+   def append(self, datum):    # Insert a new datum at end of list
+      last = self._LinkedList__last
+      link = DoubleLink(datum, None, last) # New Link after current last
+      if last is None:         # Empty list: new Link is also first
+         self._LinkedList__first = link
+      else:
+         last._Link__next = link
+      self._LinkedList__last = link
+      self._LinkedList__size += 1
+      if self._LinkedList__indexes:
+         self._LinkedList__indexChain(link, last)
+      return link
+
+   def extend(self, data):     # Append every datum of an iterable,
+      for datum in data:       # keeping their order
+         self.append(datum)
+
+   def insertAfter(            # Insert a new datum after the first
+         self, goal, newDatum, # Link with a matching key
+         key=identity):
+      link = self.find(goal, key) # Find matching Link object
+      if link is None:         # If not found,
+         return False          # return failure
+      self.__linkAfter(link, DoubleLink(newDatum))
+      return True
+
+   def __linkAfter(self, link, newLink): # Chain newLink after link
+      after = link._Link__next
+      newLink._Link__next = after
+      newLink._DoubleLink__previous = link
+      link._Link__next = newLink
+      if after is None:        # Inserted after the last Link
+         self._LinkedList__last = newLink
+      else:
+         after._DoubleLink__previous = newLink
+      self._LinkedList__size += 1
+      if self._LinkedList__indexes:
+         self._LinkedList__linked(newLink, link)
+
+   def unlink(self, link):     # Remove a Link of this list in
+      previous = link._DoubleLink__previous # constant time and
+      after = link._Link__next # return its datum
+      if previous is None:     # No previous Link: must be the first
+         if link is not self._LinkedList__first:
+            raise Exception("Link is not in this list")
+         self._LinkedList__first = after
+      else:
+         previous._Link__next = after
+      if after is None:        # No next Link: it was the last
+         self._LinkedList__last = previous
+      else:
+         after._DoubleLink__previous = previous
+      link._Link__next = link._DoubleLink__previous = None # Detach
+      self._LinkedList__size -= 1
+      if self._LinkedList__indexes:
+         self._LinkedList__unlinked(link, previous, after)
+      return link._Link__data
+
+   def moveToFront(self, link): # Make a Link of this list the first
+      if link is self._LinkedList__first: # one, in constant time
+         return
+      self.unlink(link)
+      first = self._LinkedList__first
+      link._Link__next = first
+      if first is None:        # It was the only Link
+         self._LinkedList__last = link
+      else:
+         first._DoubleLink__previous = link
+      self._LinkedList__first = link
+      self._LinkedList__size += 1
+      if self._LinkedList__indexes:
+         self._LinkedList__linked(link, None)
+
+   def deleteFirst(self):      # Delete first Link
+      if self.isEmpty():       # Empty list? Raise an exception
+         raise Exception("Cannot delete first of empty list")
+      return self.unlink(self._LinkedList__first)
+
+   def deleteLast(self):       # Delete last Link
+      if self.isEmpty():       # Empty list? Raise an exception
+         raise Exception("Cannot delete last of empty list")
+      return self.unlink(self._LinkedList__last)
+
+   def delete(self, goal,      # Delete the first Link from the
+              key=identity):   # list whose key matches the goal
+      if self.isEmpty():       # Empty list? Raise an exception
+         raise Exception("Cannot delete from empty linked list")
+      link = self.find(goal, key) # Searching is still linear, but
+      if link is None:         # removing the Link found is not
+         raise Exception("No item with matching key found in list")
+      return self.unlink(link)
+
+   def __reversed__(self):     # Iterate over the data from last to
+      link = self._LinkedList__last # first
+      while link is not None:
+         yield link._Link__data
+         link = link._DoubleLink__previous
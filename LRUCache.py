@@ -0,0 +1,119 @@
+# Implement a least recently used (LRU) cache: a dictionary finds the
+# Link of a key, and a doubly linked list keeps the Links in order of
+# use, most recent first, so lookups, updates and evictions all take
+# constant time
+
+import threading
+import time
+from DoublyLinkedList import *
+
+class LRUCache(object):        # A bounded key-value cache
+   def __init__(self, capacity, # Constructor: at most capacity entries,
+                ttl=None,      # each kept at most ttl seconds (None
+                clock=time.monotonic): # for no limit)
+      if capacity < 1:
+         raise Exception("Cache capacity must be at least 1")
+      self.__capacity = capacity
+      self.__ttl = ttl
+      self.__clock = clock     # Function returning the time in seconds
+      self.__links = {}        # key -> Link holding (key, value, expiry)
+      self.__order = DoublyLinkedList() # Links, most recently used first
+      self.__lock = threading.RLock() # Callers may be on several threads
+      self.__invalidations = 0 # Counts invalidate/clear calls (getOrLoad)
+      self.__hits = self.__misses = 0 # Lookup statistics
+      self.__evictions = self.__expirations = 0
+
+   def __len__(self):          # Number of entries, including any that
+      return len(self.__links) # have expired but not been looked up
+
+   def __contains__(self, key): # Test if key has a live entry, without
+      with self.__lock:        # counting it as a use
+         link = self.__links.get(key)
+         return link is not None and not self.__expired(link)
+
+   def __expired(self, link):  # Test if a Link's entry is too old
+      expiry = link._Link__data[2]
+      return expiry is not None and self.__clock() >= expiry
+
+   def __remove(self, link):   # Drop a Link from the dictionary and list
+      del self.__links[link._Link__data[0]]
+      self.__order.unlink(link)
+
+   def get(self, key,          # Return the value cached for key, or
+           default=None):      # default if there is none (or it expired)
+      with self.__lock:
+         link = self.__links.get(key)
+         if link is None:
+            self.__misses += 1
+            return default
+         if self.__expired(link): # Too old: drop it, as if never cached
+            self.__remove(link)
+            self.__expirations += 1
+            self.__misses += 1
+            return default
+         self.__order.moveToFront(link) # Now the most recently used
+         self.__hits += 1
+         return link._Link__data[1]
+
+   def put(self, key, value):  # Cache value for key, evicting the least
+      with self.__lock:        # recently used entry if the cache is full
+         expiry = None if self.__ttl is None else self.__clock() + self.__ttl
+         link = self.__links.get(key)
+         if link is not None:  # Replace the entry and mark it as used
+            link._Link__data = (key, value, expiry)
+            self.__order.moveToFront(link)
+            return
+         if len(self.__links) >= self.__capacity:
+            self.__remove(self.__order.getLast()) # Evict the oldest
+            self.__evictions += 1
+         self.__links[key] = self.__order.insert((key, value, expiry))
+
+   def invalidate(self, key):  # Drop the entry for key, if any, e.g.
+      with self.__lock:        # because the underlying data changed
+         self.__invalidations += 1
+         link = self.__links.get(key)
+         if link is None:
+            return False
+         self.__remove(link)
+         return True
+
+   def clear(self):            # Drop every entry (statistics are kept)
+      with self.__lock:
+         self.__invalidations += 1
+         self.__links = {}
+         self.__order = DoublyLinkedList()
+
+   def getOrLoad(self, key,    # Return the value cached for key, or
+                 loader):      # call loader(key) and cache its result.
+      missing = object()       # The loader runs without the lock held,
+      value = self.get(key, missing) # so a slow load does not block
+      if value is not missing: # other callers; if an entry was
+         return value          # invalidated meanwhile the loaded value
+      with self.__lock:        # may be stale, so it is returned but
+         invalidations = self.__invalidations # not cached. None
+      value = loader(key)      # results (nothing found) are not cached
+      if value is not None:    # either.
+         with self.__lock:
+            if invalidations == self.__invalidations:
+               self.put(key, value)
+      return value
+
+   def stats(self):            # Return the cache's statistics
+      with self.__lock:
+         lookups = self.__hits + self.__misses
+         return {'size': len(self.__links), 'capacity': self.__capacity,
+                 'hits': self.__hits, 'misses': self.__misses,
+                 'hitRate': self.__hits / lookups if lookups else 0.0,
+                 'evictions': self.__evictions,
+                 'expirations': self.__expirations}
+
+def invalidator(cache,         # Make a PetDex change event subscriber
+                entity=None):  # that keeps a cache of records keyed by
+   def onChange(event):        # ID current: a changed record is dropped,
+      if entity is not None and event.entity != entity: # and a bulk
+         return                # reload (no ID) drops everything. Only
+      if event.entity_id is None: # events of entity ('pet', 'user',
+         cache.clear()         # ...) count, when one is given
+      else:
+         cache.invalidate(event.entity_id)
+   return onChange
@@ -0,0 +1,89 @@
+# Time the doubly linked list's constant time unlink against the
+# singly linked list's search and delete, the LRU cache's get and put,
+# and an LRU cache in front of PetDex's get_pet under a skewed load
+
+import logging
+import os
+import random
+import sys
+import timeit
+from LRUCache import *
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+calls = 100000                 # Calls timed per operation
+
+def best(func, number=1):      # Best of 3 timings, per call
+   return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+# Moving the last datum to the front, as a cache hit does: LinkedList
+# must walk the whole list to delete it, DoublyLinkedList unlinks the
+# Link it is handed
+slist = LinkedList()
+slist.extend(range(size))
+dlist = DoublyLinkedList()
+dlist.extend(range(size))
+
+print('Move the last of {} items to the front:'.format(size))
+print('  {:32} {:>12.0f} ns'.format('LinkedList delete + insert',
+   best(lambda: slist.insert(slist.delete(slist.last())), 10) * 1e9))
+print('  {:32} {:>12.0f} ns'.format('DoublyLinkedList.moveToFront',
+   best(lambda: dlist.moveToFront(dlist.getLast()), calls) * 1e9))
+assert len(dlist) == size and list(reversed(dlist)) == list(dlist)[::-1]
+
+# Cache operations: hits move a Link to the front, misses on a full
+# cache evict the last one
+cache = LRUCache(1000)
+for i in range(1000):
+   cache.put(i, i)
+keys = [random.randrange(1000) for i in range(calls)]
+newKeys = iter(range(1000, 1000 + 4 * calls))
+print('\nLRUCache of 1000 entries:')
+for label, func in [
+      ('get (hit)', lambda: [cache.get(key) for key in keys]),
+      ('put (replace)', lambda: [cache.put(key, 0) for key in keys]),
+      ('put (evict)', lambda: [cache.put(next(newKeys), 0)
+                               for key in keys])]:
+   print('  {:32} {:>12.0f} ns'.format(label, best(func) / calls * 1e9))
+
+# PetDex: a cache of pets in front of a SQLite database, kept current
+# by the database's change events. 80% of the lookups go to 20% of
+# the pets, and 1% of the operations update a pet.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'PetDex'))
+from database_manager import SQLiteDBManager
+logging.disable(logging.WARNING) # Per-call log lines would dominate
+
+pets = 20000
+db = SQLiteDBManager(':memory:')
+with db.transaction():
+   db.add_user('USR-OWNER', 'owner', 'hash', {}, '2024-01-01')
+   for i in range(pets):
+      db.add_pet('PET-{:05d}'.format(i), 'USR-OWNER', 'Pet {}'.format(i),
+                 'Dog', 'Aspin', 1, 'Brown', None, '2024-01-01')
+cache = LRUCache(pets // 4)
+db.subscribe(invalidator(cache, 'pet'))
+
+rng = random.Random(1)
+def petId():                   # A pet ID, skewed towards the first 20%
+   hot = rng.random() < 0.8
+   return 'PET-{:05d}'.format(rng.randrange(pets // 5) if hot else
+                              rng.randrange(pets // 5, pets))
+load = [(petId(), rng.random() < 0.01) for i in range(calls)]
+
+def run(getPet):               # Replay the load, checking every pet
+   for n, (pet_id, update) in enumerate(load): # read is current
+      if update:
+         db.update_pet(pet_id, {'age': n})
+         assert getPet(pet_id)['age'] == n
+      else:
+         getPet(pet_id)
+
+uncached = best(lambda: run(db.get_pet))
+cache.clear()
+cached = best(lambda: run(lambda pet_id: cache.getOrLoad(pet_id,
+                                                          db.get_pet)))
+stats = cache.stats()
+print('\nPetDex get_pet, {} lookups over {} pets:'.format(calls, pets))
+print('  {:32} {:>12.3f} s'.format('SQLite', uncached))
+print('  {:32} {:>12.3f} s ({:.0%} hits)'.format(
+   'LRUCache({}) + SQLite'.format(pets // 4), cached, stats['hitRate']))
@@ -0,0 +1,25 @@
+from LRUCache import *
+
+print('Test a cache of 3 entries')
+cache = LRUCache(3)
+for i, name in enumerate(['Don', 'Ken', 'Ivan']):
+   cache.put(i, name)
+print('Entry 0 is', cache.get(0), '(now the most recently used)')
+cache.put(3, 'Raj')
+print('After adding entry 3, entry 1 was evicted:', cache.get(1),
+      ' entries 0, 2, 3 remain:', [cache.get(i) for i in (0, 2, 3)])
+print('Invalidating entry 2 returns', cache.invalidate(2),
+      'and then', cache.invalidate(2))
+print('Loading entry 5:', cache.getOrLoad(5, lambda key: 'Amir'),
+      ' loading it again:', cache.getOrLoad(5, lambda key: 'never called'))
+print('Statistics:', cache.stats())
+
+print('Test expiry with a clock we control')
+now = [0.0]
+cache = LRUCache(10, ttl=30, clock=lambda: now[0])
+cache.put('pet', 'Max')
+now[0] = 29
+print('After 29 seconds the entry is', cache.get('pet'))
+now[0] = 31
+print('After 31 seconds the entry is', cache.get('pet'),
+      ' statistics:', cache.stats())
@@ -1,8 +1,16 @@
 # Implement a singly linked list and a link class
 
+import bisect
+import itertools
+
 def identity(x): return x      # Identity function
 
+GAP = 1 << 32                  # Space between the order labels of
+                               # Links appended or inserted at an end
+
 class Link(object):            # One datum in a linked list
+   __slots__ = ('__data', '__next') # Fixed fields, no per-Link __dict__
+
    def __init__(self, datum, next=None): # Constructor
       self.__data = datum      # The datum for this link
       self.__next = next       # Reference to next Link
@@ -28,17 +36,167 @@ class Link(object):            # One datum in a linked list
       return str(self.getData())
 
 class LinkedList(object):      # A linked list of data elements
+   # Loops over the Links read and write their private slots directly
+   # (link._Link__data, link._Link__next) instead of calling getData,
+   # getNext and setNext, which cost a method call (and, for setNext,
+   # a type check) per Link. The accessors remain for everyone else.
+   #
+   # addIndex(key) keeps a dictionary from key values to the Links
+   # with that key, in list order, so find, search, insertAfter,
+   # delete and in, called with that same key function, take constant
+   # time on average; other key functions still walk the list. While
+   # any index exists, a dictionary of each Link's previous Link lets
+   # delete unlink without walking too, and a dictionary of order
+   # labels, integers increasing along the list, keeps each key's
+   # Links sorted by label, so a Link inserted in the middle finds its
+   # place in its key's Links by bisection. When two neighbours' labels
+   # leave no room between them, the labels of the smallest aligned
+   # window around them that is sparse enough are spread out evenly
+   # (amortized O(log n) relabelling). Key values must be hashable,
+   # and data must not be changed in place (setData) while indexed.
+
    def __init__(self):         # Constructor
       self.__first = None      # Reference to first Link
+      self.__last = None       # Reference to last Link (for append)
+      self.__size = 0          # Number of Links, kept by every change
+      self.__indexes = {}      # key function -> {key value: [Links]}
+      self.__previous = {}     # Link -> previous Link, while indexed
+      self.__order = {}        # Link -> order label, while indexed
 
    def getFirst(self): return self.__first # Return the first link
 
+   def getLast(self): return self.__last # Return the last link
+
    def setFirst(self, link):   # Change the first link to a new Link
       if link is None or isinstance(link, Link): # It must be None or
          self.__first = link   # a Link object
       else:
          raise Exception("First link must be Link or None")
-      
+      self.__last = None       # The new chain may have any length, so
+      size = 0                 # walk it once to find its last Link
+                               # and count its Links
+      while link is not None:
+         self.__last = link
+         size += 1
+         link = link._Link__next
+      self.__size = size
+      if self.__indexes:       # Index the new chain from scratch
+         self.__reindex()
+
+   def addIndex(self, key=identity): # Index the Links by key value
+      if key not in self.__indexes: # (see above)
+         self.__indexes[key] = {}
+         self.__reindex()
+
+   def removeIndex(self, key=identity): # Stop indexing by key
+      if self.__indexes.pop(key, None) is not None and not self.__indexes:
+         self.__previous = {}  # No index left to delete with or to
+         self.__order = {}     # keep in order
+
+   def __reindex(self):        # Rebuild every index from the Links
+      self.__previous = {}
+      self.__order = {}
+      for key in self.__indexes:
+         self.__indexes[key] = {}
+      self.__indexChain(self.__first, None)
+
+   def __indexChain(self,      # Add the Links from link to the end of
+         link, previous):      # the list, chained after previous, to
+      previousOf = self.__previous # the indexes: each one follows
+      order = self.__order     # every indexed Link with the same key
+      indexes = self.__indexes.items()
+      label = -GAP if previous is None else order[previous]
+      while link is not None:
+         previousOf[link] = previous
+         label += GAP
+         order[link] = label
+         for key, index in indexes:
+            value = key(link._Link__data)
+            links = index.get(value)
+            if links is None:
+               index[value] = [link]
+            else:
+               links.append(link)
+         previous = link
+         link = link._Link__next
+
+   def __linked(self, link,    # Add one Link just chained in after
+                previous):     # previous (None at the front) to the
+      after = link._Link__next # indexes, keeping each key's Links in
+      self.__previous[link] = previous # list order
+      order = self.__order
+      if previous is None:     # Label it below or above its neighbour
+         label = 0 if after is None else order[after] - GAP
+      elif after is None:
+         label = order[previous] + GAP
+      elif order[after] - order[previous] > 1: # or halfway between
+         label = (order[previous] + order[after]) // 2 # neighbours
+      else:                    # No label left in between: relabel the
+         order[link] = order[previous] # Links around it, itself too
+         self.__spread(link)
+         label = order[link]
+      order[link] = label
+      if after is not None:
+         self.__previous[after] = link
+      for key, index in self.__indexes.items():
+         value = key(link._Link__data)
+         links = index.get(value)
+         if links is None:
+            index[value] = [link]
+         elif previous is None: # At the front: before all the others
+            links.insert(0, link)
+         elif after is None:   # At the end: after all the others
+            links.append(link)
+         else:                 # In the middle: before the first Link
+            links.insert(bisect.bisect(links, label, # labelled after it
+                                       key=order.__getitem__), link)
+
+   def __spread(self, link):   # Give link a label of its own: widen
+      order = self.__order     # an aligned window of labels around it
+      previousOf = self.__previous # until it holds few enough Links
+      label = order[link]      # (count squared at most its width),
+      first = last = link      # then space them evenly
+      count, bits = 1, 1
+      while True:
+         low = label >> bits << bits
+         high = low + (1 << bits)
+         before = previousOf[first]
+         while before is not None and order[before] >= low:
+            first, before = before, previousOf[before]
+            count += 1
+         after = last._Link__next
+         while after is not None and order[after] < high:
+            last, after = after, after._Link__next
+            count += 1
+         if count * count <= high - low:
+            break
+         bits += 1
+      step = (high - low) // count # At least 2, leaving room between
+      link = first             # any two of them
+      while True:
+         order[link] = low
+         if link is last:
+            return
+         low += step
+         link = link._Link__next
+
+   def __unlinked(self, link,  # Drop a Link just removed from between
+                  previous, after): # previous and after from indexes
+      del self.__previous[link]
+      if after is not None:
+         self.__previous[after] = previous
+      order = self.__order
+      label = order[link]
+      for key, index in self.__indexes.items():
+         value = key(link._Link__data)
+         links = index[value]
+         if len(links) == 1:
+            del index[value]
+         else:                 # Found by its label, not by a scan
+            del links[bisect.bisect_left(links, label,
+                                         key=order.__getitem__)]
+      del order[link]
+
    def getNext(self): return self.getFirst()    # First link is next
    def setNext(self, link): self.setFirst(link) # First link is next
 
@@ -50,43 +208,104 @@ class LinkedList(object):      # A linked list of data elements
          raise Exception("No first item in empty list")
       return self.getFirst().getData() # Return data item (not Link)
    
+   def last(self):             # Return the last item in the list
+      if self.isEmpty():       # as long as it is not empty
+         raise Exception("No last item in empty list")
+      return self.__last.getData() # Return data item (not Link)
+
    def traverse(self,          # Apply a function to all items in list
                 func=print):   # with the default being to print
-      link = self.getFirst()   # Start with first link
+      link = self.__first      # Start with first link
       while link is not None:  # Keep going until no more links
-         func(link.getData())  # Apply the function to the item
-         link = link.getNext() # Move on to next link
+         func(link._Link__data) # Apply the function to the item
+         link = link._Link__next # Move on to next link
 
    def __len__(self):          # Get length of list
-      l = 0
-      link = self.getFirst()   # Start with first link
-      while link is not None:  # Keep going until no more links
-         l += 1                # Count Link in chain
-         link = link.getNext() # Move on to next link
-      return l
-         
+      return self.__size       # Maintained count, no walk needed
+
+   def __iter__(self):         # Iterate over the data (not Links) in
+      link = self.__first      # order, so lists work with for, sum,
+      while link is not None:  # itertools and so on; changing the
+         yield link._Link__data # list while iterating may skip or
+         link = link._Link__next # repeat items
+
+   def __contains__(self, goal): # Test if a datum is in the list
+      return self.find(goal) is not None
+
+   def view(self):             # Lazy view of the data, for chaining
+      return ListView(self.__iter__) # map/filter/take/chunked stages
+
+   def map(self, func): return self.view().map(func)
+   def filter(self, predicate=None): return self.view().filter(predicate)
+   def take(self, n): return self.view().take(n)
+   def chunked(self, size): return self.view().chunked(size)
+
    def __str__(self):          # Build a string representation
-      result = "["             # Enclose list in square brackets
-      link = self.getFirst()   # Start with first link
-      while link is not None:  # Keep going until no more links
-         if len(result) > 1:   # After first link,
-            result += " > "    # separate links with right arrowhead
-         result += str(link)   # Append string version of link
-         link = link.getNext() # Move on to next link
-      return result + "]"      # Close with square bracket
+      return "[" + " > ".join( # Enclose list in square brackets,
+         map(str, self)) + "]" # separating data with right arrowhead
 
    def insert(self, datum):    # Insert a new datum at start of list
       link = Link(datum,       # Make a new Link for the datum
-                  self.getFirst()) # What follows is the current list
-      self.setFirst(link)      # Update list to include new Link
+                  self.__first) # What follows is the current list
+      if self.__first is None: # The first Link of an empty list is
+         self.__last = link    # also its last
+      self.__first = link      # Update list to include new Link
+      self.__size += 1
+      if self.__indexes:
+         self.__linked(link, None)
+
+   def append(self, datum):    # Insert a new datum at end of list
+      link = Link(datum)       # Make a new Link for the datum
+      previous = self.__last
+      if previous is None:     # Empty list: new Link is also first
+         self.__first = link
+      else:                    # Otherwise chain it after last Link
+         previous._Link__next = link
+      self.__last = link       # Either way, it is the new last Link
+      self.__size += 1
+      if self.__indexes:
+         self.__indexChain(link, previous)
+
+   def extend(self, data):     # Append every datum of an iterable,
+      first = last = None      # keeping their order: chain new Links
+      size = 0                 # locally, then attach the whole chain
+      for datum in data:
+         link = Link(datum)
+         if last is None:
+            first = link
+         else:
+            last._Link__next = link
+         last = link
+         size += 1
+      if first is None:        # Nothing to append
+         return
+      previous = self.__last
+      if previous is None:     # Empty list: the chain is the list
+         self.__first = first
+      else:
+         previous._Link__next = first
+      self.__last = last
+      self.__size += size
+      if self.__indexes:
+         self.__indexChain(first, previous)
 
    def find(                   # Find the 1st Link whose key matches
          self, goal, key=identity): # the goal
-      link = self.getFirst()   # Start at first link
+      index = self.__indexes.get(key)
+      if index is not None:    # Indexed key: no need to walk
+         links = index.get(goal)
+         return links[0] if links else None
+      link = self.__first      # Start at first link
+      if key is identity:      # Comparing the data themselves: skip
+         while link is not None: # the key call for every Link
+            if link._Link__data == goal:
+               return link
+            link = link._Link__next
+         return None
       while link is not None:  # Search until the end of the list
-         if key(link.getData()) == goal:  # Does this Link match?
+         if key(link._Link__data) == goal: # Does this Link match?
             return link        # If so, return the Link itself
-         link = link.getNext() # Else, continue on along list
+         link = link._Link__next # Else, continue on along list
          
    def search(                 # Find 1st item whose key matches goal
          self, goal, key=identity):
@@ -101,8 +320,13 @@ class LinkedList(object):      # A linked list of data elements
       if link is None:         # If not found,
          return False          # return failure
       newLink = Link(          # Else build a new Link node with
-         newDatum, link.getNext()) # new datum and remainder of list
-      link.setNext(newLink)    # and insert after matching link
+         newDatum, link._Link__next) # new datum and remainder of list
+      link._Link__next = newLink # and insert after matching link
+      if link is self.__last:  # Inserted after the last Link, so
+         self.__last = newLink # the new Link is now last
+      self.__size += 1
+      if self.__indexes:
+         self.__linked(newLink, link)
       return True
 
    def deleteFirst(self):      # Delete first Link
@@ -110,22 +334,76 @@ class LinkedList(object):      # A linked list of data elements
          raise Exception("Cannot delete first of empty list")
       
       first = self.getFirst()  # Store first Link
-      self.setFirst(first.getNext()) # Remove first link from list
-      return first.getData()   # Return first Link's data
+      self.__first = first._Link__next # Remove first link from list
+      if self.__first is None: # Deleted the only Link, so there is
+         self.__last = None    # no last Link either
+      self.__size -= 1
+      if self.__indexes:
+         self.__unlinked(first, None, self.__first)
+      return first._Link__data # Return first Link's data
 
    def delete(self, goal,      # Delete the first Link from the
               key=identity):   # list whose key matches the goal
       if self.isEmpty():       # Empty list? Raise an exception
          raise Exception("Cannot delete from empty linked list")
 
-      previous = self          # Link or LinkedList before Link
-      while previous.getNext() is not None: # to be deleted
-         link = previous.getNext()  # Next link after previous
-         if goal == key(link.getData()): # If next Link matches,
-            previous.setNext(  # change the previous' next
-               link.getNext()) # to be Link's next and return
-            return link.getData() # data since match was found
-         previous = link       # Advance previous to next Link
+      index = self.__indexes.get(key)
+      if index is not None:    # Indexed key: the matching Link and
+         links = index.get(goal) # the one before it are both known
+         if links is not None:
+            return self.__remove(links[0], self.__previous[links[0]])
+      else:
+         previous = None       # Link before Link to be deleted
+         link = self.__first   # (None while at the first Link)
+         while link is not None:
+            datum = link._Link__data
+            if goal == (datum if key is identity else key(datum)):
+               return self.__remove(link, previous) # Match found
+            previous = link    # Advance previous to next Link
+            link = link._Link__next
          
-      # Since loop ended without finding item, raise exception
+      # Since no matching item was found, raise exception
       raise Exception("No item with matching key found in list")
+
+   def __remove(self, link,    # Remove a Link from the list, given
+                previous):     # the Link before it (None if first),
+      after = link._Link__next # and return its datum
+      if previous is None:     # Change the previous' next to be
+         self.__first = after  # Link's next
+      else:
+         previous._Link__next = after
+      if link is self.__last:  # Deleted the last Link, so the
+         self.__last = previous # previous one is now last
+      self.__size -= 1
+      if self.__indexes:
+         self.__unlinked(link, previous, after)
+      return link._Link__data
+
+class ListView(object):        # A lazy view of a list's data: every
+   def __init__(self, source): # iteration walks the list again, and
+      self.__source = source   # map/filter/take/chunked add stages
+                               # without copying the data
+   def __iter__(self):         # source is a function returning a new
+      return self.__source()   # iterator over the data
+
+   def map(self, func):        # View of func applied to each datum
+      return ListView(lambda: map(func, self))
+
+   def filter(self, predicate=None): # View of the data for which
+      return ListView(         # predicate is true (truthy data when
+         lambda: filter(predicate, self)) # predicate is None)
+
+   def take(self, n):          # View of the first n data; iteration
+      return ListView(         # stops there without walking the rest
+         lambda: itertools.islice(self, n))
+
+   def chunked(self, size):    # View of the data in lists of size
+      if size < 1:             # items (the last may be shorter)
+         raise Exception("Chunk size must be at least 1")
+      def chunks():
+         data = iter(self)
+         chunk = list(itertools.islice(data, size))
+         while chunk:
+            yield chunk
+            chunk = list(itertools.islice(data, size))
+      return ListView(chunks)
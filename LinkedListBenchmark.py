@@ -0,0 +1,133 @@
+# Time LinkedList operations on large lists: len() and append
+# should take the same time whatever the length of the list
+
+import sys
+import timeit
+import tracemalloc
+from LinkedList import *
+
+sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000]
+calls = 100000                 # Calls timed per operation and size
+
+def walkLength(llist):         # Count Links by walking the chain,
+   count = 0                   # as len() used to
+   link = llist.getFirst()
+   while link is not None:
+      count += 1
+      link = link.getNext()
+   return count
+
+print('{:>10} {:>12} {:>12} {:>14} {:>12}'.format(
+   'Size', 'Build (s)', 'len() (ns)', 'Walk (ms)', 'append (ns)'))
+for size in sizes:
+   llist = LinkedList()
+   start = timeit.default_timer()
+   llist.extend(range(size))   # Build the list in order
+   build = timeit.default_timer() - start
+   assert len(llist) == size and llist.last() == size - 1
+
+   length = min(timeit.repeat(lambda: len(llist), number=calls,
+                              repeat=3)) / calls
+   walk = min(timeit.repeat(lambda: walkLength(llist), number=1,
+                            repeat=3))
+   append = min(timeit.repeat(lambda: llist.append(0), number=calls,
+                              repeat=3)) / calls
+   print('{:>10} {:>12.3f} {:>12.0f} {:>14.2f} {:>12.0f}'.format(
+      size, build, length * 1e9, walk * 1e3, append * 1e9))
+
+# Memory and traversal costs at the largest size
+size = max(sizes)
+data = list(range(size))       # Data allocated before measuring, so
+tracemalloc.start()            # only the Links are counted
+llist = LinkedList()
+llist.extend(data)
+linkBytes = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+print('\n{} Links use {:.1f} MB ({:.0f} bytes per Link)'.format(
+   size, linkBytes / 1e6, linkBytes / size))
+
+def best(func):                # Best of 3 timings of one call
+   return min(timeit.repeat(func, number=1, repeat=3))
+
+def keep(datum): pass          # Does nothing with each datum
+
+for label, func in [
+      ('traverse', lambda: llist.traverse(keep)),
+      ('find (missing)', lambda: llist.find(-1)),
+      ('find (missing, key)', lambda: llist.find(-1, key=lambda x: x)),
+      ('in (missing)', lambda: -1 in llist),
+      ('sum (iteration)', lambda: sum(llist)),
+      ('str', lambda: str(llist)),
+      ('take(10) of filter', lambda: list(
+         llist.filter(lambda x: x % 2).take(10))),
+      ('chunked(1000)', lambda: sum(1 for chunk in llist.chunked(1000))),
+      ('delete last + append', lambda: llist.append(llist.delete(size - 1)))]:
+   print('{:>22} {:10.1f} ms'.format(label, best(func) * 1e3))
+
+# Before and after slotted Links: the original Link, with a per-Link
+# __dict__ and walked through getData and getNext, beside the slotted
+# Link that LinkedList's loops walk through its slots
+class DictLink(object):        # Link as it was before __slots__
+   def __init__(self, datum, next=None): # Constructor
+      self.__data = datum      # The datum for this link
+      self.__next = next       # Reference to next Link
+
+   def getData(self): return self.__data # Return the datum
+
+   def getNext(self): return self.__next # Return the next link
+
+def chain(linkClass):          # Link every datum, back to front
+   first = None
+   for datum in reversed(data):
+      first = linkClass(datum, first)
+   return first
+
+def getterTraverse(link, func): # traverse() as it was
+   while link is not None:
+      func(link.getData())
+      link = link.getNext()
+
+def getterFind(link, goal):    # find() as it was, default key
+   while link is not None:
+      if link.getData() == goal:
+         return link
+      link = link.getNext()
+
+tracemalloc.start()
+before = chain(DictLink)
+beforeBytes = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+print('\n{:>22} {:>12} {:>12}'.format(
+   '{} Links'.format(size), 'before', 'after'))
+print('{:>22} {:12.0f} {:12.0f}'.format(
+   'bytes per Link', beforeBytes / size, linkBytes / size))
+for label, old, new in [
+      ('traverse (ms)', lambda: getterTraverse(before, keep),
+       lambda: llist.traverse(keep)),
+      ('find (missing) (ms)', lambda: getterFind(before, -1),
+       lambda: llist.find(-1))]:
+   print('{:>22} {:12.1f} {:12.1f}'.format(
+      label, best(old) * 1e3, best(new) * 1e3))
+del before                     # Free the old chain before indexing
+
+# The same keyed lookups with an index on the key function: the
+# dictionary takes the place of the walk, at a cost in memory
+def negate(x): return -x       # Key function to index by
+
+tracemalloc.start()
+llist.addIndex(negate)
+indexBytes = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+print('\nIndex on {} Links uses {:.1f} MB ({:.0f} bytes per Link)'.format(
+   size, indexBytes / 1e6, indexBytes / size))
+twins = iter(range(size - 1, 0, -1)) # A new datum per call, each
+for label, func in [                 # already near the end
+      ('find (missing, key)', lambda: llist.find(1, key=negate)),
+      ('find (last, key)', lambda: llist.find(1 - size, key=negate)),
+      ('delete last + append', lambda: llist.append(
+         llist.delete(1 - size, key=negate))),
+      ('append', lambda: llist.append(size)),
+      ('insertAfter, far twin', lambda: llist.insertAfter( # New Link's
+         0, next(twins), key=negate)), # same-key Link is far along
+      ('delete first + insert', lambda: llist.insert(llist.deleteFirst()))]:
+   print('{:>22} {:10.1f} us'.format(label, best(func) * 1e6))
@@ -54,3 +54,34 @@ try:
    print('This should not be printed! Empty list allowed delete!')
 except Exception as e:
    print('Exception was raised:\n', e)
+
+print('Test appending in order')
+llist = LinkedList()
+for person in people[:3]:
+   llist.append(person)
+llist.extend(people[3:])
+print('After appending', len(llist), 'persons, the list is', llist,
+      'with first', llist.first(), 'and last', llist.last())
+llist.delete(people[-1])
+print('After deleting', people[-1], 'the last item is', llist.last())
+
+print('Test iterating over the list')
+print('Names in the list:', ', '.join(person for person in llist))
+print('Is', people[0], 'in the list?', people[0] in llist,
+      ' Is', people[-1], '?', people[-1] in llist)
+print('Lengths of names longer than 3 letters:',
+      list(llist.filter(lambda p: len(p) > 3).map(len)))
+print('First two names:', list(llist.take(2)))
+print('Names in pairs:', list(llist.chunked(2)))
+
+print('Test indexed lookups by key')
+def initial(person):
+   return person[0]
+
+llist.addIndex(initial)         # find, search and delete by initial
+llist.append('Ann')             # no longer walk the list
+print('First name starting with A:', llist.search('A', key=initial))
+print('After deleting', llist.delete('A', key=initial),
+      'the first name starting with A is', llist.search('A', key=initial))
+print('Deleting by another key function still works:',
+      llist.delete(3, key=len), 'and the list is', llist)
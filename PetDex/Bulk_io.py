@@ -0,0 +1,306 @@
+import logging # Imports the logging module for application logging
+import csv # Imports csv to read and write comma-separated files
+import json # Imports json for JSON-lines files and the nested fields stored in CSV cells
+import datetime # Imports datetime to validate dates and default missing ones to today
+from collections import namedtuple # Imports namedtuple for import reports
+
+from database_manager import SQLiteDBManager # Imports the storage engine whose column lists define the file layout
+
+logger = logging.getLogger(__name__) # Initializes a logger for this module
+
+ENTITIES = ('user', 'pet', 'stray') # Loading order when several files are imported together (pets and strays refer to users)
+FIELDS = { # Columns of each entity, in file order
+    'user': SQLiteDBManager.USER_COLUMNS,
+    'pet': SQLiteDBManager.PET_COLUMNS,
+    'stray': SQLiteDBManager.STRAY_COLUMNS,
+}
+JSON_FIELDS = SQLiteDBManager.JSON_COLUMNS # Nested dictionaries, stored as JSON text inside CSV cells
+PET_STATUSES = ('registered', 'lost')
+STRAY_STATUSES = ('stray', 'found_captured')
+
+BATCH_SIZE = 5000 # Validated records handed to the database per insert_records() call
+MAX_REPORTED_ERRORS = 100 # Rejected rows listed in an ImportReport; later ones are only counted
+
+# Outcome of an import: rows read, loaded, rejected by validation, skipped as duplicates, and (line, message) per rejected row
+ImportReport = namedtuple('ImportReport', ['entity', 'read', 'loaded', 'rejected', 'duplicates', 'errors'])
+
+def file_format(path):
+    """Returns 'csv' or 'jsonl' from a file name's extension."""
+    lowered = path.lower()
+    if lowered.endswith(".csv"):
+        return "csv"
+    if lowered.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Unsupported file type (expected .csv, .jsonl or .ndjson): {path}")
+
+# --- Reading ---
+
+def read_rows(text_file, fmt):
+    """
+    Streams the rows of an open CSV or JSON-lines file as (line_number, row dictionary) pairs.
+    Only one row is held in memory at a time. A JSON line that cannot be parsed is yielded as (line_number, None).
+    """
+    if fmt == "csv":
+        reader = csv.reader(text_file)
+        header = next(reader, None)
+        if header is None: # Empty file
+            return
+        for row in reader:
+            if row: # Skips blank lines
+                yield reader.line_num, dict(zip(header, row))
+    else:
+        for line_number, line in enumerate(text_file, 1):
+            if line.strip():
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = None # Reported as a rejected row by the loader
+                yield line_number, row
+
+# --- Validation ---
+# Each validator turns one raw row (CSV strings or JSON values) into a complete record, or raises ValueError.
+
+def _required(row, field):
+    value = row.get(field)
+    if value is None or value == "":
+        raise ValueError(f"'{field}' is required")
+    return str(value)
+
+def _text(value):
+    return None if value is None or value == "" else str(value) # CSV cannot tell an empty string from a missing value
+
+def _number(value, field, low=None, high=None):
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            value = int(value)
+        except ValueError:
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError(f"'{field}' must be a number, got {value!r}") from None
+    elif isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"'{field}' must be a number, got {value!r}")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise ValueError(f"'{field}' is out of range: {value}")
+    return value
+
+def _date(value, field, today):
+    if value is None or value == "":
+        return today # Same default as records added through the application
+    try:
+        moment = datetime.datetime.fromisoformat(str(value)) # The whole value: an ISO date, or an ISO date and time
+    except ValueError:
+        raise ValueError(f"'{field}' must be an ISO date, got {value!r}") from None
+    return moment.date().isoformat() # Stored as YYYY-MM-DD, like the application's own records (and the sort order expects)
+
+def _choice(value, field, choices):
+    if value is None or value == "":
+        return choices[0] # Status of a newly added record
+    if value not in choices:
+        raise ValueError(f"'{field}' must be one of {', '.join(choices)}, got {value!r}")
+    return value
+
+def _nested(value, field):
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            raise ValueError(f"'{field}' is not valid JSON") from None
+    if not isinstance(value, dict):
+        raise ValueError(f"'{field}' must be a JSON object")
+    return value
+
+def validate_user(row, today):
+    """Validates one user row. Passwords must already be hashed (as exported); plain-text passwords are not accepted."""
+    return {
+        'user_id': _required(row, 'user_id'),
+        'username': _required(row, 'username'),
+        'password_hash': _required(row, 'password_hash'),
+        'contact_info': _nested(row.get('contact_info'), 'contact_info') or {},
+        'registration_date': _date(row.get('registration_date'), 'registration_date', today),
+    }
+
+def validate_pet(row, today):
+    """Validates one pet row."""
+    return {
+        'pet_id': _required(row, 'pet_id'),
+        'owner_id': _required(row, 'owner_id'),
+        'pet_name': _required(row, 'pet_name'),
+        'species': _required(row, 'species'),
+        'breed': _text(row.get('breed')),
+        'age': _number(row.get('age'), 'age', low=0),
+        'color': _text(row.get('color')),
+        'image_path': _text(row.get('image_path')),
+        'registration_date': _date(row.get('registration_date'), 'registration_date', today),
+        'status': _choice(row.get('status'), 'status', PET_STATUSES),
+        'lost_details': _nested(row.get('lost_details'), 'lost_details'),
+    }
+
+def validate_stray(row, today):
+    """Validates one stray report row. Coordinates are optional but must come in pairs."""
+    record = {
+        'stray_id': _required(row, 'stray_id'),
+        'reporter_id': _text(row.get('reporter_id')),
+        'species': _required(row, 'species'),
+        'location': _required(row, 'location'),
+        'breed': _text(row.get('breed')),
+        'color': _text(row.get('color')),
+        'description': _text(row.get('description')),
+        'contact_info': _nested(row.get('contact_info'), 'contact_info'),
+        'reported_date': _date(row.get('reported_date'), 'reported_date', today),
+        'status': _choice(row.get('status'), 'status', STRAY_STATUSES),
+        'latitude': _number(row.get('latitude'), 'latitude', low=-90, high=90),
+        'longitude': _number(row.get('longitude'), 'longitude', low=-180, high=180),
+    }
+    if (record['latitude'] is None) != (record['longitude'] is None):
+        raise ValueError("'latitude' and 'longitude' must both be given or both be empty")
+    return record
+
+VALIDATORS = {'user': validate_user, 'pet': validate_pet, 'stray': validate_stray}
+
+
+class BulkLoader:
+    """
+    Streams CSV or JSON-lines files into a storage engine.
+    Rows are validated one by one and inserted in batches with insert_records(), which skips per-record index
+    maintenance, logging and change events; finish_bulk_insert() then rebuilds the indexes once and tells
+    subscribers to reload. Pets whose owner, and strays whose reporter, is neither in the store nor loaded by the
+    same call are rejected, since the user deletion cascade and the owner views would never find them.
+    Memory use stays constant apart from the loaded records and the set of known user IDs.
+    """
+
+    def __init__(self, db_manager, batch_size=BATCH_SIZE):
+        """
+        :param db_manager: Storage engine providing insert_records() and finish_bulk_insert().
+        :param batch_size: Validated records per insert_records() call.
+        """
+        self.db_manager = db_manager # Stores the storage engine to load into
+        self.batch_size = batch_size # Records per batch
+
+    def load_file(self, entity, path):
+        """
+        Loads one file of 'user', 'pet' or 'stray' records; the format follows the extension (.csv, .jsonl, .ndjson).
+        :return: An ImportReport.
+        """
+        return self.load_files({entity: path})[entity]
+
+    def load_files(self, paths):
+        """
+        Loads several files in one bulk operation (one index rebuild at the end).
+        :param paths: Dictionary entity -> file path; users are loaded before pets and strays.
+        :return: Dictionary entity -> ImportReport.
+        """
+        reports = {}
+        known_users = set() # User IDs loaded by this call or found in the store, shared by the files
+        try:
+            for entity in ENTITIES:
+                if entity in paths:
+                    with open(paths[entity], "r", encoding="utf-8", newline="") as text_file:
+                        reports[entity] = self._load(entity, read_rows(text_file, file_format(paths[entity])), known_users)
+        finally:
+            self.db_manager.finish_bulk_insert([entity for entity in ENTITIES if entity in paths]) # Also after a failure, for consistent indexes
+        return reports
+
+    def load(self, entity, rows):
+        """
+        Loads rows from any iterable of (line_number, row dictionary) pairs, e.g. read_rows() on an open file.
+        :return: An ImportReport.
+        """
+        try:
+            return self._load(entity, rows, set())
+        finally:
+            self.db_manager.finish_bulk_insert([entity])
+
+    def _known_user(self, user_id, known_users):
+        """Tells whether user_id belongs to a user loaded by this call or already stored, remembering the answer."""
+        if user_id in known_users:
+            return True
+        if self.db_manager.get_user_by_id(user_id) is None:
+            return False
+        known_users.add(user_id) # Later rows of the same user skip the lookup
+        return True
+
+    def _load(self, entity, rows, known_users):
+        """
+        Validates and inserts rows in batches; the caller finishes the bulk insert.
+        :param known_users: Set of known user IDs; users loaded here are added, pets and strays are checked against it.
+        """
+        validate = VALIDATORS[entity]
+        user_field = {'pet': 'owner_id', 'stray': 'reporter_id'}.get(entity) # Reference to a user, if any
+        today = str(datetime.date.today()) # Default date for rows without one
+        read = loaded = rejected = 0
+        errors = []
+        batch = []
+        for line_number, row in rows:
+            read += 1
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError("not a JSON object")
+                record = validate(row, today)
+                if entity == 'user':
+                    known_users.add(record['user_id']) # Pets and strays loaded after it may refer to it
+                elif record[user_field] is not None and not self._known_user(record[user_field], known_users):
+                    raise ValueError(f"'{user_field}' refers to an unknown user: {record[user_field]!r}")
+                batch.append(record)
+            except ValueError as e:
+                rejected += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append((line_number, str(e)))
+                continue
+            if len(batch) >= self.batch_size:
+                loaded += self.db_manager.insert_records(entity, batch)
+                batch = []
+        if batch:
+            loaded += self.db_manager.insert_records(entity, batch)
+        report = ImportReport(entity, read, loaded, rejected, read - rejected - loaded, errors)
+        logger.info("Bulk import: %d of %d %s rows loaded (%d rejected, %d duplicates).", loaded, read, entity, rejected, report.duplicates)
+        return report
+
+# --- Exporting ---
+
+def iter_records(db_manager, entity, page_size=1000):
+    """
+    Streams every record of an entity through keyset pagination, one page in memory at a time.
+    Records written while the export runs do not break it: each page continues after the previous page's last key.
+    """
+    fetch_page = {'user': db_manager.get_users_after, 'pet': db_manager.get_pets_after, 'stray': db_manager.get_strays_after}[entity]
+    cursor = None
+    while True:
+        records, cursor = fetch_page(cursor, page_size)
+        yield from records
+        if cursor is None: # No more pages
+            return
+
+def write_records(records, text_file, fmt, fields):
+    """
+    Writes records to an open file one at a time, as CSV (with a header row) or JSON lines.
+    :return: The number of records written.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(text_file)
+        writer.writerow(fields)
+        for record in records:
+            writer.writerow([json.dumps(record.get(field), default=dict) if field in JSON_FIELDS and record.get(field) is not None
+                             else record.get(field) for field in fields]) # None is written as an empty cell
+            count += 1
+    else:
+        for record in records:
+            text_file.write(json.dumps({field: record.get(field) for field in fields}, separators=(",", ":"), default=dict) + "\n")
+            count += 1
+    return count
+
+def export_file(db_manager, entity, path, page_size=1000):
+    """
+    Exports every 'user', 'pet' or 'stray' record to a file; the format follows the extension.
+    Files written here can be loaded back with BulkLoader.
+    :return: The number of records written.
+    """
+    with open(path, "w", encoding="utf-8", newline="") as text_file:
+        count = write_records(iter_records(db_manager, entity, page_size), text_file, file_format(path), FIELDS[entity])
+    logger.info("Bulk export: %d %s records written to '%s'.", count, entity, path)
+    return count
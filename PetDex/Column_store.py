@@ -0,0 +1,234 @@
+import logging # Imports the logging module for application logging
+import math # Imports math for NaN checks in the pure-Python fallback
+import threading # Imports threading to guard the columns against concurrent updates and queries
+import datetime # Imports datetime to store dates as day numbers
+from array import array # Imports array for compact, typed columns
+
+try:
+    import numpy # Optional: vectorised aggregation over the columns
+except ImportError: # Without NumPy the same queries run as plain Python loops
+    numpy = None
+
+logger = logging.getLogger(__name__) # Initializes a logger for this module
+
+CATEGORY_COLUMNS = ('species', 'breed', 'color', 'status') # Dictionary-encoded columns
+MISSING_DAY = 0 # Day number stored for pets without a (valid) registration date
+
+def day_number(iso_date):
+    """Converts an ISO date (or timestamp) string into a day number, MISSING_DAY if it is not a date."""
+    try:
+        return datetime.date.fromisoformat(str(iso_date)[:10]).toordinal()
+    except ValueError:
+        return MISSING_DAY
+
+
+class CategoryColumn:
+    """
+    Dictionary-encoded column: every distinct value is stored once, and each row holds a small integer code.
+    Codes are 16-bit until a column has more than 65536 distinct values, then 32-bit.
+    """
+
+    def __init__(self):
+        self.values = [] # code -> value
+        self.codes = {} # value -> code
+        self.data = array('H') # One code per row
+
+    def encode(self, value):
+        """Returns the code of a value, adding the value to the dictionary on first use."""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            if code > 0xFFFF and self.data.typecode == 'H': # Widen once the 16-bit codes run out
+                self.data = array('I', self.data)
+        return code
+
+
+class PetColumnStore:
+    """
+    Column-oriented copy of the pet table for analytics: one typed array per field instead of one record per pet.
+    Aggregates (group-by counts, per-day counts, histograms) scan only the columns they need; with NumPy
+    installed they run as vectorised operations over zero-copy views of the arrays.
+    Rows of deleted pets are marked dead and reused by later inserts, so row numbers stay stable.
+
+    Filters are given as a dictionary ("where"), e.g. {'status': 'lost', 'species': ('Dog', 'Cat'), 'age': (1, 5),
+    'registration_date': ('2024-01-01', '2024-02-01')}; ranges include the low end and exclude the high end,
+    and None leaves that end open.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock() # Change events arrive on writer threads while reports query
+        self.row_of = {} # pet_id -> row
+        self.pet_ids = [] # row -> pet_id (None for a dead row)
+        self.free_rows = [] # Dead rows available for reuse
+        self.live = array('B') # 1 for rows holding a pet, 0 for dead rows
+        self.categories = {column: CategoryColumn() for column in CATEGORY_COLUMNS}
+        self.age = array('d') # Age in years, NaN when unknown
+        self.registered = array('i') # Registration day number, MISSING_DAY when unknown
+
+    def __len__(self):
+        return len(self.row_of)
+
+    # --- Maintenance ---
+
+    def set_pet(self, pet_id, pet_data):
+        """Adds, updates or (with pet_data None) removes one pet."""
+        with self._lock:
+            row = self.row_of.get(pet_id)
+            if pet_data is None:
+                if row is not None: # Mark the row dead and keep it for reuse
+                    del self.row_of[pet_id]
+                    self.pet_ids[row] = None
+                    self.live[row] = 0
+                    self.free_rows.append(row)
+                return
+            age = pet_data.get('age')
+            values = [self.categories[column].encode(pet_data.get(column)) for column in CATEGORY_COLUMNS]
+            age = float(age) if isinstance(age, (int, float)) and not isinstance(age, bool) else math.nan
+            registered = day_number(pet_data.get('registration_date'))
+            if row is None and self.free_rows: # Reuse a dead row
+                row = self.free_rows.pop()
+                self.row_of[pet_id] = row
+                self.pet_ids[row] = pet_id
+                self.live[row] = 1
+            if row is None: # Append a new row to every column
+                self.row_of[pet_id] = len(self.pet_ids)
+                self.pet_ids.append(pet_id)
+                self.live.append(1)
+                for column, code in zip(CATEGORY_COLUMNS, values):
+                    self.categories[column].data.append(code)
+                self.age.append(age)
+                self.registered.append(registered)
+            else: # Overwrite the row in place
+                for column, code in zip(CATEGORY_COLUMNS, values):
+                    self.categories[column].data[row] = code
+                self.age[row] = age
+                self.registered[row] = registered
+
+    # --- Filtering ---
+
+    def _condition(self, column, condition):
+        """
+        Normalises one filter condition: ('in', set of codes) for category columns,
+        ('range', low, high) for age and registration_date.
+        """
+        if column in self.categories:
+            wanted = condition if isinstance(condition, (tuple, list, set, frozenset)) else (condition,)
+            codes = self.categories[column].codes
+            return ('in', [codes[value] for value in wanted if value in codes])
+        if column not in ('age', 'registration_date'):
+            raise ValueError(f"Cannot filter pets by {column!r}")
+        low, high = condition
+        if column == 'registration_date':
+            low = day_number(low) if low is not None else None
+            high = day_number(high) if high is not None else None
+        return ('range', low, high)
+
+    def _numpy_mask(self, where):
+        """Boolean NumPy array selecting the live rows that satisfy every condition. Call with the lock held."""
+        mask = numpy.frombuffer(self.live, dtype=numpy.uint8).astype(bool) # astype copies, so the view is not kept
+        for column, condition in (where or {}).items():
+            kind, *arguments = self._condition(column, condition)
+            if kind == 'in':
+                data = numpy.frombuffer(self.categories[column].data, dtype=self.categories[column].data.typecode)
+                mask &= numpy.isin(data, arguments[0])
+            else:
+                data = numpy.frombuffer(self.age if column == 'age' else self.registered,
+                                        dtype='d' if column == 'age' else 'i')
+                low, high = arguments
+                if low is not None:
+                    mask &= data >= low
+                if high is not None:
+                    mask &= data < high
+                if column == 'registration_date':
+                    mask &= data != MISSING_DAY
+        return mask
+
+    def _python_rows(self, where):
+        """List of the live rows that satisfy every condition (fallback without NumPy). Call with the lock held."""
+        rows = [row for row, alive in enumerate(self.live) if alive]
+        for column, condition in (where or {}).items():
+            kind, *arguments = self._condition(column, condition)
+            if kind == 'in':
+                wanted, data = set(arguments[0]), self.categories[column].data
+                rows = [row for row in rows if data[row] in wanted]
+            else:
+                data = self.age if column == 'age' else self.registered
+                low, high = arguments
+                rows = [row for row in rows if (low is None or data[row] >= low) and (high is None or data[row] < high)
+                        and data[row] == data[row] and (column == 'age' or data[row] != MISSING_DAY)] # NaN != NaN
+        return rows
+
+    # --- Aggregates ---
+
+    def count(self, where=None):
+        """Number of pets matching the filter."""
+        with self._lock:
+            if numpy is not None:
+                return int(numpy.count_nonzero(self._numpy_mask(where)))
+            return len(self._python_rows(where))
+
+    def group_count(self, column, where=None):
+        """
+        Counts the pets matching the filter per value of a category column, e.g. group_count('species', {'status': 'lost'}).
+        :return: Dictionary value -> count, largest first; values with no pets are left out.
+        """
+        with self._lock:
+            category = self.categories[column]
+            if numpy is not None:
+                data = numpy.frombuffer(category.data, dtype=category.data.typecode)
+                counts = numpy.bincount(data[self._numpy_mask(where)], minlength=len(category.values))
+                pairs = [(category.values[code], int(counts[code])) for code in numpy.flatnonzero(counts)]
+            else:
+                counts = {}
+                for row in self._python_rows(where):
+                    code = category.data[row]
+                    counts[code] = counts.get(code, 0) + 1
+                pairs = [(category.values[code], count) for code, count in counts.items()]
+        return dict(sorted(pairs, key=lambda pair: -pair[1]))
+
+    def per_day(self, where=None):
+        """
+        Counts registrations per day among the pets matching the filter (pets without a date are left out).
+        :return: Dictionary ISO date -> count, in date order; days without registrations are left out.
+        """
+        with self._lock:
+            if numpy is not None:
+                days = numpy.frombuffer(self.registered, dtype='i')[self._numpy_mask(where)]
+                days = days[days != MISSING_DAY]
+                if not days.size:
+                    return {}
+                first = int(days.min())
+                counts = numpy.bincount(days - first)
+                return {datetime.date.fromordinal(first + int(offset)).isoformat(): int(counts[offset])
+                        for offset in numpy.flatnonzero(counts)}
+            counts = {}
+            for row in self._python_rows(where):
+                day = self.registered[row]
+                if day != MISSING_DAY:
+                    counts[day] = counts.get(day, 0) + 1
+        return {datetime.date.fromordinal(day).isoformat(): counts[day] for day in sorted(counts)}
+
+    def age_histogram(self, bin_width=1, where=None):
+        """
+        Histogram of the ages of the pets matching the filter (pets of unknown age are left out).
+        :param bin_width: Width of each bin in years.
+        :return: List of (low, high, count) for every bin from the youngest to the oldest pet.
+        """
+        with self._lock:
+            if numpy is not None:
+                ages = numpy.frombuffer(self.age, dtype='d')[self._numpy_mask(where)]
+                bins = numpy.floor(ages[~numpy.isnan(ages)] / bin_width).astype(numpy.int64)
+                if not bins.size:
+                    return []
+                first = int(bins.min())
+                counts = [int(count) for count in numpy.bincount(bins - first)]
+            else:
+                bins = [math.floor(self.age[row] / bin_width) for row in self._python_rows(where) if not math.isnan(self.age[row])]
+                if not bins:
+                    return []
+                first = min(bins)
+                counts = [0] * (max(bins) - first + 1)
+                for value in bins:
+                    counts[value - first] += 1
+        return [((first + i) * bin_width, (first + i + 1) * bin_width, count) for i, count in enumerate(counts)]
@@ -2,25 +2,48 @@ import customtkinter # Imports the CustomTkinter library for modern GUI elements
 import logging # Imports the logging module for application logging
 import datetime # Imports datetime for handling date and time objects
 import tkinter.messagebox as messagebox # Imports messagebox for displaying pop-up messages
-from PIL import Image, ImageTk # Imports Image and ImageTk for handling images (e.g., pet photos)
-import os # Imports the os module for interacting with the operating system (e.g., file paths)
+import tkinter.filedialog as filedialog # Imports filedialog to choose where exported metrics are saved
 
 from Update_pet_dialog import UpdatePetDialog # Imports the custom dialog for updating pet details
+from Virtual_list import VirtualListFrame, ListDataSource, PagedDataSource # Imports the virtualized list widget and its data sources
+from Thumbnail_cache import ThumbnailCache # Imports the background-decoded, cached pet photo thumbnails
+from Metrics import METRICS # Imports the per-method call counts and latency histograms shown in the diagnostics panel
 
 logger = logging.getLogger(__name__) # Initializes a logger for this module
 
+# Fixed row heights (pixels) used by the virtualized lists
+PET_ROW_HEIGHT = 175
+STRAY_ROW_HEIGHT = 250
+LOST_PET_ROW_HEIGHT = 175
+SEARCH_ROW_HEIGHT = 50
+TREND_PERIODS = {"Daily": ('day', 14), "Weekly": ('week', 12), "Monthly": ('month', 12)} # Menu entry -> (granularity, periods shown)
+TREND_COLUMNS = [('user_registrations', "Users"), ('pet_registrations', "Pets"), ('lost_reports', "Lost"),
+                 ('found_events', "Found"), ('stray_reports', "Strays"), ('stray_captures', "Captured")] # Trend metric -> column heading
+
+SEARCH_DELAY_MS = 150 # Typing pause before a search runs, so fast typing does not search on every key
+
 class DashboardFrame(customtkinter.CTkFrame):
-    def __init__(self, master, user_manager, pet_data_manager, report_manager, switch_to_login_callback):
+    def __init__(self, master, user_manager, pet_data_manager, report_manager, search_manager, task_runner, switch_to_login_callback):
         super().__init__(master) # Calls the constructor of the parent class (customtkinter.CTkFrame)
         self.user_manager = user_manager # Stores the UserManager instance for user-related operations
         self.pet_data_manager = pet_data_manager # Stores the PetDataManager instance for pet data operations
         self.report_manager = report_manager # Stores the ReportManager instance for generating reports
+        self.search_manager = search_manager # Stores the SearchManager instance for searching pets and strays
+        self.task_runner = task_runner # Runs backend calls off the Tk thread and delivers their results back to it
         self.switch_to_login_callback = switch_to_login_callback # Stores the callback function to switch to the login screen
         self.current_user_id = None # Initializes current_user_id to None; will store the ID of the logged-in user
 
         # Current selected pet/stray in lists for update/delete
         self.selected_pet_id = None # Stores the ID of the currently selected owned pet in the list
         self.selected_stray_id = None # Stores the ID of the currently selected stray pet in the list
+        self.thumbnail_cache = ThumbnailCache(self) # Decodes pet photos off the Tk thread and caches the thumbnails
+
+        # Incremental refresh state: the change version each view was last synchronised to, and the patchable sources
+        self.view_versions = {} # View name ('pets', 'strays', 'reports') -> change version
+        self.pet_source = None # ListDataSource of the current user's pets
+        self.lost_pet_source = None # ListDataSource of all lost pets
+        self.stray_source = None # PagedDataSource of all stray reports
+        self.search_job = None # Pending debounced search (after() id)
 
         # Configure grid for the Dashboard frame itself
         self.grid_columnconfigure(1, weight=1) # Makes the second column (content area) expandable
@@ -92,9 +115,19 @@ class DashboardFrame(customtkinter.CTkFrame):
 
         # Display owned pets in dashboard
         customtkinter.CTkLabel(self.dashboard_content_frame, text="Your Registered Pets:", font=customtkinter.CTkFont(size=16, weight="bold")).grid(row=4, column=0, pady=(20,10), sticky="sw") # Label for registered pets list
-        self.dashboard_pets_scroll_frame = customtkinter.CTkScrollableFrame(self.dashboard_content_frame) # Scrollable frame to display registered pets
-        self.dashboard_pets_scroll_frame.grid(row=5, column=0, padx=10, pady=10, sticky="nsew") # Places the scrollable frame
-        self.dashboard_pets_scroll_frame.grid_columnconfigure(0, weight=1) # Makes the column in the scrollable frame expandable
+        self.dashboard_pets_list = VirtualListFrame(self.dashboard_content_frame, PET_ROW_HEIGHT, # Virtualized list to display registered pets
+                                                    lambda parent: self._create_pet_row(parent, is_dashboard=True), self._bind_pet_row,
+                                                    empty_text="No registered pets to display.")
+        self.dashboard_pets_list.grid(row=5, column=0, padx=10, pady=10, sticky="nsew") # Places the list
+
+        # Search Section
+        self.search_entry = customtkinter.CTkEntry(self.dashboard_content_frame, placeholder_text="Search pets and stray reports (name, breed, color, location...)") # Search box
+        self.search_entry.grid(row=6, column=0, padx=20, pady=(10, 5), sticky="ew") # Places the search box
+        self.search_entry.bind("<KeyRelease>", self._schedule_search) # Searches as the user types
+        self.search_results_list = VirtualListFrame(self.dashboard_content_frame, SEARCH_ROW_HEIGHT, # Virtualized list of search results
+                                                    self._create_search_row, self._bind_search_row,
+                                                    empty_text="Type to search pets and stray reports.", height=150)
+        self.search_results_list.grid(row=7, column=0, padx=10, pady=(0, 10), sticky="nsew") # Places the results list
 
         # ------------------------------------------------------------------------- Manage My Pets Tab ---------------------------------------------------------------------
         self.manage_pets_tab = self.tab_view.tab("Manage My Pets") # Gets the "Manage My Pets" tab frame
@@ -138,9 +171,10 @@ class DashboardFrame(customtkinter.CTkFrame):
         self.add_pet_button_form.grid(row=len(labels_and_entries_pets), column=0, columnspan=2, pady=10) # Places the add pet button
 
         customtkinter.CTkLabel(self.manage_pets_frame, text="Your Registered Pets", font=customtkinter.CTkFont(size=18, weight="bold")).grid(row=1, column=0, pady=(20,10), sticky="w") # Label for displaying registered pets list
-        self.my_pets_scroll_frame = customtkinter.CTkScrollableFrame(self.manage_pets_frame) # Scrollable frame to display owned pets
-        self.my_pets_scroll_frame.grid(row=2, column=0, padx=10, pady=10, sticky="nsew") # Places the scrollable frame
-        self.my_pets_scroll_frame.grid_columnconfigure(0, weight=1) # Makes the column in the scrollable frame expandable
+        self.my_pets_list = VirtualListFrame(self.manage_pets_frame, PET_ROW_HEIGHT, # Virtualized list to display owned pets
+                                             lambda parent: self._create_pet_row(parent, is_dashboard=False), self._bind_pet_row,
+                                             empty_text="No registered pets to display. Add one above!")
+        self.my_pets_list.grid(row=2, column=0, padx=10, pady=10, sticky="nsew") # Places the list
 
         # ------------------------------------------------------------------------- Stray Reporting Tab ---------------------------------------------------------------------
         self.stray_reporting_tab = self.tab_view.tab("Stray Reporting") # Gets the "Stray Reporting" tab frame
@@ -159,6 +193,8 @@ class DashboardFrame(customtkinter.CTkFrame):
             ("Location (Last Seen):", "stray_location_entry"),
             ("Breed (Optional):", "stray_breed_entry"),
             ("Color:", "stray_color_entry"),
+            ("Latitude (Optional):", "stray_latitude_entry"),
+            ("Longitude (Optional):", "stray_longitude_entry"),
             ("Description (Optional):", "stray_description_entry"),
             ("Contact Email (Optional):", "stray_email_entry"),
             ("Contact Phone (Optional):", "stray_phone_entry")
@@ -182,9 +218,11 @@ class DashboardFrame(customtkinter.CTkFrame):
         self.report_stray_button.grid(row=len(labels_and_entries_strays), column=0, columnspan=2, pady=10) # Places the report stray button
 
         customtkinter.CTkLabel(self.stray_reporting_tab, text="Reported Stray Pets (Public)", font=customtkinter.CTkFont(size=18, weight="bold")).grid(row=1, column=0, pady=(20,10), sticky="w") # Label for reported stray pets list
-        self.stray_pets_scroll_frame = customtkinter.CTkScrollableFrame(self.stray_reporting_tab) # Scrollable frame to display stray pets
-        self.stray_pets_scroll_frame.grid(row=2, column=0, padx=10, pady=10, sticky="nsew") # Places the scrollable frame
-        self.stray_pets_scroll_frame.grid_columnconfigure(0, weight=1) # Makes the column in the scrollable frame expandable
+        self.stray_pets_list = VirtualListFrame(self.stray_reporting_tab, STRAY_ROW_HEIGHT, # Virtualized list to display stray pets
+                                                self._create_stray_row, self._bind_stray_row,
+                                                empty_text="No stray pet reports to display.",
+                                                task_runner=self.task_runner, bind_placeholder=self._bind_stray_placeholder) # Pages load in the background
+        self.stray_pets_list.grid(row=2, column=0, padx=10, pady=10, sticky="nsew") # Places the list
 
         # ------------------------------------------------------------------------- Reports Tab ---------------------------------------------------------------------
         self.reports_tab = self.tab_view.tab("Reports") # Gets the "Reports" tab frame
@@ -195,7 +233,7 @@ class DashboardFrame(customtkinter.CTkFrame):
         self.reports_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10) # Places the frame within the tab
         self.reports_frame.grid_columnconfigure(0, weight=1) # Makes the column in the frame expandable
         self.reports_frame.grid_rowconfigure((0,1,2,3), weight=0) # Sets fixed size for report labels
-        self.reports_frame.grid_rowconfigure(4, weight=1) # Makes the scrollable frame row expandable
+        self.reports_frame.grid_rowconfigure(8, weight=1) # Makes the lost pets list row expandable
 
         customtkinter.CTkLabel(self.reports_frame, text="Application Reports", font=customtkinter.CTkFont(size=20, weight="bold")).grid(row=0, column=0, pady=10) # Title for reports section
 
@@ -211,11 +249,26 @@ class DashboardFrame(customtkinter.CTkFrame):
         self.stray_pets_report_label = customtkinter.CTkLabel(self.reports_frame, text="", wraplength=700, justify="left") # Label for stray pets count
         self.stray_pets_report_label.grid(row=4, column=0, padx=20, pady=5, sticky="ew") # Places the label
 
+        self.pet_analytics_label = customtkinter.CTkLabel(self.reports_frame, text="", wraplength=700, justify="left") # Label for lost pets by species, recent registrations and ages
+        self.pet_analytics_label.grid(row=5, column=0, padx=20, pady=5, sticky="ew") # Places the label
+
+        # Trends Panel: registrations, losses, finds and captures per period
+        self.trends_frame = customtkinter.CTkFrame(self.reports_frame) # Frame for the trends table and its period selector
+        self.trends_frame.grid(row=6, column=0, padx=10, pady=(15,5), sticky="ew") # Places the trends frame
+        self.trends_frame.grid_columnconfigure(0, weight=1) # Makes the title column expandable
+        customtkinter.CTkLabel(self.trends_frame, text="Trends:", font=customtkinter.CTkFont(size=16, weight="bold")).grid(row=0, column=0, padx=10, pady=5, sticky="w") # Label for trends panel
+        self.trend_granularity_menu = customtkinter.CTkOptionMenu(self.trends_frame, values=list(TREND_PERIODS), command=lambda _: self._update_trends()) # Selects daily, weekly or monthly buckets
+        self.trend_granularity_menu.set("Weekly") # Default period
+        self.trend_granularity_menu.grid(row=0, column=1, padx=10, pady=5, sticky="e") # Places the menu
+        self.trends_label = customtkinter.CTkLabel(self.trends_frame, text="", justify="left", font=customtkinter.CTkFont(family="Courier", size=12)) # Fixed-width table of counts per period
+        self.trends_label.grid(row=1, column=0, columnspan=2, padx=10, pady=5, sticky="w") # Places the table
+
         # Display Lost Pets in Reports Tab
-        customtkinter.CTkLabel(self.reports_frame, text="Lost Pets (Public Reports):", font=customtkinter.CTkFont(size=16, weight="bold")).grid(row=5, column=0, pady=(20,10), sticky="sw") # Label for lost pets list
-        self.lost_pets_scroll_frame = customtkinter.CTkScrollableFrame(self.reports_frame) # Scrollable frame for lost pets
-        self.lost_pets_scroll_frame.grid(row=6, column=0, padx=10, pady=10, sticky="nsew") # Places the scrollable frame
-        self.lost_pets_scroll_frame.grid_columnconfigure(0, weight=1) # Makes the column in the scrollable frame expandable
+        customtkinter.CTkLabel(self.reports_frame, text="Lost Pets (Public Reports):", font=customtkinter.CTkFont(size=16, weight="bold")).grid(row=7, column=0, pady=(20,10), sticky="sw") # Label for lost pets list
+        self.lost_pets_list = VirtualListFrame(self.reports_frame, LOST_PET_ROW_HEIGHT, # Virtualized list for lost pets
+                                               self._create_lost_pet_row, self._bind_lost_pet_row,
+                                               empty_text="No lost pets reported.")
+        self.lost_pets_list.grid(row=8, column=0, padx=10, pady=10, sticky="nsew") # Places the list
 
         # ------------------------------------------------------------------------- Settings Tab ---------------------------------------------------------------------
         self.settings_tab = self.tab_view.tab("Settings") # Gets the "Settings" tab frame
@@ -251,6 +304,17 @@ class DashboardFrame(customtkinter.CTkFrame):
         self.delete_account_button = customtkinter.CTkButton(self.settings_frame, text="Delete Account", fg_color="red", hover_color="darkred", command=self._delete_account) # Button to delete user account
         self.delete_account_button.grid(row=len(settings_fields) + 2, column=0, columnspan=2, pady=10) # Places the delete account button
 
+        # Diagnostics Panel: call counts, latency percentiles and result sizes of the manager methods
+        self.diagnostics_frame = customtkinter.CTkFrame(self.settings_frame) # Frame for the metrics table and its buttons
+        self.diagnostics_frame.grid(row=len(settings_fields) + 3, column=0, columnspan=2, padx=10, pady=(20,10), sticky="nsew") # Places the diagnostics frame
+        self.diagnostics_frame.grid_columnconfigure(0, weight=1) # Makes the title column expandable
+        customtkinter.CTkLabel(self.diagnostics_frame, text="Diagnostics:", font=customtkinter.CTkFont(size=16, weight="bold")).grid(row=0, column=0, padx=10, pady=5, sticky="w") # Label for diagnostics panel
+        customtkinter.CTkButton(self.diagnostics_frame, text="Refresh", width=80, command=self._update_diagnostics).grid(row=0, column=1, padx=5, pady=5) # Re-reads the metrics
+        customtkinter.CTkButton(self.diagnostics_frame, text="Reset", width=80, command=self._reset_diagnostics).grid(row=0, column=2, padx=5, pady=5) # Starts counting from zero
+        customtkinter.CTkButton(self.diagnostics_frame, text="Export JSON", width=100, command=self._export_diagnostics).grid(row=0, column=3, padx=(5,10), pady=5) # Saves the metrics to a file
+        self.diagnostics_text = customtkinter.CTkTextbox(self.diagnostics_frame, height=200, wrap="none", font=customtkinter.CTkFont(family="Courier", size=12)) # Fixed-width metrics table
+        self.diagnostics_text.grid(row=1, column=0, columnspan=4, padx=10, pady=(0,10), sticky="nsew") # Places the table
+
 
     def select_tab(self, tab_name):
         """
@@ -267,17 +331,67 @@ class DashboardFrame(customtkinter.CTkFrame):
         }
         self.tab_view.set(tab_map.get(tab_name, "Dashboard")) # Sets the active tab in the CTkTabview
 
-        # Reload data specific to certain tabs when they are selected
+        # Patch the data shown in the selected tab with what changed since it was last shown
         if tab_name == "dashboard_tab":
-            self.load_user_data(self.current_user_id) # Reloads user and pet data for the dashboard
-            self.load_pet_data(self.current_user_id)
-            self.load_stray_data() # Reloads stray data
+            self.load_user_data(self.current_user_id) # Reloads the user's profile (a single record)
+            self.refresh_pet_data()
+            self.refresh_stray_data()
+            self._run_search() # Re-runs the current search against the latest data
         elif tab_name == "manage_pets_tab":
-            self.load_pet_data(self.current_user_id) # Reloads pet data for the manage pets tab
+            self.refresh_pet_data() # Patches pet data for the manage pets tab
         elif tab_name == "stray_reporting_tab":
-            self.load_stray_data() # Reloads stray data for the stray reporting tab
+            self.refresh_stray_data() # Patches stray data for the stray reporting tab
         elif tab_name == "reports_tab":
-            self.load_reports_data() # Reloads report data for the reports tab
+            self.refresh_reports_data() # Patches report data for the reports tab
+        elif tab_name == "settings_tab":
+            self._update_diagnostics() # Shows the metrics gathered so far
+
+    def _changes_since_shown(self, view, manager):
+        """
+        Returns (events, version): the change events for a view since it was last synchronised, and the version they lead to.
+        events is None when the view has never been loaded or missed too many changes and must reload fully.
+        The view is only marked synchronised (_mark_shown) once it shows the changes, so a refresh that gets
+        cancelled by a newer one loses nothing: the newer one starts from the same version.
+        """
+        return manager.get_changes_since(self.view_versions.get(view))
+
+    def _mark_shown(self, view, version):
+        """Records that a view now reflects every change up to version."""
+        self.view_versions[view] = version
+
+    @staticmethod
+    def _versioned(manager, function, *args):
+        """
+        Worker: reads the change version, then calls function(*args).
+        The version is read first, so any change the result might miss is newer and applied by the next refresh.
+        """
+        version = manager.get_change_version()
+        return version, function(*args)
+
+    def _fetch_pets(self, pet_ids):
+        """Worker: the current state of each pet, or None for pets that were deleted."""
+        return {pet_id: self.pet_data_manager.get_pet(pet_id) for pet_id in pet_ids}
+
+    def _submit_action(self, function, *args, success_message, error_message, on_done=None, success_title="Success", **kwargs):
+        """
+        Runs a backend write on the task runner.
+        If it returns a truthy result, shows success_message (a string, or a callable(result) returning one) and calls on_done(result);
+        otherwise, or if it raises, shows error_message and logs the failure.
+        """
+        def finished(result):
+            if result:
+                messagebox.showinfo(success_title, success_message(result) if callable(success_message) else success_message) # Success message
+                if on_done:
+                    on_done(result)
+            else:
+                messagebox.showerror("Error", error_message) # Error message
+                logger.error(f"{error_message} ({function.__name__}{args})") # Logs the error
+
+        def failed(error):
+            messagebox.showerror("Error", error_message) # Error message
+            logger.error(f"{error_message} ({function.__name__} raised {error!r})") # Logs the error
+
+        return self.task_runner.submit(function, *args, on_success=finished, on_error=failed, **kwargs)
 
 
     def load_user_data(self, user_id):
@@ -286,33 +400,39 @@ class DashboardFrame(customtkinter.CTkFrame):
         """
         if user_id:
             self.current_user_id = user_id # Sets the current user ID
-            user_data = self.user_manager.get_user(user_id) # Fetches user data from the user manager
-            if user_data:
-                # Update Dashboard Info
-                self.user_info_label.configure(text=
-                    f"User ID: {user_data.get('user_id', 'N/A')}\n" # Displays user ID
-                    f"Username: {user_data.get('username', 'N/A')}\n" # Displays username
-                    f"Email: {user_data.get('contact_info', {}).get('email', 'N/A')}\n" # Displays email from contact info
-                    f"Phone: {user_data.get('contact_info', {}).get('phone', 'N/A')}\n" # Displays phone from contact info
-                    f"Registration Date: {user_data.get('registration_date', 'N/A')}" # Displays registration date
-                )
-
-                # Populate Settings fields
-                self.settings_widgets["username_entry"].delete(0, customtkinter.END) # Clears existing username entry
-                self.settings_widgets["username_entry"].insert(0, user_data.get('username', '')) # Inserts current username
-
-                self.settings_widgets["email_entry"].delete(0, customtkinter.END) # Clears existing email entry
-                self.settings_widgets["email_entry"].insert(0, user_data.get('contact_info', {}).get('email', '')) # Inserts current email
-
-                self.settings_widgets["phone_entry"].delete(0, customtkinter.END) # Clears existing phone entry
-                self.settings_widgets["phone_entry"].insert(0, user_data.get('contact_info', {}).get('phone', '')) # Inserts current phone
-
-                # Clear password fields
-                self.settings_widgets["new_password_entry"].delete(0, customtkinter.END) # Clears new password field
-                self.settings_widgets["confirm_new_password_entry"].delete(0, customtkinter.END) # Clears confirm password field
-            else:
-                messagebox.showerror("Error", "Could not load user data.") # Shows error if user data cannot be loaded
-                logger.error(f"Failed to load user data for user ID: {user_id}") # Logs the error
+            self.task_runner.submit(self.user_manager.get_user, user_id, key=('user', user_id), channel='user', # Fetches user data in the background
+                                    on_success=lambda user_data: self._show_user_data(user_id, user_data))
+
+    def _show_user_data(self, user_id, user_data):
+        """Fills the dashboard and settings tabs with a user's profile (on the Tk thread, once it is loaded)."""
+        if user_id != self.current_user_id: # Another user logged in meanwhile
+            return
+        if user_data:
+            # Update Dashboard Info
+            self.user_info_label.configure(text=
+                f"User ID: {user_data.get('user_id', 'N/A')}\n" # Displays user ID
+                f"Username: {user_data.get('username', 'N/A')}\n" # Displays username
+                f"Email: {user_data.get('contact_info', {}).get('email', 'N/A')}\n" # Displays email from contact info
+                f"Phone: {user_data.get('contact_info', {}).get('phone', 'N/A')}\n" # Displays phone from contact info
+                f"Registration Date: {user_data.get('registration_date', 'N/A')}" # Displays registration date
+            )
+
+            # Populate Settings fields
+            self.settings_widgets["username_entry"].delete(0, customtkinter.END) # Clears existing username entry
+            self.settings_widgets["username_entry"].insert(0, user_data.get('username', '')) # Inserts current username
+
+            self.settings_widgets["email_entry"].delete(0, customtkinter.END) # Clears existing email entry
+            self.settings_widgets["email_entry"].insert(0, user_data.get('contact_info', {}).get('email', '')) # Inserts current email
+
+            self.settings_widgets["phone_entry"].delete(0, customtkinter.END) # Clears existing phone entry
+            self.settings_widgets["phone_entry"].insert(0, user_data.get('contact_info', {}).get('phone', '')) # Inserts current phone
+
+            # Clear password fields
+            self.settings_widgets["new_password_entry"].delete(0, customtkinter.END) # Clears new password field
+            self.settings_widgets["confirm_new_password_entry"].delete(0, customtkinter.END) # Clears confirm password field
+        else:
+            messagebox.showerror("Error", "Could not load user data.") # Shows error if user data cannot be loaded
+            logger.error(f"Failed to load user data for user ID: {user_id}") # Logs the error
 
 
     def load_pet_data(self, owner_id):
@@ -320,229 +440,457 @@ class DashboardFrame(customtkinter.CTkFrame):
         Loads and displays the current user's registered pets in the Dashboard and Manage My Pets tabs.
         """
         if owner_id:
-            pets = self.pet_data_manager.get_pets_by_owner(owner_id) # Fetches pets owned by the current user
-            
-            # Clear existing pet displays
-            for widget in self.dashboard_pets_scroll_frame.winfo_children(): # Removes all widgets from dashboard scroll frame
-                widget.destroy()
-            for widget in self.my_pets_scroll_frame.winfo_children(): # Removes all widgets from manage pets scroll frame
-                widget.destroy()
-
-            if pets:
-                self.pet_summary_label.configure(text=f"You have {len(pets)} pets registered.") # Updates pet summary label on dashboard
-                
-                dashboard_row = 0
-                manage_pets_row = 0
-                for pet_id, pet_data in pets.items(): # Iterates through each pet
-                    # Display in Dashboard
-                    pet_frame_dashboard = self._create_pet_display_frame(self.dashboard_pets_scroll_frame, pet_data, is_dashboard=True) # Creates pet display frame for dashboard
-                    pet_frame_dashboard.grid(row=dashboard_row, column=0, padx=5, pady=5, sticky="ew") # Places pet frame in dashboard
-                    dashboard_row += 1
-
-                    # Display in Manage My Pets
-                    pet_frame_manage = self._create_pet_display_frame(self.my_pets_scroll_frame, pet_data, is_dashboard=False) # Creates pet display frame for manage pets
-                    pet_frame_manage.grid(row=manage_pets_row, column=0, padx=5, pady=5, sticky="ew") # Places pet frame in manage pets
-                    manage_pets_row += 1
+            # Fetches pets owned by the current user in the background; a second load of the same owner joins this one
+            self.task_runner.submit(self._versioned, self.pet_data_manager, self.pet_data_manager.get_pets_by_owner, owner_id,
+                                    key=('pets', owner_id), channel='pets',
+                                    on_success=lambda loaded: self._show_pets(owner_id, *loaded))
+
+    def _show_pets(self, owner_id, version, pets):
+        """Shows a freshly loaded set of the user's pets (on the Tk thread)."""
+        if owner_id != self.current_user_id: # Another user logged in meanwhile
+            return
+        self._mark_shown('pets', version) # Later refreshes only apply newer changes
+        self._update_pet_summary(len(pets))
+
+        # Both lists share one data source; only the rows in view are built and bound
+        self.pet_source = ListDataSource(pets.values(), key=lambda pet: pet['pet_id'])
+        self.dashboard_pets_list.set_data_source(self.pet_source)
+        self.my_pets_list.set_data_source(self.pet_source)
+
+    def refresh_pet_data(self):
+        """
+        Brings the pet lists up to date by patching only the pets that changed since they were last shown.
+        Falls back to load_pet_data() when no incremental state is available.
+        """
+        events, version = self._changes_since_shown('pets', self.pet_data_manager)
+        if events is None or self.pet_source is None:
+            self.load_pet_data(self.current_user_id)
+            return
+        pet_ids = list(dict.fromkeys(event.entity_id for event in events if event.entity == 'pet')) # Changed pets, once each
+        if not pet_ids:
+            self._mark_shown('pets', version)
+            return
+        # Fetches the changed pets in the background; an identical refresh already in flight is joined instead
+        self.task_runner.submit(self._fetch_pets, pet_ids, key=('pet_changes', self.view_versions.get('pets'), version), channel='pets',
+                                on_success=lambda pets: self._apply_pet_changes(pets, version))
+
+    def _apply_pet_changes(self, pets, version):
+        """Patches the pet lists with the current state of the changed pets (on the Tk thread)."""
+        for pet_id, pet in pets.items():
+            if pet and pet.get('owner_id') == self.current_user_id:
+                self.pet_source.upsert(pet) # New or updated pet of this user
             else:
-                self.pet_summary_label.configure(text="You have no pets registered yet.") # Updates pet summary if no pets are registered
-                customtkinter.CTkLabel(self.dashboard_pets_scroll_frame, text="No registered pets to display.").grid(row=0, column=0, padx=10, pady=10) # Message for no pets
-                customtkinter.CTkLabel(self.my_pets_scroll_frame, text="No registered pets to display. Add one above!").grid(row=0, column=0, padx=10, pady=10) # Message for no pets
+                self.pet_source.remove(pet_id) # Deleted, or no longer owned by this user
+        self._mark_shown('pets', version)
+        self._update_pet_summary(self.pet_source.count())
+        self.dashboard_pets_list.refresh() # Re-binds only the rows in view
+        self.my_pets_list.refresh()
+
+    def _update_pet_summary(self, pet_count):
+        """Updates the pet summary label on the dashboard."""
+        if pet_count:
+            self.pet_summary_label.configure(text=f"You have {pet_count} pets registered.") # Updates pet summary label on dashboard
+        else:
+            self.pet_summary_label.configure(text="You have no pets registered yet.") # Updates pet summary if no pets are registered
 
-    def _create_pet_display_frame(self, parent_frame, pet_data, is_dashboard=False):
+    def _set_row_image(self, row, image_path):
         """
-        Helper function to create a frame displaying pet details.
-        Reused for both Dashboard and Manage My Pets tabs.
+        Requests the pet photo thumbnail for a row, showing a placeholder until it is ready.
+        Rows are recycled, so the thumbnail is only applied if the row still shows the same photo.
         """
-        pet_frame = customtkinter.CTkFrame(parent_frame, fg_color="transparent") # Creates a transparent frame for pet details
-        pet_frame.grid_columnconfigure(1, weight=1) # Makes the second column expandable for text details
+        row.bound_image_path = image_path # Photo this row is waiting for
+        row.image = None # Drops the previous photo reference
+        if not image_path:
+            row.image_label.configure(image=None, text="No Image", fg_color="gray") # Placeholder if no image path
+            return
+        row.image_label.configure(image=None, text="Loading...", fg_color="gray") # Placeholder while decoding
+        self.thumbnail_cache.request(image_path, lambda pet_image: self._apply_row_image(row, image_path, pet_image))
 
-        # Load and display pet image if available
-        if pet_data.get('image_path') and os.path.exists(pet_data['image_path']): # Checks if image path exists
-            try:
-                # Open image
-                img = Image.open(pet_data['image_path'])
-                # Resize image while maintaining aspect ratio
-                img.thumbnail((70, 70)) # Resizes image to fit
-                pet_image = ImageTk.PhotoImage(img) # Converts image to PhotoImage for CustomTkinter
-                
-                # Store reference to prevent garbage collection
-                pet_frame.image = pet_image # Stores image reference
-                
-                image_label = customtkinter.CTkLabel(pet_frame, image=pet_image, text="") # Creates label for image
-                image_label.grid(row=0, column=0, rowspan=5, padx=10, pady=5, sticky="n") # Places image label
-            except Exception as e:
-                logger.error(f"Error loading image {pet_data['image_path']}: {e}") # Logs error if image fails to load
-                # Fallback if image loading fails
-                image_label = customtkinter.CTkLabel(pet_frame, text="No Image", width=70, height=70, fg_color="gray") # Placeholder if image fails
-                image_label.grid(row=0, column=0, rowspan=5, padx=10, pady=5, sticky="n")
+    def _apply_row_image(self, row, image_path, pet_image):
+        """Thumbnail callback: shows pet_image in the row unless the row was re-bound to another pet meanwhile."""
+        if row.bound_image_path != image_path: # Row now displays a different pet
+            return
+        row.image = pet_image # Stores reference to prevent garbage collection
+        if pet_image:
+            row.image_label.configure(image=pet_image, text="", fg_color="transparent")
         else:
-            image_label = customtkinter.CTkLabel(pet_frame, text="No Image", width=70, height=70, fg_color="gray") # Placeholder if no image path
-            image_label.grid(row=0, column=0, rowspan=5, padx=10, pady=5, sticky="n")
-
-        # Display pet details
-        customtkinter.CTkLabel(pet_frame, text=f"Name: {pet_data.get('pet_name', 'N/A')}", font=customtkinter.CTkFont(weight="bold")).grid(row=0, column=1, sticky="w") # Pet name
-        customtkinter.CTkLabel(pet_frame, text=f"Species: {pet_data.get('species', 'N/A')}").grid(row=1, column=1, sticky="w") # Species
-        customtkinter.CTkLabel(pet_frame, text=f"Breed: {pet_data.get('breed', 'N/A')}").grid(row=2, column=1, sticky="w") # Breed
-        customtkinter.CTkLabel(pet_frame, text=f"Age: {pet_data.get('age', 'N/A')}").grid(row=3, column=1, sticky="w") # Age
-        customtkinter.CTkLabel(pet_frame, text=f"Color: {pet_data.get('color', 'N/A')}").grid(row=4, column=1, sticky="w") # Color
-        customtkinter.CTkLabel(pet_frame, text=f"Status: {pet_data.get('status', 'N/A').replace('_', ' ').title()}").grid(row=5, column=1, sticky="w") # Status, formatted for display
-
-        # Add buttons only if not in dashboard view
-        if not is_dashboard:
-            button_frame = customtkinter.CTkFrame(pet_frame, fg_color="transparent") # Frame to hold action buttons
-            button_frame.grid(row=0, column=2, rowspan=6, padx=10, sticky="e") # Places button frame
-            button_frame.grid_rowconfigure((0,1,2,3), weight=1) # Makes rows expandable for buttons
+            row.image_label.configure(image=None, text="No Image", fg_color="gray") # Placeholder if image fails to load
 
-            # Update Button
-            update_button = customtkinter.CTkButton(button_frame, text="Update", command=lambda: self._open_update_pet_dialog(pet_data['pet_id'])) # Update button
-            update_button.grid(row=0, column=0, pady=5, sticky="ew") # Places update button
-            
-            # Report Lost Button (visible only if pet is 'registered')
-            if pet_data.get('status') == 'registered': # Only show if pet is not already lost
-                lost_button = customtkinter.CTkButton(button_frame, text="Report Lost", command=lambda: self._report_lost_pet(pet_data['pet_id'])) # Report lost button
-                lost_button.grid(row=1, column=0, pady=5, sticky="ew") # Places report lost button
-            
-            # Mark Found Button (visible only if pet is 'lost')
-            if pet_data.get('status') == 'lost': # Only show if pet is lost
-                found_button = customtkinter.CTkButton(button_frame, text="Mark Found", command=lambda: self._mark_pet_found(pet_data['pet_id'])) # Mark found button
-                found_button.grid(row=2, column=0, pady=5, sticky="ew") # Places mark found button
+    def _create_pet_row(self, parent_frame, is_dashboard=False):
+        """
+        Creates a reusable row frame for pet details; _bind_pet_row fills it with a pet.
+        Reused for both Dashboard and Manage My Pets tabs.
+        """
+        row = customtkinter.CTkFrame(parent_frame, fg_color="transparent", height=PET_ROW_HEIGHT) # Creates a transparent frame for pet details
+        row.grid_columnconfigure(1, weight=1) # Makes the second column expandable for text details
 
-            # Delete Button
-            delete_button = customtkinter.CTkButton(button_frame, text="Delete", fg_color="red", hover_color="darkred", command=lambda: self._delete_pet(pet_data['pet_id'])) # Delete button
-            delete_button.grid(row=3, column=0, pady=5, sticky="ew") # Places delete button
+        row.image_label = customtkinter.CTkLabel(row, text="No Image", width=70, height=70, fg_color="gray") # Pet photo or placeholder
+        row.image_label.grid(row=0, column=0, rowspan=5, padx=10, pady=5, sticky="n")
 
-        return pet_frame # Returns the created pet display frame
+        row.labels = {} # Detail labels, re-configured on every bind
+        for i, field in enumerate(('pet_name', 'species', 'breed', 'age', 'color', 'status')):
+            font = customtkinter.CTkFont(weight="bold") if field == 'pet_name' else None # Pet name in bold
+            row.labels[field] = customtkinter.CTkLabel(row, text="", font=font)
+            row.labels[field].grid(row=i, column=1, sticky="w")
+
+        row.buttons = {} # Action buttons, only in the Manage My Pets tab
+        if not is_dashboard:
+            button_frame = customtkinter.CTkFrame(row, fg_color="transparent") # Frame to hold action buttons
+            button_frame.grid(row=0, column=2, rowspan=6, padx=10, sticky="e") # Places button frame
+            button_frame.grid_rowconfigure((0,1,2,3), weight=1) # Makes rows expandable for buttons
+            row.buttons['update'] = customtkinter.CTkButton(button_frame, text="Update") # Update button
+            row.buttons['update'].grid(row=0, column=0, pady=5, sticky="ew")
+            row.buttons['lost'] = customtkinter.CTkButton(button_frame, text="Report Lost") # Report lost button
+            row.buttons['lost'].grid(row=1, column=0, pady=5, sticky="ew")
+            row.buttons['found'] = customtkinter.CTkButton(button_frame, text="Mark Found") # Mark found button
+            row.buttons['found'].grid(row=2, column=0, pady=5, sticky="ew")
+            row.buttons['delete'] = customtkinter.CTkButton(button_frame, text="Delete", fg_color="red", hover_color="darkred") # Delete button
+            row.buttons['delete'].grid(row=3, column=0, pady=5, sticky="ew")
+        return row # Returns the created pet row
+
+    def _bind_pet_row(self, row, pet_data):
+        """Fills a pet row (from _create_pet_row) with the details of pet_data."""
+        self._set_row_image(row, pet_data.get('image_path'))
+        row.labels['pet_name'].configure(text=f"Name: {pet_data.get('pet_name', 'N/A')}") # Pet name
+        row.labels['species'].configure(text=f"Species: {pet_data.get('species', 'N/A')}") # Species
+        row.labels['breed'].configure(text=f"Breed: {pet_data.get('breed', 'N/A')}") # Breed
+        row.labels['age'].configure(text=f"Age: {pet_data.get('age', 'N/A')}") # Age
+        row.labels['color'].configure(text=f"Color: {pet_data.get('color', 'N/A')}") # Color
+        row.labels['status'].configure(text=f"Status: {pet_data.get('status', 'N/A').replace('_', ' ').title()}") # Status, formatted for display
+
+        if row.buttons:
+            pet_id = pet_data['pet_id']
+            row.buttons['update'].configure(command=lambda: self._open_update_pet_dialog(pet_id))
+            row.buttons['lost'].configure(command=lambda: self._report_lost_pet(pet_id))
+            row.buttons['found'].configure(command=lambda: self._mark_pet_found(pet_id))
+            row.buttons['delete'].configure(command=lambda: self._delete_pet(pet_id))
+            # Report Lost only for 'registered' pets, Mark Found only for 'lost' pets
+            if pet_data.get('status') == 'registered':
+                row.buttons['lost'].grid()
+            else:
+                row.buttons['lost'].grid_remove()
+            if pet_data.get('status') == 'lost':
+                row.buttons['found'].grid()
+            else:
+                row.buttons['found'].grid_remove()
 
 
     def load_stray_data(self):
         """
         Loads and displays all reported stray pets in the Stray Reporting tab.
         """
-        strays = self.pet_data_manager.get_all_strays() # Fetches all stray pet reports
-
-        # Clear existing stray displays
-        for widget in self.stray_pets_scroll_frame.winfo_children(): # Removes all widgets from stray pets scroll frame
-            widget.destroy()
-        
-        # Update summary on dashboard (also counts captured strays)
-        num_strays_active = sum(1 for stray in strays.values() if stray.get('status') == 'stray') # Counts active strays
-        num_strays_captured = sum(1 for stray in strays.values() if stray.get('status') == 'found_captured') # Counts captured strays
+        # Counts the reports in the background; a second load joins this one
+        self.task_runner.submit(self._versioned, self.pet_data_manager, self._count_strays, key='strays', channel='strays',
+                                on_success=lambda loaded: self._show_strays(*loaded))
+
+    def _count_strays(self):
+        """Worker: (number of stray reports, active reports, found/captured reports)."""
+        return (self.pet_data_manager.get_total_strays(), self.report_manager.count_strays('stray'),
+                self.report_manager.count_strays('found_captured'))
+
+    def _show_strays(self, version, counts):
+        """Shows the stray summary and a fresh paged list of the reports (on the Tk thread)."""
+        self._mark_shown('strays', version) # Later refreshes only apply newer changes
+        total, active, captured = counts
+        self._update_stray_summary(active, captured)
+
+        # The list pulls pages from the backend as the user scrolls
+        self.stray_source = PagedDataSource(self.pet_data_manager.get_total_strays, self.pet_data_manager.get_strays_page, total=total)
+        self.stray_pets_list.set_data_source(self.stray_source)
+
+    def refresh_stray_data(self):
+        """
+        Brings the stray list and summary up to date; does nothing if no stray report changed since they were last shown.
+        """
+        events, version = self._changes_since_shown('strays', self.pet_data_manager)
+        if events is None or self.stray_source is None:
+            self.load_stray_data()
+            return
+        if not any(event.entity == 'stray' for event in events):
+            self._mark_shown('strays', version)
+            return
+        self.task_runner.submit(self._count_strays, key=('stray_changes', self.view_versions.get('strays'), version), channel='strays',
+                                on_success=lambda counts: self._show_stray_changes(version, counts))
+
+    def _show_stray_changes(self, version, counts):
+        """Applies fresh counts to the summary and the paged list, which re-fetches only the pages in view (on the Tk thread)."""
+        self._mark_shown('strays', version)
+        total, active, captured = counts
+        self._update_stray_summary(active, captured)
+        self.stray_source.total = total
+        self.stray_pets_list.refresh() # Keeps the scroll position
+
+    def _update_stray_summary(self, num_strays_active, num_strays_captured):
+        """Updates the stray summary label on the dashboard with the active and captured stray counts."""
         self.lost_stray_summary_label.configure(text=f"There are currently {num_strays_active} active stray reports and {num_strays_captured} strays have been found/captured.") # Updates summary label
 
-        if strays:
-            row = 0
-            for stray_id, stray_data in strays.items(): # Iterates through each stray report
-                stray_frame = self._create_stray_display_frame(self.stray_pets_scroll_frame, stray_data) # Creates stray display frame
-                stray_frame.grid(row=row, column=0, padx=5, pady=5, sticky="ew") # Places stray frame
-                row += 1
-        else:
-            customtkinter.CTkLabel(self.stray_pets_scroll_frame, text="No stray pet reports to display.").grid(row=0, column=0, padx=10, pady=10) # Message if no stray reports
-
-    def _create_stray_display_frame(self, parent_frame, stray_data):
+    def _create_stray_row(self, parent_frame):
         """
-        Helper function to create a frame displaying stray pet details.
+        Creates a reusable row frame for stray pet details; _bind_stray_row fills it with a report.
         """
-        stray_frame = customtkinter.CTkFrame(parent_frame, fg_color="transparent") # Creates a transparent frame for stray details
-        stray_frame.grid_columnconfigure(1, weight=1) # Makes the second column expandable for text details
-
-        # Display stray details
-        customtkinter.CTkLabel(stray_frame, text=f"ID: {stray_data.get('stray_id', 'N/A')}", font=customtkinter.CTkFont(weight="bold")).grid(row=0, column=1, sticky="w") # Stray ID
-        customtkinter.CTkLabel(stray_frame, text=f"Species: {stray_data.get('species', 'N/A')}").grid(row=1, column=1, sticky="w") # Species
-        customtkinter.CTkLabel(stray_frame, text=f"Location: {stray_data.get('location', 'N/A')}").grid(row=2, column=1, sticky="w") # Location
-        customtkinter.CTkLabel(stray_frame, text=f"Breed: {stray_data.get('breed', 'N/A')}").grid(row=3, column=1, sticky="w") # Breed
-        customtkinter.CTkLabel(stray_frame, text=f"Color: {stray_data.get('color', 'N/A')}").grid(row=4, column=1, sticky="w") # Color
-        customtkinter.CTkLabel(stray_frame, text=f"Description: {stray_data.get('description', 'N/A')}").grid(row=5, column=1, sticky="w") # Description
-        customtkinter.CTkLabel(stray_frame, text=f"Reported Date: {stray_data.get('reported_date', 'N/A')}").grid(row=6, column=1, sticky="w") # Reported date
-        customtkinter.CTkLabel(stray_frame, text=f"Status: {stray_data.get('status', 'N/A').replace('_', ' ').title()}", font=customtkinter.CTkFont(weight="bold")).grid(row=7, column=1, sticky="w") # Status, formatted
+        row = customtkinter.CTkFrame(parent_frame, fg_color="transparent", height=STRAY_ROW_HEIGHT) # Creates a transparent frame for stray details
+        row.grid_columnconfigure(1, weight=1) # Makes the second column expandable for text details
+
+        row.labels = {} # Detail labels, re-configured on every bind
+        for i, field in enumerate(('stray_id', 'species', 'location', 'breed', 'color', 'description', 'reported_date', 'status', 'contact_info')):
+            font = customtkinter.CTkFont(weight="bold") if field in ('stray_id', 'status') else None # ID and status in bold
+            row.labels[field] = customtkinter.CTkLabel(row, text="", font=font)
+            row.labels[field].grid(row=i, column=1, sticky="w")
+
+        row.mark_found_button = customtkinter.CTkButton(row, text="Mark Found/Captured") # Mark found button for active strays
+        row.mark_found_button.grid(row=0, column=2, rowspan=4, padx=10, sticky="e")
+        row.match_button = customtkinter.CTkButton(row, text="Match Lost Pets") # Nearby lost pet matching for strays with coordinates
+        row.match_button.grid(row=4, column=2, rowspan=5, padx=10, sticky="e")
+        return row # Returns the created stray row
+
+    def _bind_stray_placeholder(self, row):
+        """Shows a stray row whose report is still being fetched."""
+        for field, label in row.labels.items():
+            label.configure(text="Loading..." if field == 'stray_id' else "") # Only the first line says what is happening
+        row.mark_found_button.grid_remove()
+        row.match_button.grid_remove()
+
+    def _bind_stray_row(self, row, stray_data):
+        """Fills a stray row (from _create_stray_row) with the details of stray_data."""
+        row.labels['stray_id'].configure(text=f"ID: {stray_data.get('stray_id', 'N/A')}") # Stray ID
+        row.labels['species'].configure(text=f"Species: {stray_data.get('species', 'N/A')}") # Species
+        row.labels['location'].configure(text=f"Location: {stray_data.get('location', 'N/A')}") # Location
+        row.labels['breed'].configure(text=f"Breed: {stray_data.get('breed', 'N/A')}") # Breed
+        row.labels['color'].configure(text=f"Color: {stray_data.get('color', 'N/A')}") # Color
+        row.labels['description'].configure(text=f"Description: {stray_data.get('description', 'N/A')}") # Description
+        row.labels['reported_date'].configure(text=f"Reported Date: {stray_data.get('reported_date', 'N/A')}") # Reported date
+        row.labels['status'].configure(text=f"Status: {stray_data.get('status', 'N/A').replace('_', ' ').title()}") # Status, formatted
 
         # Display contact info if available
         contact_info = stray_data.get('contact_info', {}) # Gets contact info dictionary
+        contact_text = ""
         if contact_info:
             contact_text = "Contact: " # Prefix for contact info
             if contact_info.get('email'):
                 contact_text += f"Email: {contact_info['email']} " # Adds email if present
             if contact_info.get('phone'):
                 contact_text += f"Phone: {contact_info['phone']}" # Adds phone if present
-            customtkinter.CTkLabel(stray_frame, text=contact_text.strip()).grid(row=8, column=1, sticky="w") # Places contact info label
+        row.labels['contact_info'].configure(text=contact_text.strip())
 
-        # Mark Found/Captured button for active strays
-        if stray_data.get('status') == 'stray': # Only show if stray is active
-            mark_found_button = customtkinter.CTkButton(stray_frame, text="Mark Found/Captured", command=lambda: self._mark_stray_found_captured(stray_data['stray_id'])) # Mark found button
-            mark_found_button.grid(row=0, column=2, rowspan=9, padx=10, sticky="e") # Places button
-        
-        return stray_frame # Returns the created stray display frame
+        # Mark Found/Captured button only for active strays
+        if stray_data.get('status') == 'stray':
+            stray_id = stray_data['stray_id']
+            row.mark_found_button.configure(command=lambda: self._mark_stray_found_captured(stray_id))
+            row.mark_found_button.grid()
+        else:
+            row.mark_found_button.grid_remove()
+
+        # Match Lost Pets button only for active strays with coordinates
+        if stray_data.get('status') == 'stray' and stray_data.get('latitude') is not None and stray_data.get('longitude') is not None:
+            stray_id = stray_data['stray_id']
+            row.match_button.configure(command=lambda: self._show_lost_pet_matches(stray_id))
+            row.match_button.grid()
+        else:
+            row.match_button.grid_remove()
 
 
     def load_reports_data(self):
         """
         Loads and displays various application reports in the Reports tab.
         """
-        # Get total users
-        total_users = self.user_manager.get_total_users() # Fetches total number of users
-        self.total_users_label.configure(text=f"Total Registered Users: {total_users}") # Updates total users label
-
-        # Get total registered pets (all pets, including lost ones)
-        all_registered_pets = self.report_manager.get_all_registered_pets_data() # Fetches all registered pets
-        self.total_pets_label.configure(text=f"Total Registered Pets: {len(all_registered_pets)}") # Updates total pets label
-
-        # Get lost pets
-        lost_pets = self.report_manager.get_all_lost_pets_data() # Fetches all lost pets
+        self._update_users_report()
+        self._update_pets_report()
+        self._update_strays_report()
+        self._update_trends()
+
+        # Fetches all lost pets in the background
+        self.task_runner.submit(self._versioned, self.report_manager, self.report_manager.get_all_lost_pets_data,
+                                key='lost_pets', channel='reports', on_success=lambda loaded: self._show_lost_pets(*loaded))
+
+    def _show_lost_pets(self, version, lost_pets):
+        """Shows a freshly loaded set of lost pets in the reports tab (on the Tk thread)."""
+        self._mark_shown('reports', version) # Later refreshes only apply newer changes
         self.lost_pets_label.configure(text=f"Number of Lost Pets Reported: {len(lost_pets)}") # Updates lost pets label
 
-        # Get stray pets (active and captured)
-        stray_reports = self.report_manager.get_stray_report_data() # Fetches all stray reports
-        num_active_strays = sum(1 for stray in stray_reports.values() if stray.get('status') == 'stray') # Counts active strays
-        self.stray_pets_report_label.configure(text=f"Total Stray Pet Reports: {len(stray_reports)} ({num_active_strays} active)") # Updates stray reports label
-
-        # Clear existing lost pet displays
-        for widget in self.lost_pets_scroll_frame.winfo_children(): # Removes all widgets from lost pets scroll frame
-            widget.destroy()
-
-        if lost_pets:
-            row = 0
-            for pet_id, pet_data in lost_pets.items(): # Iterates through each lost pet
-                lost_pet_frame = self._create_lost_pet_display_frame(self.lost_pets_scroll_frame, pet_data) # Creates lost pet display frame
-                lost_pet_frame.grid(row=row, column=0, padx=5, pady=5, sticky="ew") # Places lost pet frame
-                row += 1
-        else:
-            customtkinter.CTkLabel(self.lost_pets_scroll_frame, text="No lost pets reported.").grid(row=0, column=0, padx=10, pady=10) # Message if no lost pets
+        # Only the lost pets in view are built and bound
+        self.lost_pet_source = ListDataSource(lost_pets.values(), key=lambda pet: pet['pet_id'])
+        self.lost_pets_list.set_data_source(self.lost_pet_source)
 
+    def refresh_reports_data(self):
+        """
+        Brings the reports tab up to date by updating only the counters and lost-pet rows affected
+        by the changes since it was last shown.
+        """
+        events, version = self._changes_since_shown('reports', self.report_manager)
+        if events is None or self.lost_pet_source is None:
+            self.load_reports_data()
+            return
+        entities = {event.entity for event in events} # Kinds of records that changed
+        if 'user' in entities:
+            self._update_users_report() # Counters are maintained in memory, no backend call needed
+        if 'stray' in entities:
+            self._update_strays_report()
+        if events:
+            self._update_trends() # Reads the rollups, O(periods shown)
+        pet_ids = list(dict.fromkeys(event.entity_id for event in events if event.entity == 'pet')) # Changed pets, once each
+        if not pet_ids:
+            self._mark_shown('reports', version)
+            return
+        self._update_pets_report()
+        # Fetches the changed pets in the background; an identical refresh already in flight is joined instead
+        self.task_runner.submit(self._fetch_pets, pet_ids, key=('lost_pet_changes', self.view_versions.get('reports'), version),
+                                channel='reports', on_success=lambda pets: self._apply_lost_pet_changes(pets, version))
+
+    def _apply_lost_pet_changes(self, pets, version):
+        """Patches the lost pet list with the current state of the changed pets (on the Tk thread)."""
+        for pet_id, pet in pets.items():
+            if pet and pet.get('status') == 'lost':
+                self.lost_pet_source.upsert(pet) # Newly lost, or a lost pet whose details changed
+            else:
+                self.lost_pet_source.remove(pet_id) # Found or deleted
+        self._mark_shown('reports', version)
+        self.lost_pets_label.configure(text=f"Number of Lost Pets Reported: {self.lost_pet_source.count()}") # Updates lost pets label
+        self.lost_pets_list.refresh() # Re-binds only the rows in view
+
+    def _update_users_report(self):
+        """Updates the total users label."""
+        total_users = self.report_manager.count_users() # Reads the maintained user counter
+        self.total_users_label.configure(text=f"Total Registered Users: {total_users}") # Updates total users label
 
-    def _create_lost_pet_display_frame(self, parent_frame, pet_data):
+    def _update_pets_report(self):
+        """Updates the total registered pets label (all pets, including lost ones)."""
+        total_pets = self.report_manager.count_pets() # Reads the maintained pet counter
+        self.total_pets_label.configure(text=f"Total Registered Pets: {total_pets}") # Updates total pets label
+        # Aggregates over the pet columns run in the background; a newer request replaces an older one
+        self.task_runner.submit(self.report_manager.get_pet_analytics, key='pet_analytics', channel='analytics',
+                                on_success=self._show_pet_analytics)
+
+    def _show_pet_analytics(self, analytics):
+        """Shows lost pets by species, registrations of the last 30 days and the age distribution (on the Tk thread)."""
+        lost = ", ".join(f"{species}: {count}" for species, count in analytics['lost_by_species'].items()) or "none"
+        per_day = analytics['registrations_per_day']
+        recent = f"{sum(per_day.values())} pets"
+        if per_day:
+            busiest = max(per_day, key=per_day.get) # Day with the most registrations
+            recent += f" (busiest day {busiest}: {per_day[busiest]})"
+        ages = " | ".join(f"{low:g}-{high:g}: {count}" for low, high, count in analytics['age_histogram'] if count) or "no ages recorded"
+        self.pet_analytics_label.configure(text=f"Lost Pets by Species: {lost}\n"
+                                                f"Registered in the Last 30 Days: {recent}\n"
+                                                f"Pet Ages (years): {ages}") # Updates analytics label
+
+    def _update_trends(self):
+        """Reloads the trends table for the selected period in the background."""
+        granularity, periods = TREND_PERIODS[self.trend_granularity_menu.get()]
+        self.task_runner.submit(self.report_manager.get_trends, granularity, periods, key=('trends', granularity),
+                                channel='trends', on_success=self._show_trends)
+
+    def _show_trends(self, trends):
+        """Shows the counts per period as a fixed-width table, newest period first (on the Tk thread)."""
+        lines = ["Period      " + "".join(f"{heading:>10}" for _, heading in TREND_COLUMNS)]
+        counts = {metric: dict(trends[metric]) for metric, _ in TREND_COLUMNS} # metric -> period -> count
+        for period, _ in reversed(trends['pet_registrations']):
+            lines.append(f"{period:12}" + "".join(f"{counts[metric][period]:>10}" for metric, _ in TREND_COLUMNS))
+        self.trends_label.configure(text="\n".join(lines)) # Updates trends table
+
+    def _update_diagnostics(self):
+        """Shows the current metrics table in the diagnostics panel (a snapshot of in-memory counters, cheap enough for the Tk thread)."""
+        text = METRICS.to_text() if METRICS.snapshot() else "No manager calls recorded (metrics are off when PETDEX_METRICS=0)."
+        self.diagnostics_text.configure(state="normal") # The textbox is read-only between updates
+        self.diagnostics_text.delete("1.0", "end")
+        self.diagnostics_text.insert("1.0", text)
+        self.diagnostics_text.configure(state="disabled")
+
+    def _reset_diagnostics(self):
+        """Clears the recorded metrics, e.g. before reproducing a slow operation."""
+        METRICS.reset()
+        self._update_diagnostics()
+
+    def _export_diagnostics(self):
+        """Saves the metrics as JSON to a file chosen by the user."""
+        path = filedialog.asksaveasfilename(title="Export Metrics", defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if not path: # Dialog cancelled
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as metrics_file:
+                metrics_file.write(METRICS.to_json())
+            logger.info("Metrics exported to %s.", path)
+        except OSError as e:
+            logger.error("Could not export metrics to %s: %s", path, e)
+            messagebox.showerror("Export Failed", f"Could not save the metrics: {e}")
+
+    def _update_strays_report(self):
+        """Updates the stray reports label (active and captured)."""
+        total_strays = self.report_manager.count_strays() # Reads the maintained stray counters
+        num_active_strays = self.report_manager.count_strays('stray') # Counts active strays
+        self.stray_pets_report_label.configure(text=f"Total Stray Pet Reports: {total_strays} ({num_active_strays} active)") # Updates stray reports label
+
+
+    def _create_lost_pet_row(self, parent_frame):
         """
-        Helper function to create a frame displaying lost pet details for the reports tab.
+        Creates a reusable row frame for lost pet details in the reports tab; _bind_lost_pet_row fills it.
         """
-        lost_pet_frame = customtkinter.CTkFrame(parent_frame, fg_color="transparent") # Creates a transparent frame
-        lost_pet_frame.grid_columnconfigure(1, weight=1) # Makes the second column expandable for text details
+        row = customtkinter.CTkFrame(parent_frame, fg_color="transparent", height=LOST_PET_ROW_HEIGHT) # Creates a transparent frame
+        row.grid_columnconfigure(1, weight=1) # Makes the second column expandable for text details
+
+        row.image_label = customtkinter.CTkLabel(row, text="No Image", width=70, height=70, fg_color="gray") # Pet photo or placeholder
+        row.image_label.grid(row=0, column=0, rowspan=6, padx=10, pady=5, sticky="n")
+
+        row.labels = {} # Detail labels, re-configured on every bind
+        for i, field in enumerate(('pet_name', 'species', 'breed', 'color', 'owner_id', 'last_seen')):
+            font = customtkinter.CTkFont(weight="bold") if field == 'pet_name' else None # Pet name in bold
+            row.labels[field] = customtkinter.CTkLabel(row, text="", font=font)
+            row.labels[field].grid(row=i, column=1, sticky="w")
+        return row # Returns the created lost pet row
+
+    def _bind_lost_pet_row(self, row, pet_data):
+        """Fills a lost pet row (from _create_lost_pet_row) with the details of pet_data."""
+        self._set_row_image(row, pet_data.get('image_path'))
+        row.labels['pet_name'].configure(text=f"Name: {pet_data.get('pet_name', 'N/A')}") # Pet name
+        row.labels['species'].configure(text=f"Species: {pet_data.get('species', 'N/A')}") # Species
+        row.labels['breed'].configure(text=f"Breed: {pet_data.get('breed', 'N/A')}") # Breed
+        row.labels['color'].configure(text=f"Color: {pet_data.get('color', 'N/A')}") # Color
+        row.labels['owner_id'].configure(text=f"Owner ID: {pet_data.get('owner_id', 'N/A')}") # Owner ID
+
+        lost_details = pet_data.get('lost_details') or {} # Gets lost details
+        row.labels['last_seen'].configure(text=f"Last Seen: {lost_details.get('location', 'N/A')} on {lost_details.get('timestamp', 'N/A')}") # Lost location and timestamp
+
+
+    def _schedule_search(self, event=None):
+        """Debounces the search box: runs the search once typing pauses for SEARCH_DELAY_MS."""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job) # Drops the search scheduled by the previous key press
+        self.search_job = self.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        """Runs the query in the search box and shows the ranked results."""
+        self.search_job = None
+        query = self.search_entry.get().strip() # Gets the search query
+        if not query:
+            self.task_runner.cancel_channel('search') # Drops a search still in flight
+            self.search_results_list.set_data_source(ListDataSource([])) # Empty box shows no results
+            return
+        # Only the latest query's results are shown; typing the same query again joins the search in flight
+        self.task_runner.submit(self.search_manager.search, query, key=('search', query), channel='search',
+                                on_success=lambda results: self.search_results_list.set_data_source(ListDataSource(results)))
 
-        # Load and display pet image if available
-        if pet_data.get('image_path') and os.path.exists(pet_data['image_path']): # Checks if image path exists
-            try:
-                img = Image.open(pet_data['image_path']) # Opens image
-                img.thumbnail((70, 70)) # Resizes image
-                pet_image = ImageTk.PhotoImage(img) # Converts to PhotoImage
-                lost_pet_frame.image = pet_image # Stores image reference
-                image_label = customtkinter.CTkLabel(lost_pet_frame, image=pet_image, text="") # Creates label for image
-                image_label.grid(row=0, column=0, rowspan=6, padx=10, pady=5, sticky="n") # Places image label
-            except Exception as e:
-                logger.error(f"Error loading image {pet_data['image_path']}: {e}") # Logs error
-                image_label = customtkinter.CTkLabel(lost_pet_frame, text="No Image", width=70, height=70, fg_color="gray") # Placeholder
-                image_label.grid(row=0, column=0, rowspan=6, padx=10, pady=5, sticky="n")
+    def _create_search_row(self, parent_frame):
+        """
+        Creates a reusable row frame for one search result; _bind_search_row fills it.
+        """
+        row = customtkinter.CTkFrame(parent_frame, fg_color="transparent", height=SEARCH_ROW_HEIGHT) # Creates a transparent frame
+        row.grid_columnconfigure(0, weight=1) # Makes the text column expandable
+        row.title_label = customtkinter.CTkLabel(row, text="", font=customtkinter.CTkFont(weight="bold")) # Name or stray ID
+        row.title_label.grid(row=0, column=0, padx=10, sticky="w")
+        row.detail_label = customtkinter.CTkLabel(row, text="") # Species, breed, color, status (and location for strays)
+        row.detail_label.grid(row=1, column=0, padx=10, sticky="w")
+        return row # Returns the created search row
+
+    def _bind_search_row(self, row, result):
+        """Fills a search row (from _create_search_row) with a SearchResult."""
+        record = result.record
+        status = record.get('status', 'N/A').replace('_', ' ').title() # Status, formatted for display
+        details = f"{record.get('species', 'N/A')}, {record.get('breed') or 'N/A'}, {record.get('color') or 'N/A'} - {status}"
+        if result.entity == 'pet':
+            row.title_label.configure(text=f"Pet: {record.get('pet_name', 'N/A')}") # Pet name
+            row.detail_label.configure(text=details)
         else:
-            image_label = customtkinter.CTkLabel(lost_pet_frame, text="No Image", width=70, height=70, fg_color="gray") # Placeholder
-            image_label.grid(row=0, column=0, rowspan=6, padx=10, pady=5, sticky="n")
-
-        # Display lost pet details
-        customtkinter.CTkLabel(lost_pet_frame, text=f"Name: {pet_data.get('pet_name', 'N/A')}", font=customtkinter.CTkFont(weight="bold")).grid(row=0, column=1, sticky="w") # Pet name
-        customtkinter.CTkLabel(lost_pet_frame, text=f"Species: {pet_data.get('species', 'N/A')}").grid(row=1, column=1, sticky="w") # Species
-        customtkinter.CTkLabel(lost_pet_frame, text=f"Breed: {pet_data.get('breed', 'N/A')}").grid(row=2, column=1, sticky="w") # Breed
-        customtkinter.CTkLabel(lost_pet_frame, text=f"Color: {pet_data.get('color', 'N/A')}").grid(row=3, column=1, sticky="w") # Color
-        customtkinter.CTkLabel(lost_pet_frame, text=f"Owner ID: {pet_data.get('owner_id', 'N/A')}").grid(row=4, column=1, sticky="w") # Owner ID
-        
-        lost_details = pet_data.get('lost_details', {}) # Gets lost details
-        customtkinter.CTkLabel(lost_pet_frame, text=f"Last Seen: {lost_details.get('location', 'N/A')} on {lost_details.get('timestamp', 'N/A')}").grid(row=5, column=1, sticky="w") # Lost location and timestamp
-
-        return lost_pet_frame # Returns the created lost pet display frame
+            row.title_label.configure(text=f"Stray Report: {record.get('stray_id', 'N/A')}") # Stray ID
+            row.detail_label.configure(text=f"{details} - Location: {record.get('location', 'N/A')}")
 
 
     def _add_pet(self):
@@ -575,22 +923,19 @@ class DashboardFrame(customtkinter.CTkFrame):
 
         # Call PetDataManager to add the pet
         if self.current_user_id: # Ensures a user is logged in
-            pet_id = self.pet_data_manager.add_pet(
+            self._submit_action(
+                self.pet_data_manager.add_pet,
                 owner_id=self.current_user_id,
                 pet_name=pet_name,
                 species=species,
                 breed=breed if breed else None, # Stores empty string as None
                 age=age,
                 color=color,
-                image_path=image_path if image_path else None # Stores empty string as None
+                image_path=image_path if image_path else None, # Stores empty string as None
+                success_message=lambda pet_id: f"Pet '{pet_name}' added successfully with ID: {pet_id}!",
+                error_message="Failed to add pet.",
+                on_done=lambda pet_id: (self.clear_pet_form(), self.refresh_pet_data()) # Clears the form and patches the new pet into the lists
             )
-            if pet_id:
-                messagebox.showinfo("Success", f"Pet '{pet_name}' added successfully with ID: {pet_id}!") # Success message
-                self.clear_pet_form() # Clears the form after successful addition
-                self.load_pet_data(self.current_user_id) # Reloads pet data to update lists
-            else:
-                messagebox.showerror("Error", "Failed to add pet.") # Error message if pet addition fails
-                logger.error(f"Failed to add pet for user {self.current_user_id}") # Logs the error
         else:
             messagebox.showerror("Error", "No user logged in to add a pet.") # Error if no user is logged in
 
@@ -609,18 +954,20 @@ class DashboardFrame(customtkinter.CTkFrame):
         """
         Opens the UpdatePetDialog for a selected pet.
         """
-        pet_details = self.pet_data_manager.get_pet(pet_id) # Fetches details of the pet to be updated
+        self.task_runner.submit(self.pet_data_manager.get_pet, pet_id, key=('pet', pet_id), # Fetches details of the pet to be updated
+                                on_success=lambda pet_details: self._show_update_pet_dialog(pet_id, pet_details))
+
+    def _show_update_pet_dialog(self, pet_id, pet_details):
+        """Shows the UpdatePetDialog once the pet is loaded, then saves the changes in the background."""
         if pet_details:
             dialog = UpdatePetDialog(self.master, pet_details) # Creates an instance of the update dialog
             self.master.wait_window(dialog) # Waits for the dialog to close
 
             if dialog.updated_data: # Checks if the dialog returned updated data
-                if self.pet_data_manager.update_pet(pet_id, dialog.updated_data): # Calls PetDataManager to update
-                    messagebox.showinfo("Success", "Pet details updated successfully!") # Success message
-                    self.load_pet_data(self.current_user_id) # Reloads pet data to reflect changes
-                else:
-                    messagebox.showerror("Error", "Failed to update pet details.") # Error message
-                    logger.error(f"Failed to update pet {pet_id} with data {dialog.updated_data}") # Logs the error
+                self._submit_action(self.pet_data_manager.update_pet, pet_id, dialog.updated_data, # Calls PetDataManager to update
+                                    success_message="Pet details updated successfully!",
+                                    error_message="Failed to update pet details.",
+                                    on_done=lambda result: self.refresh_pet_data()) # Patches the updated pet's row
         else:
             messagebox.showerror("Error", "Pet not found for update.") # Error if pet details can't be fetched
 
@@ -631,12 +978,10 @@ class DashboardFrame(customtkinter.CTkFrame):
         Confirms with the user before proceeding.
         """
         if messagebox.askyesno("Confirm Deletion", "Are you sure you want to delete this pet? This action cannot be undone."): # Asks for user confirmation
-            if self.pet_data_manager.delete_pet(pet_id): # Calls PetDataManager to delete
-                messagebox.showinfo("Success", "Pet deleted successfully!") # Success message
-                self.load_pet_data(self.current_user_id) # Reloads pet data to update lists
-            else:
-                messagebox.showerror("Error", "Failed to delete pet.") # Error message
-                logger.error(f"Failed to delete pet {pet_id}") # Logs the error
+            self._submit_action(self.pet_data_manager.delete_pet, pet_id, # Calls PetDataManager to delete
+                                success_message="Pet deleted successfully!",
+                                error_message="Failed to delete pet.",
+                                on_done=lambda result: self.refresh_pet_data()) # Removes the deleted pet from the lists
 
 
     def _report_lost_pet(self, pet_id):
@@ -646,12 +991,19 @@ class DashboardFrame(customtkinter.CTkFrame):
         """
         last_seen_location = customtkinter.CTkInputDialog(text="Enter last seen location:", title="Report Lost Pet").get_input() # Prompts user for location
         if last_seen_location:
-            if self.report_manager.report_lost_pet(pet_id, last_seen_location): # Calls ReportManager to mark as lost
-                messagebox.showinfo("Success", f"Pet {pet_id} reported as lost at {last_seen_location}.") # Success message
-                self.load_pet_data(self.current_user_id) # Reloads pet data to update status
-            else:
-                messagebox.showerror("Error", "Failed to report pet as lost.") # Error message
-                logger.error(f"Failed to report pet {pet_id} as lost.") # Logs the error
+            coordinates_text = customtkinter.CTkInputDialog(text="Enter last seen coordinates as 'latitude, longitude' (optional):",
+                                                            title="Report Lost Pet").get_input() # Optional coordinates for stray matching
+            latitude, longitude = None, None
+            if coordinates_text and coordinates_text.strip():
+                try:
+                    latitude, longitude = self._parse_coordinates(*(coordinates_text.split(",", 1) + [""])[:2])
+                except ValueError as e:
+                    messagebox.showerror("Input Error", str(e)) # Error for malformed coordinates
+                    return
+            self._submit_action(self.report_manager.report_lost_pet, pet_id, last_seen_location, latitude, longitude, # Calls ReportManager to mark as lost
+                                success_message=f"Pet {pet_id} reported as lost at {last_seen_location}.",
+                                error_message="Failed to report pet as lost.",
+                                on_done=lambda result: self.refresh_pet_data()) # Patches the pet's row to show its new status
         elif last_seen_location == "": # Handles empty input
             messagebox.showwarning("Input Required", "Last seen location cannot be empty.") # Warning for empty input
 
@@ -661,12 +1013,10 @@ class DashboardFrame(customtkinter.CTkFrame):
         Handles marking a lost pet as found.
         """
         if messagebox.askyesno("Confirm Found", "Are you sure you want to mark this pet as found?"): # Confirms with user
-            if self.report_manager.mark_pet_found(pet_id): # Calls ReportManager to mark as found
-                messagebox.showinfo("Success", f"Pet {pet_id} marked as found.") # Success message
-                self.load_pet_data(self.current_user_id) # Reloads pet data to update status
-            else:
-                messagebox.showerror("Error", "Failed to mark pet as found.") # Error message
-                logger.error(f"Failed to mark pet {pet_id} as found.") # Logs the error
+            self._submit_action(self.report_manager.mark_pet_found, pet_id, # Calls ReportManager to mark as found
+                                success_message=f"Pet {pet_id} marked as found.",
+                                error_message="Failed to mark pet as found.",
+                                on_done=lambda result: self.refresh_pet_data()) # Patches the pet's row to show its new status
 
 
     def _report_stray_pet(self):
@@ -686,6 +1036,12 @@ class DashboardFrame(customtkinter.CTkFrame):
         if not species or not location or not color: # Checks for mandatory fields
             messagebox.showerror("Input Error", "Species, Location, and Color cannot be empty for a stray report.") # Error for empty mandatory fields
             return
+        try:
+            latitude, longitude = self._parse_coordinates(self.stray_form_widgets["stray_latitude_entry"].get(),
+                                                          self.stray_form_widgets["stray_longitude_entry"].get()) # Optional coordinates
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e)) # Error for malformed coordinates
+            return
 
         contact_info = {} # Dictionary to store contact info
         if contact_email:
@@ -694,22 +1050,21 @@ class DashboardFrame(customtkinter.CTkFrame):
             contact_info['phone'] = contact_phone # Adds phone if provided
 
         # Calls PetDataManager to add stray pet report
-        stray_id = self.pet_data_manager.add_stray_pet_report(
+        self._submit_action(
+            self.pet_data_manager.add_stray_pet_report,
             reporter_id=self.current_user_id, # Reporter ID (can be None if user not logged in, but here we assume logged in)
             species=species,
             location=location,
             breed=breed if breed else None,
             color=color,
             description=description if description else None,
-            contact_info=contact_info if contact_info else None
+            contact_info=contact_info if contact_info else None,
+            latitude=latitude,
+            longitude=longitude,
+            success_message=lambda stray_id: f"Stray pet reported successfully with ID: {stray_id}!",
+            error_message="Failed to report stray pet.",
+            on_done=lambda stray_id: (self.clear_stray_form(), self.refresh_stray_data()) # Clears the form and patches the stray list and summary
         )
-        if stray_id:
-            messagebox.showinfo("Success", f"Stray pet reported successfully with ID: {stray_id}!") # Success message
-            self.clear_stray_form() # Clears the form
-            self.load_stray_data() # Reloads stray data to update list
-        else:
-            messagebox.showerror("Error", "Failed to report stray pet.") # Error message
-            logger.error("Failed to report stray pet.") # Logs the error
 
 
     def clear_stray_form(self):
@@ -717,24 +1072,56 @@ class DashboardFrame(customtkinter.CTkFrame):
         self.stray_form_widgets["stray_location_entry"].delete(0, customtkinter.END) # Clears location entry
         self.stray_form_widgets["stray_breed_entry"].delete(0, customtkinter.END) # Clears breed entry
         self.stray_form_widgets["stray_color_entry"].delete(0, customtkinter.END) # Clears color entry
+        self.stray_form_widgets["stray_latitude_entry"].delete(0, customtkinter.END) # Clears latitude entry
+        self.stray_form_widgets["stray_longitude_entry"].delete(0, customtkinter.END) # Clears longitude entry
         self.stray_form_widgets["stray_description_entry"].delete("1.0", customtkinter.END) # Clears description textbox
         self.stray_form_widgets["stray_email_entry"].delete(0, customtkinter.END) # Clears email entry
         self.stray_form_widgets["stray_phone_entry"].delete(0, customtkinter.END) # Clears phone entry
         self.stray_form_widgets["stray_species_optionmenu"].set("Dog") # Resets species to default
 
 
+    def _parse_coordinates(self, latitude_text, longitude_text):
+        """
+        Parses optional latitude/longitude inputs.
+        :return: (latitude, longitude) as floats, or (None, None) if both are empty.
+        :raises ValueError: If only one is given, either is not a number, or either is out of range.
+        """
+        latitude_text, longitude_text = latitude_text.strip(), longitude_text.strip()
+        if not latitude_text and not longitude_text:
+            return None, None # Coordinates are optional
+        try:
+            latitude, longitude = float(latitude_text), float(longitude_text)
+        except ValueError:
+            raise ValueError("Latitude and longitude must both be numbers, e.g. 14.5995 and 120.9842.") from None
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError("Latitude must be between -90 and 90 and longitude between -180 and 180.")
+        return latitude, longitude
+
+    def _show_lost_pet_matches(self, stray_id):
+        """Shows the lost pets last seen near a stray report, best matches first."""
+        self.task_runner.submit(self.pet_data_manager.find_lost_pet_candidates, stray_id, limit=5, # Top candidates within the default radius
+                                key=('matches', stray_id), on_success=self._show_lost_pet_candidates)
+
+    def _show_lost_pet_candidates(self, candidates):
+        """Lists ranked lost pet candidates in a message box (on the Tk thread)."""
+        if not candidates:
+            messagebox.showinfo("Lost Pet Matches", "No lost pets were reported near this stray.") # Nothing nearby
+            return
+        lines = [f"{candidate.pet.get('pet_name', 'N/A')} ({candidate.pet.get('species', 'N/A')}, {candidate.pet.get('color', 'N/A')}) - "
+                 f"{candidate.distance_km:.1f} km away, owner {candidate.pet.get('owner_id', 'N/A')}, match {candidate.score:.0%}"
+                 for candidate in candidates]
+        messagebox.showinfo("Lost Pet Matches", "Possible matches:\n" + "\n".join(lines)) # Lists the candidates
+
+
     def _mark_stray_found_captured(self, stray_id):
         """
         Handles marking a reported stray pet as found/captured.
         """
         if messagebox.askyesno("Confirm Action", "Are you sure you want to mark this stray pet as found/captured?"): # Confirms with user
-            if self.pet_data_manager.mark_stray_found_captured(stray_id): # Calls PetDataManager to mark as found
-                messagebox.showinfo("Success", f"Stray pet {stray_id} marked as found/captured.") # Success message
-                self.load_stray_data() # Reloads stray data to update list
-                self.load_reports_data() # Reloads reports data to update counts
-            else:
-                messagebox.showerror("Error", "Failed to mark stray pet as found/captured.") # Error message
-                logger.error(f"Failed to mark stray pet {stray_id} as found/captured.") # Logs the error
+            self._submit_action(self.pet_data_manager.mark_stray_found_captured, stray_id, # Calls PetDataManager to mark as found
+                                success_message=f"Stray pet {stray_id} marked as found/captured.",
+                                error_message="Failed to mark stray pet as found/captured.",
+                                on_done=lambda result: (self.refresh_stray_data(), self.refresh_reports_data())) # Patches the stray list and report counters
 
 
     def _update_profile(self):
@@ -748,22 +1135,10 @@ class DashboardFrame(customtkinter.CTkFrame):
         confirm_new_password = self.settings_widgets["confirm_new_password_entry"].get().strip() # Gets confirmed new password
 
         updates = {} # Dictionary to store updates
-        user_data = self.user_manager.get_user(self.current_user_id) # Fetches current user data
-
-        if not user_data: # Error if user data not found
-            messagebox.showerror("Error", "Could not retrieve current user data for update.")
-            logger.error(f"Attempted to update profile for non-existent user ID: {self.current_user_id}")
-            return
-
-        current_username = user_data.get('username') # Current username
+        user_id = self.current_user_id # User being edited
 
         # Username validation
-        if new_username and new_username != current_username: # Checks if username is changed and not empty
-            updates['username'] = new_username # Adds new username to updates
-            if self.user_manager.get_user_by_username(new_username): # Checks if new username is already taken
-                messagebox.showerror("Update Error", f"Username '{new_username}' is already taken.")
-                return
-        elif not new_username: # If username field is empty
+        if not new_username: # If username field is empty
              messagebox.showerror("Input Error", "Username cannot be empty.")
              return
 
@@ -783,13 +1158,31 @@ class DashboardFrame(customtkinter.CTkFrame):
         
         updates['contact_info'] = new_contact_info # Adds contact info to updates
 
-        # Call UserManager to update
-        if self.user_manager.update_user(self.current_user_id, updates): # Calls UserManager to update user
+        def save_profile():
+            """Worker: checks the new username against the database and saves the profile. Returns (title, error) or None."""
+            user_data = self.user_manager.get_user(user_id) # Fetches current user data
+            if not user_data: # Error if user data not found
+                logger.error(f"Attempted to update profile for non-existent user ID: {user_id}")
+                return ("Error", "Could not retrieve current user data for update.")
+            if new_username != user_data.get('username'): # Checks if username is changed
+                if self.user_manager.get_user_by_username(new_username): # Checks if new username is already taken
+                    return ("Update Error", f"Username '{new_username}' is already taken.")
+                updates['username'] = new_username # Adds new username to updates
+            if not self.user_manager.update_user(user_id, updates): # Calls UserManager to update user (hashes a new password)
+                logger.error(f"Failed to update profile for user {user_id}") # Logs the error
+                return ("Error", "Failed to update profile.")
+            return None
+
+        def saved(problem):
+            if problem:
+                messagebox.showerror(*problem) # Error message
+                return
             messagebox.showinfo("Success", "Profile updated successfully!") # Success message
-            self.load_user_data(self.current_user_id) # Refresh dashboard user info
-        else:
-            messagebox.showerror("Error", "Failed to update profile.") # Error message
-            logger.error(f"Failed to update profile for user {self.current_user_id}") # Logs the error
+            self.load_user_data(user_id) # Refresh dashboard user info
+
+        # Password hashing is deliberately slow and the checks hit the database, so both run in the background
+        self.task_runner.submit(save_profile, on_success=saved,
+                                on_error=lambda error: messagebox.showerror("Error", "Failed to update profile."))
 
 
     def _delete_account(self):
@@ -799,9 +1192,8 @@ class DashboardFrame(customtkinter.CTkFrame):
         """
         if messagebox.askyesno("Confirm Account Deletion", "Are you absolutely sure you want to delete your account? This action cannot be undone and will delete all your registered pets!", icon='warning'): # Asks for strong confirmation
             # Potentially add a re-authentication step here for security
-            if self.user_manager.delete_user(self.current_user_id): # Calls UserManager to delete user
-                messagebox.showinfo("Account Deleted", "Your account has been successfully deleted.") # Success message
-                self.switch_to_login_callback() # Go back to login screen
-            else:
-                messagebox.showerror("Error", "Failed to delete account.") # Error message
-                logger.error(f"Failed to delete account for user {self.current_user_id}") # Logs the error
\ No newline at end of file
+            self._submit_action(self.user_manager.delete_user, self.current_user_id, # Calls UserManager to delete user
+                                success_title="Account Deleted",
+                                success_message="Your account has been successfully deleted.",
+                                error_message="Failed to delete account.",
+                                on_done=lambda result: self.switch_to_login_callback()) # Go back to login screen
\ No newline at end of file
@@ -5,9 +5,10 @@ import tkinter.messagebox as messagebox # Imports messagebox for displaying pop-
 logger = logging.getLogger(__name__) # Initializes a logger for this module
 
 class LoginFrame(customtkinter.CTkFrame):
-    def __init__(self, master, user_manager, show_dashboard_screen_callback, switch_to_register_callback):
+    def __init__(self, master, user_manager, task_runner, show_dashboard_screen_callback, switch_to_register_callback):
         super().__init__(master) # Calls the constructor of the parent class (customtkinter.CTkFrame)
         self.user_manager = user_manager # Stores the UserManager instance to handle user authentication
+        self.task_runner = task_runner # Delivers the result of the background login on the Tk thread
         self.show_dashboard_screen_callback = show_dashboard_screen_callback # Stores the callback function to show the dashboard on successful login
         self.switch_to_register_callback = switch_to_register_callback # Stores the callback function to switch to the registration screen
 
@@ -56,20 +57,34 @@ class LoginFrame(customtkinter.CTkFrame):
         password = self.password_entry.get().strip() # Gets password from entry field and removes leading/trailing whitespace
 
         if not username or not password: # Basic validation: check if both fields are empty
-            self.message_label.configure(text="Please enter both username and password.") # Displays error message
+            self.message_label.configure(text="Please enter both username and password.", text_color="red") # Displays error message
             return # Stops function execution
 
-        user_id = self.user_manager.login_user(username, password) # Calls UserManager to attempt login and get user ID
+        # Password verification is deliberately slow, so it runs on UserManager's pool while the GUI stays responsive
+        self.login_button.configure(state="disabled") # Prevents duplicate submissions while the login is in progress
+        self.message_label.configure(text="Logging in...", text_color="gray") # Progress message
+        future = self.user_manager.login_user_async(username, password) # Starts the login in the background
+        self.task_runner.track(future, on_success=lambda result: self._finish_login(*result, username),
+                               on_error=lambda error: self._login_failed(error, username))
 
+    def _login_failed(self, error, username):
+        """Runs on the Tk thread when the background login raised an error."""
+        self.login_button.configure(state="normal") # Re-enables the login button
+        logger.error(f"GUI: Login for '{username}' raised an error: {error}") # Logs unexpected errors
+        self.message_label.configure(text="Login failed due to an internal error.", text_color="red")
+
+    def _finish_login(self, user_id, message, username):
+        """Runs on the Tk thread once the background login has finished: shows the result."""
+        self.login_button.configure(state="normal") # Re-enables the login button
         if user_id: # If login is successful (user_id is returned)
             self.message_label.configure(text=f"Login successful! Welcome, {username}!", text_color="green") # Displays success message in green
             logger.info(f"GUI: User '{username}' logged in successfully.") # Logs successful login
             self.clear_inputs() # Clears input fields after successful login
             self.show_dashboard_screen_callback(user_id) # Calls the callback to switch to the dashboard screen, passing the user ID
         else: # If login fails
-            # Error message will be set by UserManager if login fails (e.g., invalid credentials)
-            self.message_label.configure(text=self.user_manager.users_status_message, text_color="red") # Displays error message from UserManager
-            logger.warning(f"GUI: Login attempt for '{username}' failed. Message: {self.user_manager.users_status_message}") # Logs failed login attempt
+            # The message comes back with this login's result (e.g., invalid credentials)
+            self.message_label.configure(text=message, text_color="red") # Displays error message from UserManager
+            logger.warning("GUI: Login attempt for '%s' failed. Message: %s", username, message) # Logs failed login attempt
 
     def clear_inputs(self): # Renamed for consistency
         """Clears all input fields and messages on the login screen."""
@@ -1,6 +1,7 @@
 import customtkinter # Imports the CustomTkinter library for GUI components
 import logging # Imports the logging module for application-wide logging
 import sys # Imports sys module for system-specific parameters and functions (e.g., for exiting the application)
+import os # Imports os to read the storage backend settings from the environment
 
 # Basic logging configuration for the entire application
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,15 +11,44 @@ logger = logging.getLogger(__name__) # Initializes a logger for the main applica
 from User_registration import UserManager # Imports the class for managing user registration and authentication
 from Pet_data_manager import PetDataManager # Imports the class for managing pet data (registration, update, delete, lost/found)
 from Report import ReportManager # Imports the class for generating various reports
-from database_manager import InMemoryDBManager # Imports the class for handling all database interactions
+from Search import SearchManager # Imports the full-text/fuzzy search over pets and stray reports
+from Task_runner import TaskRunner # Imports the runner that keeps backend calls off the Tk thread
+from database_manager import InMemoryDBManager, SQLiteDBManager # Imports the storage engines for all database interactions
+from durable_db_manager import DurableInMemoryDBManager # Imports the in-memory engine backed by a write-ahead log and snapshots
+from Store_server import StoreClient, DEFAULT_ADDRESS # Imports the proxy for a store shared through a local store server
+from Metrics import METRICS # Imports the registry of per-method call counts, latencies and payload sizes
 
 # Import CustomTkinter GUI screen classes
 from Login_screen import LoginFrame # Imports the login screen frame
 from Register_screen import RegisterFrame # Imports the registration screen frame
 from Dashboard_screen import DashboardFrame # Imports the dashboard screen frame
 
+# Storage backend selection: "memory" (default, data lost on exit), "sqlite" (persistent file at PETDEX_DB_PATH),
+# "durable" (in-memory with a write-ahead log and snapshots in PETDEX_DATA_DIR)
+# or "server" (a store shared by several PetDex windows, served by Store_server.py at PETDEX_SERVER_ADDRESS)
+DB_BACKEND = os.environ.get("PETDEX_DB_BACKEND", "memory")
+DB_PATH = os.environ.get("PETDEX_DB_PATH", "petdex.db")
+DATA_DIR = os.environ.get("PETDEX_DATA_DIR", "petdex_data")
+SERVER_ADDRESS = os.environ.get("PETDEX_SERVER_ADDRESS", DEFAULT_ADDRESS)
+METRICS_ENABLED = os.environ.get("PETDEX_METRICS", "1") != "0" # Set PETDEX_METRICS=0 to leave the managers untimed
+
+def create_db_manager(backend=DB_BACKEND, db_path=DB_PATH, data_dir=DATA_DIR, server_address=SERVER_ADDRESS):
+    """
+    Builds the storage engine used by every manager.
+    All engines expose the same method surface, so the rest of the application does not care which one is used.
+    """
+    if backend == "sqlite":
+        return SQLiteDBManager(db_path) # Persistent engine; data survives restarts without reloading it all into memory
+    if backend == "durable":
+        return DurableInMemoryDBManager(data_dir) # In-memory speed, durability through the log and snapshots
+    if backend == "server":
+        return StoreClient(server_address) # Shared store owned by the server process; same methods over a socket
+    if backend != "memory":
+        logger.warning(f"Unknown database backend '{backend}', falling back to in-memory storage.") # Warns about a bad setting
+    return InMemoryDBManager() # Default volatile engine
+
 class App(customtkinter.CTk):
-    def __init__(self):
+    def __init__(self, db_manager=None):
         super().__init__() # Calls the constructor of the parent class (customtkinter.CTk)
 
         self.title("PetDex: Digital Database for Pet Registration and Monitoring") # Sets the title of the main application window
@@ -33,20 +63,28 @@ class App(customtkinter.CTk):
         self.current_user_id = None # Initializes current_user_id to None; will store the ID of the successfully logged-in user
 
         # --- Backend Managers Initialization ---
-        self.db_manager = InMemoryDBManager() # Initializes the DatabaseManager, establishing connection and creating tables
+        self.db_manager = db_manager or create_db_manager() # Initializes the DatabaseManager, establishing connection and creating tables
         self.user_manager = UserManager(self.db_manager) # Initializes UserManager, passing the DatabaseManager instance
         self.pet_data_manager = PetDataManager(self.db_manager) # Initializes PetDataManager, passing the DatabaseManager instance
         self.report_manager = ReportManager(self.pet_data_manager) # Initializes ReportManager, passing the PetDataManager instance
+        self.search_manager = SearchManager(self.pet_data_manager) # Builds the search index, kept current by the database's change events
+        if METRICS_ENABLED: # Counts and times every manager call, shown in the Settings tab's diagnostics panel
+            METRICS.instrument(self.db_manager, "db")
+            METRICS.instrument(self.user_manager, "users")
+            METRICS.instrument(self.pet_data_manager, "pets")
+            METRICS.instrument(self.report_manager, "reports")
+
+        self.task_runner = TaskRunner(self) # Runs backend calls on worker threads, delivering results on the Tk thread
 
         # --- GUI Screen Frames Initialization ---
         # Each screen is initialized with necessary managers and callbacks for navigation
-        self.login_frame = LoginFrame(self, self.user_manager, self.show_dashboard_screen, self.show_register_screen) # Login screen instance
+        self.login_frame = LoginFrame(self, self.user_manager, self.task_runner, self.show_dashboard_screen, self.show_register_screen) # Login screen instance
         self.login_frame.grid(row=0, column=0, sticky="nsew") # Places login frame, initially hidden
 
-        self.register_frame = RegisterFrame(self, self.user_manager, self.show_login_screen) # Register screen instance
+        self.register_frame = RegisterFrame(self, self.user_manager, self.task_runner, self.show_login_screen) # Register screen instance
         self.register_frame.grid(row=0, column=0, sticky="nsew") # Places register frame, initially hidden
 
-        self.dashboard_frame = DashboardFrame(self, self.user_manager, self.pet_data_manager, self.report_manager, self.show_login_screen) # Dashboard screen instance
+        self.dashboard_frame = DashboardFrame(self, self.user_manager, self.pet_data_manager, self.report_manager, self.search_manager, self.task_runner, self.show_login_screen) # Dashboard screen instance
         self.dashboard_frame.grid(row=0, column=0, sticky="nsew") # Places dashboard frame, initially hidden
 
         self.show_frame("login") # Sets the initial visible screen to the login screen
@@ -108,6 +146,9 @@ class App(customtkinter.CTk):
         before the application exits.
         """
         logger.info("Closing application. Closing database connection.") # Logs application shutdown
+        self.dashboard_frame.thumbnail_cache.shutdown() # Stops the thumbnail decoding threads
+        self.task_runner.shutdown() # Abandons queued backend calls; their results would have nowhere to go
+        self.user_manager.shutdown() # Lets an in-flight login/registration finish, then stops the KDF threads
         if self.db_manager: # Checks if the database manager exists
             self.db_manager.close() # Closes the database connection
         super().destroy() # Calls the parent class's destroy method
@@ -0,0 +1,191 @@
+import bisect # Imports bisect to find a latency's histogram bucket
+import functools # Imports functools to keep the wrapped methods' names and docstrings
+import inspect # Imports inspect to pick the bound methods of a manager
+import json # Imports json to export the metrics
+import math # Imports math to size the histogram buckets
+import threading # Imports threading because managers are called from worker threads
+import time # Imports time for the latency measurements
+
+from Records import SlottedRecord # Imports the in-memory record base class, counted as one record per result
+
+# Latency histogram buckets: upper bounds growing by 2**(1/4) from 1 microsecond to about 100 seconds,
+# so any percentile is known to within 19% with a fixed 108 counters per method.
+BUCKET_GROWTH = 2 ** 0.25
+BUCKET_BOUNDS = [1e-6 * BUCKET_GROWTH ** i for i in range(math.ceil(math.log(1e8, BUCKET_GROWTH)) + 1)]
+
+UNTIMED = {'subscribe', 'unsubscribe', 'transaction', 'in_transaction', 'iter_all_pets', 'iter_all_strays'} # Not calls worth timing: subscriptions, context managers, generators
+
+
+def payload_size(result):
+    """
+    Number of records in a method's result: the length of a list or collection of records, the first item
+    of a (page, cursor) or (events, version) pair, 1 for a single record, None when the result holds no records.
+    """
+    kind = type(result) # Exact type checks: this runs on every instrumented call
+    if kind is tuple:
+        return payload_size(result[0]) if result else 0
+    if kind is list or kind is set:
+        return len(result)
+    if kind is dict:
+        first = next(iter(result.values()), None)
+        if first is None or isinstance(first, (dict, SlottedRecord)): # id -> record dictionary (or an empty one)
+            return len(result)
+        return 1 # A single record stored as a dictionary (SQLite engine)
+    if isinstance(result, SlottedRecord):
+        return 1
+    return None
+
+
+class LatencyHistogram:
+    """Counts latencies in fixed logarithmic buckets, so percentiles cost no memory per call."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1) # Last bucket: slower than the largest bound
+        self.count = 0 # Latencies recorded
+        self.total = 0.0 # Sum of the latencies (seconds)
+        self.max = 0.0 # Slowest latency (seconds)
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Returns the latency (seconds) that fraction of the calls did not exceed, rounded up to its bucket bound."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * fraction)) # Calls at or below the percentile
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+
+class MethodStats:
+    """Calls, errors, latency histogram and payload sizes of one instrumented method."""
+
+    def __init__(self):
+        self._lock = threading.Lock() # Several threads may call the same method at once
+        self.clear()
+
+    def clear(self):
+        """Forgets every recorded call."""
+        self.calls = 0 # Completed calls, including failed ones
+        self.errors = 0 # Calls that raised
+        self.latency = LatencyHistogram()
+        self.payload_calls = 0 # Calls whose result held records
+        self.payload_total = 0 # Records returned by those calls
+        self.payload_max = 0 # Largest number of records returned by one call
+
+    def record(self, seconds, payload=None, error=False):
+        with self._lock:
+            self.calls += 1
+            self.errors += error
+            self.latency.record(seconds)
+            if payload is not None:
+                self.payload_calls += 1
+                self.payload_total += payload
+                if payload > self.payload_max:
+                    self.payload_max = payload
+
+    def summary(self):
+        """Returns the statistics as a dictionary of plain numbers (latencies in milliseconds)."""
+        with self._lock:
+            latency = self.latency
+            return {'calls': self.calls, 'errors': self.errors, 'total_ms': latency.total * 1000,
+                    'mean_ms': latency.total * 1000 / latency.count if latency.count else 0.0,
+                    'p50_ms': latency.percentile(0.5) * 1000, 'p95_ms': latency.percentile(0.95) * 1000,
+                    'p99_ms': latency.percentile(0.99) * 1000, 'max_ms': latency.max * 1000,
+                    'rows_mean': self.payload_total / self.payload_calls if self.payload_calls else None,
+                    'rows_max': self.payload_max if self.payload_calls else None}
+
+
+class Metrics:
+    """
+    Registry of per-method statistics. instrument() wraps the public methods of a manager instance so every call
+    is counted and timed; the cost is two clock reads and one uncontended lock per call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock() # Protects the registry itself
+        self._stats = {} # "component.method" -> MethodStats
+
+    def stats(self, name):
+        """Returns the MethodStats registered under name, creating it on first use."""
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = MethodStats()
+            return stats
+
+    def instrument(self, manager, component, methods=None):
+        """
+        Replaces the public methods of a manager instance with timed wrappers recorded as "component.method".
+        Instrumenting the same instance again has no effect.
+        :param methods: Names of the methods to time (default: every public bound method, except UNTIMED ones).
+        :return: The manager, for chaining.
+        """
+        if methods is None:
+            methods = [name for name, member in inspect.getmembers(manager, inspect.ismethod)
+                       if not name.startswith('_') and name not in UNTIMED]
+        for name in methods:
+            method = getattr(manager, name)
+            if not hasattr(method, 'metrics_name'): # Already timed
+                setattr(manager, name, self._timed(f"{component}.{name}", method))
+        return manager
+
+    def _timed(self, name, method):
+        stats = self.stats(name)
+        clock = time.perf_counter
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                result = method(*args, **kwargs)
+            except BaseException:
+                stats.record(clock() - started, error=True)
+                raise
+            stats.record(clock() - started, payload_size(result))
+            return result
+        timed.metrics_name = name
+        return timed
+
+    def snapshot(self):
+        """
+        Returns the current statistics of every method that was called at least once.
+        :return: Dictionary "component.method" -> summary dictionary (see MethodStats.summary).
+        """
+        with self._lock:
+            stats = list(self._stats.items())
+        return {name: summary for name, summary in ((name, method_stats.summary()) for name, method_stats in sorted(stats))
+                if summary['calls']}
+
+    def reset(self):
+        """Forgets every recorded call (instrumented methods stay instrumented and keep their MethodStats)."""
+        with self._lock:
+            stats = list(self._stats.values())
+        for method_stats in stats:
+            with method_stats._lock:
+                method_stats.clear()
+
+    def to_json(self):
+        """Exports the snapshot as a JSON document."""
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_text(self):
+        """Exports the snapshot as a fixed-width table, the methods with the most total time first."""
+        snapshot = self.snapshot()
+        lines = [f"{'Method':40} {'Calls':>8} {'Errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Max ms':>9} {'Rows':>8}"]
+        for name, summary in sorted(snapshot.items(), key=lambda item: -item[1]['total_ms']):
+            rows = f"{summary['rows_mean']:.1f}" if summary['rows_mean'] is not None else "-"
+            lines.append(f"{name:40} {summary['calls']:>8} {summary['errors']:>6} {summary['p50_ms']:>9.3f} {summary['p95_ms']:>9.3f} "
+                         f"{summary['p99_ms']:>9.3f} {summary['max_ms']:>9.3f} {rows:>8}")
+        return "\n".join(lines)
+
+
+METRICS = Metrics() # Registry shared by the whole application
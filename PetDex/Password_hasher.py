@@ -0,0 +1,103 @@
+import logging # Imports the logging module for application logging
+import hashlib # Imports hashlib for the scrypt and PBKDF2 key derivation functions
+import hmac # Imports hmac for constant-time comparison of derived keys
+import base64 # Imports base64 to store salts and keys as text
+import os # Imports os for cryptographically secure random salts
+
+logger = logging.getLogger(__name__) # Initializes a logger for this module
+
+SCRYPT = "scrypt" # Memory-hard KDF; used whenever the Python build provides it
+PBKDF2_SHA256 = "pbkdf2_sha256" # Fallback KDF available in every Python build
+DEFAULT_SCHEME = SCRYPT if hasattr(hashlib, "scrypt") else PBKDF2_SHA256 # hashlib.scrypt needs OpenSSL 1.1+
+
+LEGACY_PREFIX, LEGACY_SUFFIX = "hashed_", "_securely" # Placeholder format used before real hashing was introduced
+
+def _b64encode(raw):
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+def _b64decode(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+class PasswordHasher:
+    """
+    Salted password hashing with a tunable key derivation function.
+    Hashes are stored as self-describing strings, "scheme$parameters$salt$key", e.g.
+    "scrypt$n=16384,r=8,p=1$<salt>$<key>" or "pbkdf2_sha256$i=600000$<salt>$<key>".
+    Verification always uses the parameters stored in the hash, so raising the cost only affects new hashes;
+    needs_rehash() tells when a stored hash should be upgraded (on the user's next successful login).
+    """
+
+    def __init__(self, scheme=DEFAULT_SCHEME, scrypt_n=2 ** 14, scrypt_r=8, scrypt_p=1, pbkdf2_iterations=600000,
+                 salt_bytes=16, key_bytes=32):
+        """
+        :param scheme: SCRYPT or PBKDF2_SHA256, used for new hashes.
+        :param scrypt_n: scrypt CPU/memory cost (power of two); memory used is about 128 * n * r bytes.
+        :param scrypt_r: scrypt block size.
+        :param scrypt_p: scrypt parallelisation factor.
+        :param pbkdf2_iterations: PBKDF2-HMAC-SHA256 iteration count.
+        """
+        if scheme == SCRYPT and not hasattr(hashlib, "scrypt"):
+            raise ValueError("scrypt is not available in this Python build; use PBKDF2_SHA256.")
+        if scheme not in (SCRYPT, PBKDF2_SHA256):
+            raise ValueError(f"Unknown password hashing scheme: {scheme!r}")
+        self.scheme = scheme # Scheme used for new hashes
+        self.scrypt_params = {'n': scrypt_n, 'r': scrypt_r, 'p': scrypt_p} # Current scrypt cost
+        self.pbkdf2_iterations = pbkdf2_iterations # Current PBKDF2 cost
+        self.salt_bytes = salt_bytes # Length of random salts
+        self.key_bytes = key_bytes # Length of derived keys
+
+    def _params(self):
+        """Parameter string of the current scheme and cost, e.g. "n=16384,r=8,p=1"."""
+        if self.scheme == SCRYPT:
+            return ",".join(f"{name}={value}" for name, value in self.scrypt_params.items())
+        return f"i={self.pbkdf2_iterations}"
+
+    def _derive(self, scheme, params, password, salt, key_bytes):
+        """Runs the KDF named by scheme with the parameters parsed from a hash string."""
+        if scheme == SCRYPT:
+            n, r, p = params['n'], params['r'], params['p']
+            return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                                  maxmem=max(64 * 1024 * 1024, 256 * n * r * p), dklen=key_bytes) # Allow the memory n and r need
+        if scheme == PBKDF2_SHA256:
+            return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, params['i'], dklen=key_bytes)
+        raise ValueError(f"Unknown password hashing scheme: {scheme!r}")
+
+    def hash(self, password):
+        """Hashes a password with a fresh random salt and the current cost. Returns the encoded hash string."""
+        salt = os.urandom(self.salt_bytes)
+        params = self._params()
+        key = self._derive(self.scheme, self._parse_params(params), password, salt, self.key_bytes)
+        return f"{self.scheme}${params}${_b64encode(salt)}${_b64encode(key)}"
+
+    @staticmethod
+    def _parse_params(params):
+        """Parses "name=value,..." into a dictionary of integers."""
+        return {name: int(value) for name, value in (item.split("=", 1) for item in params.split(","))}
+
+    def verify(self, password, encoded):
+        """Checks a password against an encoded hash, using the scheme and cost stored in it."""
+        if encoded.startswith(LEGACY_PREFIX) and encoded.endswith(LEGACY_SUFFIX): # Hashes stored before real hashing
+            return hmac.compare_digest(encoded.encode("utf-8"), f"{LEGACY_PREFIX}{password}{LEGACY_SUFFIX}".encode("utf-8"))
+        try:
+            scheme, params, salt, key = encoded.split("$")
+            expected = _b64decode(key)
+            derived = self._derive(scheme, self._parse_params(params), password, _b64decode(salt), len(expected))
+        except (ValueError, KeyError) as e: # binascii.Error is a ValueError
+            logger.error("Password hash could not be parsed: %s", e) # Logs malformed hashes without revealing them
+            return False
+        return hmac.compare_digest(derived, expected) # Constant time, so timing does not leak how much matched
+
+    def cost(self):
+        """Scheme and cost used for new hashes, "scheme$parameters" (the public prefix of every new hash)."""
+        return f"{self.scheme}${self._params()}"
+
+    @staticmethod
+    def cost_of(encoded):
+        """Scheme and cost an encoded hash was made with, "scheme$parameters", or None for a legacy or malformed hash."""
+        parts = encoded.split("$")
+        return f"{parts[0]}${parts[1]}" if len(parts) == 4 else None
+
+    def needs_rehash(self, encoded):
+        """True if the hash was made with another scheme or cost than the current one (or is a legacy hash)."""
+        return self.cost_of(encoded) != self.cost()
@@ -1,13 +1,39 @@
 import logging # Imports the logging module for application logging
 import datetime # Imports datetime for working with dates (e.g., registration date)
 import uuid # Imports uuid for generating universally unique identifiers for pets and stray reports
+from collections import namedtuple # Imports namedtuple for ranked lost pet candidates
+
+from database_manager import ChangeJournal # Imports the versioned change log fed by the database's change events
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s') # Configures basic logging for the module
 logger = logging.getLogger(__name__) # Initializes a logger for this module
 
+# A lost pet that may be the animal described by a stray report, with its distance and match score (0 to 1)
+LostPetCandidate = namedtuple('LostPetCandidate', ['pet', 'distance_km', 'score'])
+
+# Weights of the lost pet match score; they sum to 1
+DISTANCE_WEIGHT = 0.5 # Closer last seen positions rank higher
+SPECIES_WEIGHT = 0.25 # Same species as the stray
+COLOR_WEIGHT = 0.15 # Overlapping color words ("black and white" vs "white")
+RECENCY_WEIGHT = 0.1 # Lost shortly before the stray was reported
+RECENCY_HALF_LIFE_DAYS = 7 # Days after which the recency part of the score is halved
+
 class PetDataManager:
     def __init__(self, db_manager):
         self.db_manager = db_manager # Stores an instance of DatabaseManager to interact with the database
+        self.change_journal = ChangeJournal() # Records every pet/stray/user change published by the database
+        self.db_manager.subscribe(self.change_journal.record) # Subscribes to the database's change events
+
+    def get_change_version(self):
+        """Returns the current change version; pass it to get_changes_since() later to get what changed meanwhile."""
+        return self.change_journal.version
+
+    def get_changes_since(self, version):
+        """
+        Returns (events, current_version). events lists the ChangeEvents recorded after version,
+        or is None if they are no longer available and the caller should reload everything.
+        """
+        return self.change_journal.changes_since(version), self.change_journal.version
 
     def add_pet(self, owner_id, pet_name, species, breed=None, age=None, color=None, image_path=None):
         """
@@ -19,9 +45,9 @@ class PetDataManager:
 
         # Calls the DatabaseManager to insert the new pet record
         if self.db_manager.add_pet(pet_id, owner_id, pet_name, species, breed, age, color, image_path, registration_date):
-            logger.info(f"Pet added: {pet_id} - {pet_name} by owner {owner_id}") # Logs successful pet addition
+            logger.info("Pet added: %s - %s by owner %s", pet_id, pet_name, owner_id) # Logs successful pet addition
             return pet_id # Returns the new pet's ID
-        logger.error(f"Failed to add pet {pet_name} for owner {owner_id} to the database.") # Logs error if addition fails
+        logger.error("Failed to add pet %s for owner %s to the database.", pet_name, owner_id) # Logs error if addition fails
         return None # Returns None if pet addition fails
 
     def get_pet(self, pet_id):
@@ -34,15 +60,40 @@ class PetDataManager:
         # Calls DatabaseManager to get all pets associated with the owner_id
         return self.db_manager.get_all_pets_by_owner(owner_id)
 
+    def get_total_pets(self):
+        """Counts all registered pets without fetching them."""
+        return self.db_manager.get_total_pets()
+
+    def get_pets_page(self, limit=50, offset=0):
+        """Retrieves one page of all registered pets, ordered by registration date then pet ID."""
+        # Calls DatabaseManager to get only the requested slice
+        return self.db_manager.get_pets_page(limit, offset)
+
+    def get_pets_after(self, cursor=None, limit=50):
+        """
+        Retrieves the page of registered pets following an opaque cursor (None for the first page).
+        Returns a (pets, next_cursor) tuple; next_cursor is None after the last page.
+        """
+        return self.db_manager.get_pets_after(cursor, limit)
+
+    def iter_all_pets(self, page_size=500):
+        """Streams every registered pet page by page instead of materialising the whole table."""
+        cursor = None
+        while True:
+            pets, cursor = self.db_manager.get_pets_after(cursor, page_size) # Fetch the next page
+            yield from pets # Hand the page's pets to the caller one at a time
+            if cursor is None: # No more pages
+                return
+
     def update_pet(self, pet_id, new_details):
         """
         Updates details of an existing pet in the database.
         Delegates the actual database update to DatabaseManager.
         """
         if self.db_manager.update_pet(pet_id, new_details): # Calls DatabaseManager to update pet
-            logger.info(f"Pet {pet_id} updated.") # Logs successful update
+            logger.info("Pet %s updated.", pet_id) # Logs successful update
             return True
-        logger.warning(f"Could not update pet {pet_id} (not found or no changes).") # Logs warning if update fails
+        logger.warning("Could not update pet %s (not found or no changes).", pet_id) # Logs warning if update fails
         return False
 
     def delete_pet(self, pet_id):
@@ -51,9 +102,9 @@ class PetDataManager:
         Delegates the actual database deletion to DatabaseManager.
         """
         if self.db_manager.delete_pet(pet_id): # Calls DatabaseManager to delete pet
-            logger.info(f"Pet {pet_id} deleted.") # Logs successful deletion
+            logger.info("Pet %s deleted.", pet_id) # Logs successful deletion
             return True
-        logger.warning(f"Could not delete pet {pet_id} (not found).") # Logs warning if deletion fails
+        logger.warning("Could not delete pet %s (not found).", pet_id) # Logs warning if deletion fails
         return False
 
     def mark_pet_lost(self, pet_id, lost_details):
@@ -63,9 +114,9 @@ class PetDataManager:
         # Updates the pet's status to 'lost' and stores the lost_details
         new_details = {'status': 'lost', 'lost_details': lost_details}
         if self.db_manager.update_pet(pet_id, new_details): # Calls DatabaseManager to update pet status and details
-            logger.info(f"Pet {pet_id} marked as lost.") # Logs successful marking
+            logger.info("Pet %s marked as lost.", pet_id) # Logs successful marking
             return True
-        logger.warning(f"Could not mark pet {pet_id} as lost (not found).") # Logs warning if marking fails
+        logger.warning("Could not mark pet %s as lost (not found).", pet_id) # Logs warning if marking fails
         return False
 
     def mark_pet_found(self, pet_id):
@@ -75,9 +126,9 @@ class PetDataManager:
         # Updates the pet's status back to 'registered' and clears lost_details
         new_details = {'status': 'registered', 'lost_details': None} # Set lost_details to None to clear it
         if self.db_manager.update_pet(pet_id, new_details): # Calls DatabaseManager to update pet status and clear details
-            logger.info(f"Pet {pet_id} marked as found.") # Logs successful marking
+            logger.info("Pet %s marked as found.", pet_id) # Logs successful marking
             return True
-        logger.warning(f"Could not mark pet {pet_id} as found (not found).") # Logs warning if marking fails
+        logger.warning("Could not mark pet %s as found (not found).", pet_id) # Logs warning if marking fails
         return False
 
     def get_all_lost_pets(self):
@@ -85,17 +136,20 @@ class PetDataManager:
         # Calls DatabaseManager to get all lost pets
         return self.db_manager.get_all_lost_pets()
 
-    def add_stray_pet_report(self, reporter_id, species, location, breed=None, color=None, description=None, contact_info=None):
+    def add_stray_pet_report(self, reporter_id, species, location, breed=None, color=None, description=None, contact_info=None,
+                             latitude=None, longitude=None):
         """
         Adds a new stray pet report to the database.
         Generates a unique stray ID and current reported date.
+        latitude/longitude are optional and let the report be matched against nearby lost pets.
         """
         stray_id = f"STRAY-{uuid.uuid4().hex[:8].upper()}" # Generates a unique 8-character hexadecimal ID prefixed with "STRAY-"
         reported_date = str(datetime.date.today()) # Gets the current date as a string for the report
 
         # Calls DatabaseManager to insert the new stray report
-        if self.db_manager.add_stray_pet_report(stray_id, reporter_id, species, location, breed, color, description, contact_info or {}, reported_date):
-            logger.info(f"Stray pet report added: {stray_id}") # Logs successful report addition
+        if self.db_manager.add_stray_pet_report(stray_id, reporter_id, species, location, breed, color, description, contact_info or {}, reported_date,
+                                                latitude, longitude):
+            logger.info("Stray pet report added: %s", stray_id) # Logs successful report addition
             return stray_id # Returns the new stray report's ID
         logger.error("Failed to generate a unique stray ID or add to database.") # Logs error if addition fails
         return None # Returns None if report addition fails
@@ -106,9 +160,71 @@ class PetDataManager:
         return self.db_manager.get_stray_pet(stray_id)
 
     def get_all_strays(self):
-        """Retrieves all stray pet reports from the database."""
-        # Calls DatabaseManager to get all stray pets
-        return self.db_manager.get_all_stray_pets()
+        """
+        Retrieves all stray pet reports from the database, keyed by stray ID.
+        Built from the cursor pages (see iter_all_strays), so the store's lock is held one page at a time.
+        """
+        return {stray['stray_id']: stray for stray in self.iter_all_strays()}
+
+    def get_total_strays(self):
+        """Counts all stray reports without fetching them."""
+        return self.db_manager.get_total_strays()
+
+    def get_strays_page(self, limit=50, offset=0):
+        """Retrieves one page of stray reports, ordered by reported date then stray ID."""
+        # Calls DatabaseManager to get only the requested slice
+        return self.db_manager.get_strays_page(limit, offset)
+
+    def get_strays_after(self, cursor=None, limit=50):
+        """
+        Retrieves the page of stray reports following an opaque cursor (None for the first page).
+        Returns a (strays, next_cursor) tuple; next_cursor is None after the last page.
+        """
+        return self.db_manager.get_strays_after(cursor, limit)
+
+    def iter_all_strays(self, page_size=500):
+        """Streams every stray report page by page instead of materialising the whole table."""
+        cursor = None
+        while True:
+            strays, cursor = self.db_manager.get_strays_after(cursor, page_size) # Fetch the next page
+            yield from strays # Hand the page's reports to the caller one at a time
+            if cursor is None: # No more pages
+                return
+
+    def find_lost_pet_candidates(self, stray_id, radius_km=5.0, limit=20):
+        """
+        Finds lost pets that may be the animal described by a stray report.
+        Only lost pets last seen within radius_km of the stray's coordinates are considered (through the
+        database's spatial index); they are ranked by distance, species and color match, and how recently they were lost.
+        :return: List of LostPetCandidate, best first; empty if the report does not exist or has no coordinates.
+        """
+        stray = self.db_manager.get_stray_pet(stray_id)
+        if not stray or stray.get('latitude') is None or stray.get('longitude') is None:
+            logger.warning("Stray report %s not found or has no coordinates; cannot match lost pets.", stray_id) # Logs why nothing is returned
+            return []
+        nearby = self.db_manager.get_lost_pets_near(stray['latitude'], stray['longitude'], radius_km)
+        candidates = [LostPetCandidate(pet, distance, self._match_score(stray, pet, distance, radius_km)) for distance, pet in nearby]
+        candidates.sort(key=lambda candidate: (-candidate.score, candidate.distance_km))
+        return candidates[:limit]
+
+    def _match_score(self, stray, pet, distance_km, radius_km):
+        """Scores how well a nearby lost pet matches a stray report, from 0 (poor) to 1 (excellent)."""
+        score = DISTANCE_WEIGHT * (1 - distance_km / radius_km if radius_km else 1)
+        if (stray.get('species') or '').lower() == (pet.get('species') or '').lower():
+            score += SPECIES_WEIGHT
+        stray_colors = set((stray.get('color') or '').lower().split())
+        pet_colors = set((pet.get('color') or '').lower().split())
+        if stray_colors and pet_colors:
+            score += COLOR_WEIGHT * len(stray_colors & pet_colors) / len(stray_colors | pet_colors) # Jaccard overlap
+        try:
+            lost_on = datetime.datetime.strptime((pet.get('lost_details') or {}).get('timestamp') or '', "%Y-%m-%d %H:%M:%S").date()
+            reported_on = datetime.date.fromisoformat(stray.get('reported_date') or '')
+        except (TypeError, ValueError): # Missing (null), non-string or malformed dates: no recency bonus
+            return score
+        days = (reported_on - lost_on).days
+        if days >= 0: # A stray seen before the pet went missing cannot be that pet
+            score += RECENCY_WEIGHT * 0.5 ** (days / RECENCY_HALF_LIFE_DAYS)
+        return score
 
     def mark_stray_found_captured(self, stray_id):
         """
@@ -116,7 +232,7 @@ class PetDataManager:
         Delegates the actual database update to DatabaseManager.
         """
         if self.db_manager.mark_stray_found_captured(stray_id): # Calls DatabaseManager to update stray status
-            logger.info(f"Stray report {stray_id} marked as found/captured.") # Logs successful marking
+            logger.info("Stray report %s marked as found/captured.", stray_id) # Logs successful marking
             return True
-        logger.warning(f"Could not mark stray {stray_id} as found/captured (not found).") # Logs warning if marking fails
+        logger.warning("Could not mark stray %s as found/captured (not found).", stray_id) # Logs warning if marking fails
         return False
\ No newline at end of file
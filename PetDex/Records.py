@@ -0,0 +1,153 @@
+import sys # Imports sys for string interning
+from collections.abc import MutableMapping # Imports MutableMapping so records can stand in for dictionaries
+
+class SlottedRecord(MutableMapping):
+    """
+    Fixed-schema record stored in __slots__ instead of a per-record dictionary.
+    Records behave like the dictionaries they replace (record['pet_id'], record.get('status'), record.update(...),
+    dict(record), iteration over keys), so code written against dictionaries keeps working unchanged.
+
+    - FIELDS: field names, in order. Unknown fields cannot be set (KeyError).
+    - INTERNED: low-cardinality string fields (species, status, ...); equal values share one string object.
+    - NESTED: field -> SlottedRecord subclass used to store a nested dictionary compactly.
+    - SPARSE: if True, fields holding None are treated as absent keys, like the optional keys of a nested dictionary.
+      Otherwise every field is always present, as in the top-level dictionaries.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+    INTERNED = frozenset()
+    NESTED = {}
+    SPARSE = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS) # Constant-time field name checks
+        cls._PLAIN = tuple(field for field in cls.FIELDS if field not in cls.INTERNED and field not in cls.NESTED) # Stored as given
+
+    def __init__(self, **values):
+        self._assign(values)
+
+    @classmethod
+    def from_dict(cls, values):
+        """Builds a record from a dictionary (or another record) with the same keys."""
+        if type(values) is cls:
+            return values
+        record = cls.__new__(cls) # Skips packing the dictionary into keyword arguments
+        record._assign(values)
+        return record
+
+    def _assign(self, values):
+        """Sets every field from a dictionary; missing fields are None. Runs once per record, so it is kept lean."""
+        if not values.keys() <= self._FIELD_SET:
+            raise KeyError(f"{type(self).__name__} has no fields {sorted(values.keys() - self._FIELD_SET)}")
+        get = values.get
+        for field in self._PLAIN: # Most fields: no conversion at all
+            setattr(self, field, get(field))
+        for field in self.INTERNED:
+            value = get(field)
+            setattr(self, field, sys.intern(value) if value.__class__ is str else value)
+        for field in self.NESTED:
+            setattr(self, field, self._compact(field, get(field)))
+
+    @classmethod
+    def _compact(cls, field, value):
+        """Interns enum-like strings and turns nested dictionaries into nested records where the schema allows."""
+        if value.__class__ is str:
+            if field in cls.INTERNED:
+                return sys.intern(value)
+        elif value.__class__ is dict and field in cls.NESTED:
+            nested = cls.NESTED[field]
+            if value.keys() <= nested._FIELD_SET: # Dictionaries with other keys are kept as they are
+                return nested(**value)
+        return value
+
+    # --- Dictionary Interface ---
+
+    def __getitem__(self, field):
+        if field in self._FIELD_SET:
+            value = getattr(self, field)
+            if value is not None or not self.SPARSE:
+                return value
+        raise KeyError(field)
+
+    def get(self, field, default=None):
+        if field in self._FIELD_SET: # Faster than the Mapping default, which goes through KeyError
+            value = getattr(self, field)
+            if value is not None or not self.SPARSE:
+                return value
+        return default
+
+    def __contains__(self, field):
+        return field in self._FIELD_SET and (not self.SPARSE or getattr(self, field) is not None)
+
+    def __setitem__(self, field, value):
+        if field not in self._FIELD_SET:
+            raise KeyError(f"{type(self).__name__} has no field {field!r}")
+        setattr(self, field, self._compact(field, value))
+
+    def __delitem__(self, field):
+        if not self.SPARSE:
+            raise TypeError(f"Fields of {type(self).__name__} cannot be removed")
+        if field not in self: # Same error as deleting a missing dictionary key
+            raise KeyError(field)
+        setattr(self, field, None)
+
+    def __iter__(self):
+        if not self.SPARSE:
+            return iter(self.FIELDS)
+        return (field for field in self.FIELDS if getattr(self, field) is not None)
+
+    def __len__(self):
+        if not self.SPARSE:
+            return len(self.FIELDS)
+        return sum(1 for field in self.FIELDS if getattr(self, field) is not None)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def copy(self):
+        """Returns a shallow copy of the same type. Nested records are shared: updates replace them, never change them."""
+        record = type(self).__new__(type(self))
+        for field in self.FIELDS:
+            setattr(record, field, getattr(self, field))
+        return record
+
+    def to_dict(self):
+        """Returns a plain dictionary copy, with nested records converted too (e.g. for JSON encoding)."""
+        return {field: value.to_dict() if isinstance(value, SlottedRecord) else value for field, value in self.items()}
+
+
+class ContactInfo(SlottedRecord):
+    """Contact details of a user or stray reporter (nested in 'contact_info')."""
+    __slots__ = FIELDS = ('email', 'phone')
+    SPARSE = True
+
+
+class LostDetails(SlottedRecord):
+    """Where and when a pet was lost (nested in 'lost_details')."""
+    __slots__ = FIELDS = ('location', 'timestamp', 'latitude', 'longitude')
+    SPARSE = True
+
+
+class UserRecord(SlottedRecord):
+    """A row of the users table."""
+    __slots__ = FIELDS = ('user_id', 'username', 'password_hash', 'contact_info', 'registration_date')
+    INTERNED = frozenset(('registration_date',))
+    NESTED = {'contact_info': ContactInfo}
+
+
+class PetRecord(SlottedRecord):
+    """A row of the pets table."""
+    __slots__ = FIELDS = ('pet_id', 'owner_id', 'pet_name', 'species', 'breed', 'age', 'color', 'image_path',
+                          'registration_date', 'status', 'lost_details')
+    INTERNED = frozenset(('owner_id', 'species', 'breed', 'color', 'registration_date', 'status')) # Values shared by many pets
+    NESTED = {'lost_details': LostDetails}
+
+
+class StrayRecord(SlottedRecord):
+    """A row of the strays table."""
+    __slots__ = FIELDS = ('stray_id', 'reporter_id', 'species', 'location', 'breed', 'color', 'description',
+                          'contact_info', 'reported_date', 'status', 'latitude', 'longitude')
+    INTERNED = frozenset(('reporter_id', 'species', 'location', 'breed', 'color', 'reported_date', 'status'))
+    NESTED = {'contact_info': ContactInfo}
@@ -5,9 +5,10 @@ import tkinter.messagebox as messagebox # Imports messagebox for displaying pop-
 logger = logging.getLogger(__name__) # Initializes a logger for this module
 
 class RegisterFrame(customtkinter.CTkFrame):
-    def __init__(self, master, user_manager, switch_to_login_callback): # Adjusted parameters
+    def __init__(self, master, user_manager, task_runner, switch_to_login_callback): # Adjusted parameters
         super().__init__(master) # Calls the constructor of the parent class (customtkinter.CTkFrame)
         self.user_manager = user_manager # Stores the UserManager instance to handle user registration
+        self.task_runner = task_runner # Delivers the result of the background registration on the Tk thread
         self.switch_to_login_callback = switch_to_login_callback # Stores the callback function to switch to the login screen after successful registration
 
         # --- Configure grid for the frame itself to expand symmetrically ---
@@ -77,11 +78,11 @@ class RegisterFrame(customtkinter.CTkFrame):
 
         # Input Validation
         if not username or not password or not confirm_password: # Checks for mandatory fields
-            self.message_label.configure(text="Username, Password, and Confirm Password cannot be empty.") # Displays error message
+            self.message_label.configure(text="Username, Password, and Confirm Password cannot be empty.", text_color="red") # Displays error message
             return # Stops function execution
 
         if password != confirm_password: # Checks if passwords match
-            self.message_label.configure(text="Passwords do not match.") # Displays error message
+            self.message_label.configure(text="Passwords do not match.", text_color="red") # Displays error message
             return # Stops function execution
 
         contact_info = {} # Dictionary to store optional contact information
@@ -90,18 +91,31 @@ class RegisterFrame(customtkinter.CTkFrame):
         if phone:
             contact_info['phone'] = phone # Adds phone if provided
 
-        # Attempt to register using UserManager
-        user_id = self.user_manager.register_user(username, password, contact_info=contact_info) # Calls UserManager to register the user
-
+        # Attempt to register using UserManager; password hashing is deliberately slow, so it runs in the background
+        self.register_button.configure(state="disabled") # Prevents duplicate submissions while registration is in progress
+        self.message_label.configure(text="Registering...", text_color="gray") # Progress message
+        future = self.user_manager.register_user_async(username, password, contact_info=contact_info) # Starts the registration
+        self.task_runner.track(future, on_success=lambda result: self._finish_registration(*result, username),
+                               on_error=lambda error: self._registration_failed(error, username))
+
+    def _registration_failed(self, error, username):
+        """Runs on the Tk thread when the background registration raised an error."""
+        self.register_button.configure(state="normal") # Re-enables the register button
+        logger.error(f"GUI: Registration for '{username}' raised an error: {error}") # Logs unexpected errors
+        self.message_label.configure(text="Registration failed due to an internal error.", text_color="red")
+
+    def _finish_registration(self, user_id, message, username):
+        """Runs on the Tk thread once the background registration has finished: shows the result."""
+        self.register_button.configure(state="normal") # Re-enables the register button
         if user_id: # If registration is successful (user_id is returned)
             self.message_label.configure(text=f"Registration successful! Please log in.", text_color="green") # Displays success message in green
             logger.info(f"GUI: User '{username}' registered.") # Logs successful registration
             self.clear_inputs() # Clears input fields after successful registration
             self.switch_to_login_callback() # Calls the callback to automatically go to the login screen
         else:
-            # Error message will be set by UserManager if username already exists
-            self.message_label.configure(text=self.user_manager.users_status_message, text_color="red") # Displays error message from UserManager
-            logger.warning(f"GUI: Registration attempt for '{username}' failed. Message: {self.user_manager.users_status_message}") # Logs failed registration attempt
+            # The message comes back with this registration's result (e.g., username already exists)
+            self.message_label.configure(text=message, text_color="red") # Displays error message from UserManager
+            logger.warning("GUI: Registration attempt for '%s' failed. Message: %s", username, message) # Logs failed registration attempt
 
     def clear_inputs(self): # Renamed for consistency
         """Clears all input fields and messages on the registration screen."""
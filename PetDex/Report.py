@@ -1,8 +1,150 @@
 import logging # Imports the logging module for application logging
-import datetime # Imports datetime for date/time operations (though currently not directly used for reporting timestamps, pet_data_manager handles that)
+import datetime # Imports datetime for lost-pet timestamps and the date ranges of the trend rollups
+
+from database_manager import ChangeJournal, INSERTED, DELETED, RELOADED # Imports the change log and change event actions
+from Column_store import PetColumnStore, day_number, MISSING_DAY # Imports the columnar pet table used for analytics and its date conversion
 
 logger = logging.getLogger(__name__) # Initializes a logger for this module
 
+class ReportCounters:
+    """
+    Aggregate counts for the reports: users, pets by status and species, strays by status.
+    Keeps the counted fields of every pet and stray so that updates and deletions can be
+    applied without re-reading the old record.
+    """
+
+    def __init__(self):
+        self.total_users = 0 # Number of users
+        self.pets_by_status = {} # status -> number of pets
+        self.pets_by_species = {} # species -> number of pets
+        self.strays_by_status = {} # status -> number of stray reports
+        self.pet_fields = {} # pet_id -> (status, species) as last counted
+        self.stray_fields = {} # stray_id -> status as last counted
+
+    @staticmethod
+    def _adjust(counts, key, delta):
+        """Adds delta to counts[key], dropping keys that reach zero."""
+        value = counts.get(key, 0) + delta
+        if value:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
+
+    def set_pet(self, pet_id, pet_data):
+        """Counts a new pet, or moves an existing one to its current status/species (pet_data None removes it)."""
+        old = self.pet_fields.pop(pet_id, None)
+        if old is not None: # Uncount the previous state
+            self._adjust(self.pets_by_status, old[0], -1)
+            self._adjust(self.pets_by_species, old[1], -1)
+        if pet_data is not None: # Count the current state
+            new = (pet_data.get('status'), pet_data.get('species'))
+            self.pet_fields[pet_id] = new
+            self._adjust(self.pets_by_status, new[0], 1)
+            self._adjust(self.pets_by_species, new[1], 1)
+
+    def set_stray(self, stray_id, stray_data):
+        """Counts a new stray report, or moves an existing one to its current status (stray_data None removes it)."""
+        old = self.stray_fields.pop(stray_id, None)
+        if old is not None:
+            self._adjust(self.strays_by_status, old, -1)
+        if stray_data is not None:
+            self.stray_fields[stray_id] = stray_data.get('status')
+            self._adjust(self.strays_by_status, stray_data.get('status'), 1)
+
+    def snapshot(self):
+        """Returns a copy of every counter, e.g. for display or comparison."""
+        return {
+            'users': self.total_users,
+            'pets': len(self.pet_fields),
+            'pets_by_status': dict(self.pets_by_status),
+            'pets_by_species': dict(self.pets_by_species),
+            'strays': len(self.stray_fields),
+            'strays_by_status': dict(self.strays_by_status),
+        }
+
+TREND_METRICS = ('user_registrations', 'pet_registrations', 'lost_reports', 'found_events', 'stray_reports', 'stray_captures')
+GRANULARITIES = ('day', 'week', 'month')
+
+def _to_day(value):
+    """Converts a date, or an ISO date/timestamp string, into a day number."""
+    return value.toordinal() if isinstance(value, datetime.date) else day_number(value)
+
+def _bucket(day, granularity):
+    """Key of the day/week/month bucket a day number falls into (weeks start on Monday)."""
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - (day - 1) % 7 # Day number 1 (0001-01-01) is a Monday
+    date = datetime.date.fromordinal(day)
+    return date.year * 12 + date.month - 1 # Months counted from year 0
+
+def _bucket_start(key, granularity):
+    """First date of a bucket."""
+    if granularity == 'month':
+        return datetime.date(key // 12, key % 12 + 1, 1)
+    return datetime.date.fromordinal(key)
+
+def _next_bucket(key, granularity):
+    return key + {'day': 1, 'week': 7, 'month': 1}[granularity]
+
+class TrendRollups:
+    """
+    Event counts per day, week and month for each trend metric, updated as events happen.
+    Every event is added to its day, week and month bucket, so a range query reads one bucket per period
+    (O(buckets)) instead of scanning records. Counts are a history: deleting a record does not undo its events.
+    """
+
+    def __init__(self):
+        self.buckets = {metric: {granularity: {} for granularity in GRANULARITIES} for metric in TREND_METRICS} # metric -> granularity -> bucket -> count
+
+    def add(self, metric, day, delta=1):
+        """Counts delta events of a metric on a day (a day number, date or ISO string)."""
+        day = _to_day(day)
+        if day == MISSING_DAY:
+            day = datetime.date.today().toordinal() # Undated events count as today's
+        for granularity, buckets in self.buckets[metric].items():
+            key = _bucket(day, granularity)
+            value = buckets.get(key, 0) + delta
+            if value:
+                buckets[key] = value
+            else:
+                buckets.pop(key, None)
+
+    def series(self, metric, start, end, granularity='day'):
+        """
+        Counts per period between two dates, periods without events included as zeros.
+        :param start: First date (date or ISO string); its whole period is counted.
+        :param end: Last date, inclusive.
+        :return: List of (period start ISO date, count), oldest first.
+        """
+        buckets = self.buckets[metric][granularity]
+        key, last = _bucket(_to_day(start), granularity), _bucket(_to_day(end), granularity)
+        series = []
+        while key <= last:
+            series.append((_bucket_start(key, granularity).isoformat(), buckets.get(key, 0)))
+            key = _next_bucket(key, granularity)
+        return series
+
+    def total(self, metric, start, end):
+        """
+        Number of events between two dates (inclusive): whole months are read from the monthly buckets,
+        the days before the first and after the last whole month from the daily ones.
+        """
+        daily, monthly = self.buckets[metric]['day'], self.buckets[metric]['month']
+        day, last = _to_day(start), _to_day(end)
+        total = 0
+        while day <= last:
+            date = datetime.date.fromordinal(day)
+            month = _bucket(day, 'month')
+            next_month = _bucket_start(month + 1, 'month').toordinal()
+            if date.day == 1 and next_month - 1 <= last: # The whole month lies in the range
+                total += monthly.get(month, 0)
+                day = next_month
+            else:
+                total += daily.get(day, 0)
+                day += 1
+        return total
+
 class ReportManager:
     def __init__(self, pet_data_manager):
         """
@@ -10,17 +152,243 @@ class ReportManager:
         :param pet_data_manager: An instance of PetDataManager to interact with pet data.
         """
         self.pet_data_manager = pet_data_manager # Stores an instance of PetDataManager
+        self.change_journal = ChangeJournal() # Records the changes that affect reports
+        self.pet_columns = PetColumnStore() # Columnar copy of the pets for analytics, filled by the first count
+        self.trends = TrendRollups() # Registrations, losses, finds and captures per day/week/month, filled by the first count
+        self.counters = self._count_from_scratch(self.pet_columns, self.trends) # Aggregate counters, maintained incrementally from here on
+        self.pet_data_manager.db_manager.subscribe(self._on_change) # Keeps the counters in step with every write
+        self.pet_data_manager.db_manager.subscribe(self.change_journal.record) # Subscribes to the database's change events
+
+    # --- Aggregate Counters ---
+
+    def _count_from_scratch(self, pet_columns=None, trends=None):
+        """
+        Builds a fresh ReportCounters by streaming every pet and stray report once.
+        :param pet_columns: Optional empty PetColumnStore to fill from the same pass over the pets.
+        :param trends: Optional empty TrendRollups to fill from the stored dates. Records carry no date for
+                       finds and captures, so currently lost pets count on their lost timestamp and captured
+                       strays on their reported date; found events are only counted as they happen.
+        """
+        counters = ReportCounters()
+        counters.total_users = self.pet_data_manager.db_manager.get_total_users()
+        for pet in self.pet_data_manager.iter_all_pets():
+            counters.set_pet(pet['pet_id'], pet)
+            if pet_columns is not None:
+                pet_columns.set_pet(pet['pet_id'], pet)
+            if trends is not None:
+                trends.add('pet_registrations', pet.get('registration_date'))
+                if pet.get('status') == 'lost':
+                    trends.add('lost_reports', (pet.get('lost_details') or {}).get('timestamp'))
+        for stray in self.pet_data_manager.iter_all_strays():
+            counters.set_stray(stray['stray_id'], stray)
+            if trends is not None:
+                trends.add('stray_reports', stray.get('reported_date'))
+                if stray.get('status') == 'found_captured':
+                    trends.add('stray_captures', stray.get('reported_date'))
+        if trends is not None:
+            cursor = None
+            while True: # Users are only read for their registration dates
+                users, cursor = self.pet_data_manager.db_manager.get_users_after(cursor, 500)
+                for user in users:
+                    trends.add('user_registrations', user.get('registration_date'))
+                if cursor is None:
+                    break
+        return counters
+
+    def _on_change(self, event):
+        """Change event subscriber: applies one insert/update/delete to the counters, pet columns and trends in O(1)."""
+        if event.action == RELOADED: # A bulk load: one recount instead of one event per record
+            pet_columns, trends = PetColumnStore(), TrendRollups()
+            trends.buckets['found_events'] = self.trends.buckets['found_events'] # Not derivable from the records
+            self.counters = self._count_from_scratch(pet_columns, trends)
+            self.pet_columns, self.trends = pet_columns, trends # Swapped in whole, so queries never see a half-built store
+        elif event.entity == 'user':
+            if event.action == INSERTED:
+                self.counters.total_users += 1
+                user = self.pet_data_manager.db_manager.get_user_by_id(event.entity_id)
+                self.trends.add('user_registrations', user.get('registration_date') if user else None)
+            elif event.action == DELETED:
+                self.counters.total_users -= 1
+        elif event.entity == 'pet':
+            pet = None if event.action == DELETED else self.pet_data_manager.get_pet(event.entity_id) # Current state of the pet
+            old = self.counters.pet_fields.get(event.entity_id) # (status, species) before this change
+            self._add_pet_trends(event.action, old[0] if old else None, pet)
+            self.counters.set_pet(event.entity_id, pet)
+            self.pet_columns.set_pet(event.entity_id, pet)
+        elif event.entity == 'stray':
+            stray = None if event.action == DELETED else self.pet_data_manager.get_stray_pet_report(event.entity_id) # Current state of the report
+            old_status = self.counters.stray_fields.get(event.entity_id)
+            if stray is not None:
+                if event.action == INSERTED:
+                    self.trends.add('stray_reports', stray.get('reported_date'))
+                if stray.get('status') == 'found_captured' and old_status != 'found_captured':
+                    self.trends.add('stray_captures', datetime.date.today())
+            self.counters.set_stray(event.entity_id, stray)
+
+    def _add_pet_trends(self, action, old_status, pet):
+        """Counts a pet registration, or a status transition to lost or back (found)."""
+        if pet is None:
+            return
+        if action == INSERTED:
+            self.trends.add('pet_registrations', pet.get('registration_date'))
+        status = pet.get('status')
+        if status == 'lost' and old_status != 'lost':
+            self.trends.add('lost_reports', (pet.get('lost_details') or {}).get('timestamp'))
+        elif old_status == 'lost' and status != 'lost':
+            self.trends.add('found_events', datetime.date.today())
+
+    def get_counters(self):
+        """
+        Returns every aggregate counter without touching the pet or stray tables.
+        :return: A dictionary with 'users', 'pets', 'pets_by_status', 'pets_by_species', 'strays' and 'strays_by_status'.
+        """
+        return self.counters.snapshot()
+
+    def count_users(self):
+        """:return: The number of registered users (O(1))."""
+        return self.counters.total_users
+
+    def count_pets(self, status=None, species=None):
+        """
+        Counts pets in O(1), optionally only those with a given status or species.
+        :param status: e.g. 'registered' or 'lost'; None counts every status.
+        :param species: e.g. 'Dog' or 'Cat'; None counts every species (cannot be combined with status).
+        :return: The number of matching pets.
+        """
+        if status is not None:
+            return self.counters.pets_by_status.get(status, 0)
+        if species is not None:
+            return self.counters.pets_by_species.get(species, 0)
+        return len(self.counters.pet_fields)
+
+    def count_strays(self, status=None):
+        """
+        Counts stray reports in O(1), optionally only those with a given status.
+        :param status: 'stray' (active) or 'found_captured'; None counts every report.
+        :return: The number of matching stray reports.
+        """
+        if status is not None:
+            return self.counters.strays_by_status.get(status, 0)
+        return len(self.counters.stray_fields)
+
+    def verify_counters(self, repair=True):
+        """
+        Consistency check: recounts everything from scratch and compares with the maintained counters.
+        :param repair: Replace the maintained counters with the recount if they differ.
+        :return: True if the maintained counters were correct, False otherwise.
+        """
+        expected = self._count_from_scratch()
+        if expected.snapshot() == self.counters.snapshot():
+            logger.info("Report: Counters verified.") # Logs successful verification
+            return True
+        logger.error("Report: Counter mismatch. Maintained %s, recounted %s.", self.counters.snapshot(), expected.snapshot()) # Logs the mismatch
+        if repair:
+            self.counters = expected
+        return False
+
+    # --- Pet Analytics ---
+    # Vectorised aggregates over the columnar pet table; filters are PetColumnStore "where" dictionaries.
+
+    def count_lost_pets_by_species(self):
+        """:return: Dictionary species -> number of lost pets, most frequent first."""
+        return self.pet_columns.group_count('species', {'status': 'lost'})
 
-    def report_lost_pet(self, pet_id, last_seen_location):
+    def get_registrations_per_day(self, start=None, end=None, **where):
+        """
+        Counts pet registrations per day.
+        :param start: First ISO date to include, or None.
+        :param end: ISO date to stop before, or None.
+        :param where: Further filters, e.g. species='Dog'.
+        :return: Dictionary ISO date -> number of pets registered that day, in date order.
+        """
+        if start is not None or end is not None:
+            where['registration_date'] = (start, end)
+        return self.pet_columns.per_day(where)
+
+    def get_age_histogram(self, bin_width=1, **where):
+        """
+        Builds a histogram of pet ages.
+        :param bin_width: Width of each bin in years.
+        :param where: Filters, e.g. species='Cat' or status='lost'.
+        :return: List of (low, high, count) bins.
+        """
+        return self.pet_columns.age_histogram(bin_width, where)
+
+    def get_pet_analytics(self, days=30, age_bin=1):
+        """
+        Gathers the aggregates shown in the reports tab in one call.
+        :param days: Number of days (up to today) covered by the registration counts.
+        :param age_bin: Width of the age histogram bins in years.
+        :return: A dictionary with 'lost_by_species', 'registrations_per_day' and 'age_histogram'.
+        """
+        start = datetime.date.today() - datetime.timedelta(days=days - 1)
+        return {
+            'lost_by_species': self.count_lost_pets_by_species(),
+            'registrations_per_day': self.get_registrations_per_day(start.isoformat()),
+            'age_histogram': self.get_age_histogram(age_bin),
+        }
+
+    # --- Trends ---
+
+    def get_trend(self, metric, start, end=None, granularity='day'):
+        """
+        Counts of one metric per day, week or month, read from the rollups (O(periods)).
+        :param metric: One of TREND_METRICS, e.g. 'pet_registrations' or 'lost_reports'.
+        :param start: First date (date or ISO string).
+        :param end: Last date, inclusive; defaults to today.
+        :param granularity: 'day', 'week' or 'month'.
+        :return: List of (period start ISO date, count), oldest first.
+        """
+        return self.trends.series(metric, start, end or datetime.date.today(), granularity)
+
+    def count_events(self, metric, start, end=None):
+        """
+        Total of one metric between two dates (inclusive), using whole months where possible.
+        :return: The number of events.
+        """
+        return self.trends.total(metric, start, end or datetime.date.today())
+
+    def get_trends(self, granularity='week', periods=12):
+        """
+        Gathers every trend metric over the last periods days/weeks/months, e.g. for the trends panel.
+        :return: Dictionary metric -> list of (period start ISO date, count).
+        """
+        today = datetime.date.today()
+        if granularity == 'month':
+            month = today.year * 12 + today.month - periods # Start of the first month shown
+            start = datetime.date(month // 12, month % 12 + 1, 1)
+        else:
+            start = today - datetime.timedelta(days=(periods - 1) * (7 if granularity == 'week' else 1))
+        trends = self.trends # Same rollups for every metric, even if a bulk load swaps them meanwhile
+        return {metric: trends.series(metric, start, today, granularity) for metric in TREND_METRICS}
+
+    def get_change_version(self):
+        """
+        Returns the current change version of the report data.
+        :return: A version number to pass to get_changes_since() later.
+        """
+        return self.change_journal.version
+
+    def get_changes_since(self, version):
+        """
+        Lists what changed since a previous version, so report views can patch instead of reloading.
+        :param version: A version from get_change_version() or a previous call, or None.
+        :return: (events, current_version); events is None if a full reload is needed.
+        """
+        return self.change_journal.changes_since(version), self.change_journal.version
+
+    def report_lost_pet(self, pet_id, last_seen_location, latitude=None, longitude=None):
         """
         Marks a pet as lost and stores the lost details using PetDataManager.
         :param pet_id: The ID of the pet to mark as lost.
         :param last_seen_location: The last known location of the lost pet.
+        :param latitude: Optional latitude of the last known location (used to match stray reports nearby).
+        :param longitude: Optional longitude of the last known location.
         :return: True if successful, False otherwise.
         """
         # First, check if the pet actually exists before attempting to mark it as lost
         if not self.pet_data_manager.get_pet(pet_id):
-            logger.warning(f"Report: Pet with ID {pet_id} not found.") # Logs a warning if pet not found
+            logger.warning("Report: Pet with ID %s not found.", pet_id) # Logs a warning if pet not found
             return False
 
         # Construct the lost_details dictionary
@@ -29,12 +397,15 @@ class ReportManager:
             "timestamp": str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")), # Records the current timestamp
             # The owner_id is already part of the pet record, no need to add here again
         }
+        if latitude is not None and longitude is not None:
+            lost_details["latitude"] = latitude # Indexed by the database for nearby stray matching
+            lost_details["longitude"] = longitude
         # Call the PetDataManager to update the pet's status to 'lost' and save lost details
         if self.pet_data_manager.mark_pet_lost(pet_id, lost_details):
-            logger.info(f"Report: Pet {pet_id} marked as lost.") # Logs successful operation
+            logger.info("Report: Pet %s marked as lost.", pet_id) # Logs successful operation
             return True
         else:
-            logger.error(f"Report: Failed to mark pet {pet_id} as lost.") # Logs error if operation fails
+            logger.error("Report: Failed to mark pet %s as lost.", pet_id) # Logs error if operation fails
             return False
 
     def mark_pet_found(self, pet_id):
@@ -45,10 +416,10 @@ class ReportManager:
         """
         # Call the PetDataManager to update the pet's status to 'registered' (found)
         if self.pet_data_manager.mark_pet_found(pet_id):
-            logger.info(f"Report: Pet {pet_id} marked as found.") # Logs successful operation
+            logger.info("Report: Pet %s marked as found.", pet_id) # Logs successful operation
             return True
         else:
-            logger.error(f"Report: Failed to mark pet {pet_id} as found.") # Logs error if operation fails
+            logger.error("Report: Failed to mark pet %s as found.", pet_id) # Logs error if operation fails
             return False
 
     # --- New methods for generating reports ---
@@ -67,24 +438,74 @@ class ReportManager:
         """
         Retrieves data for all stray pet reports.
         This method acts as a facade, delegating the call to PetDataManager.
+        Prefer iter_stray_report_data when the reports do not all have to be in memory at once.
         :return: A dictionary of stray reports {stray_id: stray_details}.
         """
         logger.info("Report: Generating report for all stray pet reports.") # Logs report generation
-        # PetDataManager's get_all_strays returns all strays, active or captured.
+        # PetDataManager's get_all_strays returns all strays, active or captured, streamed page by page.
         return self.pet_data_manager.get_all_strays()
 
     def get_all_registered_pets_data(self):
         """
         Retrieves data for all registered pets (not just owned by current user).
         This includes pets with 'registered', 'lost', 'found' statuses.
-        This method acts as a facade, delegating the call to DatabaseManager via PetDataManager.
+        Built from the cursor pages, so the store's lock is held one page at a time rather than for a copy of the whole
+        table; prefer iter_registered_pets_data when the pets do not all have to be in memory at once.
         :return: A dictionary of all registered pets {pet_id: pet_details}.
         """
         logger.info("Report: Generating report for all registered pets.") # Logs report generation
-        # The PetDataManager can access all registered pets via the db_manager
-        # Assuming PetDataManager has a method to get all pets, if not, it should be added or called directly via db_manager
-        return self.pet_data_manager.db_manager.get_all_registered_pets() # Directly calls db_manager via pet_data_manager
+        return {pet['pet_id']: pet for pet in self.pet_data_manager.iter_all_pets()} # Streams the pages into one dictionary
     
+    def get_registered_pets_page(self, limit=50, offset=0):
+        """
+        Retrieves one page of all registered pets in stable (registration_date, pet_id) order.
+        :param limit: Maximum number of pets to return.
+        :param offset: Number of pets to skip.
+        :return: A list of pet dictionaries.
+        """
+        logger.info("Report: Generating registered pets page (limit=%s, offset=%s).", limit, offset) # Logs report generation
+        return self.pet_data_manager.get_pets_page(limit, offset)
+
+    def get_registered_pets_after(self, cursor=None, limit=50):
+        """
+        Retrieves the page of registered pets following an opaque cursor.
+        :param cursor: Cursor returned by the previous call, or None for the first page.
+        :param limit: Maximum number of pets to return.
+        :return: A (pets, next_cursor) tuple; next_cursor is None after the last page.
+        """
+        return self.pet_data_manager.get_pets_after(cursor, limit)
+
+    def iter_registered_pets_data(self, page_size=500):
+        """
+        Streams all registered pets page by page, so reports never hold the whole table at once.
+        :return: A generator of pet dictionaries.
+        """
+        logger.info("Report: Streaming all registered pets.") # Logs report generation
+        return self.pet_data_manager.iter_all_pets(page_size)
+
+    def get_stray_report_page(self, limit=50, offset=0):
+        """
+        Retrieves one page of stray reports in stable (reported_date, stray_id) order.
+        :return: A list of stray report dictionaries.
+        """
+        logger.info("Report: Generating stray reports page (limit=%s, offset=%s).", limit, offset) # Logs report generation
+        return self.pet_data_manager.get_strays_page(limit, offset)
+
+    def get_stray_report_after(self, cursor=None, limit=50):
+        """
+        Retrieves the page of stray reports following an opaque cursor.
+        :return: A (strays, next_cursor) tuple; next_cursor is None after the last page.
+        """
+        return self.pet_data_manager.get_strays_after(cursor, limit)
+
+    def iter_stray_report_data(self, page_size=500):
+        """
+        Streams all stray reports page by page.
+        :return: A generator of stray report dictionaries.
+        """
+        logger.info("Report: Streaming all stray reports.") # Logs report generation
+        return self.pet_data_manager.iter_all_strays(page_size)
+
     def get_total_users_data(self):
         """
         Retrieves the total count of registered users.
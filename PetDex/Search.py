@@ -1 +1,257 @@
+import logging # Imports the logging module for application logging
+import re # Imports re to split text into search terms
+import bisect # Imports bisect to keep the vocabulary sorted for prefix lookups
+import heapq # Imports heapq to order candidate terms and results by score
+import threading # Imports threading to guard the index against concurrent searches and updates
+from collections import namedtuple # Imports namedtuple for lightweight search results
 
+from database_manager import DELETED, RELOADED # Imports the change event actions for deleted and bulk-loaded records
+
+logger = logging.getLogger(__name__) # Initializes a logger for this module
+
+# One search hit; record is filled in by SearchManager, the index itself only knows keys
+SearchResult = namedtuple('SearchResult', ['entity', 'entity_id', 'score', 'record'], defaults=(None,))
+
+# Searchable fields and how much a match in each one counts
+PET_FIELDS = {'pet_name': 3.0, 'breed': 2.0, 'species': 1.5, 'color': 1.0}
+STRAY_FIELDS = {'location': 2.0, 'breed': 2.0, 'species': 1.5, 'color': 1.0, 'description': 1.0}
+
+# Score of a query term against an indexed term, before the field weight is applied
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.75 # "lab" -> "labrador"
+FUZZY_MATCH = 0.6 # Multiplied by the trigram similarity, e.g. "labardor" -> "labrador"
+MIN_SIMILARITY = 0.4 # Trigram (Dice) similarity below which terms are not considered typos of each other
+MAX_EXPANSIONS = 50 # Indexed terms a single query term may expand to
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+") # Letters and digits; everything else separates terms
+
+def tokenize(text):
+    """Splits text into lower-case search terms."""
+    return TOKEN_PATTERN.findall(str(text).lower()) if text else []
+
+def trigrams(term):
+    """Character trigrams of a term, padded so that short terms and word starts/ends are represented."""
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    Inverted index with prefix and typo-tolerant matching.
+    Postings are grouped by field weight (term -> weight -> documents) so the best documents of a term
+    can be read first and a query stops as soon as no remaining posting can enter the top results.
+    Prefixes are looked up in a sorted vocabulary; typos through a trigram index over the vocabulary.
+    Documents are keyed by (entity, entity_id) and can be added, replaced or removed at any time.
+    """
+
+    def __init__(self):
+        self.postings = {} # term -> {weight: {doc_key: None}}
+        self.doc_terms = {} # doc_key -> {term: weight}, used for scoring lookups and removal
+        self.vocabulary = [] # Sorted list of indexed terms
+        self.trigram_terms = {} # trigram -> {term: None}
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def index(self, entity, entity_id, record, fields):
+        """
+        Adds or replaces the document for (entity, entity_id).
+        :param record: Record dictionary to read the searchable fields from.
+        :param fields: Dictionary field name -> weight.
+        """
+        doc_key = (entity, entity_id)
+        terms = {}
+        for field, weight in fields.items():
+            for term in tokenize(record.get(field)):
+                if weight > terms.get(term, 0):
+                    terms[term] = weight # A term counts with its best field
+        if self.doc_terms.get(doc_key) == terms: # Searchable fields unchanged
+            return
+        self.remove(entity, entity_id)
+        self.doc_terms[doc_key] = terms
+        for term, weight in terms.items():
+            buckets = self.postings.get(term)
+            if buckets is None: # First document with this term
+                buckets = self.postings[term] = {}
+                self._add_term(term)
+            buckets.setdefault(weight, {})[doc_key] = None
+
+    def remove(self, entity, entity_id):
+        """Removes the document for (entity, entity_id), if indexed."""
+        terms = self.doc_terms.pop((entity, entity_id), None)
+        if not terms:
+            return
+        for term, weight in terms.items():
+            buckets = self.postings[term]
+            bucket = buckets[weight]
+            del bucket[(entity, entity_id)]
+            if not bucket:
+                del buckets[weight]
+                if not buckets: # Last document with this term
+                    del self.postings[term]
+                    self._remove_term(term)
+
+    def _add_term(self, term):
+        bisect.insort(self.vocabulary, term)
+        for gram in trigrams(term):
+            self.trigram_terms.setdefault(gram, {})[term] = None
+
+    def _remove_term(self, term):
+        del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+        for gram in trigrams(term):
+            grams = self.trigram_terms[gram]
+            del grams[term]
+            if not grams:
+                del self.trigram_terms[gram]
+
+    def expand(self, query_term):
+        """
+        Returns {indexed term: match score} for a query term: the exact term, terms it is a prefix of,
+        and (for terms of three or more characters) terms within trigram similarity of it.
+        """
+        matches = {}
+        if query_term in self.postings:
+            matches[query_term] = EXACT_MATCH
+        start = bisect.bisect_left(self.vocabulary, query_term)
+        for term in self.vocabulary[start:start + MAX_EXPANSIONS + 1]: # Prefix matches are contiguous in sorted order
+            if not term.startswith(query_term):
+                break
+            matches.setdefault(term, PREFIX_MATCH)
+        if len(query_term) >= 3:
+            query_grams = trigrams(query_term)
+            shared = {}
+            for gram in query_grams:
+                for term in self.trigram_terms.get(gram, ()):
+                    shared[term] = shared.get(term, 0) + 1
+            for term, count in shared.items():
+                if term not in matches:
+                    similarity = 2.0 * count / (len(query_grams) + len(trigrams(term))) # Dice coefficient
+                    if similarity >= MIN_SIMILARITY:
+                        matches[term] = FUZZY_MATCH * similarity
+        if len(matches) > MAX_EXPANSIONS:
+            matches = dict(heapq.nlargest(MAX_EXPANSIONS, matches.items(), key=lambda item: item[1]))
+        return matches
+
+    def search(self, query, limit=20, entity=None):
+        """
+        Ranks documents matching every term of query.
+        A document's score is the sum, over query terms, of its best (match score x field weight).
+        :param entity: 'pet' or 'stray' to restrict results; None searches both.
+        :return: List of up to limit SearchResult, best first.
+        """
+        expansions = [self.expand(term) for term in dict.fromkeys(tokenize(query))]
+        if not expansions or not all(expansions):
+            return [] # Some query term matches nothing
+
+        # Drive the search from the query term with the fewest postings; the others are checked per document
+        def posting_count(matches):
+            return sum(len(docs) for term in matches for docs in self.postings[term].values())
+        expansions.sort(key=posting_count)
+        driver, others = expansions[0], expansions[1:]
+        others_best = sum(max(score * max(self.postings[term]) for term, score in matches.items()) for matches in others)
+
+        # Driver postings in decreasing order of their contribution, so the scan can stop early
+        groups = sorted(((score * weight, docs) for term, score in driver.items()
+                         for weight, docs in self.postings[term].items()), key=lambda group: -group[0])
+
+        top = [] # Min-heap of (score, sequence, doc_key) holding the best results so far
+        seen = set()
+        sequence = 0 # Tie-breaker: earlier hits (better driver match) win ties
+        for bound, docs in groups:
+            if len(top) >= limit and bound + others_best <= top[0][0]:
+                break # No unseen document can beat the current top results
+            for doc_key in docs:
+                if doc_key in seen or (entity is not None and doc_key[0] != entity):
+                    continue
+                seen.add(doc_key)
+                doc_terms = self.doc_terms[doc_key]
+                score = self._best(driver, doc_terms)
+                for matches in others:
+                    best = self._best(matches, doc_terms)
+                    if not best:
+                        break # Document misses one of the query terms
+                    score += best
+                else:
+                    sequence += 1
+                    if len(top) < limit:
+                        heapq.heappush(top, (score, -sequence, doc_key))
+                    elif score > top[0][0]:
+                        heapq.heapreplace(top, (score, -sequence, doc_key))
+                    if len(top) >= limit and bound + others_best <= top[0][0]:
+                        break # The rest of this group (and every later one) cannot beat the top results
+        return [SearchResult(doc_key[0], doc_key[1], round(score, 4))
+                for score, _, doc_key in sorted(top, reverse=True)]
+
+    @staticmethod
+    def _best(matches, doc_terms):
+        """Best (match score x field weight) of any expanded term present in a document, 0 if none."""
+        best = 0
+        for term, score in matches.items():
+            weight = doc_terms.get(term)
+            if weight and score * weight > best:
+                best = score * weight
+        return best
+
+
+class SearchManager:
+    """
+    Keeps a SearchIndex over all pets and stray reports and answers search queries.
+    The index is built once from the database and then updated from its change events, so it is only rebuilt after bulk loads.
+    """
+
+    def __init__(self, pet_data_manager):
+        self.pet_data_manager = pet_data_manager # Stores an instance of PetDataManager
+        self._lock = threading.Lock() # Searches and change events may run on different worker threads
+        self.index = self._build_index() # Inverted index over pet and stray text fields
+        self.pet_data_manager.db_manager.subscribe(self._on_change) # Keeps the index in step with every write
+
+    def _build_index(self):
+        """Builds a fresh SearchIndex from every pet and stray report."""
+        index = SearchIndex()
+        for pet in self.pet_data_manager.iter_all_pets(): # Streams the pets page by page
+            index.index('pet', pet['pet_id'], pet, PET_FIELDS)
+        for stray in self.pet_data_manager.iter_all_strays():
+            index.index('stray', stray['stray_id'], stray, STRAY_FIELDS)
+        logger.info("Search: Indexed %d pets and stray reports.", len(index)) # Logs the index size
+        return index
+
+    def _on_change(self, event):
+        """Change event subscriber: re-indexes or removes the single pet or stray report that changed."""
+        if event.action == RELOADED:
+            if event.entity != 'user': # Users are not searchable
+                index = self._build_index() # Built aside, so searches keep using the old index meanwhile
+                with self._lock:
+                    self.index = index
+        elif event.entity == 'pet':
+            pet = None if event.action == DELETED else self.pet_data_manager.get_pet(event.entity_id)
+            with self._lock:
+                if pet:
+                    self.index.index('pet', event.entity_id, pet, PET_FIELDS)
+                else:
+                    self.index.remove('pet', event.entity_id)
+        elif event.entity == 'stray':
+            stray = None if event.action == DELETED else self.pet_data_manager.get_stray_pet_report(event.entity_id)
+            with self._lock:
+                if stray:
+                    self.index.index('stray', event.entity_id, stray, STRAY_FIELDS)
+                else:
+                    self.index.remove('stray', event.entity_id)
+
+    def search(self, query, limit=20, entity=None):
+        """
+        Searches pet names, species, breeds and colours and stray locations and descriptions.
+        Matches whole words, word prefixes and small typos.
+        :param entity: 'pet' or 'stray' to restrict results; None searches both.
+        :return: List of SearchResult (entity, entity_id, score, record), best first.
+        """
+        results = []
+        with self._lock: # Records are fetched outside the lock
+            hits = self.index.search(query, limit, entity)
+        for result in hits:
+            if result.entity == 'pet':
+                record = self.pet_data_manager.get_pet(result.entity_id)
+            else:
+                record = self.pet_data_manager.get_stray_pet_report(result.entity_id)
+            if record: # Skips records deleted since they were indexed
+                results.append(result._replace(record=record))
+        return results
@@ -0,0 +1,541 @@
+"""
+Local store server: one process owns the PetDex store and several application processes share it.
+
+    python Store_server.py [address] [--data-dir DIR]
+
+address is "host:port" (default localhost:7431) or "unix:/path/to/socket". With --data-dir the server keeps
+a DurableInMemoryDBManager in DIR, otherwise a volatile InMemoryDBManager.
+Clients use StoreClient, which has the same methods as InMemoryDBManager, transaction() included
+(set PETDEX_DB_BACKEND=server).
+
+Clients must know the server's shared secret: $PETDEX_SERVER_TOKEN, or else the token file (~/.petdex/server_token),
+which the server creates with a random token, readable by its owner only, on first start.
+Password hashes never leave the server: user records are sent without 'password_hash', and logins are checked
+by the server-side verify_password call.
+
+Wire format: every message is a frame made of a 4-byte big-endian length and compact JSON.
+Every connection starts with [AUTH, [token]], answered with [0, null] or [1, "PermissionError", message] (then closed).
+Requests are [method, args, kwargs]; replies are [0, result] or [1, exception type, message].
+[BEGIN, []] opens a transaction() on the server for the requests that follow on the same connection, until
+[COMMIT, []] or [ROLLBACK, []]; a connection that closes (or idles for TRANSACTION_TIMEOUT) mid-transaction is rolled back.
+A connection that sends [SUBSCRIBE, []] becomes an event stream: the server acknowledges with [0, null], then pushes
+[action, entity, entity_id] for every change, which StoreClient delivers to its subscribers as ChangeEvents.
+"""
+import hmac # Imports hmac to compare tokens in constant time
+import logging # Imports the logging module for application logging
+import json # Imports json for the wire format
+import os # Imports os to remove the Unix socket file on shutdown and to create the token file
+import queue # Imports queue for the connection pool and the per-subscriber event queues
+import secrets # Imports secrets to generate the server token
+import socket # Imports socket for client connections
+import socketserver # Imports socketserver for the threaded TCP and Unix socket servers
+import struct # Imports struct to encode frame lengths
+import sys # Imports sys to read the command line
+import threading # Imports threading for the client's event thread and subscription lock
+from contextlib import contextmanager, suppress # Imports contextmanager for transaction() and suppress for closed connections
+
+from database_manager import InMemoryDBManager, ChangeEvent # Imports the store served by default and the change event type
+from durable_db_manager import DurableInMemoryDBManager # Imports the store served with --data-dir
+from Password_hasher import PasswordHasher # Imports the hasher that checks passwords on the server
+
+logger = logging.getLogger(__name__) # Initializes a logger for this module
+
+DEFAULT_ADDRESS = "localhost:7431"
+TOKEN_ENV = "PETDEX_SERVER_TOKEN" # Environment variable overriding the token file
+DEFAULT_TOKEN_FILE = os.path.join(os.path.expanduser("~"), ".petdex", "server_token")
+AUTH = "__auth__" # Pseudo-method every connection must start with
+AUTH_TIMEOUT = 10 # Seconds a new connection may take to authenticate
+SUBSCRIBE = "__subscribe__" # Pseudo-method turning a connection into an event stream
+BEGIN, COMMIT, ROLLBACK = "__begin__", "__commit__", "__rollback__" # Pseudo-methods delimiting a transaction
+TRANSACTION_TIMEOUT = 30 # Seconds a client may stay silent while its transaction holds every table's write lock
+MAX_FRAME = 256 * 2**20 # Largest accepted message (bytes); guards against garbage length prefixes
+
+# Store methods a client may call
+READ_METHODS = ('get_user_by_username', 'get_user_by_id', 'get_users_after', 'get_total_users', 'get_total_pets',
+                'get_total_strays', 'get_pet', 'get_all_pets_by_owner', 'get_all_registered_pets', 'get_pets_page',
+                'get_pets_after', 'get_all_lost_pets', 'get_lost_pets_near', 'get_stray_pet', 'get_all_stray_pets',
+                'get_strays_page', 'get_strays_after', 'lock_stats')
+WRITE_METHODS = ('add_user', 'update_user', 'delete_user', 'add_pet', 'update_pet', 'delete_pet', 'add_stray_pet_report',
+                 'mark_stray_found_captured', 'insert_records', 'finish_bulk_insert', 'rebuild_indexes')
+USER_METHODS = ('get_user_by_username', 'get_user_by_id', 'get_users_after') # Results stripped of 'password_hash'
+SERVER_METHODS = ('verify_password',) # Answered by the server itself rather than the store
+
+_HEADER = struct.Struct(">I") # Frame length prefix
+_REMOTE_EXCEPTIONS = {error.__name__: error for error in (ValueError, KeyError, TypeError, PermissionError)} # Raised again as themselves
+
+class StoreError(Exception):
+    """A store call failed on the server with an exception that has no local equivalent."""
+
+class _ClientRollback(Exception):
+    """Raised into a server-side transaction() to roll it back when the client asks to, or goes away."""
+
+def parse_address(address):
+    """Splits an address into (socket family, socketserver/connect address)."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "localhost", int(port))
+
+def load_token(path=DEFAULT_TOKEN_FILE, create=False):
+    """
+    Returns the shared secret clients present when they connect: $PETDEX_SERVER_TOKEN if set, else the token file.
+    :param create: If True (the server), a missing token file is created with a random token, readable by its owner only.
+    :raises StoreError: If there is no token to use.
+    """
+    token = os.environ.get(TOKEN_ENV)
+    if token:
+        return token
+    try:
+        with open(path, encoding="utf-8") as f:
+            token = f.read().strip()
+    except FileNotFoundError:
+        if not create:
+            raise StoreError(f"No store server token: set {TOKEN_ENV} or copy the server's {path}") from None
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600) # Never readable by other users
+        except FileExistsError: # Another server created it first
+            return load_token(path)
+        token = secrets.token_urlsafe(32)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(token)
+        logger.info("Store server: Created token file %s.", path) # Logs where clients find the token
+    if not token:
+        raise StoreError(f"Store server token file {path} is empty")
+    return token
+
+# --- Wire Format ---
+
+def encode(message):
+    """Encodes a message as one frame; records are sent as JSON objects, tuples as arrays."""
+    payload = json.dumps(message, separators=(",", ":"), default=dict).encode("utf-8")
+    return _HEADER.pack(len(payload)) + payload
+
+def _recv_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None # Peer closed the connection
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def recv_message(sock):
+    """Reads one frame and decodes it; returns None if the peer closed the connection between frames."""
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    size, = _HEADER.unpack(header)
+    if size > MAX_FRAME:
+        raise ConnectionError(f"Frame of {size} bytes exceeds the {MAX_FRAME} byte limit")
+    payload = _recv_exactly(sock, size)
+    if payload is None:
+        raise ConnectionError("Connection closed in the middle of a frame")
+    return json.loads(payload)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True # Restarts can bind while old connections linger in TIME_WAIT
+    daemon_threads = True # Connection threads do not keep the process alive
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class StoreServer:
+    """
+    Serves a store's methods to StoreClient proxies, one thread per connection.
+    The store's own table locks let reads run concurrently and give each write its tables alone;
+    returned records are never changed afterwards, so replies are encoded without holding any lock.
+    """
+
+    def __init__(self, db_manager, address=DEFAULT_ADDRESS, token=None):
+        """
+        :param db_manager: Store to serve (InMemoryDBManager or DurableInMemoryDBManager).
+        :param address: "host:port" or "unix:/path/to/socket".
+        :param token: Shared secret clients must present; by default load_token(create=True).
+        """
+        self.db_manager = db_manager # Stores the store being served
+        self.address = address # Stores the listening address
+        self._token = (token or load_token(create=True)).encode("utf-8") # Compared with what each connection presents
+        self._password_hasher = PasswordHasher() # Verification uses the scheme and cost stored in each hash
+        self._family, bind_address = parse_address(address)
+        store_server = self
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                store_server.handle_connection(self.request)
+        self._server = (_UnixServer if self._family == socket.AF_UNIX else _TCPServer)(bind_address, Handler)
+        self._thread = None # Thread running serve_forever() after start()
+        logger.info("Store server listening on %s.", address) # Logs the listening address
+
+    def serve_forever(self):
+        """Serves requests until shutdown() is called."""
+        self._server.serve_forever()
+
+    def start(self):
+        """Serves requests on a background thread (e.g. for tests and benchmarks)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="store-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        """Stops accepting requests and closes the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._family == socket.AF_UNIX:
+            os.unlink(self._server.server_address) # The socket file would block the next bind
+        logger.info("Store server stopped.") # Logs the shutdown
+
+    def handle_connection(self, sock):
+        """Connection thread: answers requests until the client disconnects."""
+        if sock.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) # Small replies go out at once
+        transaction = None # The store's transaction() context while the client has one open
+        try:
+            if not self._authenticate(sock):
+                return
+            while True:
+                request = recv_message(sock)
+                if request is None: # Client closed the connection
+                    return
+                method, args = request[0], request[1]
+                kwargs = request[2] if len(request) > 2 else {}
+                if method == SUBSCRIBE and transaction is None:
+                    self._stream_events(sock)
+                    return
+                if method in (BEGIN, COMMIT, ROLLBACK):
+                    transaction, reply = self._transaction_step(transaction, method)
+                    sock.settimeout(TRANSACTION_TIMEOUT if transaction else None) # A vanished client must not keep the locks
+                    sock.sendall(reply)
+                    continue
+                sock.sendall(self._dispatch(method, args, kwargs))
+        except (OSError, ValueError, LookupError, TypeError) as e: # Broken connection, or a malformed frame or request
+            logger.warning("Store server: Dropping connection: %r", e) # Logs broken connections
+        finally:
+            if transaction is not None: # Nothing the client did not commit is kept
+                self._transaction_step(transaction, ROLLBACK)
+                logger.warning("Store server: Rolled back the transaction of a closed connection.") # Logs abandoned transactions
+
+    def _transaction_step(self, transaction, method):
+        """
+        Opens, commits or rolls back a connection's transaction. The connection thread runs every request
+        of the transaction, so the store's thread-local transaction scope covers them all.
+        :return: (transaction context or None, encoded reply)
+        """
+        if (method == BEGIN) != (transaction is None):
+            return transaction, encode([1, "ValueError", "A transaction is already open" if transaction else "No transaction is open"])
+        try:
+            if method == BEGIN:
+                context = self.db_manager.transaction()
+                context.__enter__()
+                transaction = context
+            elif method == COMMIT:
+                transaction, context = None, transaction
+                context.__exit__(None, None, None)
+            else:
+                transaction, context = None, transaction
+                error = _ClientRollback()
+                context.__exit__(_ClientRollback, error, None) # Rolls back, then reports the error as not suppressed
+        except Exception as e: # e.g. the commit could not be logged; the store has rolled back
+            return transaction, encode([1, type(e).__name__, str(e)])
+        return transaction, encode([0, None])
+
+    def _authenticate(self, sock):
+        """Reads the [AUTH, [token]] request a connection must start with. Returns True if the token is right."""
+        sock.settimeout(AUTH_TIMEOUT) # A silent connection must not hold its thread forever
+        request = recv_message(sock)
+        sock.settimeout(None)
+        if request is None: # Client closed the connection
+            return False
+        token = request[1][0] if request[0] == AUTH and request[1] else None
+        if not isinstance(token, str) or not hmac.compare_digest(token.encode("utf-8"), self._token): # Constant time
+            logger.warning("Store server: Rejected a connection with a missing or wrong token.") # Logs failed handshakes
+            sock.sendall(encode([1, "PermissionError", "Wrong store server token"]))
+            return False
+        sock.sendall(encode([0, None]))
+        return True
+
+    def _dispatch(self, method, args, kwargs):
+        """Runs one store call and returns the encoded reply."""
+        if method in SERVER_METHODS:
+            target = getattr(self, method)
+        elif method in READ_METHODS or method in WRITE_METHODS:
+            target = getattr(self.db_manager, method)
+        else:
+            return encode([1, "ValueError", f"Unknown store method {method!r}"])
+        try:
+            result = target(*args, **kwargs)
+            if method in USER_METHODS:
+                result = [[_without_hash(user) for user in result[0]], result[1]] if method == 'get_users_after' else _without_hash(result)
+            return encode([0, result])
+        except Exception as e: # Reported to the client, which raises it again
+            return encode([1, type(e).__name__, str(e)])
+
+    def verify_password(self, username, password, cost):
+        """
+        Checks a user's password here, so hashes never leave the server.
+        :param cost: The client's current hash cost (PasswordHasher.cost()).
+        :return: [password matches, stored hash was made with another scheme or cost and should be upgraded]
+        """
+        user = self.db_manager.get_user_by_username(username)
+        if not user or not self._password_hasher.verify(password, user['password_hash']):
+            return [False, False]
+        return [True, PasswordHasher.cost_of(user['password_hash']) != cost]
+
+    def _stream_events(self, sock):
+        """
+        Pushes every change event to a subscribed connection. The client never sends on it again, so a watcher
+        thread blocked in recv() sees the client go away at once, and the subscription is dropped even if the store
+        is quiet; a send to a closed connection ends the stream too.
+        """
+        events = queue.SimpleQueue() # Filled on writer threads, drained here
+        closed = object() # Queued by the watcher when the client disconnects
+
+        def watch():
+            try:
+                sock.recv(1) # Returns (empty) at end of stream; a subscriber sending anything is dropped as well
+            except OSError:
+                pass
+            events.put(closed)
+
+        self.db_manager.subscribe(events.put)
+        try:
+            sock.sendall(encode([0, None])) # Every change made from now on will be pushed
+            threading.Thread(target=watch, name="store-events-watch", daemon=True).start()
+            while True:
+                event = events.get()
+                if event is closed:
+                    return
+                sock.sendall(encode(list(event)))
+        except OSError: # Client went away
+            pass
+        finally:
+            self.db_manager.unsubscribe(events.put)
+            with suppress(OSError):
+                sock.shutdown(socket.SHUT_RDWR) # Wakes the watcher if the stream ended first
+
+
+def _without_hash(user):
+    """A user record as sent to clients: every field but 'password_hash'."""
+    return {field: value for field, value in user.items() if field != 'password_hash'} if user else user
+
+
+class StoreClient:
+    """
+    Proxy for a store served by StoreServer, with the same methods as InMemoryDBManager.
+    Calls borrow a connection from a pool (opened on demand, at most pool_size at once), so several threads
+    can call the store concurrently. A transaction() keeps one connection for the calls its thread makes until it ends.
+    Change events arrive on a separate connection and are delivered to subscribers on a background thread,
+    as the store's own writer threads would.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, pool_size=8, timeout=30, token=None):
+        """
+        :param address: "host:port" or "unix:/path/to/socket".
+        :param pool_size: Maximum number of simultaneous calls (open request connections).
+        :param timeout: Seconds to wait for a reply before giving up on a call.
+        :param token: The server's shared secret; by default load_token().
+        """
+        self.address = address # Stores the server address
+        self.timeout = timeout # Stores the call timeout
+        self._token = token or load_token() # Presented on every new connection
+        self._family, self._connect_address = parse_address(address)
+        self._idle = queue.LifoQueue() # Idle connections; the most recently used is reused first
+        self._slots = threading.BoundedSemaphore(pool_size) # Limits the connections in use
+        self._subscribers = [] # Callbacks notified of every change
+        self._event_socket = None # Connection the server pushes change events on
+        self._subscribe_lock = threading.Lock() # Opens the event connection only once
+        self._local = threading.local() # .sock: connection holding the calling thread's open transaction
+
+    def _connect(self):
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self._connect_address)
+        if self._family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) # Requests are small; do not wait to batch them
+        try:
+            sock.sendall(encode([AUTH, [self._token]]))
+            reply = recv_message(sock)
+            if reply is None:
+                raise ConnectionError("Store server closed the connection")
+            _result(reply)
+        except BaseException: # Rejected, or the handshake failed
+            sock.close()
+            raise
+        return sock
+
+    def _borrow(self):
+        """Takes an idle connection, or opens one; call with a pool slot held."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _exchange(self, sock, method, args, kwargs=None):
+        """Sends one request and returns the raw reply. A connection that fails is closed, never reused."""
+        try:
+            sock.sendall(encode([method, args, kwargs] if kwargs else [method, args]))
+            reply = recv_message(sock)
+            if reply is None:
+                raise ConnectionError("Store server closed the connection")
+        except BaseException: # The connection is in an unknown state
+            sock.close()
+            raise
+        return reply
+
+    def _call(self, method, args, kwargs):
+        """Sends one request on a pooled connection and returns the result, raising the server's error if any."""
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None: # Inside transaction(): the connection holding it runs every call of this thread
+            return _result(self._exchange(sock, method, args, kwargs))
+        with self._slots:
+            sock = self._borrow()
+            reply = self._exchange(sock, method, args, kwargs)
+            self._idle.put(sock)
+        return _result(reply)
+
+    # --- Transactions ---
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups several writes into one atomic batch on the server, like InMemoryDBManager.transaction().
+        The calls this thread makes inside the block share one connection, on which the server holds every table's
+        write lock until the block ends; keep it short. If the block raises, the server rolls every write back and
+        the exception propagates. A lost connection rolls back too. Nested blocks join the outermost transaction.
+        """
+        if self.in_transaction():
+            yield self
+            return
+        with self._slots:
+            sock = self._borrow()
+            reply = self._exchange(sock, BEGIN, [])
+            if reply[0] != 0:
+                self._idle.put(sock)
+                _result(reply) # Raises the server's error
+            self._local.sock = sock
+            try:
+                yield self
+            except BaseException:
+                self._local.sock = None
+                with suppress(OSError): # The connection is gone, and the server rolls back on its own
+                    self._exchange(sock, ROLLBACK, [])
+                    self._idle.put(sock)
+                raise
+            self._local.sock = None
+            reply = self._exchange(sock, COMMIT, [])
+            self._idle.put(sock)
+        _result(reply)
+
+    def in_transaction(self):
+        """Returns True if the calling thread is inside a transaction() block."""
+        return getattr(self._local, 'sock', None) is not None
+
+    def verify_password(self, username, password, cost):
+        """
+        Checks a user's password on the server (user records arrive without their hashes).
+        :param cost: The caller's current hash cost (PasswordHasher.cost()).
+        :return: (password matches, stored hash should be upgraded)
+        """
+        return tuple(self._call('verify_password', (username, password, cost), None))
+
+    def connect(self):
+        """Kept for compatibility with the other storage engines; connections are opened on demand."""
+        pass
+
+    def create_tables(self):
+        """Kept for compatibility with the other storage engines; the server's store already exists."""
+        pass
+
+    def close(self):
+        """Closes every idle connection and the event stream."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        if self._event_socket is not None:
+            with suppress(OSError):
+                self._event_socket.shutdown(socket.SHUT_RDWR) # Tells the server now; close() alone waits for the event thread
+            self._event_socket.close()
+            self._event_socket = None
+
+    # --- Change Events ---
+
+    def subscribe(self, callback):
+        """Registers callback(event) to be called after every change made by any client."""
+        self._subscribers.append(callback)
+        with self._subscribe_lock:
+            if self._event_socket is None:
+                self._event_socket = self._connect()
+                self._event_socket.settimeout(None) # Events may be far apart
+                self._event_socket.sendall(encode([SUBSCRIBE, []]))
+                recv_message(self._event_socket) # Acknowledgement: changes made after subscribe() returns are delivered
+                threading.Thread(target=self._receive_events, args=(self._event_socket,), name="store-events", daemon=True).start()
+
+    def unsubscribe(self, callback):
+        """Removes a callback registered with subscribe()."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _receive_events(self, sock):
+        """Event thread: delivers pushed events one at a time, in the order the server published them."""
+        try:
+            while True:
+                message = recv_message(sock)
+                if message is None:
+                    break
+                event = ChangeEvent(*message)
+                for callback in list(self._subscribers):
+                    try:
+                        callback(event)
+                    except Exception as e: # One failing subscriber must not stop the others
+                        logger.exception("Change event subscriber raised an error: %s", e)
+        except OSError: # Closed by close(), or the server went away
+            pass
+        logger.info("Store client: Change event stream closed.") # Logs the end of the stream
+
+def _result(reply):
+    """Returns the result of a reply, or raises the server's error."""
+    if reply[0] == 0:
+        return reply[1]
+    error = _REMOTE_EXCEPTIONS.get(reply[1])
+    raise error(reply[2]) if error else StoreError(f"{reply[1]}: {reply[2]}")
+
+def _remote_method(method):
+    def call(self, *args, **kwargs):
+        return self._call(method, args, kwargs)
+    call.__name__ = method
+    call.__doc__ = getattr(InMemoryDBManager, method).__doc__ # Same documentation as the local store
+    return call
+
+for _method in READ_METHODS + WRITE_METHODS:
+    setattr(StoreClient, _method, _remote_method(_method))
+
+
+def main(argv):
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s') # Per-call INFO lines would flood the server log
+    address, data_dir = DEFAULT_ADDRESS, None
+    args = list(argv)
+    if "--data-dir" in args:
+        position = args.index("--data-dir")
+        data_dir = args[position + 1]
+        del args[position:position + 2]
+    if args:
+        address = args[0]
+    if data_dir:
+        db_manager = DurableInMemoryDBManager(data_dir)
+    else:
+        db_manager = InMemoryDBManager()
+    server = StoreServer(db_manager, address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        db_manager.close()
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,147 @@
+import logging # Imports the logging module for application logging
+from concurrent.futures import ThreadPoolExecutor # Imports the thread pool that runs backend calls
+
+logger = logging.getLogger(__name__) # Initializes a logger for this module
+
+
+class TaskHandle:
+    """
+    One caller's interest in a background task. Cancelling a handle only drops that caller's callbacks;
+    the underlying call is cancelled as well once no handle is interested in it any more.
+    """
+
+    def __init__(self, job, on_success, on_error, channel):
+        self._job = job # Shared in-flight call (several handles when duplicate calls are coalesced)
+        self.on_success = on_success # Callable(result), run on the Tk thread
+        self.on_error = on_error # Callable(exception), run on the Tk thread
+        self.channel = channel # Latest-wins channel this handle belongs to, or None
+        self.cancelled = False # True once cancel() was called or a newer task replaced it on its channel
+
+    def cancel(self):
+        """Drops this handle's callbacks; cancels the call itself if nobody else is waiting for it."""
+        if not self.cancelled:
+            self.cancelled = True
+            if all(handle.cancelled for handle in self._job.handles):
+                self._job.future.cancel() # Only succeeds if the call has not started yet; otherwise the result is discarded
+
+    def done(self):
+        return self._job.future.done()
+
+
+class _Job:
+    """A call in flight: its future, the handles waiting for it and its coalescing key."""
+
+    def __init__(self, future, key):
+        self.future = future
+        self.key = key
+        self.handles = []
+
+
+class TaskRunner:
+    """
+    Runs backend calls on worker threads and delivers their results on the Tk thread.
+    Tk widgets may only be touched from the Tk thread, so workers never call back directly:
+    the Tk thread polls the in-flight futures with after() and runs the callbacks itself.
+
+    - key: calls submitted with the same key while one is still in flight share that call (coalescing).
+    - channel: submitting on a channel cancels the previous task of that channel (latest wins),
+      e.g. a tab's data load that was overtaken by a newer one.
+    """
+
+    def __init__(self, tk_widget, workers=4, poll_ms=30):
+        """
+        :param tk_widget: Any widget of the application; used to schedule work on the Tk thread.
+        :param workers: Number of worker threads.
+        :param poll_ms: Interval at which the Tk thread collects finished tasks.
+        """
+        self.tk_widget = tk_widget # Widget used for after() scheduling
+        self.poll_ms = poll_ms # Polling interval while tasks are in flight
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backend")
+        self._jobs = [] # In-flight jobs, in submission order
+        self._jobs_by_key = {} # key -> in-flight job, for coalescing
+        self._channels = {} # channel -> latest TaskHandle
+        self._poll_scheduled = False # True while a _poll is pending on the Tk thread
+
+    def submit(self, function, *args, on_success=None, on_error=None, key=None, channel=None, **kwargs):
+        """
+        Runs function(*args, **kwargs) on a worker thread.
+        :param on_success: Callable(result), run on the Tk thread when the call returns.
+        :param on_error: Callable(exception), run on the Tk thread if the call raises (default: log it).
+        :param key: Hashable identifying the call; a call with the same key already in flight is reused.
+        :param channel: Latest-wins channel; the previous task on it is cancelled.
+        :return: A TaskHandle, which can be cancelled.
+        """
+        job = self._jobs_by_key.get(key) if key is not None else None
+        if job is None or job.future.cancelled():
+            job = self._start(self._executor.submit(function, *args, **kwargs), key)
+        return self._attach(job, on_success, on_error, channel)
+
+    def track(self, future, on_success=None, on_error=None, channel=None):
+        """
+        Delivers the result of a future started elsewhere (e.g. UserManager's password hashing pool)
+        on the Tk thread, with the same callbacks and channel semantics as submit().
+        """
+        return self._attach(self._start(future, None), on_success, on_error, channel)
+
+    def cancel_channel(self, channel):
+        """Cancels the latest task submitted on a channel, if any."""
+        handle = self._channels.pop(channel, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _start(self, future, key):
+        job = _Job(future, key)
+        self._jobs.append(job)
+        if key is not None:
+            self._jobs_by_key[key] = job
+        return job
+
+    def _attach(self, job, on_success, on_error, channel):
+        handle = TaskHandle(job, on_success, on_error, channel)
+        job.handles.append(handle) # Attach before cancelling the channel's previous task, which may be the same job
+        if channel is not None:
+            previous = self._channels.get(channel)
+            if previous is not None and previous is not handle:
+                previous.cancel() # A newer request makes the previous one stale
+            self._channels[channel] = handle
+        self._schedule_poll()
+        return handle
+
+    def _schedule_poll(self):
+        if not self._poll_scheduled:
+            self._poll_scheduled = True
+            self.tk_widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Tk thread: runs the callbacks of every finished task."""
+        self._poll_scheduled = False
+        finished = [job for job in self._jobs if job.future.done()]
+        if finished:
+            self._jobs = [job for job in self._jobs if not job.future.done()]
+        for job in finished:
+            if job.key is not None and self._jobs_by_key.get(job.key) is job:
+                del self._jobs_by_key[job.key]
+            if job.future.cancelled():
+                continue
+            error = job.future.exception()
+            for handle in job.handles:
+                if handle.cancelled:
+                    continue # Stale: a newer task replaced it, or its caller gave up
+                if handle.channel is not None and self._channels.get(handle.channel) is handle:
+                    del self._channels[handle.channel]
+                try:
+                    if error is None:
+                        if handle.on_success:
+                            handle.on_success(job.future.result())
+                    elif handle.on_error:
+                        handle.on_error(error)
+                    else:
+                        logger.error("Background task failed: %r", error) # Logs errors nobody handles
+                except Exception as e: # A failing callback must not stop the other callbacks
+                    logger.exception("Task callback raised an error: %s", e)
+        if self._jobs: # Keep polling while tasks are still in flight
+            self._schedule_poll()
+
+    def shutdown(self):
+        """Stops the worker threads; queued tasks are abandoned."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
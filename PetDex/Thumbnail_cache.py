@@ -0,0 +1,203 @@
+import logging # Imports the logging module for application logging
+import os # Imports os for file metadata and the on-disk thumbnail store
+import hashlib # Imports hashlib to derive stable file names for stored thumbnails
+import queue # Imports queue to hand decoded images from worker threads back to the Tk thread
+import tempfile # Imports tempfile to write stored thumbnails atomically
+import threading # Imports threading so only one worker trims the on-disk store at a time
+import time # Imports time to recognise temporary files left by an interrupted write
+from contextlib import suppress # Imports suppress for removals that another process may have done first
+from collections import OrderedDict # Imports OrderedDict to implement the LRU cache
+from concurrent.futures import ThreadPoolExecutor # Imports the thread pool used for decoding
+from PIL import Image, ImageTk # Imports Image and ImageTk for decoding photos and building Tk images
+
+logger = logging.getLogger(__name__) # Initializes a logger for this module
+
+DEFAULT_DISK_DIR = os.path.join(os.path.expanduser("~"), ".petdex", "thumbnails") # Default on-disk thumbnail store
+DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024 # Default size limit of the on-disk store (a few thousand thumbnails)
+TRIM_EVERY = 64 # Thumbnails stored between two checks of the on-disk store's size
+STALE_TMP_SECONDS = 600 # Age from which a temporary file in the store is left over from an interrupted write
+
+
+class ThumbnailCache:
+    """
+    Asynchronous pet photo thumbnails for the Tk GUI.
+    Decoding and resizing run on a thread pool; finished thumbnails are also written to an on-disk store
+    so later runs skip decoding the full-size photo. Stored thumbnails are written atomically, the least recently used
+    ones are deleted when the store outgrows max_disk_bytes, and an unreadable one is deleted and decoded again from the
+    photo; a store that cannot be written just goes unused. Tk images can only be created on the Tk thread, so
+    workers put decoded PIL images on a queue that the Tk thread drains with after().
+    Ready PhotoImages are kept in an LRU cache keyed by (path, mtime, size), so an edited photo is reloaded.
+    """
+
+    def __init__(self, tk_widget, size=(70, 70), max_items=512, disk_dir=DEFAULT_DISK_DIR, workers=4, poll_ms=30,
+                 max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        """
+        :param tk_widget: Any widget of the application; used to schedule work on the Tk thread.
+        :param size: Bounding box of the thumbnails.
+        :param max_items: Number of PhotoImages kept in memory.
+        :param disk_dir: Directory of the on-disk thumbnail store, or None to disable it.
+        :param workers: Number of decoding threads.
+        :param poll_ms: Interval at which the Tk thread collects finished thumbnails.
+        :param max_disk_bytes: Size limit of the on-disk store; the least recently used thumbnails are deleted beyond it.
+        """
+        self.tk_widget = tk_widget # Widget used for after() scheduling
+        self.size = size # Thumbnail bounding box
+        self.max_items = max_items # LRU capacity
+        self.disk_dir = disk_dir # On-disk store location
+        self.poll_ms = poll_ms # Polling interval while decodes are in flight
+        self.max_disk_bytes = max_disk_bytes # On-disk store size limit
+        self._cache = OrderedDict() # key -> PhotoImage (or None for unreadable files), most recently used last
+        self._waiting = {} # key -> callbacks waiting for an in-flight decode
+        self._results = queue.Queue() # (key, PIL image or None) produced by the workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+        self._poll_scheduled = False # True while a _poll is pending on the Tk thread
+        self._trim_lock = threading.Lock() # Held by the worker trimming the on-disk store
+        self._stored_since_trim = 0 # Thumbnails stored since the last trim (approximate: workers update it unlocked)
+        if disk_dir:
+            try:
+                os.makedirs(disk_dir, exist_ok=True) # Create the store on first use
+            except OSError as e:
+                logger.warning("Thumbnail store %s is unavailable, thumbnails will not be stored: %s", disk_dir, e)
+                self.disk_dir = None
+            else:
+                self._executor.submit(self._trim_disk) # Enforce the size limit left by earlier runs, off the Tk thread
+
+    def request(self, image_path, callback):
+        """
+        Asks for the thumbnail of image_path. callback(photo) is called on the Tk thread with a PhotoImage,
+        or with None if the file is missing or unreadable. Cached thumbnails are delivered immediately;
+        otherwise the caller should show a placeholder until the callback fires.
+        """
+        try:
+            stat = os.stat(image_path) # mtime and size make the key change when the photo changes
+        except (OSError, TypeError):
+            callback(None) # Missing file: no thumbnail
+            return
+        key = (os.path.abspath(image_path), stat.st_mtime_ns, self.size)
+        if key in self._cache:
+            self._cache.move_to_end(key) # Mark as most recently used
+            callback(self._cache[key])
+            return
+        if key in self._waiting: # Already being decoded: just wait for the same result
+            self._waiting[key].append(callback)
+            return
+        self._waiting[key] = [callback]
+        self._executor.submit(self._decode, key)
+        self._schedule_poll()
+
+    def _disk_path(self, key):
+        """Path of the stored thumbnail for key in the on-disk store."""
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.png")
+
+    def _decode(self, key):
+        """Worker thread: loads the thumbnail from the disk store, or decodes and resizes the original photo."""
+        image_path = key[0]
+        disk_path = self._disk_path(key) if self.disk_dir else None
+        image = self._load_stored(disk_path) if disk_path else None
+        if image is None: # Not stored yet, or the stored copy was unreadable
+            try:
+                image = Image.open(image_path)
+                image.draft("RGB", self.size) # Lets JPEG decode at reduced scale, much cheaper than full size
+                image.thumbnail(self.size) # Resize while keeping the aspect ratio
+                if image.mode not in ("RGB", "RGBA", "L", "P"):
+                    image = image.convert("RGB") # e.g. CMYK JPEGs, which PNG cannot store
+            except Exception as e:
+                logger.error("Error loading image %s: %s", image_path, e) # Logs error if image fails to load
+                image = None
+            else:
+                if disk_path:
+                    self._store(image, disk_path) # Persist for later runs; a failure here keeps the thumbnail
+        self._results.put((key, image))
+
+    def _load_stored(self, disk_path):
+        """Worker thread: returns the stored thumbnail at disk_path, or None if there is none or it is unreadable."""
+        try:
+            image = Image.open(disk_path)
+            image.load() # Decode now, on the worker thread
+        except FileNotFoundError:
+            return None
+        except Exception as e: # Truncated or corrupt: delete it, so the photo is decoded and stored again
+            logger.warning("Discarding unreadable stored thumbnail %s: %s", disk_path, e)
+            with suppress(OSError):
+                os.remove(disk_path)
+            return None
+        with suppress(OSError):
+            os.utime(disk_path) # Mark as recently used, so trimming deletes it last
+        return image
+
+    def _store(self, image, disk_path):
+        """Worker thread: writes a thumbnail to the disk store atomically, through a temporary file in the same directory."""
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.disk_dir)
+            with os.fdopen(fd, "wb") as tmp_file:
+                image.save(tmp_file, "PNG")
+            os.replace(tmp_path, disk_path) # Readers see the old file or the complete new one, never part of it
+        except Exception as e: # e.g. read-only directory or full disk
+            logger.warning("Could not store thumbnail %s: %s", disk_path, e)
+            if tmp_path:
+                with suppress(OSError):
+                    os.remove(tmp_path)
+            return
+        self._stored_since_trim += 1
+        if self._stored_since_trim >= TRIM_EVERY:
+            self._trim_disk()
+
+    def _trim_disk(self):
+        """
+        Worker thread: deletes the least recently used stored thumbnails while the store is larger than max_disk_bytes,
+        and temporary files left behind by interrupted writes.
+        """
+        if not self._trim_lock.acquire(blocking=False): # Another worker is already trimming
+            return
+        try:
+            self._stored_since_trim = 0
+            now = time.time()
+            thumbnails = [] # (mtime, size, path) of the stored thumbnails
+            with os.scandir(self.disk_dir) as entries:
+                for entry in entries:
+                    with suppress(OSError): # The file may be gone already
+                        stat = entry.stat()
+                        if entry.name.endswith(".tmp"):
+                            if now - stat.st_mtime > STALE_TMP_SECONDS:
+                                os.remove(entry.path)
+                        elif entry.name.endswith(".png"):
+                            thumbnails.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in thumbnails)
+            for _, size, path in sorted(thumbnails): # Oldest use first
+                if total <= self.max_disk_bytes:
+                    break
+                with suppress(OSError):
+                    os.remove(path)
+                total -= size
+        except OSError as e:
+            logger.warning("Could not trim thumbnail store %s: %s", self.disk_dir, e)
+        finally:
+            self._trim_lock.release()
+
+    def _schedule_poll(self):
+        if not self._poll_scheduled:
+            self._poll_scheduled = True
+            self.tk_widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Tk thread: turns decoded images into PhotoImages, caches them and runs the waiting callbacks."""
+        self._poll_scheduled = False
+        while True:
+            try:
+                key, image = self._results.get_nowait()
+            except queue.Empty:
+                break
+            photo = ImageTk.PhotoImage(image) if image is not None else None
+            self._cache[key] = photo
+            if len(self._cache) > self.max_items:
+                self._cache.popitem(last=False) # Evict the least recently used thumbnail
+            for callback in self._waiting.pop(key, []):
+                callback(photo)
+        if self._waiting: # Keep polling while decodes are still in flight
+            self._schedule_poll()
+
+    def shutdown(self):
+        """Stops the worker threads; pending decodes are abandoned."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,35 +1,75 @@
 import logging # Import the logging module for recording application events
 import uuid # Import uuid for generating universally unique IDs
 from datetime import date # Import date for capturing the current date
+from concurrent.futures import ThreadPoolExecutor # Import the thread pool that runs the slow password KDF off the GUI thread
+
+from Password_hasher import PasswordHasher # Import the salted, tunable-cost password hashing
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s') # Configure basic logging
 logger = logging.getLogger(__name__) # Get a logger instance for this module
 
 class UserManager:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, password_hasher=None, kdf_workers=2):
+        """
+        :param password_hasher: PasswordHasher defining the KDF and cost for new hashes (default: scrypt, n=2**14).
+        :param kdf_workers: Size of the thread pool used by register_user_async/login_user_async.
+        """
         self.db_manager = db_manager # Store the database manager instance (InMemoryDBManager in this case)
-        self.users_status_message = "" # Initialize a message string for UI feedback
+        self.users_status_message = "" # Message of the last synchronous register_user/login_user call, for UI feedback
+        self.password_hasher = password_hasher or PasswordHasher() # KDF used to hash and verify passwords
+        # A bounded pool keeps the deliberately slow KDF off the caller's thread; work beyond kdf_workers waits in its queue
+        self.kdf_executor = ThreadPoolExecutor(max_workers=kdf_workers, thread_name_prefix="password-kdf")
 
     def hash_password(self, password):
-        # This is a Just a String Manipulation function to simulate password verification.
-        # For a real application, you should replace this with a robust hashing library.
-        return f"hashed_{password}_securely" # Returns a simple "hashed" string for demonstration
+        """Hashes a password with a random salt; deliberately slow (see PasswordHasher)."""
+        return self.password_hasher.hash(password)
 
     def verify_password(self, password, hashed_password):
-        # This is a Just a String Manipulation function to simulate password verification.
-        # For a real application, you should replace this with a robust verification method.
-        return hashed_password == f"hashed_{password}_securely" # Compares the provided password with the stored hash
+        """Checks a password against a stored hash in constant time; deliberately slow (see PasswordHasher)."""
+        return self.password_hasher.verify(password, hashed_password)
+
+    def register_user_async(self, username, password, contact_info=None, callback=None):
+        """
+        Runs the registration on the KDF thread pool so the caller (e.g. the Tk event loop) is not blocked.
+        The status message travels in the result, so concurrent operations never see each other's message.
+        :param callback: Optional callable((user_id or None, message)), called on a pool thread when registration finishes.
+        :return: A concurrent.futures.Future resolving to (user_id or None on failure, status message for the UI).
+        """
+        return self._submit(callback, self._register, username, password, contact_info)
+
+    def login_user_async(self, username, password, callback=None):
+        """
+        Runs the login on the KDF thread pool so the caller (e.g. the Tk event loop) is not blocked.
+        The status message travels in the result, so concurrent operations never see each other's message.
+        :param callback: Optional callable((user_id or None, message)), called on a pool thread when the login finishes.
+        :return: A concurrent.futures.Future resolving to (user_id or None on failure, status message for the UI).
+        """
+        return self._submit(callback, self._login, username, password)
+
+    def _submit(self, callback, function, *args):
+        future = self.kdf_executor.submit(function, *args)
+        if callback is not None:
+            future.add_done_callback(lambda done: callback(done.result()))
+        return future
+
+    def shutdown(self):
+        """Stops the KDF thread pool once queued work has finished."""
+        self.kdf_executor.shutdown(wait=True)
 
     def register_user(self, username, password, contact_info=None):
         """
         Registers a new user.
-        Returns user_id if successful, None if username already exists.
+        Returns user_id if successful, None if username already exists; the reason is left in users_status_message.
         """
+        user_id, self.users_status_message = self._register(username, password, contact_info)
+        return user_id
+
+    def _register(self, username, password, contact_info=None):
+        """Registers a new user. Returns (user_id or None, status message for the UI)."""
         # Check if username already exists by querying the database manager
         if self.db_manager.get_user_by_username(username):
-            self.users_status_message = f"Username '{username}' already exists. Please choose a different one." # Set status message for UI
-            logger.warning(f"Registration failed: Username '{username}' already exists.") # Log the failure
-            return None # Return None as registration failed
+            logger.warning("Registration failed: Username '%s' already exists.", username) # Log the failure
+            return None, f"Username '{username}' already exists. Please choose a different one." # Registration failed
 
         user_id = f"USR-{uuid.uuid4().hex[:8].upper()}" # Generate a unique user ID using UUID
         hashed_password = self.hash_password(password) # Hash the user's password
@@ -37,42 +77,49 @@ class UserManager:
 
         # Attempt to add the new user to the database via the db_manager
         if self.db_manager.add_user(user_id, username, hashed_password, contact_info or {}, registration_date):
-            self.users_status_message = "Registration successful!" # Set success message for UI
-            logger.info(f"User '{username}' registered successfully with ID: {user_id}") # Log success
-            return user_id # Return the newly registered user's ID
+            logger.info("User '%s' registered successfully with ID: %s", username, user_id) # Log success
+            return user_id, "Registration successful!" # Return the newly registered user's ID
         else:
-            self.users_status_message = "Registration failed due to a database error." # Set error message for UI
-            logger.error(f"Failed to add user '{username}' to the database.") # Log the database error
-            return None # Return None if database addition failed
+            logger.error("Failed to add user '%s' to the database.", username) # Log the database error
+            return None, "Registration failed due to a database error." # Database addition failed
 
     def login_user(self, username, password):
         """
         Logs in a user.
-        Returns user_id if successful, None otherwise.
+        Returns user_id if successful, None otherwise; the reason is left in users_status_message.
         """
+        user_id, self.users_status_message = self._login(username, password)
+        return user_id
+
+    def _login(self, username, password):
+        """Logs in a user. Returns (user_id or None, status message for the UI)."""
         # Retrieve user data from the database manager using the provided username
         user_data = self.db_manager.get_user_by_username(username)
         if user_data: # If user data was found (username exists)
-            # Verify the provided password against the stored hashed password
-            if self.verify_password(password, user_data['password_hash']):
-                self.users_status_message = "Login successful!" # Set success message for UI
-                logger.info(f"User '{username}' logged in successfully.") # Log successful login
-                return user_data['user_id'] # Return the user's ID
+            if 'password_hash' in user_data: # Verify the provided password against the stored hashed password
+                verified = self.verify_password(password, user_data['password_hash'])
+                stale = verified and self.password_hasher.needs_rehash(user_data['password_hash'])
+            else: # Remote store: hashes never leave the server, which checks the password itself
+                verified, stale = self.db_manager.verify_password(username, password, self.password_hasher.cost())
+            if verified:
+                if stale: # Stored with an older scheme or lower cost
+                    self.db_manager.update_user(user_data['user_id'], {'password_hash': self.hash_password(password)}) # Upgrade it now that the password is known
+                    logger.info("Password hash of '%s' upgraded to the current cost.", username) # Log the upgrade
+                logger.info("User '%s' logged in successfully.", username) # Log successful login
+                return user_data['user_id'], "Login successful!" # Return the user's ID
             else: # If password verification fails
-                self.users_status_message = "Incorrect password." # Set error message for UI
-                logger.warning(f"Login failed for '{username}': Incorrect password.") # Log incorrect password attempt
-                return None # Return None as login failed
-        self.users_status_message = f"Username '{username}' not found." # Set error message for UI if username not found
-        logger.warning(f"Login failed: Username '{username}' not found.") # Log username not found attempt
-        return None # Return None as login failed
+                logger.warning("Login failed for '%s': Incorrect password.", username) # Log incorrect password attempt
+                return None, "Incorrect password." # Login failed
+        logger.warning("Login failed: Username '%s' not found.", username) # Log username not found attempt
+        return None, f"Username '{username}' not found." # Login failed
 
     def get_user(self, user_id):
         """Retrieves user details by user ID from the database."""
         user_details = self.db_manager.get_user_by_id(user_id) # Delegate to the database manager to get user by ID
         if user_details: # If user details are found
-            logger.info(f"Retrieved user with ID {user_id}: {user_details.get('username', 'Unknown')}") # Log success
+            logger.debug("Retrieved user with ID %s: %s", user_id, user_details.get('username', 'Unknown')) # Log success
         else: # If user details are not found
-            logger.info(f"User with ID {user_id} not found.") # Log user not found
+            logger.info("User with ID %s not found.", user_id) # Log user not found
         return user_details # Return user details or None
 
     def get_user_by_username(self, username):
@@ -81,21 +128,27 @@ class UserManager:
         return self.db_manager.get_user_by_username(username)
 
     def update_user(self, user_id, new_details):
-        """Updates details of an existing user in the database."""
+        """
+        Updates details of an existing user in the database.
+        A plain 'password' entry is hashed and stored as 'password_hash'.
+        """
+        if 'password' in new_details: # Never store the plain password
+            new_details = dict(new_details)
+            new_details['password_hash'] = self.hash_password(new_details.pop('password'))
         # Delegate to the database manager to update user details
         if self.db_manager.update_user(user_id, new_details):
-            logger.info(f"Updated user with ID {user_id} in DB.") # Log successful update
+            logger.info("Updated user with ID %s in DB.", user_id) # Log successful update
             return True # Indicate successful update
-        logger.warning(f"User with ID {user_id} not found for update in DB.") # Log user not found for update
+        logger.warning("User with ID %s not found for update in DB.", user_id) # Log user not found for update
         return False # Return False if update failed
 
     def delete_user(self, user_id):
         """Deletes a user from the database."""
         # Delegate to the database manager to delete the user
         if self.db_manager.delete_user(user_id):
-            logger.info(f"Deleted user with ID {user_id} from DB.") # Log successful deletion
+            logger.info("Deleted user with ID %s from DB.", user_id) # Log successful deletion
             return True # Indicate successful deletion
-        logger.warning(f"User with ID {user_id} not found for deletion in DB.") # Log user not found for deletion
+        logger.warning("User with ID %s not found for deletion in DB.", user_id) # Log user not found for deletion
         return False # Return False if deletion failed
     
     def get_total_users(self):
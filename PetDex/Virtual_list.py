@@ -0,0 +1,278 @@
+import customtkinter # Imports the CustomTkinter library for modern GUI elements
+import logging # Imports the logging module for application logging
+
+logger = logging.getLogger(__name__) # Initializes a logger for this module
+
+_LOADING = object() # Stands for a record whose page has been requested but has not arrived yet
+
+
+class ListDataSource:
+    """
+    Data source over records that are already in memory (e.g. the pets of one owner).
+    With a key function, single records can be patched with upsert()/remove() instead of rebuilding the source.
+    """
+    in_memory = True # Pages are sliced on the Tk thread; there is nothing to wait for
+
+    def __init__(self, records, key=None):
+        self.key = key # Callable record -> unique id, required for upsert/remove
+        self.records = list(records) # Records in display order
+        self._positions = None # id -> position in self.records, built on first patch
+
+    def count(self):
+        return len(self.records) # Total number of rows
+
+    def fetch(self, offset, limit):
+        return self.records[offset:offset + limit] # One page of records
+
+    def _position_map(self):
+        if self._positions is None:
+            self._positions = {self.key(record): i for i, record in enumerate(self.records)}
+        return self._positions
+
+    def upsert(self, record):
+        """Replaces the record with the same key in place, or appends it if it is new."""
+        positions = self._position_map()
+        record_id = self.key(record)
+        if record_id in positions:
+            self.records[positions[record_id]] = record
+        else:
+            positions[record_id] = len(self.records)
+            self.records.append(record)
+
+    def remove(self, record_id):
+        """Removes the record with the given key, if present."""
+        positions = self._position_map()
+        position = positions.pop(record_id, None)
+        if position is not None:
+            del self.records[position]
+            if position < len(self.records): # Later records shifted down by one
+                self._positions = None
+
+
+class PagedDataSource:
+    """
+    Data source that asks the backend for one page at a time (e.g. PetDataManager.get_strays_page).
+    If the row count was already loaded off the Tk thread, pass it as total (and update it before refreshing the list):
+    count() then returns it without a backend call.
+    """
+    in_memory = False # Pages are backend calls, run through the list's task runner when it has one
+
+    def __init__(self, count_func, page_func, total=None):
+        self.count_func = count_func # Callable returning the total number of rows
+        self.page_func = page_func # Callable (limit, offset) -> list of records
+        self.total = total # Known row count, or None to ask count_func
+
+    def count(self):
+        return self.count_func() if self.total is None else self.total
+
+    def fetch(self, offset, limit):
+        return self.page_func(limit, offset)
+
+
+class VirtualListFrame(customtkinter.CTkFrame):
+    """
+    Scrollable list that only builds widgets for the rows in view.
+    A fixed pool of row frames (visible rows plus a small buffer) is created once and recycled:
+    scrolling repositions the pool and re-binds each row frame to the record now under it,
+    so rendering cost depends on the viewport height, not on the number of records.
+    Records are fetched from the data source page by page and cached until the next set_data_source() or refresh().
+    With a task runner, pages of a backend data source (not in_memory) are fetched on a worker thread: rows of a page
+    still in flight show a placeholder (or the page's previous records, after a refresh) and are re-bound when it
+    arrives. Each page is requested once at a time. The row count is still read with count() on the Tk thread,
+    so give such sources a count loaded in the background (PagedDataSource total).
+    """
+
+    def __init__(self, master, row_height, create_row, bind_row, empty_text="Nothing to display.",
+                 buffer_rows=2, page_size=100, height=200, task_runner=None, bind_placeholder=None, **kwargs):
+        """
+        :param row_height: Height in pixels of every row.
+        :param create_row: Callable(parent) -> row widget; called only while the pool grows.
+        :param bind_row: Callable(row widget, record) that fills a row widget with a record.
+        :param empty_text: Message shown when the data source has no records.
+        :param buffer_rows: Extra rows kept above and below the viewport for smooth scrolling.
+        :param page_size: Number of records requested from the data source at once.
+        :param task_runner: TaskRunner used to fetch backend pages off the Tk thread (None: fetch them directly).
+        :param bind_placeholder: Callable(row widget) showing a row whose record is still loading (None: leave it out).
+        """
+        super().__init__(master, height=height, **kwargs) # Calls the constructor of the parent class (customtkinter.CTkFrame)
+        self.row_height = row_height # Fixed pixel height of each row
+        self.create_row = create_row # Row widget factory
+        self.bind_row = bind_row # Fills a row widget with a record
+        self.buffer_rows = buffer_rows # Rows rendered beyond each edge of the viewport
+        self.page_size = page_size # Records fetched per data source call
+        self.task_runner = task_runner # Runs backend page fetches, if given
+        self.bind_placeholder = bind_placeholder # Fills a row widget whose record is loading
+
+        self.data_source = ListDataSource([]) # Current data source
+        self.total_rows = 0 # Cached row count of the data source
+        self.pages = {} # Page cache: page number -> list of records
+        self.stale_pages = {} # Pages from before the last refresh(), shown until their replacements arrive
+        self.loading = set() # Page numbers requested from the task runner and not yet arrived
+        self.generation = 0 # Bumped by refresh(); pages requested before it are dropped when they arrive
+        self.offset_px = 0 # Scroll position in pixels from the top of the list
+        self.row_pool = [] # Recycled row widgets
+        self.bound_indexes = [] # Record index currently bound to each pooled row (None if hidden, ~index for a placeholder)
+
+        self.grid_columnconfigure(0, weight=1) # Body column expands
+        self.grid_rowconfigure(0, weight=1) # Body row expands
+
+        self.body = customtkinter.CTkFrame(self, fg_color="transparent", height=height) # Viewport; rows are placed inside it
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self._yview) # Scrollbar drives _yview
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.empty_label = customtkinter.CTkLabel(self.body, text=empty_text) # Shown when there are no records
+
+        self.body.bind("<Configure>", lambda event: self._render()) # Re-render when the viewport is resized
+        self.bind_all("<MouseWheel>", self._on_mouse_wheel, add="+") # Windows / macOS wheel
+        self.bind_all("<Button-4>", self._on_mouse_wheel, add="+") # X11 wheel up
+        self.bind_all("<Button-5>", self._on_mouse_wheel, add="+") # X11 wheel down
+
+    def set_data_source(self, data_source, keep_position=False):
+        """Replaces the records shown by the list and redraws the visible rows."""
+        self.data_source = data_source
+        self.refresh(keep_position)
+
+    def refresh(self, keep_position=True):
+        """Drops cached pages, re-reads the row count and redraws the visible rows."""
+        self.stale_pages = self.pages if keep_position else {} # Same records in view: show them until reloaded
+        self.pages = {}
+        self.loading = set()
+        self.generation += 1
+        self.total_rows = self.data_source.count()
+        if not keep_position:
+            self.offset_px = 0
+        self._clamp_offset()
+        self.bound_indexes = [None] * len(self.row_pool) # Force every pooled row to re-bind
+        self._render()
+
+    def _record_at(self, index):
+        """
+        Returns the record at index, fetching its page from the data source if needed.
+        Returns _LOADING while its page is being fetched by the task runner, and None past the end of a short page.
+        """
+        page_number = index // self.page_size
+        page = self.pages.get(page_number)
+        if page is None:
+            if self.task_runner is None or self.data_source.in_memory:
+                page = self.data_source.fetch(page_number * self.page_size, self.page_size) # One call per page
+                self.pages[page_number] = page
+            else:
+                self._request_page(page_number)
+                page = self.stale_pages.get(page_number)
+                if page is None:
+                    return _LOADING
+        position = index - page_number * self.page_size
+        return page[position] if position < len(page) else None
+
+    def _request_page(self, page_number):
+        """Fetches a page on a worker thread, unless it is already on its way."""
+        if page_number in self.loading:
+            return
+        self.loading.add(page_number)
+        generation = self.generation
+        self.task_runner.submit(self.data_source.fetch, page_number * self.page_size, self.page_size,
+                                on_success=lambda page: self._page_loaded(generation, page_number, page),
+                                on_error=lambda error: self._page_failed(generation, page_number, error))
+
+    def _page_loaded(self, generation, page_number, page):
+        """Tk thread: caches an arrived page and re-binds the rows showing its placeholders or old records."""
+        if generation != self.generation: # Requested before a refresh(); a newer request is on its way
+            return
+        self.loading.discard(page_number)
+        self.pages[page_number] = page
+        self.stale_pages.pop(page_number, None)
+        first, end = page_number * self.page_size, (page_number + 1) * self.page_size
+        for slot, index in enumerate(self.bound_indexes):
+            if index is not None and (first <= index < end or first <= ~index < end):
+                self.bound_indexes[slot] = None
+        self._render()
+
+    def _page_failed(self, generation, page_number, error):
+        """Tk thread: forgets a failed request, so the page is requested again the next time it is rendered."""
+        if generation == self.generation:
+            self.loading.discard(page_number)
+        logger.error("Virtual list: Could not load page %s: %r", page_number, error) # Logs the failed fetch
+
+    def _viewport_height(self):
+        return max(self.body.winfo_height(), 1)
+
+    def _max_offset(self):
+        return max(self.total_rows * self.row_height - self._viewport_height(), 0)
+
+    def _clamp_offset(self):
+        self.offset_px = min(max(self.offset_px, 0), self._max_offset())
+
+    def _render(self):
+        """Positions the row pool over the viewport and binds each row to the record under it."""
+        if self.total_rows == 0:
+            for row in self.row_pool:
+                row.place_forget()
+            self.empty_label.place(relx=0.5, y=20, anchor="n")
+            self.scrollbar.set(0, 1)
+            return
+        self.empty_label.place_forget()
+
+        viewport = self._viewport_height()
+        needed = viewport // self.row_height + 1 + 2 * self.buffer_rows # Rows covering the viewport plus buffers
+        while len(self.row_pool) < min(needed, self.total_rows): # Grow the pool only when the viewport grows
+            row = self.create_row(self.body)
+            row.grid_propagate(False) # Keep the fixed row height regardless of content
+            self.row_pool.append(row)
+            self.bound_indexes.append(None)
+
+        first = max(self.offset_px // self.row_height - self.buffer_rows, 0) # First record index to render
+        pool_size = len(self.row_pool)
+        for index in range(first, first + pool_size):
+            slot = index % pool_size # A record keeps its slot while in view, so scrolling one row re-binds one row
+            row = self.row_pool[slot]
+            if index >= self.total_rows:
+                row.place_forget() # Spare rows past the end of the list
+                self.bound_indexes[slot] = None
+                continue
+            if self.bound_indexes[slot] != index: # Only re-bind rows whose record changed
+                record = self._record_at(index)
+                if record is _LOADING:
+                    if self.bind_placeholder is None:
+                        row.place_forget()
+                        self.bound_indexes[slot] = None
+                        continue
+                    if self.bound_indexes[slot] != ~index: # ~index: bound to the placeholder of index
+                        self.bind_placeholder(row)
+                        self.bound_indexes[slot] = ~index
+                elif record is None:
+                    row.place_forget()
+                    self.bound_indexes[slot] = None
+                    continue
+                else:
+                    self.bind_row(row, record)
+                    self.bound_indexes[slot] = index
+            row.place(x=0, y=index * self.row_height - self.offset_px, relwidth=1.0)
+
+        total_px = self.total_rows * self.row_height
+        self.scrollbar.set(self.offset_px / total_px, min((self.offset_px + viewport) / total_px, 1.0))
+
+    def _scroll_to(self, offset_px):
+        self.offset_px = int(offset_px)
+        self._clamp_offset()
+        self._render()
+
+    def _yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', amount, 'units'|'pages')."""
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * self.total_rows * self.row_height)
+        elif args[0] == "scroll":
+            step = self._viewport_height() if args[2] == "pages" else self.row_height // 2
+            self._scroll_to(self.offset_px + int(args[1]) * step)
+
+    def _on_mouse_wheel(self, event):
+        """Scrolls the list when the wheel is used over it or any of its rows."""
+        widget_path, own_path = str(event.widget), str(self)
+        if widget_path != own_path and not widget_path.startswith(own_path + "."): # Event belongs to another widget
+            return
+        if getattr(event, "num", None) == 4:
+            delta = -1
+        elif getattr(event, "num", None) == 5:
+            delta = 1
+        else:
+            delta = -1 if event.delta > 0 else 1
+        self._scroll_to(self.offset_px + delta * self.row_height // 2)
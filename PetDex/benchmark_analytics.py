@@ -0,0 +1,78 @@
+"""
+Benchmark for the columnar pet table: build time, memory and aggregate latency, compared with a
+row-by-row pass over the pet records.
+Usage: python benchmark_analytics.py [num_pets]
+"""
+import datetime # Imports datetime to spread registration dates over a year
+import random # Imports random to generate varied pet records
+import sys # Imports sys to read the optional record count
+import time # Imports time for measurements
+
+import Column_store # Imports the module so the pure-Python fallback can be measured too
+from Column_store import PetColumnStore # The component being measured
+from Records import PetRecord # Records as stored by InMemoryDBManager
+
+SPECIES = ["Dog", "Cat", "Bird", "Rabbit"]
+BREEDS = ["Labrador", "Poodle", "Beagle", "Bulldog", "Siamese", "Persian", "Aspin", "Puspin", "Shih Tzu", "Husky", None]
+COLORS = ["Brown", "Black", "White", "Golden", "Grey", "Tabby", "Calico"]
+
+def make_pets(num_pets, rng):
+    first_day = datetime.date(2024, 1, 1).toordinal()
+    for i in range(num_pets):
+        yield PetRecord(pet_id=f"PET-{i:08d}", owner_id="USR-BENCH", pet_name=f"Pet {i}", species=rng.choice(SPECIES),
+                        breed=rng.choice(BREEDS), age=rng.choice([None, rng.randint(0, 20)]), color=rng.choice(COLORS),
+                        image_path=None, registration_date=datetime.date.fromordinal(first_day + rng.randrange(365)).isoformat(),
+                        status="lost" if rng.random() < 0.05 else "registered", lost_details=None)
+
+def row_by_row(pets):
+    """The same three aggregates computed from the records directly, as a baseline."""
+    lost_by_species, per_day, ages = {}, {}, {}
+    for pet in pets:
+        if pet['status'] == 'lost':
+            lost_by_species[pet['species']] = lost_by_species.get(pet['species'], 0) + 1
+        per_day[pet['registration_date']] = per_day.get(pet['registration_date'], 0) + 1
+        if pet['age'] is not None:
+            ages[pet['age']] = ages.get(pet['age'], 0) + 1
+    return lost_by_species, per_day, ages
+
+def timed(label, function, rounds):
+    function() # Warm-up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = function()
+    print(f"{label:34} {(time.perf_counter() - started) * 1000 / rounds:9.2f} ms")
+    return result
+
+def run(num_pets=1000000):
+    pets = list(make_pets(num_pets, random.Random(42))) # Fixed seed so runs are comparable
+    store = PetColumnStore()
+    started = time.perf_counter()
+    for pet in pets:
+        store.set_pet(pet['pet_id'], pet)
+    print(f"Build:      {len(store)} pets in {time.perf_counter() - started:.2f}s")
+    column_bytes = sum(column.itemsize * len(column) for column in
+                       [store.live, store.age, store.registered] + [category.data for category in store.categories.values()])
+    print(f"Columns:    {column_bytes / 2**20:.1f} MiB ({column_bytes / len(store):.0f} bytes per pet)")
+
+    queries = [
+        ("lost pets by species", lambda: store.group_count('species', {'status': 'lost'})),
+        ("registrations per day", lambda: store.per_day()),
+        ("age histogram", lambda: store.age_histogram(1)),
+        ("lost dogs aged 2-5 (filter count)", lambda: store.count({'status': 'lost', 'species': 'Dog', 'age': (2, 6)})),
+    ]
+    if Column_store.numpy is not None:
+        print("NumPy:")
+        for label, query in queries:
+            timed(f"  {label}", query, 20)
+    numpy, Column_store.numpy = Column_store.numpy, None # Same queries through the pure-Python fallback
+    print("Pure Python:")
+    try:
+        for label, query in queries:
+            timed(f"  {label}", query, 1)
+    finally:
+        Column_store.numpy = numpy
+    print("Row by row over the records:")
+    timed("  all three aggregates", lambda: row_by_row(pets), 1)
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,70 @@
+"""
+Benchmark for Bulk_io: CSV and JSON-lines import into InMemoryDBManager, and streaming export.
+Usage: python benchmark_bulk.py [num_pets]
+"""
+import logging # Imports logging so the per-call INFO lines can be silenced during the run
+import os # Imports os for file paths and sizes
+import random # Imports random to generate varied pet records
+import shutil # Imports shutil to remove the temporary directory
+import sys # Imports sys to read the optional record count
+import tempfile # Imports tempfile for a throwaway directory
+import time # Imports time for measurements
+
+from database_manager import InMemoryDBManager # The engine being loaded
+from Bulk_io import BulkLoader, FIELDS, export_file, write_records # The component being measured
+
+NAMES = ["Max", "Bella", "Charlie", "Luna", "Cooper", "Daisy", "Rocky", "Molly", "Buddy", "Coco"]
+BREEDS = ["Labrador", "Poodle", "Beagle", "Bulldog", "Siamese", "Persian", "Aspin", "Puspin", None]
+COLORS = ["Brown", "Black", "White", "Golden", "Grey", "Tabby"]
+
+def generate_pets(num_pets, num_owners, rng):
+    """Yields pet records; every hundredth pet is lost with coordinates."""
+    for i in range(num_pets):
+        lost = i % 100 == 0
+        yield {'pet_id': f"PET-{i:08d}", 'owner_id': f"USR-{i % num_owners:06d}", 'pet_name': rng.choice(NAMES),
+               'species': rng.choice(["Dog", "Cat"]), 'breed': rng.choice(BREEDS), 'age': rng.randint(0, 15),
+               'color': rng.choice(COLORS), 'image_path': None, 'registration_date': f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+               'status': 'lost' if lost else 'registered',
+               'lost_details': {'last_seen_location': "Makati", 'latitude': 14.55, 'longitude': 121.02} if lost else None}
+
+def timed(label, num_rows, function):
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    print(f"{label:28} {elapsed:6.2f}s ({num_rows / elapsed:,.0f} rows/s)")
+    return result
+
+def run(num_pets=1000000):
+    logging.disable(logging.INFO) # Per-call log lines would dominate the timings
+    rng = random.Random(42) # Fixed seed so runs are comparable
+    work_dir = tempfile.mkdtemp(prefix="petdex_bulk_")
+    try:
+        num_owners = max(1, num_pets // 10)
+        users_path = os.path.join(work_dir, "users.csv")
+        with open(users_path, "w", encoding="utf-8", newline="") as users_file:
+            write_records(({'user_id': f"USR-{i:06d}", 'username': f"user{i}", 'password_hash': "hash", 'contact_info': {},
+                            'registration_date': "2024-01-01"} for i in range(num_owners)), users_file, "csv", FIELDS['user'])
+        for fmt in ("csv", "jsonl"):
+            pets_path = os.path.join(work_dir, f"pets.{fmt}")
+            with open(pets_path, "w", encoding="utf-8", newline="") as pets_file:
+                write_records(generate_pets(num_pets, num_owners, rng), pets_file, fmt, FIELDS['pet'])
+            print(f"Input:      {num_pets} pets, {os.path.getsize(pets_path) / 2 ** 20:.0f} MiB of {fmt}")
+
+            db = InMemoryDBManager()
+            reports = timed(f"Import {fmt} (users + pets)", num_pets + num_owners,
+                            lambda: BulkLoader(db).load_files({'user': users_path, 'pet': pets_path}))
+            assert reports['pet'].loaded == num_pets and db.get_total_users() == num_owners
+            assert len(db.pets_by_status['lost']) == num_pets // 100 + (num_pets % 100 > 0) # Indexes were rebuilt
+
+            export_path = os.path.join(work_dir, f"export.{fmt}")
+            count = timed(f"Export {fmt} (pets)", num_pets, lambda: export_file(db, 'pet', export_path))
+            assert count == num_pets
+
+        db = InMemoryDBManager() # Round trip: the export loads back unchanged
+        BulkLoader(db).load_files({'user': users_path, 'pet': os.path.join(work_dir, "export.csv")})
+        assert db.get_pet("PET-00000000")['lost_details']['latitude'] == 14.55 and db.get_total_pets() == num_pets
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
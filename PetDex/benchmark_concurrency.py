@@ -0,0 +1,133 @@
+"""
+Stress test for InMemoryDBManager's table locks: many threads add, update, delete and read records at once.
+Checks that no update is lost, usernames stay unique, user deletions cascade completely, readers never fail,
+and the indexes and report counters match the tables afterwards. Reports throughput and lock contention per table.
+Usage: python benchmark_concurrency.py [threads] [operations_per_thread]
+"""
+import logging # Imports logging so the per-call INFO lines can be silenced during the run
+import random # Imports random to pick records and operations
+import sys # Imports sys to read the optional arguments
+import threading # Imports threading for the concurrent workers
+import time # Imports time for measurements
+
+from database_manager import InMemoryDBManager # The component being stressed
+from Pet_data_manager import PetDataManager # Manager the report counters are built from
+from Report import ReportManager # Change event subscriber whose counters must stay exact
+
+SHARED_PETS = 200 # Pets updated concurrently by the field writers
+FIELD_WRITERS = ('pet_name', 'breed', 'color', 'age', 'image_path') # One thread per field, all on the same pets
+CONTESTED_USERNAMES = 500 # Usernames every registering thread tries to take
+
+def run(num_threads=16, operations=2000):
+    logging.disable(logging.WARNING) # Per-call log lines would dominate the timings
+    db = InMemoryDBManager()
+    db.add_user("USR-OWNER", "owner", "hash", {}, "2024-01-01")
+    for i in range(SHARED_PETS):
+        db.add_pet(f"PET-{i:05d}", "USR-OWNER", f"Pet {i}", "Dog", "Aspin", 1, "Brown", None, "2024-01-01")
+    report_manager = ReportManager(PetDataManager(db)) # Counters maintained from change events during the run
+    errors = [] # Exceptions raised by any worker
+    last_written = {} # field -> value its writer wrote last
+    operations_done = [0] * num_threads
+
+    def field_writer(slot, field):
+        """Updates one field of every shared pet; other threads update the other fields of the same pets."""
+        for i in range(operations):
+            value = i if field == 'age' else f"{field}-{i}"
+            db.update_pet(f"PET-{i % SHARED_PETS:05d}", {field: value})
+            operations_done[slot] += 1
+        last_written[field] = {f"PET-{i % SHARED_PETS:05d}": i if field == 'age' else f"{field}-{i}"
+                               for i in range(max(0, operations - SHARED_PETS), operations)}
+
+    def registrar(slot):
+        """Races every other registrar for the same usernames: each must end up with exactly one user."""
+        for i in range(operations):
+            name = f"contested{i % CONTESTED_USERNAMES}"
+            db.add_user(f"USR-{slot}-{i}", name, "hash", {}, "2024-01-01")
+            operations_done[slot] += 1
+
+    def owner_churn(slot):
+        """Creates users with pets and stray reports, marks some pets lost, then deletes the users (cascade)."""
+        rng = random.Random(slot)
+        for i in range(operations // 10):
+            user_id = f"USR-CHURN-{slot}-{i}"
+            db.add_user(user_id, f"churn-{slot}-{i}", "hash", {}, "2024-01-01")
+            for j in range(4):
+                db.add_pet(f"PET-{slot}-{i}-{j}", user_id, "Churn", "Cat", None, 2, None, None, "2024-01-02")
+                db.add_stray_pet_report(f"STRAY-{slot}-{i}-{j}", user_id, "Dog", "Pasig", None, None, None, {}, "2024-01-02",
+                                        14.5 + rng.random() / 10, 121.0 + rng.random() / 10)
+            db.update_pet(f"PET-{slot}-{i}-0", {'status': 'lost', 'lost_details': {'location': "Pasig", 'latitude': 14.55, 'longitude': 121.05}})
+            db.delete_user(user_id)
+            operations_done[slot] += 14
+
+    def reader(slot):
+        """Scans, pages and queries while the tables change; any exception is a failure."""
+        for i in range(operations // 10):
+            cursor, seen = None, 0
+            while True:
+                pets, cursor = db.get_pets_after(cursor, 100)
+                seen += len(pets)
+                if cursor is None:
+                    break
+            db.get_all_lost_pets()
+            db.get_lost_pets_near(14.55, 121.05, 5)
+            db.get_all_pets_by_owner("USR-OWNER")
+            cursor = None
+            while True: # Streams the strays as well, one page per lock hold
+                strays, cursor = db.get_strays_after(cursor, 100)
+                if cursor is None:
+                    break
+            operations_done[slot] += 5 + seen // 100
+
+    workers = []
+    for slot in range(num_threads):
+        kind = slot % 4
+        if kind == 0 and slot // 4 < len(FIELD_WRITERS):
+            workers.append((field_writer, (slot, FIELD_WRITERS[slot // 4])))
+        elif kind == 1:
+            workers.append((registrar, (slot,)))
+        elif kind == 2:
+            workers.append((owner_churn, (slot,)))
+        else:
+            workers.append((reader, (slot,)))
+
+    def guarded(function, args):
+        try:
+            function(*args)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded, args=worker) for worker in workers]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    # --- Checks ---
+    assert not errors, f"Workers raised: {errors[:3]}"
+    for field, values in last_written.items(): # No lost updates: every field holds its writer's last value
+        for pet_id, value in values.items():
+            assert db.get_pet(pet_id)[field] == value, f"Lost update: {pet_id}.{field} is {db.get_pet(pet_id)[field]!r}, expected {value!r}"
+    usernames = [user['username'] for user in db.users.values()]
+    assert len(usernames) == len(set(usernames)) == len(db.username_to_id), "Duplicate usernames"
+    contested = [username for username in usernames if username.startswith("contested")]
+    assert len(contested) == min(operations, CONTESTED_USERNAMES), "A contested username was never registered"
+    assert all(pet['owner_id'] in db.users for pet in db.pets.values()), "Pets left behind by a user deletion"
+    assert all(stray['reporter_id'] in db.users for stray in db.strays.values()), "Stray reports left behind by a user deletion"
+    indexes = (db.username_to_id, db.pets_by_owner, db.pets_by_status, db.strays_by_reporter, db.strays_by_status,
+               db.users_order, db.pets_order, db.strays_order, sorted(db.lost_pets_geo.positions.items()))
+    db.rebuild_indexes() # Rebuilt from the tables: must match what the concurrent writes maintained
+    assert indexes == (db.username_to_id, db.pets_by_owner, db.pets_by_status, db.strays_by_reporter, db.strays_by_status,
+                       db.users_order, db.pets_order, db.strays_order, sorted(db.lost_pets_geo.positions.items())), "Indexes out of step"
+    assert report_manager.verify_counters(repair=False), "Report counters missed change events"
+
+    total = sum(operations_done)
+    print(f"{num_threads} threads: {total} operations in {elapsed:.2f}s ({total / elapsed:.0f} ops/s); all checks passed")
+    for table, stats in db.lock_stats().items():
+        share = stats['contended'] / stats['acquisitions'] if stats['acquisitions'] else 0
+        print(f"  {table:7} {stats['acquisitions']:9} acquisitions   {share:6.1%} waited   {stats['wait_seconds']:7.3f}s total wait")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
@@ -0,0 +1,65 @@
+"""
+Benchmark for Records: memory used by pet, user and stray records stored as plain dictionaries
+versus slotted records, measured with tracemalloc and scaled to one million records.
+Usage: python benchmark_memory.py [num_records]
+"""
+import gc # Imports gc to collect garbage between measurements
+import random # Imports random to generate varied records
+import sys # Imports sys to read the optional record count
+import tracemalloc # Imports tracemalloc to measure allocated memory
+
+from Records import UserRecord, PetRecord, StrayRecord # The record types being measured
+
+NAMES = ["Max", "Bella", "Charlie", "Luna", "Cooper", "Daisy", "Rocky", "Molly", "Buddy", "Coco"]
+BREEDS = ["Labrador", "Poodle", "Beagle", "Bulldog", "Siamese", "Persian", "Aspin", "Puspin"]
+COLORS = ["Brown", "Black", "White", "Golden", "Grey", "Tabby"]
+LOCATIONS = ["Quezon City", "Makati", "Pasig", "Taguig", "Manila"]
+
+def parsed(text):
+    """A fresh copy of a string, as produced by reading it from a file or the GUI (not shared with other records)."""
+    return text.encode("utf-8").decode("utf-8")
+
+def pet_values(i, rng):
+    lost = i % 100 == 0 # One pet in a hundred is lost
+    return {'pet_id': f"PET-{i:08d}", 'owner_id': parsed(f"USR-{i % 1000:06d}"), 'pet_name': parsed(rng.choice(NAMES)),
+            'species': parsed(rng.choice(["Dog", "Cat"])), 'breed': parsed(rng.choice(BREEDS)), 'age': rng.randint(0, 15),
+            'color': parsed(rng.choice(COLORS)), 'image_path': None, 'registration_date': parsed(f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}"),
+            'status': parsed('lost' if lost else 'registered'),
+            'lost_details': {'location': parsed("Makati"), 'timestamp': "2024-05-01 10:00:00", 'latitude': 14.55, 'longitude': 121.02} if lost else None}
+
+def user_values(i, rng):
+    return {'user_id': f"USR-{i:08d}", 'username': f"user{i}", 'password_hash': f"scrypt$n=16384,r=8,p=1$salt{i}$key{i}",
+            'contact_info': {'email': f"user{i}@example.com", 'phone': parsed("09171234567")}, 'registration_date': parsed("2024-01-01")}
+
+def stray_values(i, rng):
+    return {'stray_id': f"STRAY-{i:08d}", 'reporter_id': parsed(f"USR-{i % 1000:06d}"), 'species': parsed(rng.choice(["Dog", "Cat"])),
+            'location': parsed(rng.choice(LOCATIONS)), 'breed': parsed(rng.choice(BREEDS)), 'color': parsed(rng.choice(COLORS)),
+            'description': None, 'contact_info': {}, 'reported_date': parsed("2024-02-01"), 'status': parsed("stray"),
+            'latitude': 14.5 + rng.random() / 10, 'longitude': 121.0 + rng.random() / 10}
+
+def measure(num_records, make_values, store):
+    """Bytes allocated per record for a table of num_records records built with store(values)."""
+    rng = random.Random(42) # Same values for both representations
+    gc.collect()
+    tracemalloc.start()
+    table = {}
+    for i in range(num_records):
+        values = make_values(i, rng)
+        table[i] = store(values)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del table
+    gc.collect()
+    return allocated / num_records
+
+def run(num_records=200000):
+    print(f"{'':8} {'dict':>10} {'slotted':>10}   MiB per million records (dict -> slotted)")
+    for label, make_values, record_type in (("pets", pet_values, PetRecord), ("users", user_values, UserRecord),
+                                            ("strays", stray_values, StrayRecord)):
+        as_dicts = measure(num_records, make_values, lambda values: values) # The dictionaries the engine used to store
+        as_records = measure(num_records, make_values, record_type.from_dict)
+        print(f"{label:8} {as_dicts:8.0f} B {as_records:8.0f} B   {as_dicts * 1e6 / 2 ** 20:6.0f} -> {as_records * 1e6 / 2 ** 20:4.0f}"
+              f" MiB ({1 - as_records / as_dicts:.0%} less)")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,55 @@
+"""
+Benchmark for Metrics: the cost per call of instrumenting the managers, with logging configured as in Main.py
+(INFO level, written to a discarded stream). Prints the resulting metrics table as text.
+Usage: python benchmark_metrics.py [calls]
+"""
+import os # Imports os for the null device that swallows the log lines
+import logging # Imports logging to configure it like the application does
+import sys # Imports sys to read the optional call count
+import time # Imports time for measurements
+
+from database_manager import InMemoryDBManager # Engine whose methods are timed
+from Metrics import Metrics # The component being measured
+from Pet_data_manager import PetDataManager # Manager layered over the engine, timed as well
+
+NUM_PETS = 10000
+
+def timed_loop(label, calls, function, baseline=None, repeats=3):
+    per_call = float('inf')
+    for _ in range(repeats): # Best of several runs, to keep scheduling noise out of a difference of a few microseconds
+        started = time.perf_counter()
+        for i in range(calls):
+            function(i)
+        per_call = min(per_call, (time.perf_counter() - started) / calls)
+    overhead = f"   (+{(per_call - baseline) * 1e9:,.0f} ns instrumented)" if baseline else ""
+    print(f"{label:34} {per_call * 1e6:8.2f} us/call{overhead}")
+    return per_call
+
+def build():
+    db = InMemoryDBManager()
+    db.add_user("USR-OWNER", "owner", "hash", {}, "2024-01-01")
+    for i in range(NUM_PETS):
+        db.add_pet(f"PET-{i:06d}", "USR-OWNER", "Pet", "Dog", "Aspin", 1, "Brown", None, "2024-01-01")
+    return db, PetDataManager(db)
+
+def run(calls=200000):
+    logging.basicConfig(level=logging.INFO, stream=open(os.devnull, "w"), force=True) # As in Main.py, but the lines go nowhere
+    results = {}
+    for instrumented in (False, True):
+        db, pet_data_manager = build()
+        metrics = Metrics()
+        if instrumented:
+            metrics.instrument(db, "db")
+            metrics.instrument(pet_data_manager, "pets")
+        suffix = " (instrumented)" if instrumented else ""
+        results[('lookup', instrumented)] = timed_loop(f"pets.get_pet{suffix}", calls,
+            lambda i: pet_data_manager.get_pet(f"PET-{i % NUM_PETS:06d}"), results.get(('lookup', False)))
+        results[('update', instrumented)] = timed_loop(f"pets.update_pet{suffix}", calls // 10,
+            lambda i: pet_data_manager.update_pet(f"PET-{i % NUM_PETS:06d}", {'age': i % 20}), results.get(('update', False)))
+        results[('page', instrumented)] = timed_loop(f"pets.get_pets_page{suffix}", calls // 10,
+            lambda i: pet_data_manager.get_pets_page(50, i % NUM_PETS), results.get(('page', False)))
+    print()
+    print(metrics.to_text())
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,39 @@
+"""
+Benchmark for UserManager password hashing: logins per second at each KDF cost setting.
+Usage: python benchmark_password.py [logins_per_setting]
+"""
+import logging # Imports logging so the per-call INFO lines can be silenced during the run
+import sys # Imports sys to read the optional login count
+import time # Imports time for measurements
+
+from database_manager import InMemoryDBManager # Storage engine holding the test user
+from Password_hasher import PasswordHasher, SCRYPT, PBKDF2_SHA256, DEFAULT_SCHEME # The hashing being measured
+from User_registration import UserManager # Runs logins on its KDF thread pool
+
+# (label, PasswordHasher arguments) for each cost setting measured
+COST_SETTINGS = [
+    ("scrypt n=2**12", {'scheme': SCRYPT, 'scrypt_n': 2 ** 12}),
+    ("scrypt n=2**14 (default)", {'scheme': SCRYPT, 'scrypt_n': 2 ** 14}),
+    ("scrypt n=2**15", {'scheme': SCRYPT, 'scrypt_n': 2 ** 15}),
+    ("pbkdf2 100k iterations", {'scheme': PBKDF2_SHA256, 'pbkdf2_iterations': 100000}),
+    ("pbkdf2 600k iterations", {'scheme': PBKDF2_SHA256, 'pbkdf2_iterations': 600000}),
+]
+
+def run(logins=20, workers=(1, 4)):
+    logging.disable(logging.INFO) # Per-call log lines would dominate the timings
+    for label, hasher_args in COST_SETTINGS:
+        if hasher_args['scheme'] == SCRYPT and DEFAULT_SCHEME != SCRYPT:
+            print(f"{label:26} skipped (scrypt not available)")
+            continue
+        for worker_count in workers:
+            user_manager = UserManager(InMemoryDBManager(), PasswordHasher(**hasher_args), kdf_workers=worker_count)
+            user_manager.register_user("bench", "correct horse battery staple")
+            started = time.perf_counter()
+            futures = [user_manager.login_user_async("bench", "correct horse battery staple") for _ in range(logins)]
+            assert all(user_id for user_id, message in (future.result() for future in futures)) # Every login must succeed
+            elapsed = time.perf_counter() - started
+            print(f"{label:26} {worker_count} worker(s): {logins / elapsed:7.1f} logins/s ({elapsed * 1000 / logins:.1f} ms each)")
+            user_manager.shutdown()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
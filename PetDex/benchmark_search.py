@@ -0,0 +1,52 @@
+"""
+Benchmark for SearchManager: index build time, query latency and incremental update cost.
+Usage: python benchmark_search.py [num_pets]
+"""
+import logging # Imports logging so the per-call INFO lines can be silenced during the run
+import random # Imports random to generate varied pet records
+import sys # Imports sys to read the optional record count
+import time # Imports time for measurements
+
+from database_manager import InMemoryDBManager # Storage engine holding the records
+from Pet_data_manager import PetDataManager # Manager the search index is built from
+from Search import SearchManager # The component being measured
+
+NAMES = ["Max", "Bella", "Charlie", "Luna", "Cooper", "Daisy", "Rocky", "Molly", "Buddy", "Coco", "Milo", "Lola"]
+BREEDS = ["Labrador", "Poodle", "Beagle", "Bulldog", "Siamese", "Persian", "Aspin", "Puspin", "Shih Tzu", "Husky"]
+COLORS = ["Brown", "Black", "White", "Golden", "Grey", "Tabby", "Calico"]
+LOCATIONS = ["Quezon City", "Makati", "Pasig", "Taguig", "Manila", "Cebu", "Davao"]
+QUERIES = ["max", "labrador", "labardor", "gold", "black poodle", "bella beagle", "pasig tabby", "husky whte", "shih", "c"]
+
+def run(num_pets=100000, rounds=200):
+    logging.disable(logging.INFO) # Per-call log lines would dominate the timings
+    rng = random.Random(42) # Fixed seed so runs are comparable
+    db = InMemoryDBManager()
+    db.add_user("USR-BENCH", "bench", "hash", {}, "2024-01-01")
+    for i in range(num_pets):
+        db.add_pet(f"PET-{i:08d}", "USR-BENCH", f"{rng.choice(NAMES)} {i}", rng.choice(["Dog", "Cat"]),
+                   rng.choice(BREEDS), 3, rng.choice(COLORS), None, "2024-01-01")
+    for i in range(num_pets // 10):
+        db.add_stray_pet_report(f"STRAY-{i:08d}", "USR-BENCH", "Dog", rng.choice(LOCATIONS), rng.choice(BREEDS),
+                                rng.choice(COLORS), "Friendly, seen near the market", {}, "2024-01-01")
+    pet_data_manager = PetDataManager(db)
+
+    started = time.perf_counter()
+    search = SearchManager(pet_data_manager)
+    print(f"Build:      {len(search.index)} documents in {time.perf_counter() - started:.2f}s")
+
+    for query in QUERIES:
+        results = search.index.search(query) # Warm-up, and a sanity check that queries return something
+        started = time.perf_counter()
+        for _ in range(rounds):
+            search.index.search(query)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / rounds
+        print(f"Query:      {query!r:16} {elapsed_ms:.3f} ms ({len(results)} results)")
+
+    started = time.perf_counter()
+    for i in range(1000): # Each update re-indexes one pet through the change event
+        db.update_pet(f"PET-{i:08d}", {"pet_name": f"Renamed {i}"})
+    print(f"Updates:    {(time.perf_counter() - started) * 1000 / 1000:.3f} ms per pet update (store + index)")
+    assert search.index.search("renamed 5")[0].entity_id == "PET-00000005" # Index reflects the updates
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
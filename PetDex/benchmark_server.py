@@ -0,0 +1,100 @@
+"""
+Load test for the store server: N client processes share one server process and run a mix of
+logins, pet lookups and stray reports for a fixed time. Reports throughput and latency per operation.
+Usage: python benchmark_server.py [num_clients] [seconds] [address]
+Passwords are hashed with a cheap PBKDF2 cost so the test measures the store, not the KDF.
+"""
+import logging # Imports logging so the per-call INFO lines can be silenced during the run
+import multiprocessing # Imports multiprocessing to run the server and every client in its own process
+import random # Imports random to pick operations and records
+import secrets # Imports secrets for the run's server token
+import sys # Imports sys to read the optional arguments
+import time # Imports time for measurements
+
+from database_manager import InMemoryDBManager # Store owned by the server process
+from Password_hasher import PasswordHasher, PBKDF2_SHA256 # Imports the hasher, at a cheap cost for the test
+from Pet_data_manager import PetDataManager # Client-side manager used for stray reports
+from Store_server import StoreServer, StoreClient # The components being measured
+from User_registration import UserManager # Client-side manager used for logins
+
+NUM_USERS = 1000
+PETS_PER_USER = 5
+OPERATIONS = [("login", 0.2), ("pet lookup", 0.5), ("owner's pets", 0.2), ("stray report", 0.1)] # Operation mix (weights)
+
+def cheap_hasher():
+    return PasswordHasher(scheme=PBKDF2_SHA256, pbkdf2_iterations=1000)
+
+def serve(address, token, ready):
+    """Server process: seeds the store, then serves it until terminated."""
+    logging.disable(logging.INFO) # Per-call log lines would dominate the timings
+    db = InMemoryDBManager()
+    password_hash = cheap_hasher().hash("password")
+    for user in range(NUM_USERS):
+        db.add_user(f"USR-{user:06d}", f"user{user}", password_hash, {}, "2024-01-01")
+        for pet in range(PETS_PER_USER):
+            db.add_pet(f"PET-{user:06d}-{pet}", f"USR-{user:06d}", f"Pet {pet}", "Dog", "Aspin", 2, "Brown", None, "2024-01-01")
+    server = StoreServer(db, address, token)
+    ready.set()
+    server.serve_forever()
+
+def client(address, token, seconds, seed, results):
+    """Client process: runs the operation mix against the server and reports its latencies."""
+    logging.disable(logging.INFO)
+    rng = random.Random(seed)
+    store = StoreClient(address, token=token)
+    user_manager = UserManager(store, password_hasher=cheap_hasher())
+    pet_data_manager = PetDataManager(store)
+    names, weights = zip(*OPERATIONS)
+    latencies = {name: [] for name in names} # operation -> seconds per call
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        operation = rng.choices(names, weights)[0]
+        user = rng.randrange(NUM_USERS)
+        started = time.perf_counter()
+        if operation == "login":
+            assert user_manager.login_user(f"user{user}", "password")
+        elif operation == "pet lookup":
+            assert store.get_pet(f"PET-{user:06d}-{rng.randrange(PETS_PER_USER)}")
+        elif operation == "owner's pets":
+            assert len(store.get_all_pets_by_owner(f"USR-{user:06d}")) >= PETS_PER_USER
+        else:
+            assert pet_data_manager.add_stray_pet_report(f"USR-{user:06d}", "Cat", "Quezon City", "Puspin", "Tabby",
+                                                         "Seen near the market", None, 14.65, 121.05)
+        latencies[operation].append(time.perf_counter() - started)
+    user_manager.shutdown()
+    store.close()
+    results.put(latencies)
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run(num_clients=8, seconds=10, address="localhost:7432"):
+    token = secrets.token_urlsafe(32) # One-off secret, so the run needs no token file
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(address, token, ready), daemon=True)
+    server.start()
+    ready.wait()
+    results = multiprocessing.Queue()
+    clients = [multiprocessing.Process(target=client, args=(address, token, seconds, seed, results)) for seed in range(num_clients)]
+    for process in clients:
+        process.start()
+    merged = {name: [] for name, _ in OPERATIONS}
+    for _ in clients: # Collect before joining: a full queue would keep the clients from exiting
+        for name, values in results.get().items():
+            merged[name].extend(values)
+    for process in clients:
+        process.join()
+    server.terminate()
+
+    total = sum(len(values) for values in merged.values())
+    print(f"{num_clients} clients, {seconds}s: {total} operations, {total / seconds:.0f} ops/s")
+    for name, values in merged.items():
+        values.sort()
+        if values:
+            print(f"  {name:14} {len(values):8} calls   p50 {percentile(values, 0.5) * 1000:7.2f} ms   "
+                  f"p95 {percentile(values, 0.95) * 1000:7.2f} ms   p99 {percentile(values, 0.99) * 1000:7.2f} ms")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 10,
+        sys.argv[3] if len(sys.argv) > 3 else "localhost:7432")
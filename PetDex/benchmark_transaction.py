@@ -0,0 +1,93 @@
+"""
+Benchmark for InMemoryDBManager.transaction(): the same workflow (register a pet, mark it lost, edit it) run as
+separate writes and as batched transactions, on a store that already holds many pets and has the report counters
+and change journal subscribed. Also times the rollback of a large failed batch, and checks that a rolled-back
+SQLiteDBManager batch leaves the report counters exact.
+Usage: python benchmark_transaction.py [existing_pets] [new_pets] [batch_size]
+"""
+import logging # Imports logging so the per-call INFO lines can be silenced during the run
+import os # Imports os to place the SQLite database in a temporary directory
+import sys # Imports sys to read the optional arguments
+import tempfile # Imports tempfile for the throwaway SQLite database
+import time # Imports time for measurements
+
+from database_manager import InMemoryDBManager, SQLiteDBManager # The components being measured
+from Pet_data_manager import PetDataManager # Keeps a change journal, like the running application
+from Report import ReportManager # Change event subscriber whose counters must stay exact
+
+def build_store(existing_pets):
+    db = InMemoryDBManager()
+    db.add_user("USR-OWNER", "owner", "hash", {}, "2024-01-01")
+    records = [{'pet_id': f"PET-{i:08d}", 'owner_id': "USR-OWNER", 'pet_name': "Pet", 'species': "Dog", 'breed': "Aspin", 'age': 1,
+                'color': "Brown", 'image_path': None, 'registration_date': f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                'status': 'registered', 'lost_details': None} for i in range(existing_pets)]
+    db.insert_records('pet', records)
+    db.finish_bulk_insert(['pet'])
+    report_manager = ReportManager(PetDataManager(db))
+    return db, report_manager
+
+def workflow(db, start, count):
+    """Registers count pets, marks each one lost and then corrects its age: three writes per pet."""
+    for i in range(start, start + count):
+        pet_id = f"NEW-{i:08d}"
+        db.add_pet(pet_id, "USR-OWNER", "New", "Cat", None, 1, "Grey", None, f"2023-{1 + i % 12:02d}-{1 + i % 28:02d}")
+        db.update_pet(pet_id, {'status': 'lost', 'lost_details': {'last_seen_location': "Pasig", 'latitude': 14.57, 'longitude': 121.06}})
+        db.update_pet(pet_id, {'age': 2})
+
+def run(existing_pets=200000, new_pets=20000, batch_size=1000):
+    logging.disable(logging.WARNING) # Per-call log lines would dominate the timings
+    results = {}
+    for label in ("separate writes", f"transactions of {batch_size}"):
+        db, report_manager = build_store(existing_pets)
+        started = time.perf_counter()
+        if label == "separate writes":
+            workflow(db, 0, new_pets)
+        else:
+            for start in range(0, new_pets, batch_size):
+                with db.transaction():
+                    workflow(db, start, min(batch_size, new_pets - start))
+        elapsed = time.perf_counter() - started
+        assert report_manager.verify_counters(repair=False), "Report counters out of step"
+        assert db.get_total_pets() == existing_pets + new_pets
+        results[label] = elapsed
+        print(f"{label:24} {elapsed:6.2f}s ({new_pets * 3 / elapsed:,.0f} writes/s)")
+
+    before = (len(db.pets), len(db.pets_order), len(db.pets_by_status.get('lost', ())))
+    started = time.perf_counter()
+    try:
+        with db.transaction():
+            workflow(db, new_pets, batch_size)
+            raise RuntimeError("Abort the batch")
+    except RuntimeError:
+        pass
+    elapsed = time.perf_counter() - started
+    assert (len(db.pets), len(db.pets_order), len(db.pets_by_status.get('lost', ()))) == before, "Rollback left records behind"
+    assert report_manager.verify_counters(repair=False), "A rolled-back batch reached the counters"
+    print(f"{'failed batch + rollback':24} {elapsed:6.2f}s ({batch_size * 3} writes undone)")
+    check_sqlite_rollback(batch_size)
+
+def check_sqlite_rollback(batch_size):
+    """A failed SQLite batch must publish nothing: its events are held until a commit that never comes."""
+    with tempfile.TemporaryDirectory() as directory:
+        db = SQLiteDBManager(os.path.join(directory, "petdex.db"))
+        db.add_user("USR-OWNER", "owner", "hash", {}, "2024-01-01")
+        report_manager = ReportManager(PetDataManager(db))
+        with db.transaction(): # One committed pet, so the counters have something to be wrong about
+            workflow(db, 0, 1)
+        started = time.perf_counter()
+        try:
+            with db.transaction():
+                workflow(db, 1, batch_size)
+                raise RuntimeError("Abort the batch")
+        except RuntimeError:
+            pass
+        elapsed = time.perf_counter() - started
+        assert db.get_total_pets() == 1, "Rollback left rows behind"
+        assert report_manager.verify_counters(repair=False), "A rolled-back SQLite batch reached the counters"
+        db.close()
+    print(f"{'SQLite failed batch':24} {elapsed:6.2f}s ({batch_size * 3} writes undone)")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20000,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 1000)
@@ -1,21 +1,333 @@
 import logging # Import the logging module for recording application events
+import sqlite3 # Import sqlite3 for the persistent SQLite storage engine
+import json # Import json to store nested dictionaries (contact_info, lost_details) as text columns
+import threading # Import threading to serialise access to the shared SQLite connection and to lock the in-memory tables
+import time # Import time to measure how long threads wait for table locks
+import base64 # Import base64 to make pagination cursors opaque, URL-safe strings
+import bisect # Import bisect to keep the pagination order lists sorted
+import math # Import math for great-circle distances in the geospatial index
+from collections import namedtuple, deque # Import namedtuple for change events and deque for the bounded change journal
+from contextlib import contextmanager, ExitStack # Import contextmanager to build the transaction() and table lock context managers
+
+from Records import UserRecord, PetRecord, StrayRecord # Import the compact record types stored by the in-memory engine
 
 logger = logging.getLogger(__name__) # Get a logger instance for this module
 
-class InMemoryDBManager:
+def encode_cursor(sort_key):
+    """Encodes a (date, id) sort key into an opaque pagination cursor string."""
+    return base64.urlsafe_b64encode(json.dumps(list(sort_key)).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor):
+    """Decodes a cursor produced by encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        sort_date, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+    return (sort_date, record_id)
+
+# --- Geospatial Helpers ---
+
+EARTH_RADIUS_KM = 6371.0088 # Mean Earth radius
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180 # Length of one degree of latitude (~111 km)
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in kilometres between two latitude/longitude points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def degree_span(latitude, radius_km):
+    """
+    Half-height and half-width, in degrees, of the box around latitude that contains a circle of radius_km.
+    The half-width is 180 when the circle reaches a pole (every longitude is then within reach).
+    """
+    lat_span = radius_km / KM_PER_DEGREE
+    angular_radius = radius_km / EARTH_RADIUS_KM
+    if abs(latitude) + lat_span >= 90 or angular_radius >= math.pi / 2:
+        return lat_span, 180.0
+    # Widest longitude extent of the circle (reached north/south of its centre, where degrees are shorter)
+    lon_span = math.degrees(math.asin(math.sin(angular_radius) / math.cos(math.radians(latitude))))
+    return lat_span, min(lon_span, 180.0)
+
+def lost_position(pet_data):
+    """Returns the (latitude, longitude) a lost pet was last seen at, or None if it is not lost or has no coordinates."""
+    if pet_data.get('status') != 'lost':
+        return None
+    lost_details = pet_data.get('lost_details') or {}
+    if lost_details.get('latitude') is None or lost_details.get('longitude') is None:
+        return None
+    return (lost_details['latitude'], lost_details['longitude'])
+
+class GeoGridIndex:
+    """
+    Spatial index bucketing points into a grid of cell_deg x cell_deg degree cells.
+    A radius query only visits the cells overlapping the query's bounding box, so its cost depends on
+    the number of points nearby rather than on the total number of points.
+    """
+
+    def __init__(self, cell_deg=0.05):
+        self.cell_deg = cell_deg # Cell size in degrees (0.05 is about 5.5 km of latitude)
+        self.columns = int(round(360 / cell_deg)) # Number of longitude cells around the globe
+        self.cells = {} # (row, column) -> {record_id: (latitude, longitude)}
+        self.positions = {} # record_id -> (latitude, longitude)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _row(self, latitude):
+        return math.floor(latitude / self.cell_deg)
+
+    def _column(self, longitude):
+        return math.floor((longitude + 180.0) / self.cell_deg) % self.columns # Wraps across the antimeridian
+
+    def add(self, record_id, latitude, longitude):
+        """Adds a point, or moves it if record_id is already indexed."""
+        self.remove(record_id)
+        position = (latitude, longitude)
+        self.positions[record_id] = position
+        self.cells.setdefault((self._row(latitude), self._column(longitude)), {})[record_id] = position
+
+    def remove(self, record_id):
+        """Removes a point, if indexed."""
+        position = self.positions.pop(record_id, None)
+        if position is not None:
+            cell_key = (self._row(position[0]), self._column(position[1]))
+            cell = self.cells[cell_key]
+            del cell[record_id]
+            if not cell: # Drop empty cells
+                del self.cells[cell_key]
+
+    def within(self, latitude, longitude, radius_km):
+        """
+        Finds the points within radius_km of (latitude, longitude).
+        :return: List of (distance_km, record_id), nearest first.
+        """
+        lat_span, lon_span = degree_span(latitude, radius_km)
+        rows = range(self._row(latitude - lat_span), self._row(latitude + lat_span) + 1)
+        if lon_span >= 180.0: # The circle wraps around the globe: every column
+            columns = range(self.columns)
+        else:
+            first = math.floor((longitude - lon_span + 180.0) / self.cell_deg)
+            last = math.floor((longitude + lon_span + 180.0) / self.cell_deg)
+            columns = {column % self.columns for column in range(first, last + 1)}
+        if len(rows) * len(columns) > len(self.cells): # Fewer occupied cells than cells in the box: scan those instead
+            cells = [cell for (row, column), cell in self.cells.items() if row in rows and column in columns]
+        else:
+            cells = [self.cells[(row, column)] for row in rows for column in columns if (row, column) in self.cells]
+        matches = []
+        for cell in cells:
+            for record_id, (point_lat, point_lon) in cell.items():
+                distance = haversine_km(latitude, longitude, point_lat, point_lon)
+                if distance <= radius_km:
+                    matches.append((distance, record_id))
+        matches.sort()
+        return matches
+
+# --- Change Events ---
+
+INSERTED, UPDATED, DELETED = 'inserted', 'updated', 'deleted' # Change event actions
+RELOADED = 'reloaded' # Action of a bulk change to a whole table (entity_id is None): subscribers rebuild what they derive from it
+ChangeEvent = namedtuple('ChangeEvent', ['action', 'entity', 'entity_id']) # entity is 'user', 'pet' or 'stray'
+
+class ChangeNotifier:
+    """Publish/subscribe support shared by the storage engines: every successful write publishes a ChangeEvent."""
+
+    def __init__(self):
+        self._subscribers = [] # Callbacks notified of every change
+        self._publish_lock = threading.RLock() # Delivers one event at a time when writes come from several threads
+
+    def subscribe(self, callback):
+        """Registers callback(event) to be called after every change."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Removes a callback registered with subscribe()."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _publish(self, action, entity, entity_id):
+        """Delivers a change event to every subscriber."""
+        if self._subscribers:
+            event = ChangeEvent(action, entity, entity_id)
+            with self._publish_lock: # Subscribers see events one by one, never interleaved
+                for callback in list(self._subscribers):
+                    callback(event)
+
+class ChangeJournal:
+    """
+    Bounded, versioned log of change events, so views can ask "what changed since I last looked?".
+    The version is the number of events ever recorded. Once a view falls more than max_events behind,
+    or a RELOADED event was recorded since it last looked, changes_since() returns None and the view must reload from scratch.
+    """
+
+    def __init__(self, max_events=10000):
+        self.events = deque(maxlen=max_events) # Most recent events, oldest first
+        self.version = 0 # Number of events recorded so far
+        self._lock = threading.Lock() # Events are recorded on writer threads and read on the Tk thread
+
+    def record(self, event):
+        """Appends an event (usable directly as a ChangeNotifier subscriber)."""
+        with self._lock:
+            if event.action == RELOADED: # Individual changes before a bulk change are no use to anyone
+                self.events.clear()
+            else:
+                self.events.append(event)
+            self.version += 1
+
+    def changes_since(self, version):
+        """
+        Returns the events recorded after version, or None if they are no longer all available
+        (or version is None, meaning the caller has never loaded the data).
+        """
+        if version is None:
+            return None
+        with self._lock: # Consistent view of version and events
+            missed = self.version - version # Number of events the caller has not seen
+            if missed < 0 or missed > len(self.events):
+                return None
+            return list(self.events)[len(self.events) - missed:] if missed else []
+
+def coalesce_events(events):
+    """
+    Merges the events of a batch into one net event per record, in the order the records were first touched:
+    inserted then deleted cancels out, inserted then updated is an insert, deleted then inserted is an update.
+    Events of an entity that was RELOADED in the batch are dropped, since the reload covers them.
+    :param events: List of (action, entity, entity_id) tuples.
+    :return: The merged list.
+    """
+    reloaded = {entity for action, entity, _ in events if action == RELOADED}
+    first, last = {}, {} # (entity, entity_id) -> first and last action, in first-touched order
+    merged = []
+    for action, entity, entity_id in events:
+        if action == RELOADED:
+            merged.append((action, entity, entity_id))
+        elif entity not in reloaded:
+            if (entity, entity_id) not in first:
+                first[(entity, entity_id)] = action
+                merged.append((None, entity, entity_id)) # Placeholder, resolved once the last action is known
+            last[(entity, entity_id)] = action
+    result = []
+    for action, entity, entity_id in merged:
+        if action is None:
+            first_action, last_action = first[(entity, entity_id)], last[(entity, entity_id)]
+            if first_action == INSERTED:
+                action = None if last_action == DELETED else INSERTED # Never existed outside the batch, or new
+            elif last_action == DELETED:
+                action = DELETED
+            else:
+                action = UPDATED # Updated, or deleted and inserted again
+            if action is None:
+                continue
+        result.append((action, entity, entity_id))
+    return result
+
+# --- Concurrency Control ---
+
+USERS, PETS, STRAYS = 'users', 'pets', 'strays' # In-memory tables, each with its own lock
+TABLES = (USERS, PETS, STRAYS) # Lock order: a write touching several tables always locks them in this order, so writers cannot deadlock
+ENTITY_TABLES = {'user': USERS, 'pet': PETS, 'stray': STRAYS} # Change event entity -> table
+ORDER_BATCH_MIN = 64 # Buffered pagination order changes from which a transaction re-sorts the list instead of inserting one by one
+
+class ReadWriteLock:
+    """
+    Lets any number of readers in at once, or one writer alone.
+    Waiting writers block new readers, so a steady stream of reads cannot starve writes.
+    Counts acquisitions and the time spent waiting, to measure contention.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0 # Readers inside
+        self._writer = False # True while a writer is inside
+        self._writers_waiting = 0 # Writers queued for the lock
+        self.acquisitions = 0 # Times the lock was taken, shared or exclusive
+        self.contended = 0 # Times a thread had to wait for it
+        self.wait_seconds = 0.0 # Total time threads spent waiting for it
+
+    def _wait_while(self, blocked):
+        """Waits (with the condition held) until blocked() is false, recording the wait."""
+        self.acquisitions += 1
+        if blocked():
+            started = time.perf_counter()
+            while blocked():
+                self._condition.wait()
+            self.contended += 1
+            self.wait_seconds += time.perf_counter() - started
+
+    @contextmanager
+    def reading(self):
+        with self._condition:
+            self._wait_while(lambda: self._writer or self._writers_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self):
+        with self._condition:
+            self._writers_waiting += 1
+            self._wait_while(lambda: self._writer or self._readers)
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+    def stats(self):
+        """Returns the contention counters: acquisitions, contended (had to wait) and wait_seconds."""
+        with self._condition:
+            return {'acquisitions': self.acquisitions, 'contended': self.contended, 'wait_seconds': self.wait_seconds}
+
+class InMemoryDBManager(ChangeNotifier):
     def __init__(self):
         """
         Initializes the in-memory database.
         self.users: A dictionary where user_id (string) is the key,
                      and user data (another dictionary) is the value.
                      This dictionary acts as our primary "hash table" for user data.
+        Records are stored as slotted UserRecord/PetRecord/StrayRecord objects, which behave like dictionaries
+        but need a fraction of the memory.
         self.username_to_id: A dictionary to quickly look up user_id by username.
                               This also functions like a hash table for username indexing.
+
+        Every method is safe to call from several threads. Each table (users, pets, strays, with their indexes) has a
+        reader/writer lock: reads of a table run concurrently, a write has the table to itself, and a write touching
+        several tables (delete_user's cascade) holds all of their locks, so other threads see it whole or not at all.
+        Updates replace a record instead of changing it in place, so a record already returned to a reader never changes.
+        Change events are published once the write has released its locks, so subscribers may read the store freely.
+        Several writes can be grouped with transaction(): they are applied atomically and undone together on an exception.
         """
+        super().__init__() # Set up change event subscriptions
+        self._table_locks = {table: ReadWriteLock() for table in TABLES} # One reader/writer lock per table
+        self._scope = threading.local() # Per thread: tables locked by the current call, and the events it will publish
         self.users = {} # Main hash table (dictionary) to store user records, keyed by user_id
         self.username_to_id = {} # Secondary hash table (dictionary) for quick username-to-user_id lookups
         self.pets = {} # Hash table (dictionary) to store pet records, keyed by pet_id
         self.strays = {} # Hash table (dictionary) to store stray reports, keyed by stray_id
+
+        # Secondary indexes: each maps a field value to an insertion-ordered dict of record ids (used as an ordered set),
+        # so lookups by owner, status or reporter cost time proportional to the result instead of the whole table.
+        self.pets_by_owner = {} # owner_id -> {pet_id: None}
+        self.pets_by_status = {} # status -> {pet_id: None}
+        self.strays_by_reporter = {} # reporter_id -> {stray_id: None}
+        self.strays_by_status = {} # status -> {stray_id: None}
+
+        # Pagination order: sorted lists of (date, id) keys giving a stable order for paged and cursor queries
+        self.users_order = [] # Sorted (registration_date, user_id) keys
+        self.pets_order = [] # Sorted (registration_date, pet_id) keys
+        self.strays_order = [] # Sorted (reported_date, stray_id) keys
+
+        # Spatial index of the last seen positions of lost pets that have coordinates
+        self.lost_pets_geo = GeoGridIndex() # pet_id -> (latitude, longitude)
         logger.info("InMemoryDBManager initialized. Data will not be persistent.") # Log initialization status
 
     def connect(self):
@@ -43,6 +355,272 @@ class InMemoryDBManager:
         """
         pass # This method is a leftover from the SQLite implementation and is not used here.
 
+    # --- Table Locks ---
+
+    @contextmanager
+    def _locked(self, mode, tables):
+        """
+        Holds the locks of several tables, acquired in TABLES order. Scopes nest: a method called inside another
+        (e.g. by a subclass or a transaction) reuses the locks already held, and may only use tables held in a
+        compatible mode. Events published inside the scope are delivered when the outermost scope exits.
+        """
+        held = getattr(self._scope, 'held', None)
+        if held is not None: # Nested call: the outer scope already holds the locks
+            for table in tables:
+                if table not in held or (mode == 'write' and held[table] == 'read'):
+                    raise RuntimeError(f"Cannot {mode} table '{table}' inside a scope that does not hold it for {mode}ing")
+            yield
+            return
+        self._scope.held = {table: mode for table in tables}
+        self._scope.pending = [] # Events published while the locks are held
+        try:
+            with ExitStack() as stack:
+                for table in TABLES:
+                    if table in tables:
+                        lock = self._table_locks[table]
+                        stack.enter_context(lock.writing() if mode == 'write' else lock.reading())
+                yield
+        finally: # Locks are released by now
+            pending = self._scope.pending
+            self._scope.held = self._scope.pending = None
+            for event in pending:
+                ChangeNotifier._publish(self, *event)
+
+    def _reading(self, *tables):
+        """Context manager sharing the given tables with other readers."""
+        return self._locked('read', tables)
+
+    def _writing(self, *tables):
+        """Context manager giving the current thread the given tables to itself."""
+        return self._locked('write', tables)
+
+    def _publish(self, action, entity, entity_id):
+        """Delivers a change event, or queues it until the current write releases its locks."""
+        if getattr(self._scope, 'held', None) is not None:
+            self._scope.pending.append((action, entity, entity_id))
+        else:
+            ChangeNotifier._publish(self, action, entity, entity_id)
+
+    def lock_stats(self):
+        """
+        Measures lock contention.
+        :return: Dictionary table -> {'acquisitions', 'contended', 'wait_seconds'}.
+        """
+        return {table: lock.stats() for table, lock in self._table_locks.items()}
+
+    # --- Transactions ---
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups several writes into one atomic batch, like SQLiteDBManager.transaction().
+        The block holds every table's write lock, so other threads see all of its writes or none. If it raises,
+        every record it changed is restored and its change events are dropped. Maintenance is paid once per batch:
+        pagination order changes are merged into the sorted lists at commit, and subscribers get one net event per
+        record instead of one per write. Nested blocks join the outermost transaction.
+        """
+        if getattr(self._scope, 'undo', None) is not None: # Already inside a transaction on this thread
+            yield self
+            return
+        with self._writing(USERS, PETS, STRAYS):
+            self._scope.undo = {} # (table, record_id) -> record before the transaction touched it (None: absent)
+            self._scope.order_changes = {} # id(order list) -> (order list, keys to add, keys to remove)
+            first_event = len(self._scope.pending) # Events published before the transaction are not part of it
+            try:
+                yield self
+            except BaseException:
+                self._rollback()
+                del self._scope.pending[first_event:] # Nothing happened, so nothing is announced
+                raise
+            else:
+                self._flush_orders()
+                self._scope.pending[first_event:] = coalesce_events(self._scope.pending[first_event:])
+            finally:
+                self._scope.undo = self._scope.order_changes = None
+
+    def in_transaction(self):
+        """Returns True if the calling thread is inside a transaction() block."""
+        return getattr(self._scope, 'undo', None) is not None
+
+    def _remember(self, table, record_id):
+        """Saves a record's state before its first change in the current transaction, so it can be restored."""
+        undo = getattr(self._scope, 'undo', None)
+        if undo is not None and (table, record_id) not in undo:
+            undo[(table, record_id)] = getattr(self, table).get(record_id) # Records are replaced, never changed in place
+
+    def _rollback(self):
+        """Restores every record the current transaction changed, and their index entries."""
+        self._flush_orders() # Indexes first catch up with the tables, then both are rolled back together
+        undo = self._scope.undo
+        self._scope.undo = self._scope.order_changes = None # The restoring writes below are applied directly
+        indexers = {USERS: (self._index_user, self._unindex_user), PETS: (self._index_pet, self._unindex_pet),
+                    STRAYS: (self._index_stray, self._unindex_stray)}
+        for (table, record_id), old_record in reversed(list(undo.items())): # Latest changes are undone first
+            records = getattr(self, table)
+            index, unindex = indexers[table]
+            current = records.pop(record_id, None)
+            if current is not None:
+                unindex(record_id, current)
+            if old_record is not None:
+                records[record_id] = old_record
+                index(record_id, old_record)
+        logger.warning("In-memory DB: Transaction rolled back (%s records restored).", len(undo)) # Log the rollback
+
+    def _flush_orders(self):
+        """Applies the pagination order changes buffered by the current transaction."""
+        changes = getattr(self._scope, 'order_changes', None)
+        if not changes:
+            return
+        self._scope.order_changes = {}
+        for order, adds, removes in changes.values():
+            if len(adds) + len(removes) < ORDER_BATCH_MIN: # A few changes: binary search each one
+                for key in removes:
+                    position = bisect.bisect_left(order, key)
+                    if position < len(order) and order[position] == key:
+                        del order[position]
+                for key in adds:
+                    bisect.insort(order, key)
+            else: # Many changes: one pass to drop keys, one sort (Timsort merges the sorted list with the new keys)
+                if removes:
+                    order[:] = [key for key in order if key not in removes]
+                order.extend(adds)
+                order.sort()
+
+    # --- Secondary Index Helpers ---
+
+    def _index_add(self, index, value, record_id):
+        """Adds record_id to the bucket for value in the given secondary index."""
+        index.setdefault(value, {})[record_id] = None # Create the bucket on first use and record the id
+
+    def _index_remove(self, index, value, record_id):
+        """Removes record_id from the bucket for value, dropping the bucket once it is empty."""
+        bucket = index.get(value) # Get the bucket of ids for this value
+        if bucket is not None:
+            bucket.pop(record_id, None) # Remove the id if present
+            if not bucket: # Drop empty buckets so the index does not keep stale keys
+                del index[value]
+
+    def _order_changes(self, order):
+        """Returns the (adds, removes) buffers of an order list in the current transaction, or None outside one."""
+        changes = getattr(self._scope, 'order_changes', None)
+        if changes is None:
+            return None
+        return changes.setdefault(id(order), (order, set(), set()))[1:]
+
+    def _order_add(self, order, key):
+        """Inserts a (date, id) key into a sorted pagination order list (at commit, inside a transaction)."""
+        changes = self._order_changes(order)
+        if changes is None:
+            bisect.insort(order, key)
+        elif key in changes[1]: # Removed earlier in the transaction: the key simply stays
+            changes[1].discard(key)
+        else:
+            changes[0].add(key)
+
+    def _order_remove(self, order, key):
+        """Removes a (date, id) key from a sorted pagination order list (at commit, inside a transaction)."""
+        changes = self._order_changes(order)
+        if changes is None:
+            position = bisect.bisect_left(order, key) # Binary search for the key
+            if position < len(order) and order[position] == key:
+                del order[position]
+        elif key in changes[0]: # Added earlier in the transaction: it never reaches the list
+            changes[0].discard(key)
+        else:
+            changes[1].add(key)
+
+    def _known_fields(self, record_type, key_field, record_id, new_details):
+        """Drops update fields the record type does not have (and its key), like the SQLite engine does for missing columns."""
+        ignored = [field for field in new_details if field not in record_type._FIELD_SET or field == key_field]
+        if not ignored:
+            return new_details
+        logger.warning("In-memory DB: Ignoring unknown fields %s for '%s'.", ignored, record_id) # Log fields the record cannot hold
+        return {field: value for field, value in new_details.items() if field not in ignored}
+
+    def _user_key(self, user_id, user_data):
+        """Sort key of a user for pagination: registration date, then user_id as a tie-breaker."""
+        return (user_data.get('registration_date') or '', user_id)
+
+    def _pet_key(self, pet_id, pet_data):
+        """Sort key of a pet for pagination: registration date, then pet_id as a tie-breaker."""
+        return (pet_data.get('registration_date') or '', pet_id)
+
+    def _stray_key(self, stray_id, stray_data):
+        """Sort key of a stray report for pagination: reported date, then stray_id as a tie-breaker."""
+        return (stray_data.get('reported_date') or '', stray_id)
+
+    def _index_user(self, user_id, user_data):
+        """Registers a user record in the username map and the pagination order."""
+        self.username_to_id[user_data['username']] = user_id
+        self._order_add(self.users_order, self._user_key(user_id, user_data))
+
+    def _unindex_user(self, user_id, user_data):
+        """Removes a user record from the username map and the pagination order."""
+        if self.username_to_id.get(user_data['username']) == user_id: # The name may belong to another user by now
+            del self.username_to_id[user_data['username']]
+        self._order_remove(self.users_order, self._user_key(user_id, user_data))
+
+    def _geo_index_pet(self, pet_id, pet_data):
+        """Adds, moves or removes a pet in the lost pet spatial index according to its status and lost_details."""
+        position = lost_position(pet_data)
+        if position is not None:
+            self.lost_pets_geo.add(pet_id, *position)
+        else:
+            self.lost_pets_geo.remove(pet_id)
+
+    def _index_pet(self, pet_id, pet_data):
+        """Registers a pet record in the owner, status, pagination and spatial indexes."""
+        self._index_add(self.pets_by_owner, pet_data.get('owner_id'), pet_id)
+        self._index_add(self.pets_by_status, pet_data.get('status'), pet_id)
+        self._order_add(self.pets_order, self._pet_key(pet_id, pet_data))
+        self._geo_index_pet(pet_id, pet_data)
+
+    def _unindex_pet(self, pet_id, pet_data):
+        """Removes a pet record from the owner, status, pagination and spatial indexes."""
+        self._index_remove(self.pets_by_owner, pet_data.get('owner_id'), pet_id)
+        self._index_remove(self.pets_by_status, pet_data.get('status'), pet_id)
+        self._order_remove(self.pets_order, self._pet_key(pet_id, pet_data))
+        self.lost_pets_geo.remove(pet_id)
+
+    def _index_stray(self, stray_id, stray_data):
+        """Registers a stray report in the reporter, status and pagination indexes."""
+        self._index_add(self.strays_by_reporter, stray_data.get('reporter_id'), stray_id)
+        self._index_add(self.strays_by_status, stray_data.get('status'), stray_id)
+        self._order_add(self.strays_order, self._stray_key(stray_id, stray_data))
+
+    def _unindex_stray(self, stray_id, stray_data):
+        """Removes a stray report from the reporter, status and pagination indexes."""
+        self._index_remove(self.strays_by_reporter, stray_data.get('reporter_id'), stray_id)
+        self._index_remove(self.strays_by_status, stray_data.get('status'), stray_id)
+        self._order_remove(self.strays_order, self._stray_key(stray_id, stray_data))
+
+    def rebuild_indexes(self):
+        """
+        Rebuilds the username map and every secondary index from the primary tables.
+        Used after the tables are replaced wholesale (e.g. when a snapshot is loaded).
+        """
+        with self._writing(USERS, PETS, STRAYS):
+            if getattr(self._scope, 'order_changes', None): # Buffered order changes are superseded by the rebuild
+                self._scope.order_changes = {}
+            # Records are read through their attributes here: this loop runs once per record after every bulk load
+            self.username_to_id = {user.username: user_id for user_id, user in self.users.items()} # Username -> user_id
+            self.pets_by_owner, self.pets_by_status = {}, {} # Start from empty pet indexes
+            self.strays_by_reporter, self.strays_by_status = {}, {} # Start from empty stray indexes
+            self.lost_pets_geo = GeoGridIndex() # Start from an empty spatial index
+            for pet_id, pet_data in self.pets.items(): # Re-register every pet
+                self._index_add(self.pets_by_owner, pet_data.owner_id, pet_id)
+                self._index_add(self.pets_by_status, pet_data.status, pet_id)
+                if pet_data.status == 'lost': # Only lost pets can be in the spatial index
+                    self._geo_index_pet(pet_id, pet_data)
+            for stray_id, stray_data in self.strays.items(): # Re-register every stray report
+                self._index_add(self.strays_by_reporter, stray_data.reporter_id, stray_id)
+                self._index_add(self.strays_by_status, stray_data.status, stray_id)
+            # One sort per table instead of one insort per record
+            self.users_order = sorted((user_data.registration_date or '', user_id) for user_id, user_data in self.users.items())
+            self.pets_order = sorted((pet_data.registration_date or '', pet_id) for pet_id, pet_data in self.pets.items())
+            self.strays_order = sorted((stray_data.reported_date or '', stray_id) for stray_id, stray_data in self.strays.items())
+            logger.info("In-memory DB: Secondary indexes rebuilt.") # Log the rebuild
+
     # --- User Management Methods ---
 
     def add_user(self, user_id, username, password_hash, contact_info, registration_date):
@@ -50,217 +628,874 @@ class InMemoryDBManager:
         Adds a new user to the in-memory database.
         Returns True if successful, False if username already exists.
         """
-        if username in self.username_to_id: # Check if the username already exists in the username-to-ID hash table
-            logger.warning(f"In-memory DB: Username '{username}' already exists. Cannot add user.") # Log warning
-            return False # Return False if username is already taken
-
-        user_data = { # Create a dictionary to store all user-related data
-            'user_id': user_id,
-            'username': username,
-            'password_hash': password_hash,
-            'contact_info': contact_info, # Store contact_info directly as a dictionary
-            'registration_date': registration_date
-        }
-        self.users[user_id] = user_data # Add the new user data to the main users hash table, keyed by user_id
-        self.username_to_id[username] = user_id # Add the username-to-user_id mapping to the secondary hash table
-        logger.info(f"In-memory DB: User '{username}' added.") # Log successful addition
-        return True # Indicate successful addition
+        with self._writing(USERS):
+            if username in self.username_to_id: # Check if the username already exists in the username-to-ID hash table
+                logger.warning("In-memory DB: Username '%s' already exists. Cannot add user.", username) # Log warning
+                return False # Return False if username is already taken
+
+            user_data = UserRecord( # Create a compact record to store all user-related data
+                user_id=user_id,
+                username=username,
+                password_hash=password_hash,
+                contact_info=contact_info, # Stored as a nested ContactInfo record when it only has email/phone
+                registration_date=registration_date
+            )
+            self._remember(USERS, user_id) # Restored if the enclosing transaction fails
+            self.users[user_id] = user_data # Add the new user data to the main users hash table, keyed by user_id
+            self._index_user(user_id, user_data) # Register the username-to-user_id mapping and the pagination order
+            logger.info("In-memory DB: User '%s' added.", username) # Log successful addition
+            self._publish(INSERTED, 'user', user_id) # Notify subscribers
+            return True # Indicate successful addition
 
     def get_user_by_username(self, username):
         """
         Retrieves user details by username from the in-memory database.
         """
-        user_id = self.username_to_id.get(username) # Get the user_id from the username-to-ID hash table
-        if user_id: # If a user_id was found for the given username
-            user_data = self.users.get(user_id) # Retrieve the full user data from the main users hash table using the user_id
-            logger.info(f"In-memory DB: Retrieved user by username '{username}'.") # Log successful retrieval
-            return user_data # Return the user data
-        logger.info(f"In-memory DB: User by username '{username}' not found.") # Log if username not found
-        return None # Return None if username not found
+        with self._reading(USERS):
+            user_id = self.username_to_id.get(username) # Get the user_id from the username-to-ID hash table
+            if user_id: # If a user_id was found for the given username
+                user_data = self.users.get(user_id) # Retrieve the full user data from the main users hash table using the user_id
+                logger.debug("In-memory DB: Retrieved user by username '%s'.", username) # Log successful retrieval
+                return user_data # Return the user data
+            logger.debug("In-memory DB: User by username '%s' not found.", username) # Log if username not found
+            return None # Return None if username not found
 
     def get_user_by_id(self, user_id):
         """
         Retrieves user details by user ID from the in-memory database.
         """
-        user_data = self.users.get(user_id) # Retrieve user data directly from the main users hash table using user_id
-        if user_data: # If user data was found
-            logger.info(f"In-memory DB: Retrieved user by ID '{user_id}'.") # Log successful retrieval
-        else: # If user data was not found
-            logger.info(f"In-memory DB: User by ID '{user_id}' not found.") # Log if user_id not found
-        return user_data # Return user data or None
+        with self._reading(USERS):
+            user_data = self.users.get(user_id) # Retrieve user data directly from the main users hash table using user_id
+            if user_data: # If user data was found
+                logger.debug("In-memory DB: Retrieved user by ID '%s'.", user_id) # Log successful retrieval
+            else: # If user data was not found
+                logger.debug("In-memory DB: User by ID '%s' not found.", user_id) # Log if user_id not found
+            return user_data # Return user data or None
 
     def update_user(self, user_id, new_details):
         """
         Updates details of an existing user in the in-memory database.
         """
-        if user_id in self.users: # Check if the user_id exists in the main users hash table
-            current_username = self.users[user_id]['username'] # Get the current username of the user
+        with self._writing(USERS):
+            if user_id in self.users: # Check if the user_id exists in the main users hash table
+                new_details = self._known_fields(UserRecord, 'user_id', user_id, new_details) # Fields a UserRecord can hold
+                current_username = self.users[user_id]['username'] # Get the current username of the user
             
-            # If a new username is provided and it's different from the current one
-            if 'username' in new_details and new_details['username'] != current_username:
-                new_username = new_details['username'] # Get the new username
-                # Check if the new username is already taken by another user
-                if new_username in self.username_to_id and self.username_to_id[new_username] != user_id:
-                    logger.warning(f"In-memory DB: Cannot update user {user_id}. New username '{new_username}' is already taken.") # Log conflict
-                    return False # Return False if the new username is taken
-
-                # Remove the old username mapping from the secondary hash table
-                if current_username in self.username_to_id:
-                    del self.username_to_id[current_username]
-                self.username_to_id[new_username] = user_id # Add the new username-to-ID mapping
+                # If a new username is provided and it's different from the current one
+                if 'username' in new_details and new_details['username'] != current_username:
+                    new_username = new_details['username'] # Get the new username
+                    # Check if the new username is already taken by another user
+                    if new_username in self.username_to_id and self.username_to_id[new_username] != user_id:
+                        logger.warning("In-memory DB: Cannot update user %s. New username '%s' is already taken.", user_id, new_username) # Log conflict
+                        return False # Return False if the new username is taken
+
+                    # Remove the old username mapping from the secondary hash table
+                    if current_username in self.username_to_id:
+                        del self.username_to_id[current_username]
+                    self.username_to_id[new_username] = user_id # Add the new username-to-ID mapping
             
-            self.users[user_id].update(new_details) # Update the user's details in the main users hash table
-            logger.info(f"In-memory DB: User '{user_id}' updated.") # Log successful update
-            return True # Indicate successful update
-        logger.warning(f"In-memory DB: User '{user_id}' not found for update.") # Log if user not found for update
-        return False # Return False if user_id not found
+                self._remember(USERS, user_id) # Restored if the enclosing transaction fails
+                old_key = self._user_key(user_id, self.users[user_id]) # Remember the pagination key
+                user_data = self.users[user_id].copy() # Readers holding the current record keep an unchanged copy
+                user_data.update(new_details) # Apply the new details
+                self.users[user_id] = user_data # Replace the user's record in the main users hash table
+                if self._user_key(user_id, user_data) != old_key: # Re-position the user if the registration date changed
+                    self._order_remove(self.users_order, old_key)
+                    self._order_add(self.users_order, self._user_key(user_id, user_data))
+                logger.info("In-memory DB: User '%s' updated.", user_id) # Log successful update
+                self._publish(UPDATED, 'user', user_id) # Notify subscribers
+                return True # Indicate successful update
+            logger.warning("In-memory DB: User '%s' not found for update.", user_id) # Log if user not found for update
+            return False # Return False if user_id not found
 
     def delete_user(self, user_id):
         """
         Deletes a user from the in-memory database by user ID.
         Also deletes associated pets and stray reports (simplified for in-memory).
         """
-        if user_id in self.users: # Check if the user_id exists in the main users hash table
-            username = self.users[user_id]['username'] # Get the username before deleting the user record
-            del self.users[user_id] # Delete the user record from the main users hash table
-            if username in self.username_to_id: # Check if the username exists in the secondary hash table
-                del self.username_to_id[username] # Delete the username-to-ID mapping
-            logger.info(f"In-memory DB: User '{user_id}' deleted.") # Log successful deletion
-
-            # Simplified cascade deletion for in-memory: find and delete associated pet and stray records
-            # This demonstrates handling relationships in an in-memory context.
-            pets_to_delete = [pid for pid, pet in self.pets.items() if pet.get('owner_id') == user_id] # Find pets owned by this user
-            for pid in pets_to_delete: # Iterate through pets to delete
-                del self.pets[pid] # Delete each associated pet from the pets hash table
-                logger.info(f"In-memory DB: Deleted associated pet {pid} for user {user_id}.") # Log pet deletion
-
-            strays_to_delete = [sid for sid, stray in self.strays.items() if stray.get('reporter_id') == user_id] # Find stray reports by this user
-            for sid in strays_to_delete: # Iterate through stray reports to delete
-                del self.strays[sid] # Delete each associated stray report from the strays hash table
-                logger.info(f"In-memory DB: Deleted associated stray report {sid} by user {user_id}.") # Log stray deletion
-
-            return True # Indicate successful deletion
-        logger.warning(f"In-memory DB: User '{user_id}' not found for deletion.") # Log if user not found for deletion
-        return False # Return False if user_id not found
+        with self._writing(USERS, PETS, STRAYS): # The cascade to pets and strays is atomic
+            if user_id in self.users: # Check if the user_id exists in the main users hash table
+                self._remember(USERS, user_id) # Restored if the enclosing transaction fails
+                self._unindex_user(user_id, self.users[user_id]) # Drop the username mapping and the pagination order entry
+                del self.users[user_id] # Delete the user record from the main users hash table
+                logger.info("In-memory DB: User '%s' deleted.", user_id) # Log successful deletion
+
+                # Cascade deletion: the owner and reporter indexes give the associated records directly, without scanning the tables
+                pets_to_delete = list(self.pets_by_owner.get(user_id, ())) # Pets owned by this user
+                for pid in pets_to_delete: # Iterate through pets to delete
+                    self._remember(PETS, pid)
+                    self._unindex_pet(pid, self.pets[pid]) # Remove the pet from the secondary indexes
+                    del self.pets[pid] # Delete each associated pet from the pets hash table
+                    logger.info("In-memory DB: Deleted associated pet %s for user %s.", pid, user_id) # Log pet deletion
+                    self._publish(DELETED, 'pet', pid) # Notify subscribers of the cascaded deletion
+
+                strays_to_delete = list(self.strays_by_reporter.get(user_id, ())) # Stray reports filed by this user
+                for sid in strays_to_delete: # Iterate through stray reports to delete
+                    self._remember(STRAYS, sid)
+                    self._unindex_stray(sid, self.strays[sid]) # Remove the report from the secondary indexes
+                    del self.strays[sid] # Delete each associated stray report from the strays hash table
+                    logger.info("In-memory DB: Deleted associated stray report %s by user %s.", sid, user_id) # Log stray deletion
+                    self._publish(DELETED, 'stray', sid) # Notify subscribers of the cascaded deletion
+
+                self._publish(DELETED, 'user', user_id) # Notify subscribers
+
+                return True # Indicate successful deletion
+            logger.warning("In-memory DB: User '%s' not found for deletion.", user_id) # Log if user not found for deletion
+            return False # Return False if user_id not found
     
+    def get_users_after(self, cursor=None, limit=50):
+        """
+        Retrieves the page of users that follows an opaque cursor (None for the first page),
+        in stable (registration_date, user_id) order.
+        :return: (list of user dictionaries, cursor for the next page or None when there are no more users)
+        """
+        with self._reading(USERS):
+            self._flush_orders() # A transaction on this thread may have buffered order changes
+            start = bisect.bisect_right(self.users_order, decode_cursor(cursor)) if cursor else 0 # O(log n) seek
+            keys = self.users_order[start:start + limit]
+            next_cursor = encode_cursor(keys[-1]) if keys and start + limit < len(self.users_order) else None
+            return [self.users[user_id] for _, user_id in keys], next_cursor
+
     def get_total_users(self):
         """Counts the total number of users in the in-memory database."""
-        return len(self.users) # Return the number of entries in the users hash table
+        with self._reading(USERS):
+            return len(self.users) # Return the number of entries in the users hash table
+
+    def get_total_pets(self):
+        """Counts the total number of pets in the in-memory database."""
+        with self._reading(PETS):
+            return len(self.pets) # Return the number of entries in the pets hash table
+
+    def get_total_strays(self):
+        """Counts the total number of stray reports in the in-memory database."""
+        with self._reading(STRAYS):
+            return len(self.strays) # Return the number of entries in the strays hash table
 
     # --- Pet Management Methods ---
     
     def add_pet(self, pet_id, owner_id, pet_name, species, breed, age, color, image_path, registration_date):
         """Adds a new pet to the in-memory database."""
-        if pet_id in self.pets: # Check if the pet_id already exists in the pets hash table
-            logger.warning(f"In-memory DB: Pet ID '{pet_id}' already exists. Cannot add pet.") # Log warning
-            return False # Return False if pet_id is already taken
+        with self._writing(PETS):
+            if pet_id in self.pets: # Check if the pet_id already exists in the pets hash table
+                logger.warning("In-memory DB: Pet ID '%s' already exists. Cannot add pet.", pet_id) # Log warning
+                return False # Return False if pet_id is already taken
         
-        pet_data = { # Create a dictionary to store all pet-related data
-            'pet_id': pet_id,
-            'owner_id': owner_id,
-            'pet_name': pet_name,
-            'species': species,
-            'breed': breed,
-            'age': age,
-            'color': color,
-            'image_path': image_path,
-            'registration_date': registration_date,
-            'status': 'registered', # Initial status of a new pet
-            'lost_details': None # Initialize lost_details as None
-        }
-        self.pets[pet_id] = pet_data # Add the new pet data to the pets hash table, keyed by pet_id
-        logger.info(f"In-memory DB: Pet '{pet_name}' added for owner '{owner_id}'.") # Log successful addition
-        return True # Indicate successful addition
+            pet_data = PetRecord( # Create a compact record to store all pet-related data
+                pet_id=pet_id,
+                owner_id=owner_id,
+                pet_name=pet_name,
+                species=species,
+                breed=breed,
+                age=age,
+                color=color,
+                image_path=image_path,
+                registration_date=registration_date,
+                status='registered', # Initial status of a new pet
+                lost_details=None # Initialize lost_details as None
+            )
+            self._remember(PETS, pet_id) # Restored if the enclosing transaction fails
+            self.pets[pet_id] = pet_data # Add the new pet data to the pets hash table, keyed by pet_id
+            self._index_pet(pet_id, pet_data) # Register the pet in the owner and status indexes
+            logger.info("In-memory DB: Pet '%s' added for owner '%s'.", pet_name, owner_id) # Log successful addition
+            self._publish(INSERTED, 'pet', pet_id) # Notify subscribers
+            return True # Indicate successful addition
 
     def get_pet(self, pet_id):
         """Retrieves pet details by pet ID."""
-        pet_data = self.pets.get(pet_id) # Retrieve pet data directly from the pets hash table using pet_id
-        if pet_data: # If pet data was found
-            logger.info(f"In-memory DB: Retrieved pet by ID '{pet_id}'.") # Log successful retrieval
-        else: # If pet data was not found
-            logger.info(f"In-memory DB: Pet by ID '{pet_id}' not found.") # Log if pet_id not found
-        return pet_data # Return pet data or None
+        with self._reading(PETS):
+            pet_data = self.pets.get(pet_id) # Retrieve pet data directly from the pets hash table using pet_id
+            if pet_data: # If pet data was found
+                logger.debug("In-memory DB: Retrieved pet by ID '%s'.", pet_id) # Log successful retrieval
+            else: # If pet data was not found
+                logger.debug("In-memory DB: Pet by ID '%s' not found.", pet_id) # Log if pet_id not found
+            return pet_data # Return pet data or None
 
     def get_all_pets_by_owner(self, owner_id):
         """Retrieves all pets registered to a specific owner."""
-        # Use a dictionary comprehension to filter pets by owner_id and create a new dictionary
-        owner_pets = {pet_id: pet_data for pet_id, pet_data in self.pets.items() if pet_data.get('owner_id') == owner_id}
-        logger.info(f"In-memory DB: Retrieved {len(owner_pets)} pets for owner '{owner_id}'.") # Log count of retrieved pets
-        return owner_pets # Return the dictionary of pets owned by the specified owner
+        with self._reading(PETS):
+            # Resolve the owner's pet ids through the owner index instead of scanning every pet
+            owner_pets = {pet_id: self.pets[pet_id] for pet_id in self.pets_by_owner.get(owner_id, ())}
+            logger.debug("In-memory DB: Retrieved %s pets for owner '%s'.", len(owner_pets), owner_id) # Log count of retrieved pets
+            return owner_pets # Return the dictionary of pets owned by the specified owner
 
     def get_all_registered_pets(self):
-        """Retrieves all registered pets."""
-        logger.info("In-memory DB: Retrieved all registered pets.") # Log that all pets are being retrieved
-        return self.pets # Return the entire pets hash table (all registered pets)
+        """
+        Retrieves a snapshot of all registered pets.
+        Copies the whole table under the read lock (O(N), blocking writers meanwhile), so it is only for callers that
+        need every pet as of one instant; everyone else should stream with get_pets_after / PetDataManager.iter_all_pets.
+        """
+        with self._reading(PETS):
+            logger.debug("In-memory DB: Retrieved all registered pets.") # Log that all pets are being retrieved
+            return dict(self.pets) # Return a copy of the pets hash table, which other threads may change while the caller reads it
+
+    def get_pets_page(self, limit=50, offset=0):
+        """
+        Retrieves one page of pets in stable (registration_date, pet_id) order.
+        Only the requested slice is materialised; the cost does not depend on the table size.
+        :return: A list of pet dictionaries.
+        """
+        with self._reading(PETS):
+            self._flush_orders() # A transaction on this thread may have buffered order changes
+            keys = self.pets_order[offset:offset + limit] # Slice of the sorted key list
+            return [self.pets[pet_id] for _, pet_id in keys]
+
+    def get_pets_after(self, cursor=None, limit=50):
+        """
+        Retrieves the page of pets that follows an opaque cursor (None for the first page).
+        Unlike offsets, cursors stay correct when records are inserted or deleted between calls.
+        :return: (list of pet dictionaries, cursor for the next page or None when there are no more pets)
+        """
+        with self._reading(PETS):
+            self._flush_orders() # A transaction on this thread may have buffered order changes
+            start = bisect.bisect_right(self.pets_order, decode_cursor(cursor)) if cursor else 0 # O(log n) seek
+            keys = self.pets_order[start:start + limit]
+            next_cursor = encode_cursor(keys[-1]) if keys and start + limit < len(self.pets_order) else None
+            return [self.pets[pet_id] for _, pet_id in keys], next_cursor
 
     def update_pet(self, pet_id, new_details):
         """Updates details of an existing pet."""
-        if pet_id in self.pets: # Check if the pet_id exists in the pets hash table
-            self.pets[pet_id].update(new_details) # Update the pet's details in the pets hash table
-            logger.info(f"In-memory DB: Pet '{pet_id}' updated.") # Log successful update
-            return True # Indicate successful update
-        logger.warning(f"In-memory DB: Pet '{pet_id}' not found for update.") # Log if pet not found for update
-        return False # Return False if pet_id not found
+        with self._writing(PETS):
+            if pet_id in self.pets: # Check if the pet_id exists in the pets hash table
+                self._remember(PETS, pet_id) # Restored if the enclosing transaction fails
+                pet_data = self.pets[pet_id].copy() # Readers holding the current record keep an unchanged copy
+                new_details = self._known_fields(PetRecord, 'pet_id', pet_id, new_details) # Fields a PetRecord can hold
+                old_owner, old_status = pet_data.get('owner_id'), pet_data.get('status') # Remember the indexed fields
+                old_key = self._pet_key(pet_id, pet_data) # Remember the pagination key
+                pet_data.update(new_details) # Apply the new details
+                self.pets[pet_id] = pet_data # Replace the pet's record in the pets hash table
+                if self._pet_key(pet_id, pet_data) != old_key: # Re-position the pet if its registration date changed
+                    self._order_remove(self.pets_order, old_key)
+                    self._order_add(self.pets_order, self._pet_key(pet_id, pet_data))
+                if pet_data.get('owner_id') != old_owner: # Move the pet to its new owner's bucket if the owner changed
+                    self._index_remove(self.pets_by_owner, old_owner, pet_id)
+                    self._index_add(self.pets_by_owner, pet_data.get('owner_id'), pet_id)
+                if pet_data.get('status') != old_status: # Move the pet to its new status bucket if the status changed
+                    self._index_remove(self.pets_by_status, old_status, pet_id)
+                    self._index_add(self.pets_by_status, pet_data.get('status'), pet_id)
+                self._geo_index_pet(pet_id, pet_data) # Status or lost_details may have changed the last seen position
+                logger.info("In-memory DB: Pet '%s' updated.", pet_id) # Log successful update
+                self._publish(UPDATED, 'pet', pet_id) # Notify subscribers
+                return True # Indicate successful update
+            logger.warning("In-memory DB: Pet '%s' not found for update.", pet_id) # Log if pet not found for update
+            return False # Return False if pet_id not found
 
     def delete_pet(self, pet_id):
         """Deletes a pet from the in-memory database by pet ID."""
-        if pet_id in self.pets: # Check if the pet_id exists in the pets hash table
-            del self.pets[pet_id] # Delete the pet record from the pets hash table
-            logger.info(f"In-memory DB: Pet '{pet_id}' deleted.") # Log successful deletion
-            return True # Indicate successful deletion
-        logger.warning(f"In-memory DB: Pet '{pet_id}' not found for deletion.") # Log if pet not found for deletion
-        return False # Return False if pet_id not found
+        with self._writing(PETS):
+            if pet_id in self.pets: # Check if the pet_id exists in the pets hash table
+                self._remember(PETS, pet_id) # Restored if the enclosing transaction fails
+                self._unindex_pet(pet_id, self.pets[pet_id]) # Remove the pet from the secondary indexes
+                del self.pets[pet_id] # Delete the pet record from the pets hash table
+                logger.info("In-memory DB: Pet '%s' deleted.", pet_id) # Log successful deletion
+                self._publish(DELETED, 'pet', pet_id) # Notify subscribers
+                return True # Indicate successful deletion
+            logger.warning("In-memory DB: Pet '%s' not found for deletion.", pet_id) # Log if pet not found for deletion
+            return False # Return False if pet_id not found
 
     def get_all_lost_pets(self):
         """Retrieves all pets currently marked as 'lost'."""
-        # Use a dictionary comprehension to filter pets that have 'status' set to 'lost'
-        lost_pets = {pet_id: pet_data for pet_id, pet_data in self.pets.items() if pet_data.get('status') == 'lost'}
-        logger.info(f"In-memory DB: Retrieved {len(lost_pets)} lost pets.") # Log count of lost pets
-        return lost_pets # Return the dictionary of lost pets
+        with self._reading(PETS):
+            # Resolve lost pet ids through the status index instead of scanning every pet
+            lost_pets = {pet_id: self.pets[pet_id] for pet_id in self.pets_by_status.get('lost', ())}
+            logger.debug("In-memory DB: Retrieved %s lost pets.", len(lost_pets)) # Log count of lost pets
+            return lost_pets # Return the dictionary of lost pets
+
+    def get_lost_pets_near(self, latitude, longitude, radius_km):
+        """
+        Retrieves the lost pets last seen within radius_km of a point, using the spatial index.
+        :return: List of (distance_km, pet dictionary), nearest first.
+        """
+        with self._reading(PETS):
+            return [(distance, self.pets[pet_id]) for distance, pet_id in self.lost_pets_geo.within(latitude, longitude, radius_km)]
 
     # --- Stray Pet Management Methods ---
     
-    def add_stray_pet_report(self, stray_id, reporter_id, species, location, breed, color, description, contact_info, reported_date):
+    def add_stray_pet_report(self, stray_id, reporter_id, species, location, breed, color, description, contact_info, reported_date,
+                             latitude=None, longitude=None):
         """Adds a new stray pet report to the in-memory database."""
-        if stray_id in self.strays: # Check if the stray_id already exists in the strays hash table
-            logger.warning(f"In-memory DB: Stray ID '{stray_id}' already exists. Cannot add report.") # Log warning
-            return False # Return False if stray_id is already taken
+        with self._writing(STRAYS):
+            if stray_id in self.strays: # Check if the stray_id already exists in the strays hash table
+                logger.warning("In-memory DB: Stray ID '%s' already exists. Cannot add report.", stray_id) # Log warning
+                return False # Return False if stray_id is already taken
         
-        stray_data = { # Create a dictionary to store all stray report data
-            'stray_id': stray_id,
-            'reporter_id': reporter_id,
-            'species': species,
-            'location': location,
-            'breed': breed,
-            'color': color,
-            'description': description,
-            'contact_info': contact_info, # Store contact_info directly as a dictionary
-            'reported_date': reported_date,
-            'status': 'stray' # Initial status of a new stray report
-        }
-        self.strays[stray_id] = stray_data # Add the new stray report data to the strays hash table, keyed by stray_id
-        logger.info(f"In-memory DB: Stray report '{stray_id}' added.") # Log successful addition
-        return True # Indicate successful addition
+            stray_data = StrayRecord( # Create a compact record to store all stray report data
+                stray_id=stray_id,
+                reporter_id=reporter_id,
+                species=species,
+                location=location,
+                breed=breed,
+                color=color,
+                description=description,
+                contact_info=contact_info, # Stored as a nested ContactInfo record when it only has email/phone
+                reported_date=reported_date,
+                status='stray', # Initial status of a new stray report
+                latitude=latitude, # Optional coordinates of the sighting
+                longitude=longitude
+            )
+            self._remember(STRAYS, stray_id) # Restored if the enclosing transaction fails
+            self.strays[stray_id] = stray_data # Add the new stray report data to the strays hash table, keyed by stray_id
+            self._index_stray(stray_id, stray_data) # Register the report in the reporter and status indexes
+            logger.info("In-memory DB: Stray report '%s' added.", stray_id) # Log successful addition
+            self._publish(INSERTED, 'stray', stray_id) # Notify subscribers
+            return True # Indicate successful addition
 
     def get_stray_pet(self, stray_id):
         """Retrieves stray pet details by stray ID."""
-        stray_data = self.strays.get(stray_id) # Retrieve stray data directly from the strays hash table using stray_id
-        if stray_data: # If stray data was found
-            logger.info(f"In-memory DB: Retrieved stray pet by ID '{stray_id}'.") # Log successful retrieval
-        else: # If stray data was not found
-            logger.info(f"In-memory DB: Stray pet by ID '{stray_id}' not found.") # Log if stray_id not found
-        return stray_data # Return stray data or None
+        with self._reading(STRAYS):
+            stray_data = self.strays.get(stray_id) # Retrieve stray data directly from the strays hash table using stray_id
+            if stray_data: # If stray data was found
+                logger.debug("In-memory DB: Retrieved stray pet by ID '%s'.", stray_id) # Log successful retrieval
+            else: # If stray data was not found
+                logger.debug("In-memory DB: Stray pet by ID '%s' not found.", stray_id) # Log if stray_id not found
+            return stray_data # Return stray data or None
 
     def get_all_stray_pets(self):
-        """Retrieves all stray pets."""
-        logger.info("In-memory DB: Retrieved all stray reports.") # Log that all stray reports are being retrieved
-        return self.strays # Return the entire strays hash table (all stray reports)
+        """
+        Retrieves a snapshot of all stray pets.
+        Copies the whole table under the read lock (O(N), blocking writers meanwhile), so it is only for callers that
+        need every report as of one instant; everyone else should stream with get_strays_after / iter_all_strays.
+        """
+        with self._reading(STRAYS):
+            logger.debug("In-memory DB: Retrieved all stray reports.") # Log that all stray reports are being retrieved
+            return dict(self.strays) # Return a copy of the strays hash table, which other threads may change while the caller reads it
+
+    def get_strays_page(self, limit=50, offset=0):
+        """
+        Retrieves one page of stray reports in stable (reported_date, stray_id) order.
+        :return: A list of stray report dictionaries.
+        """
+        with self._reading(STRAYS):
+            self._flush_orders() # A transaction on this thread may have buffered order changes
+            keys = self.strays_order[offset:offset + limit] # Slice of the sorted key list
+            return [self.strays[stray_id] for _, stray_id in keys]
+
+    def get_strays_after(self, cursor=None, limit=50):
+        """
+        Retrieves the page of stray reports that follows an opaque cursor (None for the first page).
+        :return: (list of stray report dictionaries, cursor for the next page or None when there are no more reports)
+        """
+        with self._reading(STRAYS):
+            self._flush_orders() # A transaction on this thread may have buffered order changes
+            start = bisect.bisect_right(self.strays_order, decode_cursor(cursor)) if cursor else 0 # O(log n) seek
+            keys = self.strays_order[start:start + limit]
+            next_cursor = encode_cursor(keys[-1]) if keys and start + limit < len(self.strays_order) else None
+            return [self.strays[stray_id] for _, stray_id in keys], next_cursor
 
     def mark_stray_found_captured(self, stray_id):
         """Marks a stray pet report as found/captured."""
-        if stray_id in self.strays: # Check if the stray_id exists in the strays hash table
-            self.strays[stray_id]['status'] = 'found_captured' # Update the 'status' field of the stray report
-            logger.info(f"In-memory DB: Stray report '{stray_id}' marked as found/captured.") # Log successful update
-            return True # Indicate successful update
-        logger.warning(f"In-memory DB: Stray report '{stray_id}' not found for status update.") # Log if stray not found for update
-        return False # Return False if stray_id not found
\ No newline at end of file
+        with self._writing(STRAYS):
+            if stray_id in self.strays: # Check if the stray_id exists in the strays hash table
+                self._remember(STRAYS, stray_id) # Restored if the enclosing transaction fails
+                stray_data = self.strays[stray_id].copy() # Readers holding the current record keep an unchanged copy
+                self._index_remove(self.strays_by_status, stray_data.get('status'), stray_id) # Drop the old status entry
+                stray_data['status'] = 'found_captured' # Update the 'status' field of the stray report
+                self.strays[stray_id] = stray_data # Replace the report in the strays hash table
+                self._index_add(self.strays_by_status, 'found_captured', stray_id) # Register the new status
+                logger.info("In-memory DB: Stray report '%s' marked as found/captured.", stray_id) # Log successful update
+                self._publish(UPDATED, 'stray', stray_id) # Notify subscribers
+                return True # Indicate successful update
+            logger.warning("In-memory DB: Stray report '%s' not found for status update.", stray_id) # Log if stray not found for update
+            return False # Return False if stray_id not found
+
+    # --- Bulk Loading ---
+
+    def insert_records(self, entity, records):
+        """
+        Inserts a batch of complete, validated records straight into the 'user', 'pet' or 'stray' table.
+        Secondary indexes and subscribers are not updated per record: call finish_bulk_insert() once after the last batch.
+        Records whose ID (or, for users, username) already exists are skipped.
+        :return: The number of records inserted.
+        """
+        with self._writing(ENTITY_TABLES[entity]):
+            inserted = 0
+            if entity == 'user':
+                for record in records:
+                    if record['user_id'] in self.users or record['username'] in self.username_to_id: # Duplicate user
+                        continue
+                    self._remember(USERS, record['user_id'])
+                    self.users[record['user_id']] = UserRecord.from_dict(record)
+                    self.username_to_id[record['username']] = record['user_id'] # Kept current so later duplicates are caught
+                    inserted += 1
+                return inserted
+            table, key, record_type = (self.pets, 'pet_id', PetRecord) if entity == 'pet' else (self.strays, 'stray_id', StrayRecord)
+            for record in records:
+                if record[key] not in table: # Skip duplicate IDs
+                    self._remember(ENTITY_TABLES[entity], record[key])
+                    table[record[key]] = record_type.from_dict(record)
+                    inserted += 1
+            return inserted
+
+    def finish_bulk_insert(self, entities):
+        """
+        Completes a bulk load: rebuilds the secondary indexes once (one sort per table instead of one insort per record)
+        and publishes a RELOADED event for each loaded entity, so subscribers rebuild their derived state.
+        """
+        with self._writing(USERS, PETS, STRAYS):
+            self.rebuild_indexes()
+            for entity in entities:
+                self._publish(RELOADED, entity, None) # Notify subscribers
+
+class SQLiteDBManager(ChangeNotifier):
+    """
+    Persistent storage engine with the same method surface as InMemoryDBManager.
+    Uses a single SQLite connection in WAL mode, parameterised (cached) statements,
+    indexes on owner_id/status/reporter_id and explicit transactions for batched writes.
+    """
+
+    USER_COLUMNS = ('user_id', 'username', 'password_hash', 'contact_info', 'registration_date') # Columns of the users table
+    ORDER_COLUMNS = {'users': ('registration_date', 'user_id'), 'pets': ('registration_date', 'pet_id'),
+                     'strays': ('reported_date', 'stray_id')} # Pagination order of each table, as in InMemoryDBManager
+    PET_COLUMNS = ('pet_id', 'owner_id', 'pet_name', 'species', 'breed', 'age', 'color', 'image_path',
+                   'registration_date', 'status', 'lost_details') # Columns of the pets table
+    STRAY_COLUMNS = ('stray_id', 'reporter_id', 'species', 'location', 'breed', 'color', 'description',
+                     'contact_info', 'reported_date', 'status', 'latitude', 'longitude') # Columns of the strays table
+    JSON_COLUMNS = ('contact_info', 'lost_details') # Columns holding dictionaries serialised as JSON text
+
+    def __init__(self, db_path="petdex.db"):
+        """
+        Opens (or creates) the SQLite database file at db_path and makes sure the schema exists.
+        :param db_path: Path of the database file, or ":memory:" for a throwaway database.
+        """
+        super().__init__() # Set up change event subscriptions
+        self.db_path = db_path # Path of the SQLite database file
+        self.conn = None # The single shared connection, opened by connect()
+        self._lock = threading.RLock() # Serialises use of the connection across threads
+        self._tx_depth = 0 # Nesting depth of transaction() blocks; commits happen only at depth 0
+        self._tx_thread = None # Thread running the open transaction
+        self._tx_events = [] # Events of the open transaction, published only once it commits
+        self.connect() # Open the connection
+        self.create_tables() # Create tables and indexes if they do not exist yet
+
+    def connect(self):
+        """Opens the SQLite connection and applies the performance pragmas."""
+        if self.conn is not None: # Already connected
+            return
+        # isolation_level=None puts sqlite3 in autocommit mode so transactions are controlled explicitly
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        self.conn.row_factory = sqlite3.Row # Rows can be converted to dictionaries by column name
+        if self.db_path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL") # Readers do not block the writer and commits are cheaper
+        self.conn.execute("PRAGMA synchronous=NORMAL") # Safe with WAL, avoids an fsync on every commit
+        self.conn.execute("PRAGMA temp_store=MEMORY") # Keep temporary b-trees in memory
+        logger.info("SQLite DB: Connected to '%s'.", self.db_path) # Log connection
+
+    def close(self):
+        """Closes the SQLite connection."""
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close() # Close the connection; committed data stays on disk
+                self.conn = None
+                logger.info("SQLite DB: Connection to '%s' closed.", self.db_path) # Log closing
+
+    def create_tables(self):
+        """Creates the users, pets and strays tables and their secondary indexes if they do not exist."""
+        with self.transaction():
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id TEXT PRIMARY KEY,
+                    username TEXT NOT NULL UNIQUE,
+                    password_hash TEXT NOT NULL,
+                    contact_info TEXT,
+                    registration_date TEXT
+                )""")
+            pet_columns = {row['name']: row['type'] for row in self.conn.execute("PRAGMA table_info(pets)")}
+            if pet_columns.get('age') == 'REAL': # Databases created when age had REAL affinity, which read 3 and '3' back as 3.0
+                self.conn.execute("ALTER TABLE pets RENAME TO pets_real_age") # Rebuilt below; its indexes go with it
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pets (
+                    pet_id TEXT PRIMARY KEY,
+                    owner_id TEXT,
+                    pet_name TEXT NOT NULL,
+                    species TEXT,
+                    breed TEXT,
+                    age,
+                    color TEXT,
+                    image_path TEXT,
+                    registration_date TEXT,
+                    status TEXT NOT NULL DEFAULT 'registered',
+                    lost_details TEXT
+                )""") # age has no type, so no affinity: values come back exactly as stored, as in InMemoryDBManager
+            if pet_columns.get('age') == 'REAL':
+                columns = ", ".join(pet_columns)
+                self.conn.execute(f"INSERT INTO pets ({columns}) SELECT {columns} FROM pets_real_age")
+                self.conn.execute("DROP TABLE pets_real_age")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS strays (
+                    stray_id TEXT PRIMARY KEY,
+                    reporter_id TEXT,
+                    species TEXT,
+                    location TEXT,
+                    breed TEXT,
+                    color TEXT,
+                    description TEXT,
+                    contact_info TEXT,
+                    reported_date TEXT,
+                    status TEXT NOT NULL DEFAULT 'stray',
+                    latitude REAL,
+                    longitude REAL
+                )""")
+            stray_columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(strays)")}
+            for column in ('latitude', 'longitude'): # Databases created before coordinates were added
+                if column not in stray_columns:
+                    self.conn.execute(f"ALTER TABLE strays ADD COLUMN {column} REAL")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pets_owner ON pets(owner_id)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pets_status ON pets(status)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_strays_reporter ON strays(reporter_id)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_strays_status ON strays(status)")
+            for table, (date_column, id_column) in self.ORDER_COLUMNS.items(): # Pagination order, missing dates first as ''
+                name = f"idx_{table}_order"
+                order_index = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+                if order_index is not None and 'COALESCE' not in order_index['sql']: # Created when NULL dates broke keyset pages
+                    self.conn.execute(f"DROP INDEX {name}")
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}(COALESCE({date_column}, ''), {id_column})")
+            # Lost pets by last seen latitude, then longitude: radius queries scan one latitude band of lost pets,
+            # and pets outside the longitude window are skipped on the index entries, without reading their rows
+            geo_index = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_pets_lost_geo'").fetchone()
+            if geo_index is not None and '$.longitude' not in geo_index['sql']: # Created when only latitude was indexed
+                self.conn.execute("DROP INDEX idx_pets_lost_geo")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pets_lost_geo ON pets(json_extract(lost_details, '$.latitude'), "
+                              "json_extract(lost_details, '$.longitude')) WHERE status = 'lost'")
+        logger.info("SQLite DB: Tables and indexes are ready.") # Log schema creation
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups several writes into one SQLite transaction (one commit, one WAL sync).
+        Nested blocks join the outermost transaction; an exception rolls everything back.
+        Change events of the batch are held back and published after the commit; a rollback drops them.
+        """
+        events = ()
+        with self._lock:
+            if self._tx_depth == 0:
+                self.conn.execute("BEGIN IMMEDIATE") # Take the write lock up front
+                self._tx_thread, self._tx_events = threading.get_ident(), []
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self._tx_events = [] # Nothing happened, so nothing is announced
+                    self.conn.execute("ROLLBACK") # Undo every write of the batch
+                raise
+            else:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    events, self._tx_events = self._tx_events, []
+                    self.conn.execute("COMMIT") # Make the batch durable
+        for event in events: # Outside the lock, like the events of single writes
+            super()._publish(*event)
+
+    def _publish(self, action, entity, entity_id):
+        """Delivers a change event, or holds it back until the transaction open on this thread commits."""
+        if self._tx_depth and self._tx_thread == threading.get_ident():
+            self._tx_events.append((action, entity, entity_id))
+        else:
+            super()._publish(action, entity, entity_id)
+
+    def _execute_query(self, query, params=(), fetch_one=False, fetch_all=False):
+        """
+        Runs a parameterised query on the shared connection.
+        Statements are cached by sqlite3, so repeated queries are prepared only once.
+        :return: a Row for fetch_one, a list of Rows for fetch_all, otherwise the cursor's rowcount.
+        """
+        with self._lock:
+            cursor = self.conn.execute(query, params)
+            if fetch_one:
+                return cursor.fetchone()
+            if fetch_all:
+                return cursor.fetchall()
+            return cursor.rowcount
+
+    def _row_to_dict(self, row):
+        """Converts a sqlite3.Row into a record dictionary, decoding JSON columns."""
+        if row is None:
+            return None
+        record = dict(row) # Column name -> value
+        for column in self.JSON_COLUMNS:
+            if column in record and record[column] is not None:
+                record[column] = json.loads(record[column]) # Restore the nested dictionary
+        return record
+
+    def _encode(self, column, value):
+        """Serialises dictionaries stored in JSON columns."""
+        if column in self.JSON_COLUMNS and value is not None:
+            return json.dumps(value)
+        return value
+
+    def _update_row(self, table, key_column, key, allowed_columns, new_details):
+        """Updates the allowed columns of one row; unknown keys are ignored. Returns the number of rows changed."""
+        columns = [c for c in new_details if c in allowed_columns and c != key_column] # Only real, non-key columns
+        ignored = [c for c in new_details if c not in allowed_columns]
+        if ignored:
+            logger.warning("SQLite DB: Ignoring unknown %s fields %s.", table, ignored) # Log fields with no column
+        if not columns: # Nothing to write; report whether the row exists
+            row = self._execute_query(f"SELECT 1 FROM {table} WHERE {key_column} = ?", (key,), fetch_one=True)
+            return 1 if row else 0
+        assignments = ", ".join(f"{c} = ?" for c in columns)
+        params = [self._encode(c, new_details[c]) for c in columns] + [key]
+        return self._execute_query(f"UPDATE {table} SET {assignments} WHERE {key_column} = ?", params)
+
+    # --- User Management Methods ---
+
+    def add_user(self, user_id, username, password_hash, contact_info, registration_date):
+        """Adds a new user. Returns True if successful, False if username or user_id already exists."""
+        try:
+            self._execute_query(
+                "INSERT INTO users (user_id, username, password_hash, contact_info, registration_date) VALUES (?, ?, ?, ?, ?)",
+                (user_id, username, password_hash, json.dumps(contact_info), registration_date))
+        except sqlite3.IntegrityError: # UNIQUE constraint on username or PRIMARY KEY on user_id
+            logger.warning("SQLite DB: Username '%s' already exists. Cannot add user.", username)
+            return False
+        logger.info("SQLite DB: User '%s' added.", username)
+        self._publish(INSERTED, 'user', user_id)
+        return True
+
+    def get_user_by_username(self, username):
+        """Retrieves user details by username."""
+        row = self._execute_query("SELECT * FROM users WHERE username = ?", (username,), fetch_one=True)
+        return self._row_to_dict(row)
+
+    def get_user_by_id(self, user_id):
+        """Retrieves user details by user ID."""
+        row = self._execute_query("SELECT * FROM users WHERE user_id = ?", (user_id,), fetch_one=True)
+        return self._row_to_dict(row)
+
+    def update_user(self, user_id, new_details):
+        """Updates details of an existing user. Returns False if the user is missing or the new username is taken."""
+        try:
+            changed = self._update_row('users', 'user_id', user_id, self.USER_COLUMNS, new_details)
+        except sqlite3.IntegrityError: # UNIQUE constraint on username
+            logger.warning("SQLite DB: Cannot update user %s. New username '%s' is already taken.", user_id, new_details.get('username'))
+            return False
+        if changed:
+            logger.info("SQLite DB: User '%s' updated.", user_id)
+            self._publish(UPDATED, 'user', user_id)
+            return True
+        logger.warning("SQLite DB: User '%s' not found for update.", user_id)
+        return False
+
+    def delete_user(self, user_id):
+        """Deletes a user together with their pets and stray reports in one transaction."""
+        with self.transaction():
+            if not self._execute_query("DELETE FROM users WHERE user_id = ?", (user_id,)):
+                logger.warning("SQLite DB: User '%s' not found for deletion.", user_id)
+                return False
+            pet_ids = [row[0] for row in self._execute_query("SELECT pet_id FROM pets WHERE owner_id = ?", (user_id,), fetch_all=True)]
+            stray_ids = [row[0] for row in self._execute_query("SELECT stray_id FROM strays WHERE reporter_id = ?", (user_id,), fetch_all=True)]
+            self._execute_query("DELETE FROM pets WHERE owner_id = ?", (user_id,)) # Uses idx_pets_owner
+            self._execute_query("DELETE FROM strays WHERE reporter_id = ?", (user_id,)) # Uses idx_strays_reporter
+        logger.info("SQLite DB: User '%s' deleted with %s pets and %s stray reports.", user_id, len(pet_ids), len(stray_ids))
+        for pet_id in pet_ids: # Publish the cascaded deletions after the commit
+            self._publish(DELETED, 'pet', pet_id)
+        for stray_id in stray_ids:
+            self._publish(DELETED, 'stray', stray_id)
+        self._publish(DELETED, 'user', user_id)
+        return True
+
+    def get_users_after(self, cursor=None, limit=50):
+        """Retrieves the page of users that follows an opaque cursor (keyset pagination on idx_users_order)."""
+        return self._page_after('users', cursor, limit)
+
+    def _page_after(self, table, cursor, limit):
+        """
+        Keyset pagination on idx_<table>_order. Missing dates sort first as '', like InMemoryDBManager's order lists:
+        a NULL in the row comparison would make it NULL, and every page after such a row would come back empty.
+        SQLite cannot seek an expression index with a row value, so the page is read as two seeks: the rest of the
+        cursor's date, then the dates after it.
+        :return: (list of record dictionaries, cursor for the next page or None when there are no more records)
+        """
+        date_column, id_column = self.ORDER_COLUMNS[table]
+        sort_date = f"COALESCE({date_column}, '')"
+        if cursor:
+            after_date, after_id = decode_cursor(cursor)
+            after_date = after_date or '' # Cursors made before missing dates were coalesced hold None
+            with self._lock: # Both reads see the same table
+                rows = self._execute_query(f"SELECT * FROM {table} WHERE {sort_date} = ? AND {id_column} > ? "
+                                           f"ORDER BY {id_column} LIMIT ?", (after_date, after_id, limit + 1), fetch_all=True)
+                if len(rows) <= limit:
+                    rows += self._execute_query(f"SELECT * FROM {table} WHERE {sort_date} > ? ORDER BY {sort_date}, {id_column} "
+                                                "LIMIT ?", (after_date, limit + 1 - len(rows)), fetch_all=True)
+        else:
+            rows = self._execute_query(f"SELECT * FROM {table} ORDER BY {sort_date}, {id_column} LIMIT ?", (limit + 1,), fetch_all=True)
+        records = [self._row_to_dict(row) for row in rows[:limit]] # The extra row only tells whether another page exists
+        next_cursor = encode_cursor((records[-1][date_column] or '', records[-1][id_column])) if len(rows) > limit else None
+        return records, next_cursor
+
+    def get_total_users(self):
+        """Counts the total number of users."""
+        return self._execute_query("SELECT COUNT(*) FROM users", fetch_one=True)[0]
+
+    def get_total_pets(self):
+        """Counts the total number of pets."""
+        return self._execute_query("SELECT COUNT(*) FROM pets", fetch_one=True)[0]
+
+    def get_total_strays(self):
+        """Counts the total number of stray reports."""
+        return self._execute_query("SELECT COUNT(*) FROM strays", fetch_one=True)[0]
+
+    # --- Pet Management Methods ---
+
+    def add_pet(self, pet_id, owner_id, pet_name, species, breed, age, color, image_path, registration_date):
+        """Adds a new pet. Returns False if pet_id already exists."""
+        try:
+            self._execute_query(
+                "INSERT INTO pets (pet_id, owner_id, pet_name, species, breed, age, color, image_path, registration_date, status, lost_details) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'registered', NULL)",
+                (pet_id, owner_id, pet_name, species, breed, age, color, image_path, registration_date))
+        except sqlite3.IntegrityError:
+            logger.warning("SQLite DB: Pet ID '%s' already exists. Cannot add pet.", pet_id)
+            return False
+        logger.info("SQLite DB: Pet '%s' added for owner '%s'.", pet_name, owner_id)
+        self._publish(INSERTED, 'pet', pet_id)
+        return True
+
+    def get_pet(self, pet_id):
+        """Retrieves pet details by pet ID."""
+        row = self._execute_query("SELECT * FROM pets WHERE pet_id = ?", (pet_id,), fetch_one=True)
+        return self._row_to_dict(row)
+
+    def get_all_pets_by_owner(self, owner_id):
+        """Retrieves all pets registered to a specific owner, keyed by pet_id."""
+        rows = self._execute_query("SELECT * FROM pets WHERE owner_id = ? ORDER BY rowid", (owner_id,), fetch_all=True)
+        return {row['pet_id']: self._row_to_dict(row) for row in rows}
+
+    def get_all_registered_pets(self):
+        """Retrieves all registered pets, keyed by pet_id."""
+        rows = self._execute_query("SELECT * FROM pets ORDER BY rowid", fetch_all=True)
+        return {row['pet_id']: self._row_to_dict(row) for row in rows}
+
+    def get_pets_page(self, limit=50, offset=0):
+        """Retrieves one page of pets in stable (registration_date, pet_id) order."""
+        rows = self._execute_query("SELECT * FROM pets ORDER BY COALESCE(registration_date, ''), pet_id LIMIT ? OFFSET ?",
+                                   (limit, offset), fetch_all=True)
+        return [self._row_to_dict(row) for row in rows]
+
+    def get_pets_after(self, cursor=None, limit=50):
+        """Retrieves the page of pets that follows an opaque cursor (keyset pagination on idx_pets_order)."""
+        return self._page_after('pets', cursor, limit)
+
+    def update_pet(self, pet_id, new_details):
+        """Updates details of an existing pet."""
+        if self._update_row('pets', 'pet_id', pet_id, self.PET_COLUMNS, new_details):
+            logger.info("SQLite DB: Pet '%s' updated.", pet_id)
+            self._publish(UPDATED, 'pet', pet_id)
+            return True
+        logger.warning("SQLite DB: Pet '%s' not found for update.", pet_id)
+        return False
+
+    def delete_pet(self, pet_id):
+        """Deletes a pet by pet ID."""
+        if self._execute_query("DELETE FROM pets WHERE pet_id = ?", (pet_id,)):
+            logger.info("SQLite DB: Pet '%s' deleted.", pet_id)
+            self._publish(DELETED, 'pet', pet_id)
+            return True
+        logger.warning("SQLite DB: Pet '%s' not found for deletion.", pet_id)
+        return False
+
+    def get_all_lost_pets(self):
+        """Retrieves all pets currently marked as 'lost', keyed by pet_id."""
+        rows = self._execute_query("SELECT * FROM pets WHERE status = 'lost' ORDER BY rowid", fetch_all=True) # Uses idx_pets_status
+        return {row['pet_id']: self._row_to_dict(row) for row in rows}
+
+    def get_lost_pets_near(self, latitude, longitude, radius_km):
+        """
+        Retrieves the lost pets last seen within radius_km of a point.
+        The bounding box is read through idx_pets_lost_geo (a latitude band, filtered to the longitude window, which
+        wraps across the antimeridian like GeoGridIndex's columns); exact distances are checked afterwards.
+        :return: List of (distance_km, pet dictionary), nearest first.
+        """
+        lat_span, lon_span = degree_span(latitude, radius_km)
+        query = ("SELECT * FROM pets INDEXED BY idx_pets_lost_geo "
+                 "WHERE status = 'lost' AND json_extract(lost_details, '$.latitude') BETWEEN ? AND ?")
+        params = [latitude - lat_span, latitude + lat_span]
+        if lon_span < 180.0: # Otherwise the circle reaches a pole: every longitude is within reach
+            west = (longitude - lon_span + 180.0) % 360.0 - 180.0 # Window edges, normalised to [-180, 180)
+            east = (longitude + lon_span + 180.0) % 360.0 - 180.0
+            longitude_term = "json_extract(lost_details, '$.longitude')"
+            if west <= east:
+                query += f" AND {longitude_term} BETWEEN ? AND ?"
+            else: # The window crosses the antimeridian: both ends of the longitude range
+                query += f" AND ({longitude_term} >= ? OR {longitude_term} <= ?)"
+            params += [west, east]
+        rows = self._execute_query(query, params, fetch_all=True)
+        matches = []
+        for row in rows:
+            pet_data = self._row_to_dict(row)
+            position = lost_position(pet_data)
+            if position is not None:
+                distance = haversine_km(latitude, longitude, *position)
+                if distance <= radius_km:
+                    matches.append((distance, pet_data))
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    # --- Stray Pet Management Methods ---
+
+    def add_stray_pet_report(self, stray_id, reporter_id, species, location, breed, color, description, contact_info, reported_date,
+                             latitude=None, longitude=None):
+        """Adds a new stray pet report. Returns False if stray_id already exists."""
+        try:
+            self._execute_query(
+                "INSERT INTO strays (stray_id, reporter_id, species, location, breed, color, description, contact_info, reported_date, status, "
+                "latitude, longitude) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'stray', ?, ?)",
+                (stray_id, reporter_id, species, location, breed, color, description, json.dumps(contact_info), reported_date,
+                 latitude, longitude))
+        except sqlite3.IntegrityError:
+            logger.warning("SQLite DB: Stray ID '%s' already exists. Cannot add report.", stray_id)
+            return False
+        logger.info("SQLite DB: Stray report '%s' added.", stray_id)
+        self._publish(INSERTED, 'stray', stray_id)
+        return True
+
+    def get_stray_pet(self, stray_id):
+        """Retrieves stray pet details by stray ID."""
+        row = self._execute_query("SELECT * FROM strays WHERE stray_id = ?", (stray_id,), fetch_one=True)
+        return self._row_to_dict(row)
+
+    def get_all_stray_pets(self):
+        """Retrieves all stray pet reports, keyed by stray_id."""
+        rows = self._execute_query("SELECT * FROM strays ORDER BY rowid", fetch_all=True)
+        return {row['stray_id']: self._row_to_dict(row) for row in rows}
+
+    def get_strays_page(self, limit=50, offset=0):
+        """Retrieves one page of stray reports in stable (reported_date, stray_id) order."""
+        rows = self._execute_query("SELECT * FROM strays ORDER BY COALESCE(reported_date, ''), stray_id LIMIT ? OFFSET ?",
+                                   (limit, offset), fetch_all=True)
+        return [self._row_to_dict(row) for row in rows]
+
+    def get_strays_after(self, cursor=None, limit=50):
+        """Retrieves the page of stray reports that follows an opaque cursor (keyset pagination on idx_strays_order)."""
+        return self._page_after('strays', cursor, limit)
+
+    def mark_stray_found_captured(self, stray_id):
+        """Marks a stray pet report as found/captured."""
+        if self._execute_query("UPDATE strays SET status = 'found_captured' WHERE stray_id = ?", (stray_id,)):
+            logger.info("SQLite DB: Stray report '%s' marked as found/captured.", stray_id)
+            self._publish(UPDATED, 'stray', stray_id)
+            return True
+        logger.warning("SQLite DB: Stray report '%s' not found for status update.", stray_id)
+        return False
+
+    # --- Bulk Loading ---
+
+    def insert_records(self, entity, records):
+        """
+        Inserts a batch of complete, validated records into the 'user', 'pet' or 'stray' table
+        with one executemany() in one transaction. Records whose ID or username already exists are skipped.
+        :return: The number of records inserted.
+        """
+        table, columns = {'user': ('users', self.USER_COLUMNS), 'pet': ('pets', self.PET_COLUMNS),
+                          'stray': ('strays', self.STRAY_COLUMNS)}[entity]
+        rows = [tuple(self._encode(column, record.get(column)) for column in columns) for record in records]
+        statement = f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        with self.transaction():
+            before = self.conn.total_changes
+            self.conn.executemany(statement, rows)
+            return self.conn.total_changes - before
+
+    def finish_bulk_insert(self, entities):
+        """Completes a bulk load: refreshes the query planner statistics and publishes a RELOADED event per loaded entity."""
+        self._execute_query("PRAGMA optimize") # SQLite maintained its indexes row by row; only the statistics are stale
+        for entity in entities:
+            self._publish(RELOADED, entity, None)
@@ -0,0 +1,306 @@
+import logging # Import the logging module for recording application events
+import json # Import json to encode log records and snapshots
+import os # Import os for fsync, atomic renames and file paths
+import threading # Import threading for the background group-commit flusher
+import time # Import time to measure how long records have been waiting for fsync
+from contextlib import contextmanager # Import contextmanager to build the logged transaction() context manager
+
+from database_manager import InMemoryDBManager, USERS, PETS, STRAYS # The in-memory engine this module makes durable, and its tables
+from Records import UserRecord, PetRecord, StrayRecord # Record types the snapshot tables are restored into
+
+logger = logging.getLogger(__name__) # Get a logger instance for this module
+
+
+class WriteAheadLog:
+    """
+    Append-only JSON-lines log with group commit.
+    Records are written to the OS buffer immediately, but fsync is issued only once per group:
+    when group_size records are pending, or when the oldest pending record is older than group_interval seconds.
+    A background thread enforces the time bound so a lone write is never left unsynced for long.
+    """
+
+    def __init__(self, path, group_size=128, group_interval=0.05, last_seq=0):
+        self.path = path # Path of the log file
+        self.group_size = group_size # Number of pending records that forces an fsync
+        self.group_interval = group_interval # Maximum age (seconds) of an unsynced record
+        self.last_seq = last_seq # Sequence number of the last record appended
+        self._lock = threading.Lock() # Protects the file handle, the sequence number and the pending counter
+        self._file = open(path, "a", encoding="utf-8") # Append mode: existing records are kept
+        self._pending = 0 # Records written since the last fsync
+        self._oldest_pending = None # Time the oldest unsynced record was written
+        self._closed = threading.Event() # Set when the log is closed, stops the flusher
+        self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+        self._flusher.start() # Start the background group-commit thread
+
+    def append(self, op, args):
+        """
+        Appends one mutation to the log, numbered under the log's lock so the sequence numbers follow the file order.
+        :return: The record's sequence number.
+        """
+        body = json.dumps({"op": op, "args": args}, separators=(",", ":"), default=dict) # Compact encoding (records as objects),
+        with self._lock:                                                                  # done before taking the lock
+            self.last_seq += 1
+            self._file.write(f'{{"seq":{self.last_seq},{body[1:]}\n') # Buffered write, no syscall per record
+            self._pending += 1
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+            if self._pending >= self.group_size: # Group is full: commit it now
+                self._sync_locked()
+            return self.last_seq
+
+    def sync(self):
+        """Forces every pending record to stable storage."""
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self._pending: # Nothing to do if every record is already durable
+            self._file.flush() # Push Python's buffer to the OS
+            os.fsync(self._file.fileno()) # One fsync covers the whole group
+            self._pending = 0
+            self._oldest_pending = None
+
+    def _flush_loop(self):
+        """Background loop that commits groups whose oldest record has waited group_interval seconds."""
+        while not self._closed.wait(self.group_interval):
+            with self._lock:
+                if self._oldest_pending is not None and time.monotonic() - self._oldest_pending >= self.group_interval:
+                    self._sync_locked()
+
+    def truncate(self):
+        """Discards every record in the log (called once a snapshot covers them)."""
+        with self._lock:
+            self._sync_locked()
+            self._file.truncate(0) # Append mode keeps writing at the (new) end of file
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Syncs pending records and closes the log."""
+        self._closed.set() # Stop the flusher thread
+        self._flusher.join()
+        with self._lock:
+            self._sync_locked()
+            self._file.close()
+
+    @staticmethod
+    def read(path):
+        """
+        Yields the records stored in the log at path, in order.
+        A torn final line (a crash in the middle of a write) is ignored.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as log_file:
+            for line in log_file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("WAL: Ignoring torn record at the end of '%s'.", path)
+                    return
+
+
+class DurableInMemoryDBManager(InMemoryDBManager):
+    """
+    InMemoryDBManager whose mutations survive restarts.
+    Every successful add/update/delete is appended to a write-ahead log; every snapshot_every mutations
+    the whole store is written to a snapshot file and the log is truncated. On startup the latest
+    snapshot is loaded and only the log tail written after it is replayed.
+    """
+
+    SNAPSHOT_FILE = "snapshot.json" # Name of the snapshot file inside data_dir
+    LOG_FILE = "wal.jsonl" # Name of the write-ahead log inside data_dir
+
+    def __init__(self, data_dir="petdex_data", snapshot_every=10000, group_size=128, group_interval=0.05):
+        super().__init__() # Set up the in-memory tables and indexes
+        self.data_dir = data_dir # Directory holding the snapshot and the log
+        self.snapshot_every = snapshot_every # Mutations between automatic snapshots (0 disables them)
+        self.snapshot_path = os.path.join(data_dir, self.SNAPSHOT_FILE)
+        self.log_path = os.path.join(data_dir, self.LOG_FILE)
+        self._seq = 0 # Sequence number recovery reached; the log numbers the mutations after it
+        self._since_snapshot = 0 # Mutations logged since the last snapshot
+        self._count_lock = threading.Lock() # Writers to different tables log concurrently
+        self._snapshot_lock = threading.Lock() # Held by the thread taking an automatic snapshot
+        os.makedirs(data_dir, exist_ok=True) # Make sure the data directory exists
+        self.recover() # Load snapshot + replay log before accepting new writes
+        self.wal = WriteAheadLog(self.log_path, group_size, group_interval, self._seq) # Open the log for appending
+
+    # --- Recovery and Snapshots ---
+
+    def recover(self):
+        """Loads the latest snapshot and replays the log records written after it."""
+        started = time.perf_counter()
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            # Restore the primary tables as compact records
+            self.users = {user_id: UserRecord.from_dict(user) for user_id, user in snapshot["users"].items()}
+            self.pets = {pet_id: PetRecord.from_dict(pet) for pet_id, pet in snapshot["pets"].items()}
+            self.strays = {stray_id: StrayRecord.from_dict(stray) for stray_id, stray in snapshot["strays"].items()}
+            self._seq = snapshot["seq"]
+            self.rebuild_indexes() # Derived indexes are not stored in the snapshot
+        replayed = 0
+        for record in WriteAheadLog.read(self.log_path):
+            if record["seq"] <= self._seq: # Already covered by the snapshot
+                continue
+            if record["op"] == "transaction": # One record per committed transaction: a torn line loses all of it, never part
+                operations = record["args"]
+            else:
+                operations = [(record["op"], record["args"])]
+            for op, args in operations:
+                getattr(InMemoryDBManager, op)(self, *args) # Apply without logging again
+            self._seq = record["seq"]
+            replayed += 1
+        self._since_snapshot = replayed
+        logger.info("Durable DB: Recovered to seq %s (%s log records replayed) in %.3fs.", self._seq, replayed, time.perf_counter() - started)
+
+    def snapshot(self):
+        """
+        Writes the whole store to the snapshot file atomically, then truncates the log.
+        If the process dies between the two steps, recovery skips the log records the snapshot already covers.
+        Inside a transaction the snapshot is postponed until the transaction commits, so it never holds uncommitted writes.
+        """
+        if self.in_transaction():
+            self._scope.snapshot_due = True
+            return
+        with self._reading(USERS, PETS, STRAYS): # Waits for writes in progress: every applied write is logged, and no other
+            self.wal.sync()                       # one can start, so the snapshot matches the log's last sequence number
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as snapshot_file:
+                json.dump({"seq": self.wal.last_seq, "users": self.users, "pets": self.pets, "strays": self.strays},
+                          snapshot_file, separators=(",", ":"), default=dict) # Records are written as JSON objects
+                snapshot_file.flush()
+                os.fsync(snapshot_file.fileno())
+            os.replace(tmp_path, self.snapshot_path) # Atomic switch to the new snapshot
+            self.wal.truncate() # The log tail is now redundant
+            with self._count_lock:
+                self._since_snapshot = 0
+            logger.info("Durable DB: Snapshot written at seq %s.", self.wal.last_seq)
+
+    def _log(self, op, *args):
+        """Appends a mutation to the log (buffered until commit inside a transaction). Called with its tables write-locked."""
+        if self.in_transaction():
+            self._scope.log_records.append((op, args))
+            return
+        self.wal.append(op, args)
+        with self._count_lock:
+            self._since_snapshot += len(args) if op == "transaction" else 1
+
+    def _snapshot_if_due(self):
+        """Takes a snapshot once snapshot_every mutations were logged. Called after a write has released its table locks."""
+        if self.snapshot_every and self._since_snapshot >= self.snapshot_every and self._snapshot_lock.acquire(blocking=False):
+            try:
+                if self._since_snapshot >= self.snapshot_every: # Not already taken by another thread meanwhile
+                    self.snapshot()
+            finally:
+                self._snapshot_lock.release()
+
+    @contextmanager
+    def transaction(self):
+        """
+        InMemoryDBManager.transaction() whose mutations are logged as one record when it commits,
+        so recovery replays the whole transaction or none of it. A rolled-back transaction logs nothing.
+        """
+        if self.in_transaction(): # Nested blocks join the outermost transaction
+            yield self
+            return
+        with self._writing(USERS, PETS, STRAYS): # Held until the record is logged, like every other mutation
+            with super().transaction():
+                self._scope.log_records, self._scope.snapshot_due = [], False
+                try:
+                    yield self
+                finally:
+                    log_records, snapshot_due = self._scope.log_records, self._scope.snapshot_due
+                    self._scope.log_records = None
+            if log_records: # Committed: the in-memory transaction has ended, so this is logged for real
+                self._log("transaction", *log_records)
+        if snapshot_due:
+            self.snapshot()
+        self._snapshot_if_due()
+
+    def close(self):
+        """Flushes the log so no acknowledged write is lost, then closes it."""
+        self.wal.close()
+        logger.info("Durable DB: Log closed, data is persistent.")
+
+    # --- Logged Mutations ---
+    # Each mutation is applied in memory first and logged only if it succeeded, so replay never sees a rejected write.
+    # A mutation holds the write locks of the tables it changes (the same ones InMemoryDBManager takes) until it is
+    # logged, so writes to one table are logged in the order they were applied. Writes to different tables commute, so
+    # their order in the log does not matter to replay, and they run concurrently. delete_user and transactions lock
+    # every table. A due snapshot is taken once the locks are released.
+
+    def add_user(self, user_id, username, password_hash, contact_info, registration_date):
+        with self._writing(USERS):
+            if not super().add_user(user_id, username, password_hash, contact_info, registration_date):
+                return False
+            self._log("add_user", user_id, username, password_hash, contact_info, registration_date)
+        self._snapshot_if_due()
+        return True
+
+    def update_user(self, user_id, new_details):
+        with self._writing(USERS):
+            if not super().update_user(user_id, new_details):
+                return False
+            self._log("update_user", user_id, new_details)
+        self._snapshot_if_due()
+        return True
+
+    def delete_user(self, user_id):
+        with self._writing(USERS, PETS, STRAYS):
+            if not super().delete_user(user_id):
+                return False
+            self._log("delete_user", user_id) # Replay repeats the cascade to pets and strays
+        self._snapshot_if_due()
+        return True
+
+    def add_pet(self, pet_id, owner_id, pet_name, species, breed, age, color, image_path, registration_date):
+        with self._writing(PETS):
+            if not super().add_pet(pet_id, owner_id, pet_name, species, breed, age, color, image_path, registration_date):
+                return False
+            self._log("add_pet", pet_id, owner_id, pet_name, species, breed, age, color, image_path, registration_date)
+        self._snapshot_if_due()
+        return True
+
+    def update_pet(self, pet_id, new_details):
+        with self._writing(PETS):
+            if not super().update_pet(pet_id, new_details):
+                return False
+            self._log("update_pet", pet_id, new_details)
+        self._snapshot_if_due()
+        return True
+
+    def delete_pet(self, pet_id):
+        with self._writing(PETS):
+            if not super().delete_pet(pet_id):
+                return False
+            self._log("delete_pet", pet_id)
+        self._snapshot_if_due()
+        return True
+
+    def add_stray_pet_report(self, stray_id, reporter_id, species, location, breed, color, description, contact_info, reported_date,
+                             latitude=None, longitude=None):
+        with self._writing(STRAYS):
+            if not super().add_stray_pet_report(stray_id, reporter_id, species, location, breed, color, description, contact_info,
+                                                reported_date, latitude, longitude):
+                return False
+            self._log("add_stray_pet_report", stray_id, reporter_id, species, location, breed, color, description, contact_info, reported_date,
+                      latitude, longitude)
+        self._snapshot_if_due()
+        return True
+
+    def mark_stray_found_captured(self, stray_id):
+        with self._writing(STRAYS):
+            if not super().mark_stray_found_captured(stray_id):
+                return False
+            self._log("mark_stray_found_captured", stray_id)
+        self._snapshot_if_due()
+        return True
+
+    def finish_bulk_insert(self, entities):
+        """
+        Bulk-loaded records bypass the log (one log record per row would double the load time);
+        a snapshot taken once the load completes makes them durable in one sequential write instead.
+        """
+        with self._writing(USERS, PETS, STRAYS):
+            super().finish_bulk_insert(entities)
+            self.snapshot()